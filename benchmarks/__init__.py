@@ -0,0 +1,10 @@
+"""
+Pakiet testów wydajności z generatorem syntetycznych drzew genealogicznych
+
+Uruchomienie:
+    python -m benchmarks --sizes 1000 10000 --output wyniki.json
+"""
+
+from .generator import GeneratorConfig, GenealogyGenerator, GeneratedTree, generate_tree
+
+__all__ = ['GeneratorConfig', 'GenealogyGenerator', 'GeneratedTree', 'generate_tree']
@@ -0,0 +1,9 @@
+"""
+Punkt wejścia: python -m benchmarks
+"""
+
+import sys
+
+from .runner import main
+
+sys.exit(main())
@@ -0,0 +1,263 @@
+"""
+Generator syntetycznych drzew genealogicznych do testów wydajności
+"""
+
+import math
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+MALE_NAMES = ['Jan', 'Piotr', 'Andrzej', 'Krzysztof', 'Stanisław', 'Tomasz', 'Paweł',
+              'Józef', 'Marcin', 'Marek', 'Michał', 'Grzegorz', 'Jerzy', 'Tadeusz',
+              'Adam', 'Łukasz', 'Zbigniew', 'Ryszard', 'Dariusz', 'Henryk', 'Mariusz',
+              'Kazimierz', 'Wojciech', 'Robert', 'Mateusz', 'Marian', 'Rafał', 'Jacek']
+
+FEMALE_NAMES = ['Anna', 'Maria', 'Katarzyna', 'Małgorzata', 'Agnieszka', 'Barbara',
+                'Ewa', 'Krystyna', 'Elżbieta', 'Zofia', 'Teresa', 'Magdalena', 'Joanna',
+                'Janina', 'Monika', 'Danuta', 'Jadwiga', 'Aleksandra', 'Halina', 'Irena',
+                'Beata', 'Marta', 'Dorota', 'Helena', 'Karolina', 'Jolanta', 'Iwona']
+
+# Nazwiska w formie męskiej i żeńskiej
+SURNAMES = [('Nowak', 'Nowak'), ('Kowalski', 'Kowalska'), ('Wiśniewski', 'Wiśniewska'),
+            ('Wójcik', 'Wójcik'), ('Kowalczyk', 'Kowalczyk'), ('Kamiński', 'Kamińska'),
+            ('Lewandowski', 'Lewandowska'), ('Zieliński', 'Zielińska'),
+            ('Szymański', 'Szymańska'), ('Woźniak', 'Woźniak'), ('Dąbrowski', 'Dąbrowska'),
+            ('Kozłowski', 'Kozłowska'), ('Jankowski', 'Jankowska'), ('Mazur', 'Mazur'),
+            ('Kwiatkowski', 'Kwiatkowska'), ('Krawczyk', 'Krawczyk'), ('Piotrowski', 'Piotrowska'),
+            ('Grabowski', 'Grabowska'), ('Nowakowski', 'Nowakowska'), ('Pawłowski', 'Pawłowska'),
+            ('Michalski', 'Michalska'), ('Nowicki', 'Nowicka'), ('Adamczyk', 'Adamczyk'),
+            ('Dudek', 'Dudek'), ('Zając', 'Zając'), ('Wieczorek', 'Wieczorek'),
+            ('Jabłoński', 'Jabłońska'), ('Król', 'Król'), ('Majewski', 'Majewska'),
+            ('Olszewski', 'Olszewska'), ('Jaworski', 'Jaworska'), ('Wróbel', 'Wróbel')]
+
+PLACES = ['Warszawa', 'Kraków', 'Łódź', 'Wrocław', 'Poznań', 'Gdańsk', 'Szczecin',
+          'Bydgoszcz', 'Lublin', 'Białystok', 'Katowice', 'Gdynia', 'Częstochowa',
+          'Radom', 'Toruń', 'Kielce', 'Rzeszów', 'Olsztyn', 'Opole', 'Tarnów',
+          'Zamość', 'Przemyśl', 'Sandomierz', 'Płock', 'Kalisz', 'Łomża']
+
+
+@dataclass
+class GeneratorConfig:
+    """Parametry generatora drzewa genealogicznego"""
+    
+    population: int = 1000
+    generations: int = 8
+    fertility: float = 2.6          # Średnia liczba dzieci w małżeństwie
+    marriage_rate: float = 0.75     # Odsetek osób zawierających małżeństwo
+    pedigree_collapse: float = 0.02 # Prawdopodobieństwo małżeństwa kuzynów
+    missing_data: float = 0.1       # Prawdopodobieństwo braku daty lub miejsca
+    first_birth_year: int = 1750
+    generation_span: int = 28
+    seed: int = 42
+    mirror_child_relations: bool = False  # Dodawaj relacje 'dziecko' jak PersonDialog
+
+
+@dataclass
+class GeneratedTree:
+    """Wynik generowania drzewa"""
+    
+    person_ids: List[int] = field(default_factory=list)
+    generations: List[List[int]] = field(default_factory=list)
+    relation_count: int = 0
+    couples: int = 0
+    cousin_marriages: int = 0
+
+
+class GenealogyGenerator:
+    """Generuje powtarzalne (deterministyczne dla danego ziarna) drzewa genealogiczne"""
+    
+    def __init__(self, config: Optional[GeneratorConfig] = None):
+        """
+        Inicjalizacja generatora
+        
+        Args:
+            config: Parametry generatora (None = domyślne)
+        """
+        self.config = config or GeneratorConfig()
+        self.random = random.Random(self.config.seed)
+        
+        # Dane budowane w pamięci przed zapisem do bazy (indeks = lokalne ID)
+        self.persons: List[dict] = []
+        self.parents: List[Tuple[Optional[int], Optional[int]]] = []
+        self.surname_index: List[int] = []
+        self.relations: List[Tuple[int, int, str]] = []
+    
+    def generate(self, db_manager) -> GeneratedTree:
+        """
+        Generuje drzewo i zapisuje je do bazy za pomocą operacji zbiorczych
+        
+        Args:
+            db_manager: Instancja DatabaseManager
+        
+        Returns:
+            Obiekt GeneratedTree z identyfikatorami w bazie
+        """
+        result = GeneratedTree()
+        local_generations = self._build(result)
+        
+        person_ids = db_manager.add_persons_bulk(self.persons)
+        relations = [(person_ids[a], person_ids[b], kind) for a, b, kind in self.relations]
+        result.relation_count = db_manager.add_relations_bulk(relations)
+        
+        result.person_ids = person_ids
+        result.generations = [[person_ids[i] for i in gen] for gen in local_generations]
+        return result
+    
+    def _build(self, result: GeneratedTree) -> List[List[int]]:
+        """Buduje osoby i relacje w pamięci, pokolenie po pokoleniu"""
+        config = self.config
+        per_generation = max(2, config.population // max(1, config.generations))
+        generations = []
+        current = [self._new_person(0) for _ in range(min(per_generation, config.population))]
+        
+        for gen in range(config.generations):
+            generations.append(current)
+            remaining = config.population - len(self.persons)
+            if remaining <= 0 or gen == config.generations - 1:
+                break
+            
+            couples = self._marry(current, result)
+            children = []
+            for father, mother in couples:
+                for _ in range(self._children_count()):
+                    if len(children) >= remaining:
+                        break
+                    children.append(self._new_person(gen + 1, father, mother))
+            
+            # Uzupełnij pokolenie osobami spoza drzewa (np. przyszłymi małżonkami)
+            while len(children) < min(per_generation, remaining):
+                children.append(self._new_person(gen + 1))
+            
+            current = children
+        
+        return generations
+    
+    def _children_count(self) -> int:
+        """Losuje liczbę dzieci w małżeństwie (rozkład zbliżony do Poissona)"""
+        count = 0
+        threshold = self.random.random()
+        probability = math.exp(-self.config.fertility)
+        cumulative = probability
+        while threshold > cumulative and count < 15:
+            count += 1
+            probability *= self.config.fertility / count
+            cumulative += probability
+        return count
+    
+    def _marry(self, generation: List[int], result: GeneratedTree) -> List[Tuple[int, int]]:
+        """Dobiera pary małżeńskie w pokoleniu"""
+        men = [i for i in generation if self.persons[i]['plec'] == 'M']
+        women = [i for i in generation if self.persons[i]['plec'] == 'K']
+        self.random.shuffle(men)
+        self.random.shuffle(women)
+        
+        # Kobiety wg dziadków - pozwala szybko znaleźć kuzynki
+        women_by_grandparent: Dict[int, List[int]] = {}
+        for woman in women:
+            for grandparent in self._grandparents(woman):
+                women_by_grandparent.setdefault(grandparent, []).append(woman)
+        
+        available = dict.fromkeys(women)  # Zachowuje wylosowaną kolejność
+        couples = []
+        for man in men:
+            if not available or self.random.random() > self.config.marriage_rate:
+                continue
+            
+            wife = None
+            if self.random.random() < self.config.pedigree_collapse:
+                for grandparent in self._grandparents(man):
+                    cousins = [w for w in women_by_grandparent.get(grandparent, ())
+                               if w in available and not self._are_siblings(w, man)]
+                    if cousins:
+                        wife = cousins[0]
+                        result.cousin_marriages += 1
+                        break
+            
+            if wife is None:
+                wife = next(iter(available))
+            del available[wife]
+            
+            self._wed(man, wife)
+            couples.append((man, wife))
+        
+        result.couples += len(couples)
+        return couples
+    
+    def _wed(self, husband: int, wife: int):
+        """Zapisuje małżeństwo i zmienia nazwisko żony"""
+        wife_data = self.persons[wife]
+        if not wife_data.get('nazwisko_panienskie'):
+            wife_data['nazwisko_panienskie'] = wife_data['nazwisko']
+        wife_data['nazwisko'] = SURNAMES[self.surname_index[husband]][1]
+        self.relations.append((husband, wife, 'małżonek'))
+    
+    def _are_siblings(self, first: int, second: int) -> bool:
+        """Sprawdza czy osoby mają wspólnego rodzica"""
+        common = set(self.parents[first]) & set(self.parents[second])
+        common.discard(None)
+        return bool(common)
+    
+    def _grandparents(self, person: int) -> List[int]:
+        """Zwraca lokalne ID znanych dziadków osoby"""
+        grandparents = []
+        for parent in self.parents[person]:
+            if parent is not None:
+                grandparents.extend(g for g in self.parents[parent] if g is not None)
+        return grandparents
+    
+    def _new_person(self, gen: int, father: Optional[int] = None, mother: Optional[int] = None) -> int:
+        """Tworzy osobę i jej relacje z rodzicami; zwraca lokalne ID"""
+        rnd = self.random
+        config = self.config
+        plec = rnd.choice(('M', 'K'))
+        
+        if father is not None:
+            surname_idx = self.surname_index[father]
+        else:
+            surname_idx = rnd.randrange(len(SURNAMES))
+        
+        birth_year = config.first_birth_year + gen * config.generation_span + rnd.randint(-6, 6)
+        death_year = birth_year + rnd.randint(1, 95)
+        
+        person = {
+            'imie': rnd.choice(MALE_NAMES if plec == 'M' else FEMALE_NAMES),
+            'nazwisko': SURNAMES[surname_idx][0 if plec == 'M' else 1],
+            'plec': plec,
+            'data_urodzenia': self._maybe(f"{birth_year:04d}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}"),
+            'data_smierci': self._maybe(f"{death_year:04d}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}")
+            if death_year < 2020 else None,
+            'miejsce_urodzenia': self._maybe(rnd.choice(PLACES)),
+            'miejsce_smierci': self._maybe(rnd.choice(PLACES)) if death_year < 2020 else None,
+        }
+        
+        local_id = len(self.persons)
+        self.persons.append(person)
+        self.parents.append((father, mother))
+        self.surname_index.append(surname_idx)
+        
+        for parent in (father, mother):
+            if parent is not None:
+                self.relations.append((parent, local_id, 'rodzic'))
+                if config.mirror_child_relations:
+                    self.relations.append((local_id, parent, 'dziecko'))
+        
+        return local_id
+    
+    def _maybe(self, value):
+        """Zwraca wartość lub None z prawdopodobieństwem braku danych"""
+        return None if self.random.random() < self.config.missing_data else value
+
+
+def generate_tree(db_manager, **kwargs) -> GeneratedTree:
+    """
+    Generuje drzewo z podanymi parametrami GeneratorConfig
+    
+    Args:
+        db_manager: Instancja DatabaseManager
+        **kwargs: Parametry GeneratorConfig
+    
+    Returns:
+        Obiekt GeneratedTree
+    """
+    return GenealogyGenerator(GeneratorConfig(**kwargs)).generate(db_manager)
@@ -0,0 +1,490 @@
+"""
+Uruchamianie testów wydajności i zapis wyników w formacie JSON
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.database.db_manager import DatabaseManager
+from src.business_logic.relationship_calculator import RelationshipCalculator
+from src.business_logic.deduplication import DuplicateFinder
+from src.business_logic.tree_layout import compute_tree_layout
+from src.utils.gedcom_handler import GedcomHandler
+from src.utils.snapshot import load_snapshot, save_snapshot
+
+from .generator import GeneratedTree, GeneratorConfig, GenealogyGenerator
+
+
+@dataclass
+class BenchmarkContext:
+    """Dane współdzielone przez testy wydajności dla jednego rozmiaru drzewa"""
+    
+    db_manager: DatabaseManager
+    calculator: RelationshipCalculator
+    tree: GeneratedTree
+    rng: random.Random
+    workdir: str
+
+
+@dataclass
+class BenchmarkResult:
+    """Wynik pojedynczego testu wydajności"""
+    
+    name: str
+    population: int
+    operations: int
+    repeat: int
+    min_s: float
+    median_s: float
+    mean_s: float
+    per_op_us: float
+
+
+# Rejestr testów: nazwa -> funkcja przygotowująca (zwraca krotkę (funkcja, liczba operacji))
+BENCHMARKS: Dict[str, Callable[[BenchmarkContext], Tuple[Callable[[], None], int]]] = {}
+
+
+def benchmark(name: str):
+    """Dekorator rejestrujący test wydajności"""
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def _sample(ctx: BenchmarkContext, ids: List[int], count: int) -> List[int]:
+    """Wybiera powtarzalną próbkę identyfikatorów"""
+    if not ids:
+        return []
+    return [ctx.rng.choice(ids) for _ in range(count)]
+
+
+@benchmark('db.get_person.cold')
+def bench_get_person_cold(ctx):
+    ids = _sample(ctx, ctx.tree.person_ids, 1000)
+    
+    def run():
+        ctx.db_manager.cache.clear()
+        for person_id in ids:
+            ctx.db_manager.get_person(person_id)
+    return run, len(ids)
+
+
+@benchmark('db.get_person.warm')
+def bench_get_person_warm(ctx):
+    ids = _sample(ctx, ctx.tree.person_ids, 1000)
+    for person_id in ids:
+        ctx.db_manager.get_person(person_id)
+    
+    def run():
+        for person_id in ids:
+            ctx.db_manager.get_person(person_id)
+    return run, len(ids)
+
+
+@benchmark('db.get_relations.cold')
+def bench_get_relations_cold(ctx):
+    ids = _sample(ctx, ctx.tree.person_ids, 1000)
+    
+    def run():
+        ctx.db_manager.cache.clear()
+        for person_id in ids:
+            ctx.db_manager.get_relations(person_id)
+    return run, len(ids)
+
+
+@benchmark('db.get_all_persons')
+def bench_get_all_persons(ctx):
+    return ctx.db_manager.get_all_persons, 1
+
+
+@benchmark('db.search_persons')
+def bench_search_persons(ctx):
+    queries = ['Kowal', 'Nowak', 'Anna', 'ski', 'Zofia', 'Wró', 'Jan', 'Mazur']
+    
+    def run():
+        for query in queries:
+            ctx.db_manager.search_persons(query)
+    return run, len(queries)
+
+
+@benchmark('db.update_person')
+def bench_update_person(ctx):
+    ids = _sample(ctx, ctx.tree.person_ids, 100)
+    persons = [ctx.db_manager.get_person(person_id) for person_id in ids]
+    
+    def run():
+        for person in persons:
+            ctx.db_manager.update_person(
+                person['id'], person['imie'], person['nazwisko'],
+                person['data_urodzenia'], person['data_smierci'], person['plec'],
+                person['miejsce_urodzenia'], person['miejsce_smierci'],
+                person['notatki'], person['zdjecie_sciezka'], person['nazwisko_panienskie']
+            )
+    return run, len(persons)
+
+
+@benchmark('db.open.in_memory')
+def bench_open_in_memory(ctx):
+    # Kopia całej bazy do pamięci (z indeksami i tabelą przodków)
+    def run():
+        DatabaseManager(ctx.db_manager.db_path, in_memory=True).close()
+    return run, 1
+
+
+@benchmark('db.search_persons.in_memory')
+def bench_search_persons_in_memory(ctx):
+    memory = DatabaseManager(ctx.db_manager.db_path, in_memory=True)
+    queries = ['Kowal', 'Nowak', 'Anna', 'ski', 'Zofia', 'Wró', 'Jan', 'Mazur']
+    
+    def run():
+        for query in queries:
+            memory.search_persons(query)
+    return run, len(queries)
+
+
+@benchmark('db.parent_candidates')
+def bench_parent_candidates(ctx):
+    # Pierwsze trzy strony podpowiedzi wyboru rodzica (jak przy przewijaniu listy)
+    queries = ['', 'Kowal', 'Jan', 'Anna', 'Wró', 'M']
+    
+    def run():
+        for query in queries:
+            page = None
+            for _ in range(3):
+                page = ctx.db_manager.get_parent_candidates(
+                    'K' if query == 'Anna' else 'M', 1900, query,
+                    after=page[-1] if page else None
+                )
+    return run, len(queries) * 3
+
+
+@benchmark('calc.get_ancestors')
+def bench_get_ancestors(ctx):
+    ids = _sample(ctx, ctx.tree.generations[-1], 50)
+    
+    def run():
+        for person_id in ids:
+            ctx.calculator.get_ancestors(person_id, max_generations=10)
+    return run, len(ids)
+
+
+@benchmark('calc.get_descendants')
+def bench_get_descendants(ctx):
+    ids = _sample(ctx, ctx.tree.generations[0], 5)
+    
+    def run():
+        for person_id in ids:
+            ctx.calculator.get_descendants(person_id, max_generations=10)
+    return run, len(ids)
+
+
+@benchmark('db.is_ancestor')
+def bench_is_ancestor(ctx):
+    ancestors = _sample(ctx, ctx.tree.generations[0], 20)
+    persons = _sample(ctx, ctx.tree.generations[-1], 20)
+    
+    def run():
+        for ancestor_id, person_id in zip(ancestors, persons):
+            ctx.db_manager.is_ancestor(ancestor_id, person_id)
+    return run, len(persons)
+
+
+@benchmark('calc.find_relationship_path')
+def bench_find_relationship_path(ctx):
+    last_generation = ctx.tree.generations[-1]
+    pairs = list(zip(_sample(ctx, last_generation, 3), _sample(ctx, last_generation, 3)))
+    
+    def run():
+        for person1_id, person2_id in pairs:
+            ctx.calculator.find_relationship_path(person1_id, person2_id)
+    return run, len(pairs)
+
+
+@benchmark('gedcom.export')
+def bench_gedcom_export(ctx):
+    handler = GedcomHandler(ctx.db_manager)
+    filename = os.path.join(ctx.workdir, 'export.ged')
+    return (lambda: handler.export_file(filename)), 1
+
+
+@benchmark('gedcom.import')
+def bench_gedcom_import(ctx):
+    source = os.path.join(ctx.workdir, 'source.ged')
+    GedcomHandler(ctx.db_manager).export_file(source)
+    target_path = os.path.join(ctx.workdir, 'import.db')
+    
+    def run():
+        if os.path.exists(target_path):
+            os.unlink(target_path)
+        target = DatabaseManager(target_path)
+        try:
+            GedcomHandler(target).import_file(source)
+        finally:
+            target.close()
+    return run, 1
+
+
+@benchmark('snapshot.save')
+def bench_snapshot_save(ctx):
+    filename = os.path.join(ctx.workdir, 'save.snap')
+    return (lambda: save_snapshot(ctx.db_manager, filename)), 1
+
+
+@benchmark('snapshot.load')
+def bench_snapshot_load(ctx):
+    # Wczytanie razem z budową indeksu rodziców (gotowe do rodowodów i pokrewieństwa)
+    filename = os.path.join(ctx.workdir, 'load.snap')
+    save_snapshot(ctx.db_manager, filename)
+    return (lambda: load_snapshot(filename).parents_of(0)), 1
+
+
+@benchmark('snapshot.restore')
+def bench_snapshot_restore(ctx):
+    filename = os.path.join(ctx.workdir, 'restore.snap')
+    snapshot = save_snapshot(ctx.db_manager, filename)
+    target_path = os.path.join(ctx.workdir, 'restore.db')
+    
+    def run():
+        if os.path.exists(target_path):
+            os.unlink(target_path)
+        target = DatabaseManager(target_path)
+        try:
+            snapshot.restore(target)
+        finally:
+            target.close()
+    return run, 1
+
+
+@benchmark('stats.query')
+def bench_stats_query(ctx):
+    # Odczyt tabel zbiorczych (już odświeżonych)
+    ctx.db_manager.statistics.refresh()
+    
+    def run():
+        ctx.db_manager.get_surname_frequency(100)
+        ctx.db_manager.get_migrations(100)
+        ctx.db_manager.get_birth_decades()
+    return run, 3
+
+
+@benchmark('stats.refresh.incremental')
+def bench_stats_refresh_incremental(ctx):
+    ids = _sample(ctx, ctx.tree.person_ids, 100)
+    persons = [ctx.db_manager.get_person(person_id) for person_id in ids]
+    ctx.db_manager.statistics.refresh()
+    
+    def run():
+        for person in persons:
+            ctx.db_manager.update_person(
+                person['id'], person['imie'], person['nazwisko'],
+                person['data_urodzenia'], person['data_smierci'], person['plec'],
+                person['miejsce_urodzenia'], person['miejsce_smierci'],
+                person['notatki'], person['zdjecie_sciezka'], person['nazwisko_panienskie']
+            )
+        ctx.db_manager.statistics.refresh()
+    return run, 1
+
+
+@benchmark('stats.rebuild')
+def bench_stats_rebuild(ctx):
+    return (lambda: ctx.db_manager.statistics.refresh(full=True)), 1
+
+
+@benchmark('places.find')
+def bench_places_find(ctx):
+    queries = ['Kra', 'War', 'Po', 'Gd', 'Łó', 'Wro', 'Lu', 'Sz']
+    
+    def run():
+        for query in queries:
+            ctx.db_manager.find_places(query)
+    return run, len(queries)
+
+
+@benchmark('places.persons')
+def bench_places_persons(ctx):
+    places = [place['id'] for place in ctx.db_manager.find_places(limit=20)]
+    
+    def run():
+        for place_id in places:
+            ctx.db_manager.get_persons_by_place(place_id)
+    return run, max(len(places), 1)
+
+
+@benchmark('places.counts')
+def bench_places_counts(ctx):
+    return (lambda: ctx.db_manager.get_place_counts(100)), 1
+
+
+@benchmark('layout.full_tree')
+def bench_full_tree_layout(ctx):
+    def run():
+        persons = ctx.db_manager.get_all_persons()
+        relations = ctx.db_manager.get_all_relations()
+        compute_tree_layout(persons, relations, ctx.db_manager.get_generations())
+    return run, 1
+
+
+@benchmark('dedup.find')
+def bench_dedup_find(ctx):
+    finder = DuplicateFinder(ctx.db_manager)
+    return (lambda: finder.find()), 1
+
+
+def time_call(func: Callable[[], None], repeat: int) -> List[float]:
+    """Mierzy czas wykonania funkcji w kolejnych powtórzeniach"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run_benchmarks(population: int, seed: int = 42, repeat: int = 3,
+                   pattern: str = '*', generations: int = 8) -> Tuple[dict, List[BenchmarkResult]]:
+    """
+    Generuje drzewo danej wielkości i uruchamia na nim testy wydajności
+    
+    Args:
+        population: Liczba osób w drzewie
+        seed: Ziarno generatora liczb losowych
+        repeat: Liczba powtórzeń każdego testu
+        pattern: Wzorzec nazw testów (fnmatch)
+        generations: Liczba pokoleń
+    
+    Returns:
+        Krotka (informacje o wygenerowanym drzewie, lista wyników)
+    """
+    workdir = tempfile.mkdtemp(prefix='dzewo_bench_')
+    db_manager = DatabaseManager(os.path.join(workdir, 'bench.db'))
+    try:
+        config = GeneratorConfig(population=population, generations=generations, seed=seed)
+        start = time.perf_counter()
+        tree = GenealogyGenerator(config).generate(db_manager)
+        setup = {
+            'population': population,
+            'persons': len(tree.person_ids),
+            'relations': tree.relation_count,
+            'couples': tree.couples,
+            'cousin_marriages': tree.cousin_marriages,
+            'generate_s': time.perf_counter() - start
+        }
+        
+        ctx = BenchmarkContext(db_manager, RelationshipCalculator(db_manager),
+                               tree, random.Random(seed), workdir)
+        results = []
+        for name, prepare in BENCHMARKS.items():
+            if not fnmatch.fnmatch(name, pattern):
+                continue
+            func, operations = prepare(ctx)
+            timings = time_call(func, repeat)
+            results.append(BenchmarkResult(
+                name=name,
+                population=population,
+                operations=operations,
+                repeat=repeat,
+                min_s=min(timings),
+                median_s=statistics.median(timings),
+                mean_s=statistics.mean(timings),
+                per_op_us=min(timings) / max(1, operations) * 1e6
+            ))
+        return setup, results
+    finally:
+        db_manager.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def get_commit() -> Optional[str]:
+    """Zwraca identyfikator bieżącego commita (jeśli dostępny)"""
+    try:
+        output = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True, check=True)
+        return output.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(baseline: dict, current: dict) -> List[str]:
+    """
+    Porównuje wyniki dwóch przebiegów
+    
+    Args:
+        baseline: Wyniki odniesienia (wczytany JSON)
+        current: Bieżące wyniki
+    
+    Returns:
+        Lista linii raportu
+    """
+    reference = {(r['name'], r['population']): r for r in baseline.get('results', [])}
+    lines = []
+    for result in current['results']:
+        previous = reference.get((result['name'], result['population']))
+        if not previous or not previous['min_s']:
+            continue
+        ratio = result['min_s'] / previous['min_s']
+        lines.append(f"{result['name']:<32} n={result['population']:<8} "
+                     f"{previous['min_s']:.4f}s -> {result['min_s']:.4f}s  x{ratio:.2f}")
+    return lines
+
+
+def main(argv=None):
+    """Punkt wejścia: python -m benchmarks"""
+    parser = argparse.ArgumentParser(description='Testy wydajności Drzewa Genealogicznego')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000],
+                        help='Liczby osób w generowanych drzewach')
+    parser.add_argument('--generations', type=int, default=8, help='Liczba pokoleń')
+    parser.add_argument('--seed', type=int, default=42, help='Ziarno generatora')
+    parser.add_argument('--repeat', type=int, default=3, help='Liczba powtórzeń testu')
+    parser.add_argument('--filter', default='*', help='Wzorzec nazw testów, np. "calc.*"')
+    parser.add_argument('--output', help='Plik wynikowy JSON')
+    parser.add_argument('--compare', help='Plik JSON z wynikami odniesienia')
+    args = parser.parse_args(argv)
+    
+    report = {
+        'meta': {
+            'commit': get_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'repeat': args.repeat,
+        },
+        'setup': [],
+        'results': []
+    }
+    
+    for size in args.sizes:
+        setup, results = run_benchmarks(size, args.seed, args.repeat, args.filter, args.generations)
+        report['setup'].append(setup)
+        report['results'].extend(asdict(r) for r in results)
+        for r in results:
+            print(f"{r.name:<32} n={size:<8} min={r.min_s:.4f}s  median={r.median_s:.4f}s  "
+                  f"{r.per_op_us:.1f} us/op", file=sys.stderr)
+    
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            for line in compare_results(json.load(f), report):
+                print(line, file=sys.stderr)
+    
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    
+    return 0
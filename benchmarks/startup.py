@@ -0,0 +1,243 @@
+"""
+Pomiar czasu uruchamiania aplikacji: czas importu i czas do pierwszego odrysowania okna
+
+Każdy pomiar wykonywany jest w osobnym procesie, aby moduły zaimportowane
+wcześniej nie zafałszowały wyniku (zimny start interpretera).
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime
+from typing import List, Optional
+
+
+# Moduły, które nie powinny być ładowane przed otwarciem zakładek z wykresami
+HEAVY_MODULES = ('matplotlib',)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _heavy_modules_loaded() -> List[str]:
+    """Zwraca listę ciężkich modułów obecnych w sys.modules"""
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+def probe_import(module: str) -> dict:
+    """
+    Mierzy czas importu modułu w bieżącym (świeżym) procesie
+    
+    Args:
+        module: Nazwa modułu, np. "src.gui.main_window"
+    """
+    start = time.perf_counter()
+    __import__(module)
+    return {
+        'import_s': time.perf_counter() - start,
+        'heavy_modules': _heavy_modules_loaded()
+    }
+
+
+def probe_first_paint(db_path: str, timeout_s: float = 60.0) -> dict:
+    """
+    Mierzy czas od początku importów do pierwszego odrysowania głównego okna
+    
+    Args:
+        db_path: Ścieżka do bazy danych
+        timeout_s: Maksymalny czas oczekiwania na odrysowanie
+    """
+    start = time.perf_counter()
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QObject, QEvent, QTimer
+    from src.database.db_manager import DatabaseManager
+    from src.gui.main_window import MainWindow
+    imported = time.perf_counter()
+    
+    app = QApplication([sys.argv[0]])
+    db_manager = DatabaseManager(db_path)
+    result = {'import_s': imported - start, 'first_paint_s': None}
+    
+    class PaintWatcher(QObject):
+        """Zapisuje czas pierwszego zdarzenia Paint i kończy pętlę zdarzeń"""
+        
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint and result['first_paint_s'] is None:
+                result['first_paint_s'] = time.perf_counter() - start
+                QTimer.singleShot(0, app.quit)
+            return False
+    
+    window = MainWindow(db_manager)
+    watcher = PaintWatcher()
+    window.installEventFilter(watcher)
+    window.show()
+    QTimer.singleShot(int(timeout_s * 1000), app.quit)
+    app.exec()
+    
+    result['heavy_modules'] = _heavy_modules_loaded()
+    db_manager.close()
+    return result
+
+
+def _run_probe(args: List[str], env: dict) -> dict:
+    """Uruchamia sondę w osobnym procesie i zwraca jej wynik JSON"""
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, '-m', 'benchmarks.startup', '--probe'] + args,
+                            cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True)
+    result = json.loads(output.stdout.strip().splitlines()[-1])
+    result['process_s'] = time.perf_counter() - start
+    return result
+
+
+def _result(name: str, population: int, timings: List[float]):
+    """Tworzy wynik w formacie zgodnym z benchmarks.runner"""
+    from .runner import BenchmarkResult
+    return BenchmarkResult(
+        name=name,
+        population=population,
+        operations=1,
+        repeat=len(timings),
+        min_s=min(timings),
+        median_s=statistics.median(timings),
+        mean_s=statistics.mean(timings),
+        per_op_us=min(timings) * 1e6
+    )
+
+
+def run_startup_benchmarks(population: int, seed: int = 42, repeat: int = 5,
+                           generations: int = 8) -> tuple:
+    """
+    Generuje bazę danej wielkości i mierzy czas uruchamiania
+    
+    Args:
+        population: Liczba osób w bazie
+        seed: Ziarno generatora
+        repeat: Liczba powtórzeń (każde w nowym procesie)
+        generations: Liczba pokoleń
+    
+    Returns:
+        Krotka (informacje o przebiegu, lista wyników)
+    """
+    from src.database.db_manager import DatabaseManager
+    from .generator import GeneratorConfig, GenealogyGenerator
+    
+    workdir = tempfile.mkdtemp(prefix='dzewo_startup_')
+    try:
+        db_path = os.path.join(workdir, 'startup.db')
+        db_manager = DatabaseManager(db_path)
+        try:
+            GenealogyGenerator(GeneratorConfig(population=population, generations=generations,
+                                               seed=seed)).generate(db_manager)
+        finally:
+            db_manager.close()
+        
+        env = dict(os.environ)
+        env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        
+        imports = [_run_probe(['import'], env) for _ in range(repeat)]
+        paints = [_run_probe(['first-paint', '--db', db_path], env) for _ in range(repeat)]
+        paints = [p for p in paints if p['first_paint_s'] is not None]
+        
+        results = [
+            _result('startup.import_main_window', population, [r['import_s'] for r in imports]),
+            _result('startup.process_import', population, [r['process_s'] for r in imports]),
+        ]
+        if paints:
+            results.append(_result('startup.first_paint', population,
+                                   [r['first_paint_s'] for r in paints]))
+            results.append(_result('startup.process_first_paint', population,
+                                   [r['process_s'] for r in paints]))
+        
+        setup = {
+            'population': population,
+            'heavy_modules_after_import': imports[0]['heavy_modules'],
+            'heavy_modules_after_first_paint': paints[0]['heavy_modules'] if paints else None,
+        }
+        return setup, results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Punkt wejścia: python -m benchmarks.startup"""
+    parser = argparse.ArgumentParser(description='Czas uruchamiania Drzewa Genealogicznego')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000],
+                        help='Liczby osób w generowanych bazach')
+    parser.add_argument('--generations', type=int, default=8, help='Liczba pokoleń')
+    parser.add_argument('--seed', type=int, default=42, help='Ziarno generatora')
+    parser.add_argument('--repeat', type=int, default=5, help='Liczba powtórzeń pomiaru')
+    parser.add_argument('--budget', type=float,
+                        help='Maksymalny czas do pierwszego odrysowania [s]; przekroczenie = kod 1')
+    parser.add_argument('--output', help='Plik wynikowy JSON')
+    parser.add_argument('--compare', help='Plik JSON z wynikami odniesienia')
+    parser.add_argument('--probe', nargs='+', help=argparse.SUPPRESS)
+    parser.add_argument('--db', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    
+    # Tryb sondy uruchamianej w osobnym procesie
+    if args.probe:
+        if args.probe[0] == 'import':
+            result = probe_import('src.gui.main_window')
+        else:
+            result = probe_first_paint(args.db)
+        print(json.dumps(result))
+        return 0
+
+    # Import dopiero tutaj, aby moduły projektu nie były załadowane w sondach
+    from .runner import compare_results, get_commit
+
+    report = {
+        'meta': {
+            'commit': get_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'seed': args.seed,
+            'repeat': args.repeat,
+        },
+        'setup': [],
+        'results': []
+    }
+    
+    exit_code = 0
+    for size in args.sizes:
+        setup, results = run_startup_benchmarks(size, args.seed, args.repeat, args.generations)
+        report['setup'].append(setup)
+        report['results'].extend(asdict(r) for r in results)
+        for r in results:
+            print(f"{r.name:<32} n={size:<8} min={r.min_s:.4f}s  median={r.median_s:.4f}s",
+                  file=sys.stderr)
+        
+        if setup['heavy_modules_after_import']:
+            print(f"Ostrzeżenie: import okna ładuje {', '.join(setup['heavy_modules_after_import'])}",
+                  file=sys.stderr)
+            exit_code = 1
+        
+        first_paint = next((r for r in results if r.name == 'startup.first_paint'), None)
+        if args.budget is not None and (first_paint is None or first_paint.median_s > args.budget):
+            print(f"Przekroczono budżet czasu uruchamiania ({args.budget:.2f}s) dla n={size}",
+                  file=sys.stderr)
+            exit_code = 1
+    
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            for line in compare_results(json.load(f), report):
+                print(line, file=sys.stderr)
+    
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -10,6 +10,8 @@ from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QIcon
 from src.gui.main_window import MainWindow
 from src.database.db_manager import DatabaseManager
+from src.utils.profiler import profiler
+from src.utils.thumbnail_cache import thumbnail_cache
 
 def main():
     """Główna funkcja uruchamiająca aplikację"""
@@ -18,8 +20,9 @@ def main():
     if not os.path.exists('data'):
         os.makedirs('data')
     
-    if not os.path.exists('data/photos'):
-        os.makedirs('data/photos')
+    # Profilowanie od startu (DZEWO_PROFILE=1)
+    if os.environ.get('DZEWO_PROFILE'):
+        profiler.enable()
     
     # Inicjalizacja aplikacji
     app = QApplication(sys.argv)
@@ -29,7 +32,8 @@ def main():
     
     # Inicjalizacja bazy danych
     db_path = os.path.join('data', 'family_tree.db')
-    db_manager = DatabaseManager(db_path)
+    # DZEWO_IN_MEMORY=1 - praca na kopii bazy w pamięci, zapisywanej przy zamknięciu
+    db_manager = DatabaseManager(db_path, in_memory=bool(os.environ.get('DZEWO_IN_MEMORY')))
     
     # Utworzenie i wyświetlenie głównego okna
     window = MainWindow(db_manager)
@@ -38,7 +42,12 @@ def main():
     # Uruchomienie pętli zdarzeń
     exit_code = app.exec()
     
-    # Zamknięcie połączenia z bazą danych
+    # Zatrzymanie generowania miniatur w tle
+    thumbnail_cache.shutdown()
+    
+    # Zapis kopii w pamięci i zamknięcie połączenia z bazą danych
+    if db_manager.has_unsaved_changes():
+        db_manager.save()
     db_manager.close()
     
     sys.exit(exit_code)
@@ -3,5 +3,9 @@ Moduł logiki biznesowej
 """
 
 from .relationship_calculator import RelationshipCalculator
+from .pedigree import Pedigree, GenerationStats
+from .deduplication import DuplicateFinder, DuplicateCandidate
+from .batch_analytics import BatchAnalytics, BatchResult, FileReport
 
-__all__ = ['RelationshipCalculator']
+__all__ = ['RelationshipCalculator', 'Pedigree', 'GenerationStats', 'DuplicateFinder',
+           'DuplicateCandidate', 'BatchAnalytics', 'BatchResult', 'FileReport']
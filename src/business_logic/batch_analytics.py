@@ -0,0 +1,223 @@
+"""
+Analizy wsadowe - statystyki i wyszukiwanie w wielu bazach jednocześnie
+"""
+
+import glob
+import multiprocessing
+import os
+import sqlite3
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..database.reader import DatabaseReader
+from ..utils.dates import parse_date
+from ..utils.profiler import profiled
+
+
+@dataclass
+class Analysis:
+    """
+    Analiza w stylu map-reduce
+    
+    Funkcja map oblicza wynik częściowy dla jednej bazy otwartej tylko do
+    odczytu (w procesie roboczym, więc wynik musi dać się przesłać między
+    procesami), a funkcja reduce łączy wyniki częściowe wszystkich baz
+    w wynik końcowy.
+    """
+    
+    map: Callable[[DatabaseReader, dict], Any]
+    reduce: Callable[[List[Any], dict], Any]
+
+
+# Rejestr analiz: nazwa -> Analysis. Procesy robocze odnajdują analizę po
+# nazwie, więc własne analizy trzeba rejestrować przy imporcie modułu
+ANALYSES: Dict[str, Analysis] = {}
+
+
+def analysis(name: str, reduce: Callable[[List[Any], dict], Any]):
+    """Dekorator rejestrujący funkcję map analizy wraz z funkcją reduce"""
+    def register(func):
+        ANALYSES[name] = Analysis(func, reduce)
+        return func
+    return register
+
+
+def _reduce_statistics(partials: List[dict], params: dict) -> dict:
+    """Sumuje liczności i wyznacza skrajne daty urodzenia wszystkich baz"""
+    result = {'bazy': len(partials), 'osoby': 0, 'mezczyzni': 0, 'kobiety': 0, 'zmarli': 0,
+              'relacje': 0, 'relacje_wg_rodzaju': Counter(),
+              'najwczesniejsze_urodzenie': None, 'najpozniejsze_urodzenie': None}
+    earliest = latest = None
+    for stats in partials:
+        for key in ('osoby', 'mezczyzni', 'kobiety', 'zmarli', 'relacje'):
+            result[key] += stats[key]
+        result['relacje_wg_rodzaju'].update(stats['relacje_wg_rodzaju'])
+        
+        first = parse_date(stats['najwczesniejsze_urodzenie'])
+        if first and (earliest is None or first.sort_key < earliest):
+            earliest = first.sort_key
+            result['najwczesniejsze_urodzenie'] = stats['najwczesniejsze_urodzenie']
+        last = parse_date(stats['najpozniejsze_urodzenie'])
+        if last and (latest is None or last.sort_key > latest):
+            latest = last.sort_key
+            result['najpozniejsze_urodzenie'] = stats['najpozniejsze_urodzenie']
+    
+    result['relacje_wg_rodzaju'] = dict(result['relacje_wg_rodzaju'])
+    return result
+
+
+@analysis('stats', reduce=_reduce_statistics)
+def _map_statistics(reader: DatabaseReader, params: dict) -> dict:
+    """Podstawowe statystyki bazy"""
+    return reader.get_statistics()
+
+
+def _reduce_surnames(partials: List[Dict[str, int]], params: dict) -> List[dict]:
+    """Łączy liczności nazwisk i zlicza bazy, w których nazwisko występuje"""
+    persons, databases = Counter(), Counter()
+    for counts in partials:
+        persons.update(counts)
+        databases.update(counts.keys())
+    ranking = sorted(persons.items(), key=lambda item: (-item[1], item[0]))
+    limit = params.get('limit')
+    return [{'nazwisko': surname, 'osoby': count, 'bazy': databases[surname]}
+            for surname, count in ranking[:limit or None]]
+
+
+@analysis('surnames', reduce=_reduce_surnames)
+def _map_surnames(reader: DatabaseReader, params: dict) -> Dict[str, int]:
+    """Liczba osób noszących każde nazwisko"""
+    return reader.get_surname_counts()
+
+
+def _reduce_search(partials: List[List[dict]], params: dict) -> List[dict]:
+    """Łączy wyniki wyszukiwania w jedną listę uporządkowaną wg nazwiska i imienia"""
+    persons = [person for found in partials for person in found]
+    persons.sort(key=lambda person: (person['nazwisko'], person['imie'], person['db'], person['id']))
+    limit = params.get('limit')
+    return persons[:limit] if limit else persons
+
+
+@analysis('search', reduce=_reduce_search)
+def _map_search(reader: DatabaseReader, params: dict) -> List[dict]:
+    """Osoby pasujące do frazy (z informacją o bazie)"""
+    return [{'db': reader.db_path, **person}
+            for person in reader.search_persons(params['query'])]
+
+
+@dataclass
+class FileReport:
+    """Przebieg analizy jednej bazy"""
+    
+    path: str
+    seconds: float
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchResult:
+    """Wynik analizy wsadowej"""
+    
+    # Wynik połączony funkcją reduce (tylko z baz przeanalizowanych bez błędu)
+    result: Any
+    files: List[FileReport] = field(default_factory=list)
+    
+    @property
+    def errors(self) -> List[FileReport]:
+        """Bazy, których nie udało się przeanalizować"""
+        return [report for report in self.files if report.error is not None]
+
+
+def run_on_database(path: str, name: str, params: dict) -> Tuple[Any, FileReport]:
+    """
+    Wykonuje funkcję map analizy na jednej bazie
+    
+    Plik jest otwierany tylko do odczytu i bez migracji schematu, więc
+    analiza nie zmienia baz i działa na nośnikach tylko do odczytu.
+    
+    Args:
+        path: Ścieżka do pliku bazy
+        name: Nazwa zarejestrowanej analizy
+        params: Parametry analizy
+    
+    Returns:
+        Krotka (wynik częściowy lub None przy błędzie, raport)
+    """
+    start = time.perf_counter()
+    if not os.path.exists(path):
+        return None, FileReport(path, 0.0, 'Plik bazy danych nie istnieje')
+    try:
+        reader = DatabaseReader(path)
+        try:
+            partial = ANALYSES[name].map(reader, params)
+        finally:
+            reader.close()
+    except (sqlite3.Error, OSError, ValueError) as e:
+        return None, FileReport(path, time.perf_counter() - start, str(e))
+    return partial, FileReport(path, time.perf_counter() - start)
+
+
+def find_databases(directory: str, pattern: str = '*.db') -> List[str]:
+    """
+    Zwraca pliki baz w katalogu (uporządkowane wg nazwy)
+    
+    Args:
+        directory: Katalog z bazami
+        pattern: Wzorzec nazw plików
+    """
+    return sorted(glob.glob(os.path.join(glob.escape(directory), pattern)))
+
+
+class BatchAnalytics:
+    """
+    Wykonuje analizę na wielu bazach w puli procesów
+    
+    Każda baza jest otwierana tylko do odczytu przez osobny DatabaseReader
+    w procesie roboczym; proces główny otrzymuje tylko wyniki częściowe
+    i łączy je funkcją reduce analizy. Baza, której nie da się otworzyć lub
+    przeanalizować, jest zgłaszana w raporcie i nie przerywa pozostałych.
+    """
+    
+    def __init__(self, paths: List[str], workers: Optional[int] = None):
+        """
+        Inicjalizacja analizy wsadowej
+        
+        Args:
+            paths: Ścieżki do plików baz
+            workers: Liczba procesów roboczych (domyślnie liczba procesorów)
+        """
+        self.paths = list(paths)
+        self.workers = workers or os.cpu_count() or 1
+    
+    @profiled
+    def run(self, name: str, **params) -> BatchResult:
+        """
+        Wykonuje analizę na wszystkich bazach
+        
+        Args:
+            name: Nazwa analizy ('stats', 'surnames', 'search' lub zarejestrowana)
+            params: Parametry analizy (np. query dla 'search', limit)
+        
+        Returns:
+            BatchResult z wynikiem połączonym i raportem każdej bazy w kolejności paths
+        """
+        if name not in ANALYSES:
+            raise ValueError(f"Nieznana analiza: {name}")
+        
+        if self.workers > 1 and len(self.paths) > 1:
+            # Procesy uruchamiane od nowa (spawn), jak przy wyszukiwaniu duplikatów
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(self.paths)),
+                                     mp_context=context) as executor:
+                outcomes = list(executor.map(run_on_database, self.paths,
+                                             repeat(name), repeat(params)))
+        else:
+            outcomes = [run_on_database(path, name, params) for path in self.paths]
+        
+        partials = [partial for partial, report in outcomes if report.error is None]
+        return BatchResult(ANALYSES[name].reduce(partials, params),
+                           [report for _, report in outcomes])
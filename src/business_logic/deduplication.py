@@ -0,0 +1,405 @@
+"""
+Wykrywanie zdublowanych osób - klucze blokujące, kod fonetyczny i ocena podobieństwa
+"""
+
+import multiprocessing
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from functools import lru_cache
+from itertools import combinations, repeat
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+from ..utils.profiler import profiled
+
+
+# Litery z polskimi znakami sprowadzane do podstawowych (Kraków - Krakow)
+_LETTERS = str.maketrans('ąćęłńóśźż', 'acelnoszz')
+
+# Różne zapisy tej samej głoski: polskie dwuznaki oraz pisownia niemiecka
+# i łacińska z dawnych metryk; dłuższe zapisy są zamieniane wcześniej
+_SPELLINGS = (('tsch', 'c'), ('szcz', 'sc'), ('sch', 's'), ('rz', 'z'), ('sz', 's'),
+              ('cz', 'c'), ('ch', 'h'), ('ph', 'f'), ('th', 't'), ('dt', 't'), ('ck', 'k'),
+              ('tz', 'c'), ('qu', 'kw'), ('q', 'k'), ('x', 'ks'), ('v', 'w'), ('y', 'i'),
+              ('j', 'i'))
+
+# Spółgłoski dźwięczne i bezdźwięczne (ubezdźwięcznienie: Bóg - buk) w jednej klasie
+_CLASSES = {'b': 'P', 'p': 'P', 'd': 'T', 't': 'T', 'g': 'K', 'k': 'K', 'w': 'F', 'f': 'F',
+            'z': 'S', 's': 'S', 'c': 'C', 'h': 'H', 'l': 'L', 'm': 'M', 'n': 'N', 'r': 'R'}
+
+_VOWELS = set('aeiou')
+
+# Żeńskie i rodowe formy nazwisk sprowadzane do formy podstawowej
+# (Kowalska - Kowalski, Nowakowa i Nowakówna - Nowak)
+_SURNAME_ENDINGS = (('ówna', ''), ('owna', ''), ('owa', ''), ('dzka', 'dzki'),
+                    ('ska', 'ski'), ('cka', 'cki'))
+
+# Długość kodu fonetycznego
+CODE_LENGTH = 8
+
+
+def fold(text: Optional[str]) -> str:
+    """Sprowadza tekst do małych liter bez polskich znaków i zbędnych odstępów"""
+    if not text:
+        return ''
+    return ' '.join(text.lower().translate(_LETTERS).split())
+
+
+def normalize_surname(surname: Optional[str]) -> str:
+    """
+    Sprowadza nazwisko do formy podstawowej bez polskich znaków
+    
+    Args:
+        surname: Nazwisko w dowolnej formie
+    
+    Returns:
+        Nazwisko w formie męskiej/podstawowej (pusty tekst dla braku nazwiska)
+    """
+    text = ' '.join((surname or '').lower().split())
+    for ending, replacement in _SURNAME_ENDINGS:
+        if text.endswith(ending) and len(text) - len(ending) >= 3:
+            text = text[:-len(ending)] + replacement
+            break
+    return fold(text)
+
+
+@lru_cache(maxsize=65536)
+def phonetic_code(text: Optional[str]) -> str:
+    """
+    Zwraca kod fonetyczny dostosowany do polskiej pisowni
+    
+    Różne zapisy tej samej głoski (rz/ż, sz/sch, w/v, i/y/j) dają ten
+    sam kod, spółgłoski dźwięczne i bezdźwięczne należą do jednej klasy,
+    a samogłoski poza pierwszą literą są pomijane. Dzięki temu np. Wójcik,
+    Wojcik i Woycik albo Szmit i Schmidt mają wspólny kod.
+    
+    Args:
+        text: Imię lub nazwisko (brane jest pierwsze słowo)
+    
+    Returns:
+        Kod o długości najwyżej CODE_LENGTH (pusty tekst dla braku danych)
+    """
+    words = fold(text).split()
+    if not words:
+        return ''
+    word = ''.join(letter for letter in words[0] if letter.isalpha())
+    for spelling, sound in _SPELLINGS:
+        word = word.replace(spelling, sound)
+    
+    code = []
+    previous = None
+    for i, letter in enumerate(word):
+        if letter in _VOWELS:
+            symbol = 'A' if i == 0 else None
+        else:
+            symbol = _CLASSES.get(letter)
+        if symbol and symbol != previous:
+            code.append(symbol)
+        previous = symbol
+    return ''.join(code)[:CODE_LENGTH]
+
+
+class PersonRecord(NamedTuple):
+    """Dane osoby przygotowane do porównywania (przekazywane do procesów roboczych)"""
+    
+    id: int
+    first_name: str
+    first_code: str
+    surnames: Tuple[str, ...]
+    surname_codes: Tuple[str, ...]
+    sex: Optional[str]
+    birth_key: Optional[int]
+    death_key: Optional[int]
+    birth_place: str
+    death_place: str
+    relatives: FrozenSet[int]
+    keys: FrozenSet[str]
+
+
+def blocking_keys(first_name: str, first_code: str, surname_codes: Iterable[str],
+                  birth_key: Optional[int]) -> FrozenSet[str]:
+    """
+    Wyznacza klucze blokujące osoby
+    
+    Porównywane są tylko osoby o wspólnym kluczu: kod nazwiska (także
+    panieńskiego) z kodem imienia albo z dekadą urodzenia i pierwszą literą
+    imienia (Jan - Johann). Rok urodzenia wyznacza dekady lat od rok-2 do
+    rok+2, więc osoby urodzone w 1899 i 1901 roku trafiają do wspólnego bloku.
+    
+    Args:
+        first_name: Imię po fold()
+        first_code: Kod fonetyczny imienia
+        surname_codes: Kody fonetyczne nazwisk
+        birth_key: Klucz daty urodzenia RRRRMMDD
+    """
+    keys = set()
+    initial = first_name[:1]
+    for code in surname_codes:
+        keys.add(f'{code}|{first_code}')
+        if birth_key:
+            year = birth_key // 10000
+            keys.update(f'{code}|{decade}|{initial}' for decade in {(year - 2) // 10, (year + 2) // 10})
+    return frozenset(keys)
+
+
+def build_records(persons: Iterable[dict], relations: Iterable[dict]) -> List[PersonRecord]:
+    """
+    Przygotowuje dane osób do wyszukiwania duplikatów
+    
+    Args:
+        persons: Słowniki osób (jak z get_all_persons)
+        relations: Słowniki relacji (jak z get_all_relations)
+    
+    Returns:
+        Lista rekordów osób; osoby bez nazwiska nie mają kluczy blokujących
+    """
+    relatives = defaultdict(set)
+    for relation in relations:
+        relatives[relation['osoba1_id']].add(relation['osoba2_id'])
+        relatives[relation['osoba2_id']].add(relation['osoba1_id'])
+    
+    records = []
+    for person in persons:
+        first_name = fold(person['imie'])
+        first_code = phonetic_code(first_name)
+        surnames = tuple(dict.fromkeys(
+            normalize_surname(name) for name in (person['nazwisko'], person.get('nazwisko_panienskie'))
+            if name and name.strip()))
+        surname_codes = tuple(dict.fromkeys(phonetic_code(name) for name in surnames))
+        records.append(PersonRecord(
+            id=person['id'],
+            first_name=first_name,
+            first_code=first_code,
+            surnames=surnames,
+            surname_codes=surname_codes,
+            sex=person.get('plec') or None,
+            birth_key=person.get('urodzenie_klucz'),
+            death_key=person.get('smierc_klucz'),
+            birth_place=fold(person.get('miejsce_urodzenia')),
+            death_place=fold(person.get('miejsce_smierci')),
+            relatives=frozenset(relatives.get(person['id'], ())),
+            keys=blocking_keys(first_name, first_code, surname_codes, person.get('urodzenie_klucz'))
+        ))
+    return records
+
+
+@dataclass
+class DuplicateCandidate:
+    """Para osób, które mogą być tą samą osobą"""
+    
+    person1_id: int
+    person2_id: int
+    # Ocena podobieństwa 0-1
+    score: float
+    # Oceny składowe (imie, nazwisko, urodzenie, smierc, miejsca, krewni)
+    components: Dict[str, float] = field(default_factory=dict)
+
+
+# Wagi składowych oceny (suma 1)
+WEIGHTS = {'imie': 0.25, 'nazwisko': 0.2, 'urodzenie': 0.2, 'smierc': 0.1,
+           'miejsca': 0.1, 'krewni': 0.15}
+
+# Ocena składowej, dla której brakuje danych po jednej ze stron - dwie osoby
+# o tym samym imieniu i nazwisku bez innych danych nie przekraczają progu
+NEUTRAL = 0.5
+
+# Ocena dat według różnicy lat (większa różnica - 0)
+_YEAR_DIFFERENCE_SCORES = (1.0, 0.8, 0.6, 0.3)
+
+
+@lru_cache(maxsize=65536)
+def _ratio(text1: str, text2: str) -> float:
+    """Podobieństwo napisów 0-1 (imiona i miejsca powtarzają się, więc wyniki są zapamiętywane)"""
+    return SequenceMatcher(None, text1, text2).ratio()
+
+
+def _name_similarity(name1: str, name2: str, code1: str, code2: str) -> float:
+    """Podobieństwo zapisów imienia lub nazwiska (zgodny kod fonetyczny - co najmniej 0.9)"""
+    if not name1 or not name2:
+        return NEUTRAL
+    if name1 == name2:
+        return 1.0
+    ratio = _ratio(*sorted((name1, name2)))
+    return max(ratio, 0.9) if code1 and code1 == code2 else ratio
+
+
+def _date_similarity(key1: Optional[int], key2: Optional[int]) -> float:
+    """Podobieństwo dat według kluczy RRRRMMDD"""
+    if not key1 or not key2:
+        return NEUTRAL
+    if key1 == key2:
+        return 1.0
+    difference = abs(key1 // 10000 - key2 // 10000)
+    if difference == 0:
+        # Ten sam rok, inny miesiąc lub dzień - możliwa pomyłka w zapisie
+        return 0.9
+    return _YEAR_DIFFERENCE_SCORES[difference] if difference < len(_YEAR_DIFFERENCE_SCORES) else 0.0
+
+
+def _place_similarity(record1: PersonRecord, record2: PersonRecord) -> float:
+    """Podobieństwo miejsc urodzenia i śmierci (znanych dla obu osób)"""
+    scores = [1.0 if place1 == place2 else _ratio(*sorted((place1, place2)))
+              for place1, place2 in ((record1.birth_place, record2.birth_place),
+                                     (record1.death_place, record2.death_place))
+              if place1 and place2]
+    return sum(scores) / len(scores) if scores else NEUTRAL
+
+
+# Składowe porównujące napisy - wyliczane dopiero, gdy składowe liczbowe
+# nie wykluczają osiągnięcia progu
+_TEXT_COMPONENTS = ('imie', 'nazwisko', 'miejsca')
+_TEXT_WEIGHT = sum(WEIGHTS[name] for name in _TEXT_COMPONENTS)
+
+
+def score_pair(record1: PersonRecord, record2: PersonRecord,
+               threshold: float = 0.0) -> Optional[DuplicateCandidate]:
+    """
+    Ocenia podobieństwo dwóch osób
+    
+    Osoby różnej płci oraz osoby połączone relacją (np. ojciec i syn o tym
+    samym imieniu) nie są duplikatami.
+    
+    Args:
+        record1: Pierwsza osoba
+        record2: Druga osoba
+        threshold: Próg oceny - para, która nie może go osiągnąć, jest
+                   odrzucana bez porównywania napisów
+    
+    Returns:
+        Kandydat z oceną lub None dla pary wykluczonej lub poniżej progu
+    """
+    if record1.sex and record2.sex and record1.sex != record2.sex:
+        return None
+    if record2.id in record1.relatives:
+        return None
+    
+    if record1.relatives and record2.relatives:
+        shared = len(record1.relatives & record2.relatives)
+        relatives = shared / min(len(record1.relatives), len(record2.relatives))
+    else:
+        relatives = NEUTRAL
+    birth = _date_similarity(record1.birth_key, record2.birth_key)
+    death = _date_similarity(record1.death_key, record2.death_key)
+    score = (WEIGHTS['urodzenie'] * birth + WEIGHTS['smierc'] * death
+             + WEIGHTS['krewni'] * relatives)
+    if score + _TEXT_WEIGHT < threshold:
+        return None
+    
+    components = {'urodzenie': birth, 'smierc': death, 'krewni': relatives}
+    components['imie'] = _name_similarity(record1.first_name, record2.first_name,
+                                          record1.first_code, record2.first_code)
+    components['nazwisko'] = max((_name_similarity(name1, name2, code1, code2)
+                                  for name1, code1 in zip(record1.surnames, record1.surname_codes)
+                                  for name2, code2 in zip(record2.surnames, record2.surname_codes)),
+                                 default=NEUTRAL)
+    components['miejsca'] = _place_similarity(record1, record2)
+    score += sum(WEIGHTS[name] * components[name] for name in _TEXT_COMPONENTS)
+    if score < threshold:
+        return None
+    
+    person1_id, person2_id = sorted((record1.id, record2.id))
+    return DuplicateCandidate(person1_id, person2_id, round(score, 4), components)
+
+
+def score_blocks(blocks: List[Tuple[str, List[PersonRecord]]], threshold: float) -> List[DuplicateCandidate]:
+    """
+    Ocenia pary osób w blokach i zwraca pary o ocenie nie niższej niż próg
+    
+    Para mająca kilka wspólnych kluczy jest oceniana tylko w bloku
+    najmniejszego z nich, więc bloki można przetwarzać niezależnie
+    (również w osobnych procesach) bez powtórzeń.
+    """
+    candidates = []
+    for key, records in blocks:
+        for record1, record2 in combinations(records, 2):
+            if min(record1.keys & record2.keys) != key:
+                continue
+            candidate = score_pair(record1, record2, threshold)
+            if candidate:
+                candidates.append(candidate)
+    return candidates
+
+
+class DuplicateFinder:
+    """
+    Wyszukuje osoby zapisane w bazie wielokrotnie (np. po imporcie
+    nakładających się plików GEDCOM)
+    
+    Zamiast porównywać każdą parę osób, osoby są dzielone na bloki według
+    kluczy blokujących i porównywane tylko wewnątrz bloków. Przy dużej
+    liczbie par bloki są oceniane równolegle w puli procesów.
+    """
+    
+    DEFAULT_THRESHOLD = 0.8
+    
+    # Poniżej tej liczby par uruchamianie procesów kosztuje więcej niż ocena
+    PARALLEL_MIN_PAIRS = 50000
+    
+    # Przybliżona liczba par w jednym zadaniu dla procesu roboczego
+    TASK_PAIRS = 20000
+    
+    def __init__(self, db_manager, threshold: float = DEFAULT_THRESHOLD,
+                 workers: Optional[int] = None):
+        """
+        Inicjalizacja wyszukiwania duplikatów
+        
+        Args:
+            db_manager: Instancja DatabaseManager
+            threshold: Najniższa ocena podobieństwa zgłaszanej pary (0-1)
+            workers: Liczba procesów roboczych (domyślnie liczba procesorów)
+        """
+        self.db_manager = db_manager
+        self.threshold = threshold
+        self.workers = workers or os.cpu_count() or 1
+    
+    @staticmethod
+    def build_blocks(records: Iterable[PersonRecord]) -> List[Tuple[str, List[PersonRecord]]]:
+        """Grupuje osoby według kluczy blokujących (pomija bloki jednoosobowe)"""
+        blocks = defaultdict(list)
+        for record in records:
+            for key in record.keys:
+                blocks[key].append(record)
+        return sorted((key, members) for key, members in blocks.items() if len(members) > 1)
+    
+    def _split_tasks(self, blocks: List[Tuple[str, List[PersonRecord]]]) -> List[list]:
+        """Dzieli bloki na zadania o zbliżonej liczbie par"""
+        tasks = [[]]
+        pairs = 0
+        for block in blocks:
+            if pairs >= self.TASK_PAIRS:
+                tasks.append([])
+                pairs = 0
+            tasks[-1].append(block)
+            size = len(block[1])
+            pairs += size * (size - 1) // 2
+        return [task for task in tasks if task]
+    
+    @profiled
+    def find(self) -> List[DuplicateCandidate]:
+        """
+        Wyszukuje prawdopodobne duplikaty
+        
+        Returns:
+            Pary osób uporządkowane od najwyższej oceny
+        """
+        records = build_records(self.db_manager.get_all_persons(),
+                                self.db_manager.get_all_relations())
+        blocks = self.build_blocks(records)
+        pairs = sum(len(members) * (len(members) - 1) // 2 for _, members in blocks)
+        tasks = self._split_tasks(blocks)
+        
+        if self.workers > 1 and len(tasks) > 1 and pairs >= self.PARALLEL_MIN_PAIRS:
+            # Procesy uruchamiane od nowa (spawn) - rozwidlenie procesu z wątkami
+            # interfejsu i otwartym połączeniem SQLite nie jest bezpieczne
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(tasks)),
+                                     mp_context=context) as executor:
+                results = list(executor.map(score_blocks, tasks, repeat(self.threshold)))
+        else:
+            results = [score_blocks(task, self.threshold) for task in tasks]
+        
+        candidates = [candidate for result in results for candidate in result]
+        candidates.sort(key=lambda c: (-c.score, c.person1_id, c.person2_id))
+        return candidates
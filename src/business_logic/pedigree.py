@@ -0,0 +1,222 @@
+"""
+Rodowód - przodkowie z uwzględnieniem implexu, wykrywanie cykli i współczynniki pokrewieństwa
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class GenerationStats:
+    """Zapełnienie jednego pokolenia rodowodu"""
+    
+    generation: int
+    # Liczba miejsc w pełnym rodowodzie (2^pokolenie)
+    slots: int
+    # Miejsca zajęte przez znanych przodków (przodek osiągalny kilkoma drogami liczy się wielokrotnie)
+    filled: int
+    # Liczba różnych znanych przodków w pokoleniu
+    distinct: int
+    
+    @property
+    def implex(self) -> float:
+        """Udział miejsc powtórzonych wśród zajętych (0 - brak zapętleń rodowodu)"""
+        return 1 - self.distinct / self.filled if self.filled else 0.0
+
+
+class Pedigree:
+    """
+    Graf rodowodu wybranych osób (ich rodzice, dziadkowie itd.)
+    
+    Przodek osiągalny kilkoma liniami (np. przy małżeństwie kuzynów) nie jest
+    pomijany: liczba dróg do każdego przodka jest wyliczana programowaniem
+    dynamicznym w porządku topologicznym, bez wyliczania samych ścieżek.
+    Krawędzie zamykające cykl (błędne dane, w których osoba jest własnym
+    przodkiem) są zapamiętywane w cycle_edges i pomijane w obliczeniach.
+    """
+    
+    # Model genetyczny zakłada najwyżej dwoje rodziców; kolejni są pomijani
+    # we współczynnikach pokrewieństwa
+    MAX_PARENTS = 2
+    
+    def __init__(self, roots: Iterable[int], edges: Iterable[Tuple[int, int]]):
+        """
+        Inicjalizacja rodowodu
+        
+        Args:
+            roots: ID osób, których rodowód jest analizowany
+            edges: Krawędzie (rodzic_id, dziecko_id)
+        """
+        self.roots = list(dict.fromkeys(roots))
+        parents = defaultdict(set)
+        for parent_id, child_id in edges:
+            parents[child_id].add(parent_id)
+        self.parents = {child_id: sorted(ids) for child_id, ids in parents.items()}
+        
+        self.cycle_edges = []
+        self.order = self._topological_order()
+        self.position = {person_id: i for i, person_id in enumerate(self.order)}
+        self._kinship = {}
+    
+    def parents_of(self, person_id: int) -> List[int]:
+        """Zwraca ID rodziców osoby w rodowodzie"""
+        return self.parents.get(person_id, [])
+    
+    def _topological_order(self) -> List[int]:
+        """
+        Porządkuje osoby od najstarszych przodków do korzeni
+        
+        Przeszukiwanie w głąb po rodzicach (iteracyjne - rodowody mogą być
+        głębokie); krawędź do osoby na bieżącym stosie zamyka cykl, więc jest
+        usuwana z grafu i zapisywana w cycle_edges.
+        """
+        order = []
+        state = {}  # 1 - na stosie, 2 - przetworzona
+        for root in self.roots:
+            if root in state:
+                continue
+            state[root] = 1
+            stack = [(root, iter(list(self.parents_of(root))))]
+            while stack:
+                person_id, pending = stack[-1]
+                for parent_id in pending:
+                    if state.get(parent_id) == 1:
+                        self.parents[person_id].remove(parent_id)
+                        self.cycle_edges.append((parent_id, person_id))
+                    elif parent_id not in state:
+                        state[parent_id] = 1
+                        stack.append((parent_id, iter(list(self.parents_of(parent_id)))))
+                        break
+                else:
+                    stack.pop()
+                    state[person_id] = 2
+                    order.append(person_id)
+        return order
+    
+    def path_counts(self, person_id: int,
+                    max_generations: Optional[int] = None) -> Dict[int, Dict[int, int]]:
+        """
+        Liczy drogi od osoby do każdego jej przodka, osobno dla każdego pokolenia
+        
+        Args:
+            person_id: ID osoby (jeden z korzeni rodowodu)
+            max_generations: Maksymalna liczba pokoleń (None = wszystkie)
+        
+        Returns:
+            Słownik ID przodka -> {pokolenie: liczba dróg}
+        """
+        counts = defaultdict(lambda: defaultdict(int))
+        counts[person_id][0] = 1
+        # Dzieci są przetwarzane przed rodzicami, więc liczby dróg do dziecka są już pełne
+        for current_id in reversed(self.order[:self.position[person_id] + 1]):
+            if current_id not in counts:
+                continue
+            for generation, paths in counts[current_id].items():
+                if max_generations is not None and generation >= max_generations:
+                    continue
+                for parent_id in self.parents_of(current_id):
+                    counts[parent_id][generation + 1] += paths
+        
+        del counts[person_id]
+        return {ancestor_id: dict(by_generation) for ancestor_id, by_generation in counts.items()}
+    
+    def generation_stats(self, person_id: int, max_generations: int) -> List[GenerationStats]:
+        """
+        Zwraca zapełnienie kolejnych pokoleń rodowodu osoby
+        
+        Args:
+            person_id: ID osoby
+            max_generations: Liczba pokoleń
+        
+        Returns:
+            Lista GenerationStats dla pokoleń 1..max_generations
+        """
+        filled = defaultdict(int)
+        distinct = defaultdict(int)
+        for by_generation in self.path_counts(person_id, max_generations).values():
+            for generation, paths in by_generation.items():
+                filled[generation] += paths
+                distinct[generation] += 1
+        return [GenerationStats(generation, 2 ** generation, filled[generation], distinct[generation])
+                for generation in range(1, max_generations + 1)]
+    
+    def implex(self, person_id: int, max_generations: Optional[int] = None) -> float:
+        """
+        Zwraca współczynnik implexu (zapętlenia) rodowodu osoby
+        
+        Args:
+            person_id: ID osoby
+            max_generations: Liczba uwzględnianych pokoleń (None = wszystkie)
+        
+        Returns:
+            1 - (różni przodkowie / miejsca zajęte przez znanych przodków)
+        """
+        counts = self.path_counts(person_id, max_generations)
+        filled = sum(sum(by_generation.values()) for by_generation in counts.values())
+        return 1 - len(counts) / filled if filled else 0.0
+    
+    def kinship(self, person1_id: int, person2_id: int) -> float:
+        """
+        Zwraca współczynnik pokrewieństwa (kinship) dwóch osób
+        
+        Prawdopodobieństwo, że losowo wybrane allele obu osób są identyczne
+        z pochodzenia. Wyliczany rekurencyjnie po rodzicach młodszej osoby
+        z zapamiętywaniem wyników par, z jawnym stosem zamiast rekurencji.
+        
+        Args:
+            person1_id: ID pierwszej osoby
+            person2_id: ID drugiej osoby
+        
+        Returns:
+            Współczynnik z przedziału [0, 1] (rodzeństwo: 0.25, kuzyni: 0.0625)
+        """
+        target = self._pair(person1_id, person2_id)
+        stack = [target]
+        while stack:
+            pair = stack[-1]
+            if pair in self._kinship:
+                stack.pop()
+                continue
+            terms = self._kinship_terms(pair)
+            missing = [term for term in terms if term not in self._kinship]
+            if missing:
+                stack.extend(missing)
+                continue
+            
+            total = sum(self._kinship[term] for term in terms)
+            if pair[0] == pair[1]:
+                self._kinship[pair] = (1 + total) / 2
+            else:
+                self._kinship[pair] = total / 2
+            stack.pop()
+        return self._kinship[target]
+    
+    def inbreeding(self, person_id: int) -> float:
+        """
+        Zwraca współczynnik inbredu osoby (pokrewieństwo jej rodziców)
+        
+        Args:
+            person_id: ID osoby
+        
+        Returns:
+            Współczynnik z przedziału [0, 1] (dziecko kuzynów: 0.0625)
+        """
+        parents = self.parents_of(person_id)[:self.MAX_PARENTS]
+        if len(parents) < 2:
+            return 0.0
+        return self.kinship(*parents)
+    
+    def _pair(self, person1_id: int, person2_id: int) -> Tuple[int, int]:
+        """Para uporządkowana tak, że pierwsza osoba nie jest przodkiem drugiej"""
+        if self.position[person1_id] >= self.position[person2_id]:
+            return person1_id, person2_id
+        return person2_id, person1_id
+    
+    def _kinship_terms(self, pair: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """Pary, od których zależy współczynnik pary (brak rodzica daje 0)"""
+        person_id, other_id = pair
+        parents = self.parents_of(person_id)[:self.MAX_PARENTS]
+        if person_id == other_id:
+            return [self._pair(*parents)] if len(parents) == 2 else []
+        return [self._pair(parent_id, other_id) for parent_id in parents]
@@ -5,6 +5,9 @@ RelationshipCalculator - Oblicza relacje między osobami w drzewie genealogiczny
 from typing import List, Dict, Set, Optional, Tuple
 from collections import deque
 
+from .pedigree import GenerationStats, Pedigree
+from ..utils.profiler import profiled
+
 
 class RelationshipCalculator:
     """Oblicza relacje i zależności między osobami w drzewie genealogicznym"""
@@ -18,6 +21,7 @@ class RelationshipCalculator:
         """
         self.db_manager = db_manager
     
+    @profiled
     def get_parents(self, person_id: int) -> List[dict]:
         """
         Pobiera rodziców osoby
@@ -43,6 +47,7 @@ class RelationshipCalculator:
         
         return parents
     
+    @profiled
     def get_children(self, person_id: int) -> List[dict]:
         """
         Pobiera dzieci osoby
@@ -68,6 +73,7 @@ class RelationshipCalculator:
         
         return children
     
+    @profiled
     def get_spouse(self, person_id: int) -> Optional[dict]:
         """
         Pobiera małżonka osoby
@@ -89,6 +95,7 @@ class RelationshipCalculator:
         
         return None
     
+    @profiled
     def get_siblings(self, person_id: int) -> List[dict]:
         """
         Pobiera rodzeństwo osoby
@@ -110,6 +117,7 @@ class RelationshipCalculator:
         
         return siblings
     
+    @profiled
     def get_ancestors(self, person_id: int, max_generations: int = 10) -> List[Tuple[dict, int]]:
         """
         Pobiera wszystkich przodków osoby
@@ -121,26 +129,10 @@ class RelationshipCalculator:
         Returns:
             Lista krotek (osoba, pokolenie)
         """
-        ancestors = []
-        visited = set()
-        queue = deque([(person_id, 0)])
-        
-        while queue and max_generations > 0:
-            current_id, generation = queue.popleft()
-            
-            if current_id in visited or generation >= max_generations:
-                continue
-            
-            visited.add(current_id)
-            parents = self.get_parents(current_id)
-            
-            for parent in parents:
-                if parent['id'] not in visited:
-                    ancestors.append((parent, generation + 1))
-                    queue.append((parent['id'], generation + 1))
-        
-        return ancestors
+        # Przodkowie z tabeli domknięcia - jedno zapytanie zamiast BFS po relacjach
+        return self.db_manager.get_ancestors(person_id, max_generations)
     
+    @profiled
     def get_descendants(self, person_id: int, max_generations: int = 10) -> List[Tuple[dict, int]]:
         """
         Pobiera wszystkich potomków osoby
@@ -152,26 +144,103 @@ class RelationshipCalculator:
         Returns:
             Lista krotek (osoba, pokolenie)
         """
-        descendants = []
-        visited = set()
-        queue = deque([(person_id, 0)])
+        return self.db_manager.get_descendants(person_id, max_generations)
+    
+    @profiled
+    def get_pedigree(self, *person_ids: int) -> Pedigree:
+        """
+        Buduje rodowód osób (jednej lub kilku, np. pary do porównania)
         
-        while queue and max_generations > 0:
-            current_id, generation = queue.popleft()
+        Args:
+            person_ids: ID osób
             
-            if current_id in visited or generation >= max_generations:
-                continue
+        Returns:
+            Obiekt Pedigree
+        """
+        return Pedigree(person_ids, self.db_manager.get_pedigree_edges(list(person_ids)))
+    
+    @profiled
+    def get_ancestors_with_paths(self, person_id: int, max_generations: int = 10,
+                                 pedigree: Optional[Pedigree] = None) -> List[Tuple[dict, int, int]]:
+        """
+        Pobiera przodków osoby we wszystkich pokoleniach, w których występują
+        
+        W przeciwieństwie do get_ancestors przodek osiągalny kilkoma liniami
+        (zapętlenie rodowodu) pojawia się w każdym swoim pokoleniu wraz
+        z liczbą dróg, którymi do niego prowadzi.
+        
+        Args:
+            person_id: ID osoby
+            max_generations: Maksymalna liczba pokoleń do sprawdzenia
+            pedigree: Rodowód osoby, jeśli został już zbudowany
             
-            visited.add(current_id)
-            children = self.get_children(current_id)
+        Returns:
+            Lista krotek (osoba, pokolenie, liczba dróg) uporządkowana wg pokolenia
+        """
+        persons = {person['id']: person for person, _ in
+                   self.db_manager.get_ancestors(person_id, max_generations)}
+        pedigree = pedigree or self.get_pedigree(person_id)
+        counts = pedigree.path_counts(person_id, max_generations)
+        
+        ancestors = [(persons[ancestor_id], generation, paths)
+                     for ancestor_id, by_generation in counts.items()
+                     for generation, paths in by_generation.items()]
+        ancestors.sort(key=lambda item: (item[1], item[0]['id']))
+        return ancestors
+    
+    @profiled
+    def get_pedigree_collapse(self, person_id: int, max_generations: int = 10) -> List[GenerationStats]:
+        """
+        Zwraca zapełnienie i implex kolejnych pokoleń rodowodu osoby
+        
+        Args:
+            person_id: ID osoby
+            max_generations: Liczba pokoleń
             
-            for child in children:
-                if child['id'] not in visited:
-                    descendants.append((child, generation + 1))
-                    queue.append((child['id'], generation + 1))
+        Returns:
+            Lista GenerationStats dla pokoleń 1..max_generations
+        """
+        return self.get_pedigree(person_id).generation_stats(person_id, max_generations)
+    
+    @profiled
+    def calculate_kinship(self, person1_id: int, person2_id: int) -> float:
+        """
+        Oblicza współczynnik pokrewieństwa dwóch osób
         
-        return descendants
+        Args:
+            person1_id: ID pierwszej osoby
+            person2_id: ID drugiej osoby
+            
+        Returns:
+            Współczynnik pokrewieństwa (rodzic-dziecko i rodzeństwo: 0.25)
+        """
+        return self.get_pedigree(person1_id, person2_id).kinship(person1_id, person2_id)
     
+    @profiled
+    def calculate_inbreeding(self, person_id: int) -> float:
+        """
+        Oblicza współczynnik inbredu osoby
+        
+        Args:
+            person_id: ID osoby
+            
+        Returns:
+            Współczynnik inbredu (0 gdy rodzice nie są spokrewnieni)
+        """
+        return self.get_pedigree(person_id).inbreeding(person_id)
+    
+    @profiled
+    def find_cycles(self) -> List[Tuple[dict, dict]]:
+        """
+        Wyszukuje błędne relacje, przez które osoba jest własnym przodkiem
+        
+        Returns:
+            Lista krotek (rodzic, dziecko) dla krawędzi leżących na cyklach
+        """
+        return [(self.db_manager.get_person(parent_id), self.db_manager.get_person(child_id))
+                for parent_id, child_id in self.db_manager.find_ancestry_cycles()]
+    
+    @profiled
     def find_relationship_path(self, person1_id: int, person2_id: int) -> Optional[List[dict]]:
         """
         Znajduje najkrótszą ścieżkę relacji między dwiema osobami
@@ -221,6 +290,7 @@ class RelationshipCalculator:
         
         return None
     
+    @profiled
     def calculate_relation_degree(self, person1_id: int, person2_id: int) -> Optional[str]:
         """
         Oblicza stopień pokrewieństwa między dwiema osobami
@@ -247,32 +317,24 @@ class RelationshipCalculator:
         # Pośrednia relacja
         distance = len(path) - 1
         
-        # Sprawdź czy to relacja w linii prostej (przodek-potomek)
-        is_ancestor = all(
-            p2['id'] in [c['id'] for c in self.get_children(p1['id'])]
-            for p1, p2 in zip(path[:-1], path[1:])
-        )
-        
-        if is_ancestor:
-            if distance == 2:
+        # Relacja w linii prostej (przodek-potomek) z tabeli domknięcia
+        depth = self.db_manager.get_lineage_depth(person1_id, person2_id)
+        if depth is not None:
+            if depth == 2:
                 return "wnuk/wnuczka"
-            elif distance == 3:
+            elif depth == 3:
                 return "prawnuk/prawnuczka"
             else:
-                return f"potomek ({distance} pokoleń)"
-        
-        is_descendant = all(
-            p2['id'] in [p['id'] for p in self.get_parents(p1['id'])]
-            for p1, p2 in zip(path[:-1], path[1:])
-        )
+                return f"potomek ({depth} pokoleń)"
         
-        if is_descendant:
-            if distance == 2:
+        depth = self.db_manager.get_lineage_depth(person2_id, person1_id)
+        if depth is not None:
+            if depth == 2:
                 return "dziadek/babcia"
-            elif distance == 3:
+            elif depth == 3:
                 return "pradziadek/prababcia"
             else:
-                return f"przodek ({distance} pokoleń)"
+                return f"przodek ({depth} pokoleń)"
         
         # Inne relacje
         return f"krewny ({distance} stopni oddalenia)"
@@ -0,0 +1,158 @@
+"""
+Dane osi czasu w postaci tablic NumPy z indeksem przedziałów życia
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+
+
+# Kody płci w tablicy TimelineData.gender
+GENDER_UNKNOWN = 0
+GENDER_MALE = 1
+GENDER_FEMALE = 2
+
+GENDER_CODES = {'M': GENDER_MALE, 'K': GENDER_FEMALE}
+
+
+class LifespanIndex:
+    """
+    Posortowany indeks przedziałów [urodzenie, koniec] do zapytań o zakres lat
+    
+    Wiersze są uporządkowane według roku urodzenia. Dla osób z datą śmierci
+    długość życia jest ograniczona przez najdłuższą z nich, więc osoby żyjące
+    w przedziale [od, do] leżą w ciągłym fragmencie tablicy wyznaczonym
+    wyszukiwaniem binarnym. Osoby bez daty śmierci (żyjące do dziś) są
+    przechowywane osobno.
+    """
+    
+    def __init__(self, birth: np.ndarray, end: np.ndarray, open_ended: np.ndarray):
+        """
+        Inicjalizacja indeksu
+        
+        Args:
+            birth: Lata urodzenia posortowane rosnąco
+            end: Lata końca życia (dla osób żyjących - bieżący rok)
+            open_ended: Czy osoba nie ma daty śmierci
+        """
+        self.closed_rows = np.flatnonzero(~open_ended)
+        self.closed_birth = birth[self.closed_rows]
+        self.closed_end = end[self.closed_rows]
+        spans = self.closed_end - self.closed_birth
+        self.max_span = int(spans.max()) if len(spans) else 0
+        
+        self.open_rows = np.flatnonzero(open_ended)
+        self.open_birth = birth[self.open_rows]
+        self.open_end = int(end[self.open_rows].max()) if len(self.open_rows) else 0
+    
+    def query(self, year_from: float, year_to: float) -> np.ndarray:
+        """
+        Zwraca wiersze osób żyjących w przedziale lat
+        
+        Args:
+            year_from: Początek przedziału
+            year_to: Koniec przedziału
+        
+        Returns:
+            Posortowana tablica numerów wierszy
+        """
+        lo = np.searchsorted(self.closed_birth, year_from - self.max_span, side='left')
+        hi = np.searchsorted(self.closed_birth, year_to, side='right')
+        closed = self.closed_rows[lo:hi][self.closed_end[lo:hi] >= year_from]
+        
+        if self.open_end < year_from:
+            return closed
+        open_hi = np.searchsorted(self.open_birth, year_to, side='right')
+        return np.sort(np.concatenate((closed, self.open_rows[:open_hi])))
+
+
+@dataclass
+class TimelineData:
+    """Dane osi czasu uporządkowane według roku urodzenia"""
+    
+    ids: np.ndarray
+    birth: np.ndarray
+    end: np.ndarray
+    open_ended: np.ndarray
+    gender: np.ndarray
+    names: List[str]
+    
+    def __post_init__(self):
+        self.index = LifespanIndex(self.birth, self.end, self.open_ended)
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    @property
+    def year_range(self) -> tuple:
+        """Zakres lat (najwcześniejsze urodzenie, najpóźniejszy koniec życia)"""
+        if not len(self):
+            return 0, 0
+        return int(self.birth.min()), int(self.end.max())
+    
+    def visible_rows(self, year_from: float, year_to: float) -> np.ndarray:
+        """Zwraca wiersze osób żyjących w przedziale lat"""
+        return self.index.query(year_from, year_to)
+    
+    def rows_of(self, person_ids) -> np.ndarray:
+        """Zwraca posortowane wiersze osób o podanych ID (nieobecne są pomijane)"""
+        return np.flatnonzero(np.isin(self.ids, np.fromiter(person_ids, dtype=np.int64)))
+    
+    def bar_vertices(self, rows: np.ndarray, height: float = 0.5) -> np.ndarray:
+        """
+        Zwraca wierzchołki prostokątów linii życia dla PolyCollection
+        
+        Args:
+            rows: Numery wierszy
+            height: Wysokość paska
+        
+        Returns:
+            Tablica o kształcie (liczba wierszy, 4, 2)
+        """
+        left = self.birth[rows]
+        right = self.end[rows]
+        bottom = rows - height / 2
+        top = rows + height / 2
+        return np.stack([
+            np.column_stack((left, bottom)),
+            np.column_stack((left, top)),
+            np.column_stack((right, top)),
+            np.column_stack((right, bottom)),
+        ], axis=1).astype(float)
+
+
+def build_timeline_data(rows, current_year: Optional[int] = None) -> TimelineData:
+    """
+    Tworzy dane osi czasu z projekcji SQL
+    
+    Args:
+        rows: Krotki (id, imie, nazwisko, plec, rok_urodzenia, rok_smierci)
+        current_year: Rok końca linii życia osób bez daty śmierci
+    
+    Returns:
+        Obiekt TimelineData
+    """
+    if current_year is None:
+        current_year = datetime.now().year
+    
+    rows = list(rows)
+    count = len(rows)
+    ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=count)
+    birth = np.fromiter((r[4] for r in rows), dtype=np.int32, count=count)
+    death = np.fromiter((r[5] if r[5] is not None else -1 for r in rows),
+                        dtype=np.int32, count=count)
+    gender = np.fromiter((GENDER_CODES.get(r[3], GENDER_UNKNOWN) for r in rows),
+                         dtype=np.int8, count=count)
+    
+    order = np.argsort(birth, kind='stable')
+    ids, birth, death, gender = ids[order], birth[order], death[order], gender[order]
+    names = [f"{rows[i][1]} {rows[i][2]}" for i in order]
+    
+    open_ended = death < 0
+    end = np.where(open_ended, current_year, death)
+    # Błędne dane (śmierć przed urodzeniem) nie mogą dać ujemnej długości życia
+    end = np.maximum(end, birth)
+    
+    return TimelineData(ids, birth, end, open_ended, gender, names)
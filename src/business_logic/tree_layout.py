@@ -0,0 +1,153 @@
+"""
+Układ pełnego drzewa genealogicznego niezależny od warstwy prezentacji
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+
+def find_root_persons(persons: List[dict], relations: List[dict]) -> List[dict]:
+    """
+    Znajduje osoby bez rodziców (osoby startowe)
+    
+    Args:
+        persons: Wszystkie osoby
+        relations: Wszystkie relacje
+        
+    Returns:
+        Lista osób startowych
+    """
+    persons_with_parents = set()
+    for rel in relations:
+        if rel['rodzaj_relacji'] == 'dziecko':
+            persons_with_parents.add(rel['osoba1_id'])
+    
+    root_persons = [p for p in persons if p['id'] not in persons_with_parents]
+    
+    if not root_persons:
+        # Jeśli wszystkie mają rodziców, wybierz najstarszą osobę
+        root_persons = sorted(persons,
+                              key=lambda p: p.get('urodzenie_klucz') or float('inf'))[:1]
+    
+    return root_persons
+
+
+def organize_by_generations(root_persons: List[dict], relations: List[dict],
+                            persons_by_id: Dict[int, dict]) -> Dict[int, List[dict]]:
+    """
+    Organizuje osoby według pokoleń
+    
+    Args:
+        root_persons: Lista osób bez rodziców
+        relations: Wszystkie relacje
+        persons_by_id: Słownik ID -> osoba
+        
+    Returns:
+        Słownik: generacja -> lista osób
+    """
+    generations = {0: root_persons}
+    processed = set(p['id'] for p in root_persons)
+    
+    # Buduj słownik relacji dla szybkiego dostępu
+    children_map = {}
+    for rel in relations:
+        if rel['rodzaj_relacji'] == 'rodzic':
+            if rel['osoba1_id'] not in children_map:
+                children_map[rel['osoba1_id']] = []
+            children_map[rel['osoba1_id']].append(rel['osoba2_id'])
+    
+    # Przetwarzaj pokolenia
+    gen = 0
+    while True:
+        current_gen = generations.get(gen, [])
+        if not current_gen:
+            break
+        
+        next_gen = []
+        for person in current_gen:
+            children_ids = children_map.get(person['id'], [])
+            for child_id in children_ids:
+                if child_id not in processed:
+                    child = persons_by_id.get(child_id)
+                    if child:
+                        next_gen.append(child)
+                        processed.add(child_id)
+        
+        if next_gen:
+            generations[gen + 1] = next_gen
+            gen += 1
+        else:
+            break
+    
+    return generations
+
+
+def group_by_generation(persons: List[dict], generations: Dict[int, int]) -> Dict[int, List[dict]]:
+    """
+    Grupuje osoby według zapisanych numerów pokoleń
+    
+    Args:
+        persons: Wszystkie osoby
+        generations: Słownik ID osoby -> pokolenie (brak wpisu = 0)
+        
+    Returns:
+        Słownik: generacja -> lista osób
+    """
+    grouped = {}
+    for person in persons:
+        grouped.setdefault(generations.get(person['id'], 0), []).append(person)
+    return dict(sorted(grouped.items()))
+
+
+def calculate_positions(generations: Dict[int, List[dict]]) -> Dict[int, Tuple[float, float]]:
+    """
+    Oblicza pozycje węzłów na wykresie
+    
+    Args:
+        generations: Słownik: generacja -> lista osób
+        
+    Returns:
+        Słownik: person_id -> (x, y)
+    """
+    positions = {}
+    max_generation = max(generations.keys()) if generations else 0
+    
+    for gen, persons in generations.items():
+        count = len(persons)
+        for i, person in enumerate(persons):
+            # Pozycja x: rozłożenie równomierne
+            if count == 1:
+                x = 0.5
+            else:
+                x = i / (count - 1)
+            
+            # Pozycja y: od góry do dołu
+            y = 1 - (gen / (max_generation + 1)) if max_generation > 0 else 0.5
+            
+            positions[person['id']] = (x, y)
+    
+    return positions
+
+
+def compute_tree_layout(persons: List[dict], relations: List[dict],
+                        generation_numbers: Optional[Dict[int, int]] = None):
+    """
+    Oblicza pełny układ drzewa: pokolenia i pozycje węzłów
+    
+    Args:
+        persons: Wszystkie osoby
+        relations: Wszystkie relacje
+        generation_numbers: Zapisane pokolenia osób (ID -> pokolenie); bez
+                            nich pokolenia są wyznaczane przeszukiwaniem od
+                            osób bez rodziców
+        
+    Returns:
+        Krotka (generacja -> lista osób, person_id -> (x, y))
+    """
+    if generation_numbers is not None:
+        generations = group_by_generation(persons, generation_numbers)
+    else:
+        persons_by_id = {p['id']: p for p in persons}
+        root_persons = find_root_persons(persons, relations)
+        generations = organize_by_generations(root_persons, relations, persons_by_id)
+    positions = calculate_positions(generations)
+    return generations, positions
@@ -0,0 +1,454 @@
+"""
+Interfejs wiersza poleceń - operacje na bazie drzewa bez interfejsu graficznego
+
+Wyniki są wypisywane jako JSON lines (jeden obiekt JSON w wierszu), dzięki
+czemu można je przetwarzać potokowo i uruchamiać równolegle dla wielu baz:
+
+    python -m src.cli --db rodzina.db search Kowal
+    ls *.db | xargs -P4 -I{} python -m src.cli --db {} stats
+    python -m src.cli --db-dir rodziny batch surnames --limit 20
+
+Moduł nie importuje PyQt6 ani matplotlib.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+from typing import Iterable, List, Optional
+
+from .database.db_manager import DatabaseManager
+from .business_logic.relationship_calculator import RelationshipCalculator
+from .business_logic.batch_analytics import BatchAnalytics, find_databases
+from .business_logic.deduplication import DuplicateFinder
+from .utils.gedcom_handler import GedcomHandler
+from .utils.snapshot import load_snapshot, save_snapshot
+
+
+# Kody wyjścia
+EXIT_OK = 0
+EXIT_NOT_FOUND = 1
+EXIT_ERROR = 2
+
+
+class CommandError(Exception):
+    """Błąd wykonania polecenia (np. brak osoby o podanym ID)"""
+    
+    def __init__(self, message: str, exit_code: int = EXIT_NOT_FOUND):
+        super().__init__(message)
+        self.exit_code = exit_code
+
+
+def _require_person(db_manager: DatabaseManager, person_id: int) -> dict:
+    """Pobiera osobę lub zgłasza CommandError"""
+    person = db_manager.get_person(person_id)
+    if person is None:
+        raise CommandError(f"Nie znaleziono osoby o ID {person_id}")
+    return person
+
+
+def cmd_import(db_manager, calculator, args) -> Iterable[dict]:
+    """Importuje plik GEDCOM"""
+    persons_before = db_manager.count_persons()
+    relations_before = db_manager.get_statistics()['relacje']
+    GedcomHandler(db_manager).import_file(args.file, workers=args.workers)
+    yield {
+        'plik': args.file,
+        'zaimportowane_osoby': db_manager.count_persons() - persons_before,
+        'zaimportowane_relacje': db_manager.get_statistics()['relacje'] - relations_before
+    }
+
+
+def cmd_sync(db_manager, calculator, args) -> Iterable[dict]:
+    """Synchronizuje bazę z plikiem GEDCOM prowadzonym poza programem"""
+    summary = GedcomHandler(db_manager).sync_file(args.file, source=args.source, delete=args.delete,
+                                                  workers=args.workers)
+    yield {'plik': args.file, **summary}
+
+
+def cmd_export(db_manager, calculator, args) -> Iterable[dict]:
+    """Eksportuje bazę do pliku GEDCOM"""
+    GedcomHandler(db_manager).export_file(args.file)
+    yield {'plik': args.file, 'osoby': db_manager.count_persons()}
+
+
+def cmd_snapshot(db_manager, calculator, args) -> Iterable[dict]:
+    """Zapisuje bazę jako binarną migawkę"""
+    compression = None if args.compression == 'none' else args.compression
+    snapshot = save_snapshot(db_manager, args.file, compression)
+    yield {'plik': args.file, 'osoby': len(snapshot), 'rozmiar': os.path.getsize(args.file)}
+
+
+def cmd_restore(db_manager, calculator, args) -> Iterable[dict]:
+    """Odtwarza pustą bazę z binarnej migawki"""
+    yield {'plik': args.file, 'osoby': load_snapshot(args.file).restore(db_manager)}
+
+
+def cmd_ancestors(db_manager, calculator, args) -> Iterable[dict]:
+    """Wypisuje przodków osoby"""
+    _require_person(db_manager, args.person_id)
+    for person, generation in calculator.get_ancestors(args.person_id, args.generations):
+        yield {'pokolenie': generation, **person}
+
+
+def cmd_descendants(db_manager, calculator, args) -> Iterable[dict]:
+    """Wypisuje potomków osoby"""
+    _require_person(db_manager, args.person_id)
+    for person, generation in calculator.get_descendants(args.person_id, args.generations):
+        yield {'pokolenie': generation, **person}
+
+
+def cmd_path(db_manager, calculator, args) -> Iterable[dict]:
+    """Wypisuje najkrótszą ścieżkę relacji między osobami"""
+    _require_person(db_manager, args.person1_id)
+    _require_person(db_manager, args.person2_id)
+    path = calculator.find_relationship_path(args.person1_id, args.person2_id)
+    if not path:
+        raise CommandError(f"Brak połączenia między osobami {args.person1_id} i {args.person2_id}")
+    for step, person in enumerate(path):
+        yield {'krok': step, **person}
+
+
+def cmd_relate(db_manager, calculator, args) -> Iterable[dict]:
+    """Wypisuje stopień pokrewieństwa dwóch osób"""
+    _require_person(db_manager, args.person1_id)
+    _require_person(db_manager, args.person2_id)
+    yield {
+        'osoba1_id': args.person1_id,
+        'osoba2_id': args.person2_id,
+        'relacja': calculator.calculate_relation_degree(args.person1_id, args.person2_id)
+    }
+
+
+def cmd_kinship(db_manager, calculator, args) -> Iterable[dict]:
+    """Wypisuje współczynnik pokrewieństwa dwóch osób"""
+    _require_person(db_manager, args.person1_id)
+    _require_person(db_manager, args.person2_id)
+    yield {
+        'osoba1_id': args.person1_id,
+        'osoba2_id': args.person2_id,
+        'wspolczynnik_pokrewienstwa': calculator.calculate_kinship(args.person1_id, args.person2_id)
+    }
+
+
+def cmd_cycles(db_manager, calculator, args) -> Iterable[dict]:
+    """Wypisuje relacje rodzicielskie tworzące cykl"""
+    for parent_id, child_id in db_manager.find_ancestry_cycles():
+        yield {'rodzic_id': parent_id, 'dziecko_id': child_id}
+
+
+def cmd_validate(db_manager, calculator, args) -> Iterable[dict]:
+    """Sprawdza spójność danych i wypisuje problemy w miarę ich wykrywania"""
+    for finding in db_manager.validate(full=args.full):
+        yield {
+            'kod': finding.code,
+            'powaga': finding.severity,
+            'osoba_id': finding.person_id,
+            'osoba2_id': finding.other_person_id,
+            'relacja_id': finding.relation_id,
+            'opis': finding.message
+        }
+
+
+def cmd_duplicates(db_manager, calculator, args) -> Iterable[dict]:
+    """Wypisuje pary osób, które mogą być duplikatami"""
+    finder = DuplicateFinder(db_manager, threshold=args.threshold, workers=args.workers)
+    for candidate in finder.find():
+        yield {
+            'osoba1_id': candidate.person1_id,
+            'osoba2_id': candidate.person2_id,
+            'ocena': candidate.score,
+            'skladowe': candidate.components
+        }
+
+
+def cmd_merge(db_manager, calculator, args) -> Iterable[dict]:
+    """Scala duplikat z osobą zachowywaną"""
+    _require_person(db_manager, args.keep_id)
+    _require_person(db_manager, args.remove_id)
+    yield {
+        'zachowana_id': args.keep_id,
+        'usunieta_id': args.remove_id,
+        'przepiete_relacje': db_manager.merge_persons(args.keep_id, args.remove_id)
+    }
+
+
+def cmd_stats(db_manager, calculator, args) -> Iterable[dict]:
+    """Wypisuje statystyki bazy"""
+    yield db_manager.get_statistics()
+
+
+def cmd_surnames(db_manager, calculator, args) -> Iterable[dict]:
+    """Wypisuje najczęstsze nazwiska"""
+    yield from db_manager.get_surname_frequency(args.limit or None)
+
+
+def cmd_migrations(db_manager, calculator, args) -> Iterable[dict]:
+    """Wypisuje liczbę osób wg miejsca urodzenia i miejsca śmierci"""
+    yield from db_manager.get_migrations(args.limit or None, include_same=args.include_same)
+
+
+def cmd_decades(db_manager, calculator, args) -> Iterable[dict]:
+    """Wypisuje liczbę urodzeń w kolejnych dekadach"""
+    yield from db_manager.get_birth_decades()
+
+
+def cmd_places(db_manager, calculator, args) -> Iterable[dict]:
+    """Wypisuje miejsca pasujące do frazy albo liczności urodzeń i zgonów w miejscach"""
+    if args.counts:
+        yield from db_manager.get_place_counts(args.limit or None)
+    else:
+        yield from db_manager.find_places(args.query, args.limit or None)
+
+
+def cmd_place_alias(db_manager, calculator, args) -> Iterable[dict]:
+    """Dodaje wariant nazwy miejsca (scalając miejsce zapisane tym wariantem)"""
+    yield {
+        'miejsce_id': args.place_id,
+        'alias': args.alias,
+        'przepiete_osoby': db_manager.add_place_alias(args.place_id, args.alias)
+    }
+
+
+def cmd_place_coords(db_manager, calculator, args) -> Iterable[dict]:
+    """Ustawia współrzędne miejsc z lokalnego pliku CSV (nazwa, szerokość, długość)"""
+    with open(args.file, newline='', encoding='utf-8') as f:
+        for line, row in enumerate(csv.reader(f), start=1):
+            if len(row) < 3 or not row[0].strip():
+                continue
+            try:
+                latitude, longitude = float(row[1]), float(row[2])
+            except ValueError:
+                if line == 1:
+                    continue  # Wiersz nagłówka
+                raise ValueError(f"Błędne współrzędne w wierszu {line}: {row[1]}, {row[2]}")
+            place_id = db_manager.get_place_id(row[0])
+            if place_id is not None:
+                db_manager.update_place(place_id, szerokosc=latitude, dlugosc=longitude)
+            yield {'nazwa': row[0], 'miejsce_id': place_id}
+
+
+def cmd_search(db_manager, calculator, args) -> Iterable[dict]:
+    """Wyszukuje osoby po imieniu lub nazwisku"""
+    persons = db_manager.search_persons(args.query)
+    if args.limit:
+        persons = persons[:args.limit]
+    yield from persons
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Tworzy parser argumentów wiersza poleceń"""
+    parser = argparse.ArgumentParser(
+        prog='python -m src.cli',
+        description='Operacje na bazie Drzewa Genealogicznego (wynik: JSON lines)'
+    )
+    parser.add_argument('--db', action='append', default=[], metavar='PLIK',
+                        help='Plik bazy danych (można podać wielokrotnie)')
+    parser.add_argument('--db-dir', action='append', default=[], metavar='KATALOG',
+                        help='Katalog z plikami baz *.db (można podać wielokrotnie)')
+    parser.add_argument('--in-memory', action='store_true',
+                        help='Pracuj na kopii bazy w pamięci (zmiany są zapisywane po udanym poleceniu)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    sub = subparsers.add_parser('import', help='Importuj plik GEDCOM')
+    sub.add_argument('file', help='Plik GEDCOM')
+    sub.add_argument('--workers', type=int, default=None,
+                     help='Liczba procesów parsujących (domyślnie liczba procesorów)')
+    sub.set_defaults(handler=cmd_import)
+    
+    sub = subparsers.add_parser('sync', help='Synchronizuj z plikiem GEDCOM (bez dublowania osób)')
+    sub.add_argument('file', help='Plik GEDCOM')
+    sub.add_argument('--source', default=None,
+                     help='Nazwa źródła (domyślnie nazwa pliku)')
+    sub.add_argument('--delete', action='store_true',
+                     help='Usuń osoby i rodziny, których nie ma już w pliku')
+    sub.add_argument('--workers', type=int, default=None,
+                     help='Liczba procesów parsujących (domyślnie liczba procesorów)')
+    sub.set_defaults(handler=cmd_sync)
+    
+    sub = subparsers.add_parser('export', help='Eksportuj do pliku GEDCOM')
+    sub.add_argument('file', help='Plik GEDCOM')
+    sub.set_defaults(handler=cmd_export)
+    
+    sub = subparsers.add_parser('snapshot', help='Zapisz bazę jako binarną migawkę')
+    sub.add_argument('file', help='Plik migawki')
+    sub.add_argument('--compression', choices=('zlib', 'zstd', 'none'), default='zlib',
+                     help='Kompresja (zstd wymaga pakietu zstandard)')
+    sub.set_defaults(handler=cmd_snapshot)
+    
+    sub = subparsers.add_parser('restore', help='Odtwórz pustą bazę z binarnej migawki')
+    sub.add_argument('file', help='Plik migawki')
+    sub.set_defaults(handler=cmd_restore)
+    
+    for name, handler, help_text in (('ancestors', cmd_ancestors, 'Przodkowie osoby'),
+                                     ('descendants', cmd_descendants, 'Potomkowie osoby')):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('person_id', type=int, help='ID osoby')
+        sub.add_argument('--generations', type=int, default=10, help='Maksymalna liczba pokoleń')
+        sub.set_defaults(handler=handler)
+    
+    for name, handler, help_text in (('path', cmd_path, 'Ścieżka relacji między osobami'),
+                                     ('relate', cmd_relate, 'Stopień pokrewieństwa'),
+                                     ('kinship', cmd_kinship, 'Współczynnik pokrewieństwa')):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('person1_id', type=int, help='ID pierwszej osoby')
+        sub.add_argument('person2_id', type=int, help='ID drugiej osoby')
+        sub.set_defaults(handler=handler)
+    
+    sub = subparsers.add_parser('cycles', help='Relacje rodzicielskie tworzące cykl')
+    sub.set_defaults(handler=cmd_cycles)
+    
+    sub = subparsers.add_parser('validate', help='Sprawdź spójność danych')
+    sub.add_argument('--full', action='store_true',
+                     help='Sprawdź całą bazę (domyślnie tylko zmiany od poprzedniego sprawdzenia)')
+    sub.set_defaults(handler=cmd_validate)
+    
+    sub = subparsers.add_parser('duplicates', help='Prawdopodobne duplikaty osób')
+    sub.add_argument('--threshold', type=float, default=DuplicateFinder.DEFAULT_THRESHOLD,
+                     help='Najniższa ocena podobieństwa (0-1)')
+    sub.add_argument('--workers', type=int, default=None,
+                     help='Liczba procesów roboczych (domyślnie liczba procesorów)')
+    sub.set_defaults(handler=cmd_duplicates)
+    
+    sub = subparsers.add_parser('merge', help='Scal duplikat z osobą zachowywaną')
+    sub.add_argument('keep_id', type=int, help='ID osoby zachowywanej')
+    sub.add_argument('remove_id', type=int, help='ID duplikatu do usunięcia')
+    sub.set_defaults(handler=cmd_merge)
+    
+    sub = subparsers.add_parser('stats', help='Statystyki bazy')
+    sub.set_defaults(handler=cmd_stats)
+    
+    sub = subparsers.add_parser('surnames', help='Najczęstsze nazwiska')
+    sub.add_argument('--limit', type=int, default=0, help='Maksymalna liczba wyników')
+    sub.set_defaults(handler=cmd_surnames)
+    
+    sub = subparsers.add_parser('migrations', help='Osoby wg miejsca urodzenia i miejsca śmierci')
+    sub.add_argument('--limit', type=int, default=0, help='Maksymalna liczba wyników')
+    sub.add_argument('--include-same', action='store_true',
+                     help='Uwzględnij osoby zmarłe w miejscu urodzenia')
+    sub.set_defaults(handler=cmd_migrations)
+    
+    sub = subparsers.add_parser('decades', help='Liczba urodzeń w kolejnych dekadach')
+    sub.set_defaults(handler=cmd_decades)
+    
+    sub = subparsers.add_parser('places', help='Wyszukaj miejsca lub wypisz ich liczności')
+    sub.add_argument('query', nargs='?', default='', help='Początek nazwy miejsca lub wariantu')
+    sub.add_argument('--counts', action='store_true',
+                     help='Liczba urodzeń i zgonów w miejscach (zamiast wyszukiwania)')
+    sub.add_argument('--limit', type=int, default=0, help='Maksymalna liczba wyników')
+    sub.set_defaults(handler=cmd_places)
+    
+    sub = subparsers.add_parser('place-alias', help='Dodaj wariant nazwy miejsca')
+    sub.add_argument('place_id', type=int, help='ID miejsca')
+    sub.add_argument('alias', help='Wariant nazwy (np. W-wa)')
+    sub.set_defaults(handler=cmd_place_alias)
+    
+    sub = subparsers.add_parser('place-coords', help='Wczytaj współrzędne miejsc z pliku CSV')
+    sub.add_argument('file', help='Plik CSV: nazwa, szerokość, długość')
+    sub.set_defaults(handler=cmd_place_coords)
+    
+    sub = subparsers.add_parser('batch', help='Analiza wszystkich baz naraz w puli procesów')
+    sub.add_argument('analysis', choices=('stats', 'surnames', 'search'),
+                     help='Statystyki łączne, częstość nazwisk lub wyszukiwanie osób')
+    sub.add_argument('--query', default=None, help='Fraza wyszukiwania (dla search)')
+    sub.add_argument('--limit', type=int, default=0, help='Maksymalna liczba wyników')
+    sub.add_argument('--workers', type=int, default=None,
+                     help='Liczba procesów roboczych (domyślnie liczba procesorów)')
+    sub.set_defaults(handler=None)
+    
+    sub = subparsers.add_parser('search', help='Wyszukaj osoby')
+    sub.add_argument('query', help='Fraza (fragment imienia lub nazwiska)')
+    sub.add_argument('--limit', type=int, default=0, help='Maksymalna liczba wyników')
+    sub.set_defaults(handler=cmd_search)
+    
+    return parser
+
+
+def _write(record: dict, out):
+    """Wypisuje rekord jako jeden wiersz JSON"""
+    out.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+
+
+def run_batch(db_paths: List[str], args, out) -> int:
+    """
+    Wykonuje analizę wsadową: wynik połączony trafia na wyjście, a czas
+    i ewentualny błąd każdej bazy na stderr
+    
+    Returns:
+        Kod wyjścia
+    """
+    batch = BatchAnalytics(db_paths, workers=args.workers).run(
+        args.analysis, query=args.query, limit=args.limit)
+    
+    records = [batch.result] if isinstance(batch.result, dict) else batch.result
+    for record in records:
+        _write(record, out)
+    out.flush()
+    for report in batch.files:
+        record = {'db': report.path, 'czas_s': round(report.seconds, 4)}
+        if report.error is not None:
+            record['blad'] = report.error
+        _write(record, sys.stderr)
+    return EXIT_ERROR if batch.errors else EXIT_OK
+
+
+def main(argv: Optional[List[str]] = None, out=None) -> int:
+    """
+    Punkt wejścia CLI
+    
+    Args:
+        argv: Argumenty (domyślnie sys.argv[1:])
+        out: Strumień wyjściowy (domyślnie sys.stdout)
+    
+    Returns:
+        Kod wyjścia
+    """
+    out = out or sys.stdout
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    db_paths = args.db + [path for directory in args.db_dir for path in find_databases(directory)]
+    if not db_paths:
+        parser.error('podaj bazę (--db) lub katalog z bazami (--db-dir)')
+    if args.command == 'batch':
+        if args.analysis == 'search' and not args.query:
+            parser.error('analiza search wymaga --query')
+        return run_batch(db_paths, args, out)
+    
+    tag_db = len(db_paths) > 1
+    exit_code = EXIT_OK
+    
+    for db_path in db_paths:
+        # Polecenia inne niż import, synchronizacja i odtworzenie z migawki
+        # nie powinny tworzyć nowych plików baz
+        if args.command not in ('import', 'sync', 'restore') and not os.path.exists(db_path):
+            _write({'db': db_path, 'blad': 'Plik bazy danych nie istnieje'}, sys.stderr)
+            exit_code = max(exit_code, EXIT_ERROR)
+            continue
+        
+        db_manager = None
+        try:
+            db_manager = DatabaseManager(db_path, in_memory=args.in_memory)
+            calculator = RelationshipCalculator(db_manager)
+            for record in args.handler(db_manager, calculator, args):
+                _write({'db': db_path, **record} if tag_db else record, out)
+            if db_manager.has_unsaved_changes():
+                db_manager.save()
+        except CommandError as e:
+            _write({'db': db_path, 'blad': str(e)}, sys.stderr)
+            exit_code = max(exit_code, e.exit_code)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            # Uszkodzony lub niedostępny plik nie przerywa pracy na pozostałych bazach
+            _write({'db': db_path, 'blad': str(e)}, sys.stderr)
+            exit_code = max(exit_code, EXIT_ERROR)
+        finally:
+            if db_manager is not None:
+                db_manager.close()
+        out.flush()
+    
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
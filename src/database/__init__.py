@@ -3,5 +3,17 @@ Moduł zarządzania bazą danych
 """
 
 from .db_manager import DatabaseManager
+from .change_journal import ChangeJournal
+from .query_cache import QueryCache
+from .photo_store import PhotoStore
+from .lifespan_tree import LifespanTree
+from .ancestry import AncestryClosure
+from .validator import DataValidator, Finding
+from .gedcom_sync import GedcomSyncIndex
+from .statistics import StatisticsAggregates
+from .places import PlaceRegistry, place_key
+from .reader import DatabaseReader
 
-__all__ = ['DatabaseManager']
+__all__ = ['DatabaseManager', 'ChangeJournal', 'QueryCache', 'PhotoStore', 'LifespanTree',
+           'AncestryClosure', 'DataValidator', 'Finding', 'GedcomSyncIndex',
+           'StatisticsAggregates', 'PlaceRegistry', 'place_key', 'DatabaseReader']
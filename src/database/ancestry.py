@@ -0,0 +1,418 @@
+"""
+AncestryClosure - Tabela domknięcia przodków i numery pokoleń
+"""
+
+import sqlite3
+from collections import defaultdict
+from typing import Iterable, List, Optional, Tuple
+
+
+class AncestryClosure:
+    """
+    Utrzymuje tabelę domknięcia (przodek, potomek, głębokość) i pokolenia osób
+    
+    Każda para osób połączona linią prostą ma jeden wiersz z najmniejszą
+    liczbą pokoleń między nimi, więc pytania "czy X jest przodkiem Y" oraz
+    pobranie wszystkich przodków lub potomków to pojedyncze zapytania po
+    indeksie. Tabela pokolenia przechowuje długość najdłuższego łańcucha
+    przodków każdej osoby (brak wiersza oznacza 0 - osobę bez rodziców),
+    dzięki czemu dziecko jest zawsze pokolenie niżej niż każde z rodziców.
+    Pokolenie jest daną wyliczaną, więc nie trafia do kolumn osoby ani do
+    dziennika zmian.
+    
+    Metody zmieniające dane nie zatwierdzają transakcji - są wywoływane
+    przez DatabaseManager w tej samej transakcji co zmiana relacji.
+    """
+    
+    TABLE = 'przodkowie'
+    GENERATIONS_TABLE = 'pokolenia'
+    EDGES_VIEW = 'krawedzie_rodzicielskie'
+    
+    DESCENDANT_INDEX_SQL = f'''
+        CREATE INDEX IF NOT EXISTS idx_przodkowie_potomek
+        ON {TABLE} (potomek_id, glebokosc)
+    '''
+    
+    # Kolumny relacji (rodzic, dziecko, rodzaj) dla obu zapisów krawędzi
+    PARENT_COLUMNS = (('osoba1_id', 'osoba2_id', 'rodzic'),
+                      ('osoba2_id', 'osoba1_id', 'dziecko'))
+    
+    # Ograniczenie głębokości chroni przed pętlą przy błędnych danych z cyklem
+    MAX_DEPTH = 500
+    
+    def __init__(self, connection: sqlite3.Connection):
+        """
+        Inicjalizacja tabeli domknięcia
+        
+        Args:
+            connection: Połączenie z bazą danych SQLite
+        """
+        self.connection = connection
+        if self.create_schema():
+            self.rebuild()
+            self.connection.commit()
+    
+    def create_schema(self) -> bool:
+        """
+        Tworzy tabele domknięcia i pokoleń oraz widok krawędzi rodzic-dziecko
+        
+        Returns:
+            True jeśli tabela została utworzona (wymaga wypełnienia)
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN (?, ?)",
+                       (self.TABLE, self.GENERATIONS_TABLE))
+        created = cursor.fetchone()[0] < 2
+        
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                przodek_id INTEGER NOT NULL,
+                potomek_id INTEGER NOT NULL,
+                glebokosc INTEGER NOT NULL,
+                PRIMARY KEY (przodek_id, potomek_id)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute(self.DESCENDANT_INDEX_SQL)
+        
+        # Relacja 'rodzic': osoba1 jest rodzicem osoby2, 'dziecko' - odwrotnie
+        cursor.execute(f'''
+            CREATE VIEW IF NOT EXISTS {self.EDGES_VIEW} AS
+            SELECT osoba1_id AS rodzic_id, osoba2_id AS dziecko_id
+            FROM relacje WHERE rodzaj_relacji = 'rodzic'
+            UNION
+            SELECT osoba2_id, osoba1_id
+            FROM relacje WHERE rodzaj_relacji = 'dziecko'
+        ''')
+        
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {self.GENERATIONS_TABLE} (
+                osoba_id INTEGER PRIMARY KEY,
+                pokolenie INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute(f'''
+            CREATE INDEX IF NOT EXISTS idx_pokolenia_pokolenie
+            ON {self.GENERATIONS_TABLE} (pokolenie)
+        ''')
+        
+        cursor.execute('CREATE TEMP TABLE IF NOT EXISTS poddrzewo (id INTEGER PRIMARY KEY)')
+        # Czoło przeszukiwania poziomami w _recompute_subtree
+        for name in ('czolo', 'czolo_nowe'):
+            cursor.execute(f'''
+                CREATE TEMP TABLE IF NOT EXISTS {name} (
+                    przodek_id INTEGER NOT NULL,
+                    potomek_id INTEGER NOT NULL,
+                    PRIMARY KEY (przodek_id, potomek_id)
+                ) WITHOUT ROWID
+            ''')
+        
+        self.connection.commit()
+        return created
+    
+    @staticmethod
+    def edge(osoba1_id: int, osoba2_id: int, rodzaj_relacji: str) -> Optional[Tuple[int, int]]:
+        """
+        Zwraca krawędź (rodzic, dziecko) odpowiadającą relacji
+        
+        Returns:
+            Krotka (rodzic_id, dziecko_id) lub None dla relacji innej niż rodzicielska
+        """
+        if rodzaj_relacji == 'rodzic':
+            return osoba1_id, osoba2_id
+        if rodzaj_relacji == 'dziecko':
+            return osoba2_id, osoba1_id
+        return None
+    
+    def rebuild(self):
+        """Wylicza całą tabelę domknięcia i pokolenia od nowa"""
+        cursor = self.connection.cursor()
+        cursor.execute('DELETE FROM poddrzewo')
+        cursor.execute('INSERT INTO poddrzewo (id) SELECT id FROM osoby')
+        cursor.execute(f'DELETE FROM {self.TABLE}')
+        # Indeks budowany raz po wypełnieniu jest tańszy niż aktualizowany przy każdym wierszu
+        cursor.execute('DROP INDEX IF EXISTS idx_przodkowie_potomek')
+        self._fill_closure(cursor)
+        cursor.execute(self.DESCENDANT_INDEX_SQL)
+        self._update_generations(cursor)
+    
+    def add_edge(self, parent_id: int, child_id: int):
+        """
+        Uwzględnia nową krawędź rodzic -> dziecko
+        
+        Każdy przodek rodzica (i sam rodzic) staje się przodkiem każdego
+        potomka dziecka (i samego dziecka). Dla par już obecnych w tabeli
+        zachowywana jest mniejsza głębokość.
+        
+        Args:
+            parent_id: ID rodzica
+            child_id: ID dziecka
+        """
+        cursor = self.connection.cursor()
+        cursor.execute(f'''
+            INSERT INTO {self.TABLE} (przodek_id, potomek_id, glebokosc)
+            SELECT a.przodek_id, d.potomek_id, a.glebokosc + 1 + d.glebokosc
+            FROM (SELECT ? AS przodek_id, 0 AS glebokosc
+                  UNION ALL
+                  SELECT przodek_id, glebokosc FROM {self.TABLE} WHERE potomek_id = ?) a,
+                 (SELECT ? AS potomek_id, 0 AS glebokosc
+                  UNION ALL
+                  SELECT potomek_id, glebokosc FROM {self.TABLE} WHERE przodek_id = ?) d
+            WHERE a.przodek_id != d.potomek_id
+            ON CONFLICT (przodek_id, potomek_id)
+            DO UPDATE SET glebokosc = MIN(glebokosc, excluded.glebokosc)
+        ''', (parent_id, parent_id, child_id, child_id))
+        
+        self._select_subtree(cursor, child_id)
+        self._update_generations(cursor)
+    
+    def remove_edge(self, child_id: int):
+        """
+        Uwzględnia usunięcie krawędzi prowadzącej do dziecka
+        
+        Wywoływana po usunięciu relacji. Przodkowie dziecka i jego potomków
+        są wyliczani od nowa, bo ta sama para może być połączona inną drogą.
+        
+        Args:
+            child_id: ID dziecka
+        """
+        cursor = self.connection.cursor()
+        self._select_subtree(cursor, child_id)
+        self._recompute_subtree(cursor)
+    
+    def remove_person(self, person_id: int):
+        """
+        Uwzględnia usunięcie osoby (wywoływana po usunięciu jej relacji)
+        
+        Args:
+            person_id: ID usuniętej osoby
+        """
+        cursor = self.connection.cursor()
+        self._select_subtree(cursor, person_id)
+        cursor.execute('DELETE FROM poddrzewo WHERE id = ?', (person_id,))
+        cursor.execute(f'DELETE FROM {self.TABLE} WHERE przodek_id = ? OR potomek_id = ?',
+                       (person_id, person_id))
+        cursor.execute(f'DELETE FROM {self.GENERATIONS_TABLE} WHERE osoba_id = ?', (person_id,))
+        self._recompute_subtree(cursor)
+    
+    def _select_subtree(self, cursor: sqlite3.Cursor, person_id: int):
+        """Wypełnia tabelę tymczasową poddrzewo osobą i jej potomkami"""
+        cursor.execute('DELETE FROM poddrzewo')
+        cursor.execute(f'''
+            INSERT INTO poddrzewo (id)
+            SELECT ? UNION SELECT potomek_id FROM {self.TABLE} WHERE przodek_id = ?
+        ''', (person_id, person_id))
+    
+    def _recompute_subtree(self, cursor: sqlite3.Cursor):
+        """Wylicza od nowa przodków i pokolenia osób z tabeli poddrzewo"""
+        cursor.execute(f'''
+            DELETE FROM {self.TABLE}
+            WHERE potomek_id IN (SELECT id FROM poddrzewo)
+        ''')
+        self._fill_closure(cursor)
+        self._update_generations(cursor)
+    
+    def _fill_closure(self, cursor: sqlite3.Cursor):
+        """
+        Dopisuje do tabeli domknięcia przodków osób z tabeli poddrzewo
+        
+        Przodkowie są dopisywani poziomami: rodzice par odkrytych na
+        głębokości d dają pary na głębokości d + 1. Para trafia do tabeli
+        przy pierwszym odkryciu, czyli z najmniejszą głębokością, a dalej
+        rozwijane są tylko nowe pary - w odróżnieniu od rekurencyjnego CTE
+        nie są przeglądane wszystkie ścieżki między przodkiem a potomkiem.
+        """
+        # Tabele czoła zamieniają się rolami co poziom (bez kopiowania wierszy)
+        frontier, expanded = 'czolo', 'czolo_nowe'
+        cursor.execute(f'DELETE FROM {frontier}')
+        cursor.execute(f'''
+            INSERT OR IGNORE INTO {frontier} (przodek_id, potomek_id)
+            SELECT rodzic_id, dziecko_id FROM {self.EDGES_VIEW}
+            WHERE dziecko_id IN (SELECT id FROM poddrzewo) AND rodzic_id != dziecko_id
+        ''')
+        
+        depth = 1
+        while True:
+            cursor.execute(f'''
+                INSERT OR IGNORE INTO {self.TABLE} (przodek_id, potomek_id, glebokosc)
+                SELECT przodek_id, potomek_id, ? FROM {frontier}
+            ''', (depth,))
+            if depth >= self.MAX_DEPTH:
+                break
+            
+            # Rodzice przodków z poprzedniego poziomu, bez par już obecnych w tabeli
+            cursor.execute(f'DELETE FROM {expanded}')
+            found = 0
+            for parent_column, child_column, kind in self.PARENT_COLUMNS:
+                cursor.execute(f'''
+                    INSERT OR IGNORE INTO {expanded} (przodek_id, potomek_id)
+                    SELECT r.{parent_column}, c.potomek_id FROM {frontier} c
+                    JOIN relacje r ON r.{child_column} = c.przodek_id AND r.rodzaj_relacji = ?
+                    WHERE r.{parent_column} != c.potomek_id
+                    AND NOT EXISTS (SELECT 1 FROM {self.TABLE} p
+                                    WHERE p.przodek_id = r.{parent_column}
+                                    AND p.potomek_id = c.potomek_id)
+                ''', (kind,))
+                found += cursor.rowcount
+            if not found:
+                break
+            frontier, expanded = expanded, frontier
+            depth += 1
+    
+    def _update_generations(self, cursor: sqlite3.Cursor):
+        """
+        Wylicza pokolenia osób z tabeli poddrzewo
+        
+        Rodzic ma ściśle mniej przodków niż jego dziecko, więc kolejność wg
+        liczby przodków jest porządkiem topologicznym. Pokolenia rodziców
+        spoza poddrzewa nie zmieniają się i są odczytywane z bazy.
+        """
+        cursor.execute(f'''
+            SELECT s.id, COALESCE(g.pokolenie, 0) FROM poddrzewo s
+            LEFT JOIN {self.GENERATIONS_TABLE} g ON g.osoba_id = s.id
+            ORDER BY (SELECT COUNT(*) FROM {self.TABLE} WHERE potomek_id = s.id)
+        ''')
+        order = cursor.fetchall()
+        
+        cursor.execute(f'''
+            SELECT k.dziecko_id, k.rodzic_id, COALESCE(g.pokolenie, 0)
+            FROM {self.EDGES_VIEW} k
+            JOIN poddrzewo s ON s.id = k.dziecko_id
+            LEFT JOIN {self.GENERATIONS_TABLE} g ON g.osoba_id = k.rodzic_id
+        ''')
+        parents = defaultdict(list)
+        for child_id, parent_id, parent_generation in cursor.fetchall():
+            parents[child_id].append((parent_id, parent_generation))
+        
+        generations = {}
+        changed = []
+        for person_id, stored in order:
+            generation = max((generations.get(parent_id, parent_generation) + 1
+                              for parent_id, parent_generation in parents[person_id]),
+                             default=0)
+            generations[person_id] = generation
+            if generation != stored:
+                changed.append((person_id, generation))
+        
+        cursor.executemany(f'''
+            INSERT OR REPLACE INTO {self.GENERATIONS_TABLE} (osoba_id, pokolenie)
+            VALUES (?, ?)
+        ''', changed)
+    
+    def pedigree_edges(self, person_ids: Iterable[int]) -> List[Tuple[int, int]]:
+        """
+        Zwraca krawędzie rodowodu osób - do nich i do wszystkich ich przodków
+        
+        Args:
+            person_ids: ID osób, których rodowód jest pobierany
+        
+        Returns:
+            Lista krotek (rodzic_id, dziecko_id)
+        """
+        person_ids = list(person_ids)
+        placeholders = ', '.join('?' for _ in person_ids)
+        cursor = self.connection.cursor()
+        cursor.execute(f'''
+            WITH rodowod (id) AS (
+                SELECT id FROM osoby WHERE id IN ({placeholders})
+                UNION
+                SELECT przodek_id FROM {self.TABLE} WHERE potomek_id IN ({placeholders})
+            )
+            SELECT r.osoba1_id, r.osoba2_id FROM rodowod
+            JOIN relacje r ON r.osoba2_id = rodowod.id AND r.rodzaj_relacji = 'rodzic'
+            UNION
+            SELECT r.osoba2_id, r.osoba1_id FROM rodowod
+            JOIN relacje r ON r.osoba1_id = rodowod.id AND r.rodzaj_relacji = 'dziecko'
+        ''', person_ids + person_ids)
+        return [tuple(row) for row in cursor.fetchall()]
+    
+    def cycle_edges(self) -> List[Tuple[int, int]]:
+        """
+        Zwraca krawędzie rodzic -> dziecko leżące na cyklach
+        
+        Krawędź zamyka cykl, gdy dziecko jest jednocześnie przodkiem swojego
+        rodzica (lub osoba jest wpisana jako własny rodzic).
+        
+        Returns:
+            Lista krotek (rodzic_id, dziecko_id)
+        """
+        cursor = self.connection.cursor()
+        cursor.execute(f'''
+            SELECT k.rodzic_id, k.dziecko_id FROM {self.EDGES_VIEW} k
+            WHERE k.rodzic_id = k.dziecko_id
+            OR EXISTS (SELECT 1 FROM {self.TABLE} p
+                       WHERE p.przodek_id = k.dziecko_id AND p.potomek_id = k.rodzic_id)
+            ORDER BY k.dziecko_id, k.rodzic_id
+        ''')
+        return [tuple(row) for row in cursor.fetchall()]
+    
+    def generations(self) -> dict:
+        """
+        Zwraca pokolenia osób
+        
+        Returns:
+            Słownik ID osoby -> pokolenie (osoby bez wpisu mają pokolenie 0)
+        """
+        cursor = self.connection.cursor()
+        cursor.execute(f'SELECT osoba_id, pokolenie FROM {self.GENERATIONS_TABLE} WHERE pokolenie > 0')
+        return dict(cursor.fetchall())
+    
+    def depth(self, ancestor_id: int, descendant_id: int) -> Optional[int]:
+        """
+        Zwraca liczbę pokoleń między przodkiem a potomkiem
+        
+        Args:
+            ancestor_id: ID przodka
+            descendant_id: ID potomka
+        
+        Returns:
+            Najmniejsza liczba pokoleń lub None jeśli osoby nie są w linii prostej
+        """
+        cursor = self.connection.cursor()
+        cursor.execute(f'''
+            SELECT glebokosc FROM {self.TABLE}
+            WHERE przodek_id = ? AND potomek_id = ?
+        ''', (ancestor_id, descendant_id))
+        row = cursor.fetchone()
+        return row[0] if row else None
+    
+    def ancestors(self, person_id: int, max_depth: Optional[int] = None) -> List[Tuple[dict, int]]:
+        """
+        Pobiera przodków osoby
+        
+        Args:
+            person_id: ID osoby
+            max_depth: Maksymalna liczba pokoleń (None = bez ograniczenia)
+        
+        Returns:
+            Lista krotek (osoba, pokolenie) uporządkowana od najbliższych
+        """
+        return self._related(person_id, 'potomek_id', 'przodek_id', max_depth)
+    
+    def descendants(self, person_id: int, max_depth: Optional[int] = None) -> List[Tuple[dict, int]]:
+        """
+        Pobiera potomków osoby
+        
+        Args:
+            person_id: ID osoby
+            max_depth: Maksymalna liczba pokoleń (None = bez ograniczenia)
+        
+        Returns:
+            Lista krotek (osoba, pokolenie) uporządkowana od najbliższych
+        """
+        return self._related(person_id, 'przodek_id', 'potomek_id', max_depth)
+    
+    def _related(self, person_id: int, key: str, other: str,
+                 max_depth: Optional[int]) -> List[Tuple[dict, int]]:
+        """Pobiera osoby połączone z daną osobą w linii prostej"""
+        cursor = self.connection.cursor()
+        cursor.execute(f'''
+            SELECT o.*, p.glebokosc AS glebokosc_linii FROM {self.TABLE} p
+            JOIN osoby o ON o.id = p.{other}
+            WHERE p.{key} = ? AND p.glebokosc <= ?
+            ORDER BY p.glebokosc, o.id
+        ''', (person_id, self.MAX_DEPTH if max_depth is None else max_depth))
+        result = []
+        for row in cursor.fetchall():
+            person = dict(row)
+            result.append((person, person.pop('glebokosc_linii')))
+        return result
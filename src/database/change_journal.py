@@ -0,0 +1,272 @@
+"""
+ChangeJournal - Dziennik zmian w tabelach osoby i relacje
+"""
+
+import sqlite3
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, List, Optional
+
+
+class ChangeJournal:
+    """Rejestruje zmiany w bazie danych i powiadamia obserwatorów"""
+    
+    TABLE = 'dziennik_zmian'
+    
+    # Wyzwalacze rejestrujące zmiany (zob. _create_triggers)
+    TRIGGERS = ('dziennik_osoby_insert', 'dziennik_osoby_update', 'dziennik_osoby_delete',
+                'dziennik_relacje_insert', 'dziennik_relacje_update', 'dziennik_relacje_delete',
+                'dziennik_relacje_update_old')
+    
+    # Liczba zmian przekazywanych obserwatorom w jednym wywołaniu (duże
+    # operacje, np. odtworzenie z migawki, nie są wczytywane do pamięci naraz)
+    NOTIFY_BATCH = 1000
+    
+    # Liczba najnowszych wpisów zachowywanych przez prune_consumed niezależnie
+    # od odbiorców dawno nieodświeżanych (przy brakujących wpisach odbiorca
+    # przelicza swój stan od nowa)
+    MAX_ENTRIES = 100000
+    
+    def __init__(self, connection: sqlite3.Connection):
+        """
+        Inicjalizacja dziennika zmian
+        
+        Args:
+            connection: Połączenie z bazą danych SQLite
+        """
+        self.connection = connection
+        self.observers: List[Callable[[Optional[List[dict]]], None]] = []
+        self.create_schema()
+        self.last_notified_sequence = self.get_last_sequence()
+    
+    def create_schema(self):
+        """Tworzy tabelę dziennika i wyzwalacze rejestrujące zmiany"""
+        cursor = self.connection.cursor()
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                tabela TEXT NOT NULL,
+                operacja TEXT NOT NULL,
+                rekord_id INTEGER NOT NULL,
+                osoba1_id INTEGER,
+                osoba2_id INTEGER,
+                czas TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        self._create_triggers(cursor)
+        self.connection.commit()
+    
+    def _create_triggers(self, cursor: sqlite3.Cursor):
+        """Tworzy wyzwalacze zapisujące zmiany osób i relacji w dzienniku"""
+        # Wyzwalacze rejestrują również zmiany wykonane poza DatabaseManager
+        # (np. przez inny proces), więc dziennik jest kompletny
+        for operation, row in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')):
+            suffix = operation.lower()
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS dziennik_osoby_{suffix}
+                AFTER {operation} ON osoby
+                BEGIN
+                    INSERT INTO {self.TABLE} (tabela, operacja, rekord_id)
+                    VALUES ('osoby', '{operation}', {row}.id);
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS dziennik_relacje_{suffix}
+                AFTER {operation} ON relacje
+                BEGIN
+                    INSERT INTO {self.TABLE} (tabela, operacja, rekord_id, osoba1_id, osoba2_id)
+                    VALUES ('relacje', '{operation}', {row}.id, {row}.osoba1_id, {row}.osoba2_id);
+                END
+            ''')
+        
+        # Zmiana końców relacji dotyczy również poprzednich osób
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS dziennik_relacje_update_old
+            AFTER UPDATE OF osoba1_id, osoba2_id ON relacje
+            WHEN OLD.osoba1_id != NEW.osoba1_id OR OLD.osoba2_id != NEW.osoba2_id
+            BEGIN
+                INSERT INTO {self.TABLE} (tabela, operacja, rekord_id, osoba1_id, osoba2_id)
+                VALUES ('relacje', 'UPDATE', OLD.id, OLD.osoba1_id, OLD.osoba2_id);
+            END
+        ''')
+    
+    @contextmanager
+    def suspended(self) -> Iterator[None]:
+        """
+        Wstrzymuje rejestrowanie zmian na czas operacji zbiorczej
+        
+        Wyzwalacze dziennika są usuwane w otwartej transakcji, więc inne
+        połączenia nie mogą w tym czasie zapisywać zmian, a wycofanie
+        transakcji po błędzie przywraca wyzwalacze. Po operacji licznik
+        dziennika przesuwa się o jeden wpis, a wcześniejsze wpisy są usuwane:
+        odbiorcy widzą lukę (jak po prune) i przeliczają swój stan od nowa,
+        zamiast przetwarzać wpis dla każdego wiersza.
+        """
+        if not self.connection.in_transaction:
+            self.connection.execute('BEGIN')
+        for trigger in self.TRIGGERS:
+            self.connection.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        yield
+        
+        cursor = self.connection.cursor()
+        self._create_triggers(cursor)
+        # Wpis-znacznik przesuwa licznik AUTOINCREMENT i jest usuwany razem z wcześniejszymi
+        cursor.execute(f'''
+            INSERT INTO {self.TABLE} (tabela, operacja, rekord_id)
+            VALUES ('osoby', 'INSERT', 0)
+        ''')
+        cursor.execute(f'DELETE FROM {self.TABLE} WHERE seq <= ?', (cursor.lastrowid,))
+    
+    def get_last_sequence(self) -> int:
+        """
+        Zwraca numer ostatniej zarejestrowanej zmiany
+        
+        Numer jest odczytywany z licznika AUTOINCREMENT, więc pozostaje ten
+        sam po usunięciu wpisów przez prune.
+        
+        Returns:
+            Numer sekwencyjny (0 jeśli nie zarejestrowano żadnej zmiany)
+        """
+        row = self.connection.execute('SELECT seq FROM sqlite_sequence WHERE name = ?',
+                                      (self.TABLE,)).fetchone()
+        return row[0] if row else 0
+    
+    def is_complete_since(self, sequence: int) -> bool:
+        """
+        Sprawdza, czy dziennik zawiera wszystkie zmiany po danym numerze
+        
+        Args:
+            sequence: Ostatni przetworzony numer sekwencyjny
+        
+        Returns:
+            False, jeśli część zmian została usunięta przez prune
+        """
+        row = self.connection.execute(f'SELECT MIN(seq) FROM {self.TABLE}').fetchone()
+        if row[0] is None:
+            return sequence >= self.get_last_sequence()
+        return row[0] <= sequence + 1
+    
+    def has_changes_since(self, sequence: int, table: str) -> bool:
+        """
+        Sprawdza, czy po danym numerze zmieniono wiersze tabeli
+        
+        Args:
+            sequence: Ostatni znany numer sekwencyjny
+            table: Nazwa tabeli ('osoby' lub 'relacje')
+        
+        Returns:
+            True również wtedy, gdy część zmian została usunięta przez prune
+        """
+        if not self.is_complete_since(sequence):
+            return True
+        row = self.connection.execute(f'''
+            SELECT EXISTS (SELECT 1 FROM {self.TABLE} WHERE seq > ? AND tabela = ?)
+        ''', (sequence, table)).fetchone()
+        return bool(row[0])
+    
+    def get_changes_since(self, sequence: int, limit: int = None) -> List[dict]:
+        """
+        Pobiera zmiany zarejestrowane po danym numerze sekwencyjnym
+        
+        Args:
+            sequence: Ostatni znany numer sekwencyjny
+            limit: Maksymalna liczba zmian (None = wszystkie)
+        
+        Returns:
+            Lista słowników ze zmianami w kolejności wykonania
+        """
+        query = f'''
+            SELECT seq, tabela, operacja, rekord_id, osoba1_id, osoba2_id, czas
+            FROM {self.TABLE}
+            WHERE seq > ?
+            ORDER BY seq
+        '''
+        params = [sequence]
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        
+        cursor = self.connection.execute(query, params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def subscribe(self, callback: Callable[[List[dict]], None]):
+        """
+        Rejestruje obserwatora zmian
+        
+        Args:
+            callback: Funkcja wywoływana z listą nowych zmian po zatwierdzeniu
+                      transakcji albo z None, gdy części zmian brakuje w dzienniku
+                      (usunęło je inne połączenie) i obserwator powinien odrzucić
+                      cały zapamiętany stan
+        """
+        if callback not in self.observers:
+            self.observers.append(callback)
+    
+    def unsubscribe(self, callback: Callable[[List[dict]], None]):
+        """
+        Wyrejestrowuje obserwatora zmian
+        
+        Args:
+            callback: Wcześniej zarejestrowana funkcja
+        """
+        if callback in self.observers:
+            self.observers.remove(callback)
+    
+    def notify(self):
+        """
+        Przekazuje obserwatorom zmiany zarejestrowane od ostatniego powiadomienia
+        
+        Zmiany są przekazywane porcjami po NOTIFY_BATCH wpisów.
+        """
+        if not self.observers:
+            self.last_notified_sequence = self.get_last_sequence()
+            return
+        
+        if not self.is_complete_since(self.last_notified_sequence):
+            self.last_notified_sequence = self.get_last_sequence()
+            for callback in list(self.observers):
+                callback(None)
+            return
+        
+        while True:
+            changes = self.get_changes_since(self.last_notified_sequence, self.NOTIFY_BATCH)
+            if not changes:
+                return
+            
+            self.last_notified_sequence = changes[-1]['seq']
+            for callback in list(self.observers):
+                callback(changes)
+    
+    def prune(self, up_to_sequence: int) -> int:
+        """
+        Usuwa z dziennika zmiany, które zostały już przetworzone
+        
+        Args:
+            up_to_sequence: Numer sekwencyjny, do którego (włącznie) usunąć wpisy
+        
+        Returns:
+            Liczba usuniętych wpisów
+        """
+        cursor = self.connection.execute(f'DELETE FROM {self.TABLE} WHERE seq <= ?',
+                                         (up_to_sequence,))
+        self.connection.commit()
+        return cursor.rowcount
+    
+    def prune_consumed(self, sequences: Iterable[Optional[int]]) -> int:
+        """
+        Usuwa zmiany przetworzone przez obserwatorów i pozostałych odbiorców
+        
+        Wpisy starsze niż MAX_ENTRIES najnowszych są usuwane zawsze.
+        
+        Args:
+            sequences: Ostatnie numery przetworzone przez odbiorców czytających
+                       dziennik zapytaniami (None - odbiorca bez stanu, który
+                       i tak przeliczy go od nowa)
+        
+        Returns:
+            Liczba usuniętych wpisów
+        """
+        consumed = [self.last_notified_sequence]
+        consumed.extend(sequence for sequence in sequences if sequence is not None)
+        return self.prune(max(min(consumed), self.get_last_sequence() - self.MAX_ENTRIES))
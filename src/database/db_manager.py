@@ -2,32 +2,116 @@
 DatabaseManager - Zarządza połączeniem z bazą danych i operacjami CRUD
 """
 
+import os
 import sqlite3
-from typing import List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 
+from .ancestry import AncestryClosure
+from .change_journal import ChangeJournal
+from .gedcom_sync import GedcomSyncIndex
+from .lifespan_tree import LifespanTree
+from .photo_store import PhotoStore
+from .places import PlaceRegistry
+from .query_cache import QueryCache
+from .reader import read_persons_matching, read_statistics
+from .statistics import StatisticsAggregates
+from .validator import DataValidator, Finding
+from ..utils.dates import date_fields
+from ..utils.gedcom_parser import family_relations
+from ..utils.hashing import record_hash
+from ..utils.profiler import profiled, profiler
+
+
+# Górna granica zakresu tekstów zaczynających się od danego prefiksu
+_PREFIX_RANGE_END = '\U0010ffff'
+
 
 class DatabaseManager:
     """Zarządza połączeniem z bazą danych SQLite i operacjami CRUD"""
     
-    def __init__(self, db_path: str):
+    # Wiek rodzica w chwili narodzin dziecka uznawany za prawdopodobny
+    PARENT_MIN_AGE = 12
+    PARENT_MAX_AGE = 70
+    
+    # Kolumny pomocnicze dat wyliczane przy zapisie: klucz sortowania RRRRMMDD,
+    # dokładność i kwalifikator (zob. utils.dates)
+    BIRTH_DATE_COLUMNS = ('urodzenie_klucz', 'urodzenie_dokladnosc', 'urodzenie_kwalifikator')
+    DEATH_DATE_COLUMNS = ('smierc_klucz', 'smierc_dokladnosc', 'smierc_kwalifikator')
+    DATE_COLUMNS = BIRTH_DATE_COLUMNS + DEATH_DATE_COLUMNS
+    
+    # Klucze obce miejsc urodzenia i śmierci (tabela miejsc, zob. PlaceRegistry)
+    # wyznaczane przy zapisie z kolumn miejsce_urodzenia i miejsce_smierci
+    PLACE_COLUMNS = ('miejsce_urodzenia_id', 'miejsce_smierci_id')
+    
+    # Powyżej tej liczby relacji rodzicielskich dodawanych naraz tabela
+    # domknięcia przodków jest wyliczana od nowa zamiast krawędź po krawędzi
+    ANCESTRY_REBUILD_THRESHOLD = 500
+    
+    def __init__(self, db_path: str, cache_size: int = 1024, photos_dir: Optional[str] = None,
+                 in_memory: bool = False):
         """
         Inicjalizacja managera bazy danych
         
         Args:
             db_path: Ścieżka do pliku bazy danych SQLite
+            cache_size: Liczba wpisów pamięci podręcznej get_person/get_relations
+                        (0 wyłącza pamięć podręczną)
+            photos_dir: Katalog zdjęć (domyślnie "<nazwa bazy>.photos" obok
+                        pliku bazy, osobny dla każdej bazy)
+            in_memory: Czy pracować na kopii bazy w pamięci (zmiany trafiają
+                       do pliku dopiero po wywołaniu save)
         """
         self.db_path = db_path
+        self.in_memory = in_memory
         self.connection = None
         self.cursor = None
         self._connect()
         self._create_tables()
+        self.journal = ChangeJournal(self.connection)
+        self.cache = QueryCache(cache_size)
+        if self.cache.enabled:
+            self.journal.subscribe(self._invalidate_cache)
+        if photos_dir is None:
+            # Liczniki odwołań są osobne dla każdej bazy, więc wspólny katalog
+            # pozwoliłby jednej bazie usunąć zdjęcia używane przez inną
+            photos_dir = os.path.splitext(db_path)[0] + '.photos'
+        self.photos = PhotoStore(self.connection, photos_dir, self.journal)
+        self.lifespans = LifespanTree(self.connection)
+        self.ancestry = AncestryClosure(self.connection)
+        self.gedcom_sync = GedcomSyncIndex(self.connection)
+        self.validator = DataValidator(self.connection, self.journal,
+                                       self.PARENT_MIN_AGE, self.PARENT_MAX_AGE)
+        self.statistics = StatisticsAggregates(self.connection, self.journal)
+        # Stan kopii w pamięci w chwili wczytania lub zapisu: numer ostatniej
+        # zmiany osób i relacji w dzienniku oraz zatwierdzenie innych zmian
+        # użytkownika (miejsca, zdjęcia). Zapisy pamięci podręcznych
+        # (statystyki, walidacja) nie są zmianami do zapisania.
+        self._saved_sequence = self.journal.get_last_sequence()
+        self._unsaved_commit = False
     
     def _connect(self):
-        """Nawiązuje połączenie z bazą danych"""
-        self.connection = sqlite3.connect(self.db_path)
+        """
+        Nawiązuje połączenie z bazą danych
+        
+        W trybie in_memory zawartość pliku (wraz z indeksami, tabelami
+        pomocniczymi i wyzwalaczami) jest kopiowana przez API kopii zapasowej
+        SQLite do bazy ":memory:", a plik nie jest dalej używany; brak pliku
+        oznacza pustą bazę, a plik nie jest tworzony przed save.
+        """
+        if self.in_memory:
+            self.connection = sqlite3.connect(':memory:')
+            if os.path.exists(self.db_path):
+                source = sqlite3.connect(self.db_path)
+                try:
+                    source.backup(self.connection)
+                finally:
+                    source.close()
+        else:
+            self.connection = sqlite3.connect(self.db_path)
         self.connection.row_factory = sqlite3.Row
         self.cursor = self.connection.cursor()
+        profiler.attach_connection(self.connection)
     
     def _create_tables(self):
         """Tworzy tabele w bazie danych jeśli nie istnieją"""
@@ -44,7 +128,15 @@ class DatabaseManager:
                 miejsce_urodzenia TEXT,
                 miejsce_smierci TEXT,
                 notatki TEXT,
-                zdjecie_sciezka TEXT
+                zdjecie_sciezka TEXT,
+                urodzenie_klucz INTEGER,
+                urodzenie_dokladnosc TEXT,
+                urodzenie_kwalifikator TEXT,
+                smierc_klucz INTEGER,
+                smierc_dokladnosc TEXT,
+                smierc_kwalifikator TEXT,
+                miejsce_urodzenia_id INTEGER REFERENCES miejsca (id),
+                miejsce_smierci_id INTEGER REFERENCES miejsca (id)
             )
         ''')
         
@@ -62,6 +154,9 @@ class DatabaseManager:
         
         self.connection.commit()
         
+        # Słownik miejsc, do którego odwołują się osoby
+        self.places = PlaceRegistry(self.connection)
+        
         # Migration: Add nazwisko_panienskie column if it doesn't exist
         self._migrate_database()
     
@@ -74,8 +169,94 @@ class DatabaseManager:
         if 'nazwisko_panienskie' not in columns:
             self.cursor.execute('ALTER TABLE osoby ADD COLUMN nazwisko_panienskie TEXT')
             self.connection.commit()
-
+        
+        # Kolumny pomocnicze dat - wypełnij dla istniejących osób
+        if 'urodzenie_klucz' not in columns:
+            for column in self.DATE_COLUMNS:
+                column_type = 'INTEGER' if column.endswith('_klucz') else 'TEXT'
+                self.cursor.execute(f'ALTER TABLE osoby ADD COLUMN {column} {column_type}')
+            self.cursor.execute('SELECT id, data_urodzenia, data_smierci FROM osoby')
+            rows = [self._date_values(birth, death)[2:] + (person_id,)
+                    for person_id, birth, death in self.cursor.fetchall()]
+            assignments = ', '.join(f'{column} = ?' for column in self.DATE_COLUMNS)
+            self.cursor.executemany(f'UPDATE osoby SET {assignments} WHERE id = ?', rows)
+            self.connection.commit()
+        
+        # Klucze obce miejsc - jedno miejsce dla nazw różniących się wielkością liter i spacjami
+        if 'miejsce_urodzenia_id' not in columns:
+            for column in self.PLACE_COLUMNS:
+                self.cursor.execute(f'ALTER TABLE osoby ADD COLUMN {column} INTEGER REFERENCES miejsca (id)')
+            self.places.link_persons()
+            self.connection.commit()
+        
+        self._create_indexes()
+    
+    def _create_indexes(self):
+        """Tworzy indeksy wspierające częste zapytania"""
+        # Wybór kandydatów na rodziców: strony wg nazwiska i imienia w obrębie
+        # płci oraz wyszukiwanie po początku imienia (indeks zawiera kolumny
+        # sortowania i filtra dat, więc pasujące osoby nie są odczytywane z tabeli)
+        for index in ('idx_osoby_plec_urodzenie', 'idx_osoby_plec_urodzenie_klucz'):
+            self.cursor.execute(f'DROP INDEX IF EXISTS {index}')
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_osoby_plec_nazwisko
+            ON osoby (plec, nazwisko COLLATE NOCASE, imie COLLATE NOCASE)
+        ''')
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_osoby_plec_imie
+            ON osoby (plec, imie COLLATE NOCASE, nazwisko COLLATE NOCASE, urodzenie_klucz)
+        ''')
+        # Porządkowanie i zapytania o zakres dat
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_osoby_urodzenie_klucz
+            ON osoby (urodzenie_klucz)
+        ''')
+        # Przeliczanie statystyk nazwisk i migracji (GROUP BY po indeksie)
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_osoby_nazwisko
+            ON osoby (nazwisko)
+        ''')
+        self.cursor.execute('DROP INDEX IF EXISTS idx_osoby_miejsca')
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_osoby_miejsca_id
+            ON osoby (miejsce_urodzenia_id, miejsce_smierci_id)
+        ''')
+        # Osoby urodzone lub zmarłe w miejscu i liczności miejsc
+        for column in self.PLACE_COLUMNS:
+            self.cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_osoby_{column} ON osoby ({column})')
+        # Relacje osoby i krawędzie rodzic-dziecko
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_relacje_osoba1
+            ON relacje (osoba1_id, rodzaj_relacji)
+        ''')
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_relacje_osoba2
+            ON relacje (osoba2_id, rodzaj_relacji)
+        ''')
+        self.connection.commit()
+    
+    @staticmethod
+    def _date_values(data_urodzenia, data_smierci) -> tuple:
+        """
+        Normalizuje daty osoby i wylicza ich kolumny pomocnicze
+        
+        Returns:
+            Krotka (data_urodzenia, data_smierci, *wartości DATE_COLUMNS)
+        """
+        birth_text, *birth_columns = date_fields(data_urodzenia)
+        death_text, *death_columns = date_fields(data_smierci)
+        return (birth_text, death_text, *birth_columns, *death_columns)
     
+    def _place_values(self, miejsce_urodzenia, miejsce_smierci) -> tuple:
+        """
+        Wyznacza klucze obce miejsc osoby, dodając nowe miejsca do słownika
+        
+        Returns:
+            Krotka wartości PLACE_COLUMNS
+        """
+        return self.places.resolve(miejsce_urodzenia), self.places.resolve(miejsce_smierci)
+    
+    @profiled
     def add_person(self, imie: str, nazwisko: str, data_urodzenia: Optional[str] = None,
                    data_smierci: Optional[str] = None, plec: Optional[str] = None,
                    miejsce_urodzenia: Optional[str] = None, miejsce_smierci: Optional[str] = None,
@@ -87,8 +268,8 @@ class DatabaseManager:
         Args:
             imie: Imię osoby
             nazwisko: Nazwisko osoby
-            data_urodzenia: Data urodzenia (YYYY-MM-DD)
-            data_smierci: Data śmierci (YYYY-MM-DD)
+            data_urodzenia: Data urodzenia (YYYY-MM-DD, data częściowa lub przybliżona)
+            data_smierci: Data śmierci (YYYY-MM-DD, data częściowa lub przybliżona)
             plec: Płeć (M/K)
             miejsce_urodzenia: Miejsce urodzenia
             miejsce_smierci: Miejsce śmierci
@@ -99,16 +280,90 @@ class DatabaseManager:
         Returns:
             ID dodanej osoby
         """
-        self.cursor.execute('''
+        data_urodzenia, data_smierci, *date_values = self._date_values(data_urodzenia, data_smierci)
+        place_values = self._place_values(miejsce_urodzenia, miejsce_smierci)
+        self.cursor.execute(f'''
             INSERT INTO osoby (imie, nazwisko, nazwisko_panienskie, data_urodzenia, data_smierci, plec,
-                             miejsce_urodzenia, miejsce_smierci, notatki, zdjecie_sciezka)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                             miejsce_urodzenia, miejsce_smierci, notatki, zdjecie_sciezka,
+                             {', '.join(self.DATE_COLUMNS + self.PLACE_COLUMNS)})
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (imie, nazwisko, nazwisko_panienskie, data_urodzenia, data_smierci, plec,
-              miejsce_urodzenia, miejsce_smierci, notatki, zdjecie_sciezka))
+              miejsce_urodzenia, miejsce_smierci, notatki, zdjecie_sciezka, *date_values, *place_values))
         
-        self.connection.commit()
+        self._commit()
         return self.cursor.lastrowid
     
+    PERSON_COLUMNS = ('imie', 'nazwisko', 'nazwisko_panienskie', 'data_urodzenia', 'data_smierci',
+                      'plec', 'miejsce_urodzenia', 'miejsce_smierci', 'notatki', 'zdjecie_sciezka')
+    
+    @profiled
+    def add_persons_bulk(self, persons: List[dict]) -> List[int]:
+        """
+        Dodaje wiele osób w jednej transakcji
+        
+        Args:
+            persons: Lista słowników z polami osoby (klucze jak w add_person)
+            
+        Returns:
+            Lista ID dodanych osób w kolejności wejściowej
+        """
+        if not persons:
+            return []
+        
+        ids = self._insert_persons(persons)
+        self._commit()
+        return ids
+    
+    def _person_rows(self, persons: List[dict], columns: Tuple[str, ...]) -> List[tuple]:
+        """
+        Przygotowuje wiersze osób do zapisu
+        
+        Args:
+            persons: Słowniki z polami osoby
+            columns: Zapisywane kolumny osoby (w tym data_urodzenia i data_smierci)
+        
+        Returns:
+            Krotki z wartościami kolumn, kolumn pomocniczych dat (DATE_COLUMNS)
+            i kluczy obcych miejsc (PLACE_COLUMNS)
+        """
+        birth, death = columns.index('data_urodzenia'), columns.index('data_smierci')
+        places = self.places.resolve_many(person.get(column) for person in persons
+                                          for column in ('miejsce_urodzenia', 'miejsce_smierci'))
+        rows = []
+        for person in persons:
+            row = [person.get(column) for column in columns]
+            values = self._date_values(row[birth], row[death])
+            row[birth], row[death] = values[:2]
+            rows.append(tuple(row) + values[2:] + (places.get(person.get('miejsce_urodzenia')),
+                                                   places.get(person.get('miejsce_smierci'))))
+        return rows
+    
+    def _insert_persons(self, persons: List[dict]) -> List[int]:
+        """
+        Wstawia osoby bez zatwierdzania transakcji
+        
+        Returns:
+            Lista ID wstawionych osób w kolejności wejściowej
+        """
+        columns = self.PERSON_COLUMNS + self.DATE_COLUMNS + self.PLACE_COLUMNS
+        placeholders = ', '.join('?' for _ in columns)
+        
+        first_id = self._next_autoincrement_id('osoby')
+        self.cursor.executemany(f'''
+            INSERT INTO osoby ({', '.join(columns)})
+            VALUES ({placeholders})
+        ''', self._person_rows(persons, self.PERSON_COLUMNS))
+        
+        # AUTOINCREMENT w jednej transakcji nadaje kolejne identyfikatory
+        return list(range(first_id, first_id + len(persons)))
+    
+    def _next_autoincrement_id(self, table: str) -> int:
+        """Zwraca ID, które otrzyma następny wiersz tabeli z AUTOINCREMENT"""
+        self.cursor.execute('SELECT seq FROM sqlite_sequence WHERE name = ?', (table,))
+        row = self.cursor.fetchone()
+        return (row[0] if row else 0) + 1
+    
+    @profiled
     def update_person(self, person_id: int, imie: str, nazwisko: str,
                      data_urodzenia: Optional[str] = None, data_smierci: Optional[str] = None,
                      plec: Optional[str] = None, miejsce_urodzenia: Optional[str] = None,
@@ -130,17 +385,24 @@ class DatabaseManager:
             zdjecie_sciezka: Ścieżka do zdjęcia
             nazwisko_panienskie: Nazwisko panieńskie
         """
-        self.cursor.execute('''
+        data_urodzenia, data_smierci, *date_values = self._date_values(data_urodzenia, data_smierci)
+        place_values = self._place_values(miejsce_urodzenia, miejsce_smierci)
+        derived_assignments = ', '.join(f'{column} = ?'
+                                     for column in self.DATE_COLUMNS + self.PLACE_COLUMNS)
+        self.cursor.execute(f'''
             UPDATE osoby
             SET imie = ?, nazwisko = ?, nazwisko_panienskie = ?, data_urodzenia = ?, data_smierci = ?,
                 plec = ?, miejsce_urodzenia = ?, miejsce_smierci = ?,
-                notatki = ?, zdjecie_sciezka = ?
+                notatki = ?, zdjecie_sciezka = ?, {derived_assignments}
             WHERE id = ?
         ''', (imie, nazwisko, nazwisko_panienskie, data_urodzenia, data_smierci, plec,
-              miejsce_urodzenia, miejsce_smierci, notatki, zdjecie_sciezka, person_id))
+              miejsce_urodzenia, miejsce_smierci, notatki, zdjecie_sciezka, *date_values,
+              *place_values, person_id))
         
-        self.connection.commit()
+        self._commit()
+        self.collect_photo_garbage()
     
+    @profiled
     def delete_person(self, person_id: int):
         """
         Usuwa osobę z bazy danych
@@ -153,8 +415,259 @@ class DatabaseManager:
                           (person_id, person_id))
         # Następnie usuń osobę
         self.cursor.execute('DELETE FROM osoby WHERE id = ?', (person_id,))
-        self.connection.commit()
+        self.ancestry.remove_person(person_id)
+        self._commit()
+        self.collect_photo_garbage()
+    
+    @profiled
+    def merge_persons(self, keep_id: int, remove_id: int) -> int:
+        """
+        Scala zdublowaną osobę z osobą zachowywaną
+        
+        Brakujące dane zachowywanej osoby są uzupełniane danymi duplikatu
+        (notatki są łączone), relacje duplikatu są przepinane na zachowywaną
+        osobę, a relacje, które po przepięciu powtarzają istniejące lub łączą
+        osobę z samą sobą, są usuwane. Całość odbywa się w jednej transakcji.
+        
+        Args:
+            keep_id: ID osoby zachowywanej
+            remove_id: ID duplikatu do usunięcia
+        
+        Returns:
+            Liczba relacji przepiętych na zachowywaną osobę
+        
+        Raises:
+            ValueError: Gdy osoby nie istnieją lub to ta sama osoba
+        """
+        if keep_id == remove_id:
+            raise ValueError("Nie można scalić osoby z samą sobą")
+        keep = self.get_person(keep_id)
+        duplicate = self.get_person(remove_id)
+        if keep is None or duplicate is None:
+            raise ValueError(f"Nie znaleziono osoby o ID {keep_id if keep is None else remove_id}")
+        
+        merged = {column: keep[column] if keep[column] not in (None, '') else duplicate[column]
+                  for column in self.PERSON_COLUMNS}
+        if keep['notatki'] and duplicate['notatki'] and keep['notatki'] != duplicate['notatki']:
+            merged['notatki'] = f"{keep['notatki']}\n\n{duplicate['notatki']}"
+        
+        try:
+            data_urodzenia, data_smierci, *date_values = self._date_values(
+                merged['data_urodzenia'], merged['data_smierci'])
+            merged['data_urodzenia'], merged['data_smierci'] = data_urodzenia, data_smierci
+            place_values = self._place_values(merged['miejsce_urodzenia'], merged['miejsce_smierci'])
+            assignments = ', '.join(f'{column} = ?' for column in
+                                    self.PERSON_COLUMNS + self.DATE_COLUMNS + self.PLACE_COLUMNS)
+            self.cursor.execute(f'UPDATE osoby SET {assignments} WHERE id = ?',
+                                (*merged.values(), *date_values, *place_values, keep_id))
+            
+            # Relacje między scalanymi osobami stałyby się relacjami z samą sobą
+            self.cursor.execute('''
+                DELETE FROM relacje
+                WHERE (osoba1_id = ? AND osoba2_id = ?) OR (osoba1_id = ? AND osoba2_id = ?)
+            ''', (keep_id, remove_id, remove_id, keep_id))
+            self.cursor.execute('UPDATE relacje SET osoba1_id = ? WHERE osoba1_id = ?',
+                                (keep_id, remove_id))
+            moved = self.cursor.rowcount
+            self.cursor.execute('UPDATE relacje SET osoba2_id = ? WHERE osoba2_id = ?',
+                                (keep_id, remove_id))
+            moved += self.cursor.rowcount
+            
+            # Ta sama relacja zapisana dwukrotnie (również jako 'rodzic' i 'dziecko'
+            # albo małżeństwo w obu kierunkach) - zostaje najstarszy wpis
+            self.cursor.execute('''
+                DELETE FROM relacje WHERE id IN (
+                    SELECT id FROM (
+                        SELECT id, ROW_NUMBER() OVER (
+                            PARTITION BY
+                                CASE rodzaj_relacji WHEN 'dziecko' THEN osoba2_id
+                                     WHEN 'małżonek' THEN MIN(osoba1_id, osoba2_id)
+                                     ELSE osoba1_id END,
+                                CASE rodzaj_relacji WHEN 'dziecko' THEN osoba1_id
+                                     WHEN 'małżonek' THEN MAX(osoba1_id, osoba2_id)
+                                     ELSE osoba2_id END,
+                                CASE rodzaj_relacji WHEN 'dziecko' THEN 'rodzic'
+                                     ELSE rodzaj_relacji END
+                            ORDER BY id) AS numer
+                        FROM relacje WHERE osoba1_id = ? OR osoba2_id = ?
+                    ) WHERE numer > 1
+                )
+            ''', (keep_id, keep_id))
+            moved -= self.cursor.rowcount
+            
+            # Rekord pliku GEDCOM wskazujący duplikat wskazuje teraz scaloną osobę
+            self.gedcom_sync.reassign_person(remove_id, keep_id)
+            self.cursor.execute('DELETE FROM osoby WHERE id = ?', (remove_id,))
+            # Potomkowie duplikatu są już potomkami zachowywanej osoby, więc po
+            # przeliczeniu ich przodków przeliczane jest całe poddrzewo tej osoby
+            self.ancestry.remove_person(remove_id)
+            self.ancestry.remove_edge(keep_id)
+        except sqlite3.Error:
+            self.connection.rollback()
+            raise
+        
+        self._commit()
+        self.collect_photo_garbage()
+        return moved
+    
+    @profiled
+    def sync_gedcom(self, source: str, persons: List[dict], families: List[tuple],
+                    delete: bool = False) -> dict:
+        """
+        Synchronizuje osoby i relacje z rekordami zewnętrznego pliku GEDCOM
+        
+        Rekordy są rozpoznawane po xref zapamiętanym przy poprzedniej
+        synchronizacji tego samego źródła. Nowe osoby są dodawane, a osoby,
+        których rekord zmienił się od poprzedniej synchronizacji (inny skrót
+        treści), są aktualizowane; zmiany wprowadzone w programie w osobach
+        o niezmienionym rekordzie pozostają. Relacje zmienionych rodzin są
+        dodawane i usuwane według różnicy składu rodziny. Całość odbywa się
+        w jednej transakcji.
+        
+        Args:
+            source: Nazwa źródła (pliku prowadzonego poza programem)
+            persons: Słowniki osób z kluczem 'xref' i polami jak w add_person
+            families: Rodziny (xref, mąż, żona, dzieci) z odwołaniami do osób jako xref
+            delete: Czy usuwać osoby i rodziny, których nie ma już w pliku
+        
+        Returns:
+            Słownik z liczbą osób dodanych, zmienionych, usuniętych i bez zmian
+            oraz relacji dodanych i usuniętych
+        """
+        known = self.gedcom_sync.persons(source)
+        known_families = self.gedcom_sync.families(source)
+        
+        # Podział osób na nowe i zmienione (przy powtórzonym xref obowiązuje pierwszy rekord)
+        new_persons, changed_persons, digests = [], [], {}
+        for person in persons:
+            xref = person['xref']
+            if xref in digests:
+                continue
+            digests[xref] = record_hash(person.get(column) for column in self.PERSON_COLUMNS)
+            entry = known.get(xref)
+            if entry is None:
+                new_persons.append(person)
+            elif entry[1] != digests[xref]:
+                changed_persons.append(person)
+        removed_xrefs = [xref for xref in known if xref not in digests] if delete else []
+        
+        current_families = {}
+        for xref, husband, wife, children in families:
+            current_families.setdefault(xref, (husband, wife, tuple(children)))
+        removed_families = ([xref for xref in known_families if xref not in current_families]
+                            if delete else [])
+        
+        try:
+            person_map = {xref: person_id for xref, (person_id, _) in known.items()}
+            new_ids = self._insert_persons(new_persons)
+            person_map.update(zip((person['xref'] for person in new_persons), new_ids))
+            
+            if changed_persons:
+                columns = tuple(column for column in self.PERSON_COLUMNS
+                                if column in changed_persons[0])
+                assignments = ', '.join(f'{column} = ?' for column in
+                                        columns + self.DATE_COLUMNS + self.PLACE_COLUMNS)
+                rows = self._person_rows(changed_persons, columns)
+                self.cursor.executemany(f'UPDATE osoby SET {assignments} WHERE id = ?',
+                                        [row + (person_map[person['xref']],)
+                                         for row, person in zip(rows, changed_persons)])
+            
+            # Po scaleniu duplikatów kilka xref wskazuje tę samą osobę - jest
+            # ona usuwana dopiero wtedy, gdy nie pozostał żaden wpis indeksu
+            removed_ids = [person_map.pop(xref) for xref in removed_xrefs]
+            self.gedcom_sync.remove_persons(source, removed_xrefs)
+            removed_ids = self.gedcom_sync.unmapped(removed_ids)
+            for person_id in removed_ids:
+                self.cursor.execute('DELETE FROM relacje WHERE osoba1_id = ? OR osoba2_id = ?',
+                                    (person_id, person_id))
+                self.cursor.execute('DELETE FROM osoby WHERE id = ?', (person_id,))
+            
+            # Rodzina jest zmieniona, gdy różni się jej skład albo obejmuje osobę
+            # dodaną teraz (np. wcześniej pominiętą z powodu braku nazwiska)
+            added = {person['xref'] for person in new_persons}
+            changed_families = [
+                (xref, *members) for xref, members in current_families.items()
+                if known_families.get(xref) != members
+                or added.intersection(members[:2]) or added.intersection(members[2])
+            ]
+            previous = [(xref, *known_families[xref])
+                        for xref in [family[0] for family in changed_families] + removed_families
+                        if xref in known_families]
+            desired = set(family_relations(
+                [(xref, *members) for xref, members in current_families.items()], person_map))
+            stale = [relation for relation in family_relations(previous, person_map)
+                     if relation not in desired]
+            added_ids = set(new_ids)
+            missing = [relation for relation in family_relations(changed_families, person_map)
+                       if not self._relation_exists(relation, added_ids)]
+            
+            for relation in stale:
+                condition, params = self._relation_condition(relation)
+                self.cursor.execute(f'DELETE FROM relacje WHERE {condition}', params)
+            self.cursor.executemany('''
+                INSERT INTO relacje (osoba1_id, osoba2_id, rodzaj_relacji)
+                VALUES (?, ?, ?)
+            ''', missing)
+            
+            # Przodkowie są przeliczani w poddrzewach dzieci zmienionych krawędzi
+            children = {child_id for _, child_id, kind in stale + missing if kind == 'rodzic'}
+            if len(children) + len(removed_ids) > self.ANCESTRY_REBUILD_THRESHOLD:
+                self.ancestry.rebuild()
+            else:
+                for person_id in removed_ids:
+                    self.ancestry.remove_person(person_id)
+                for child_id in children:
+                    self.ancestry.remove_edge(child_id)
+            
+            self.gedcom_sync.store_persons(source, [
+                (person['xref'], person_map[person['xref']], digests[person['xref']])
+                for person in new_persons + changed_persons])
+            self.gedcom_sync.store_families(source, [
+                (family[0], current_families[family[0]]) for family in changed_families])
+            self.gedcom_sync.remove_families(source, removed_families)
+        except sqlite3.Error:
+            self.connection.rollback()
+            raise
+        
+        self._commit()
+        if changed_persons or removed_ids:
+            self.collect_photo_garbage()
+        
+        return {
+            'dodane': len(new_persons),
+            'zmienione': len(changed_persons),
+            'usuniete': len(removed_ids),
+            'bez_zmian': len(digests) - len(new_persons) - len(changed_persons),
+            'relacje_dodane': len(missing),
+            'relacje_usuniete': len(stale)
+        }
     
+    @staticmethod
+    def _relation_condition(relation: Tuple[int, int, str]) -> Tuple[str, tuple]:
+        """
+        Warunek SQL dopasowujący relację w obu możliwych zapisach
+        
+        Relacja rodzic-dziecko może być zapisana jako 'rodzic' albo 'dziecko',
+        a małżeństwo w dowolnym kierunku.
+        
+        Returns:
+            Krotka (warunek WHERE, parametry)
+        """
+        osoba1_id, osoba2_id, rodzaj_relacji = relation
+        reverse = 'dziecko' if rodzaj_relacji == 'rodzic' else rodzaj_relacji
+        return ('(osoba1_id = ? AND osoba2_id = ? AND rodzaj_relacji = ?) '
+                'OR (osoba1_id = ? AND osoba2_id = ? AND rodzaj_relacji = ?)',
+                (osoba1_id, osoba2_id, rodzaj_relacji, osoba2_id, osoba1_id, reverse))
+    
+    def _relation_exists(self, relation: Tuple[int, int, str], added_ids: set) -> bool:
+        """Sprawdza, czy relacja istnieje (osoby dodane w bieżącej transakcji nie mają relacji)"""
+        if relation[0] in added_ids or relation[1] in added_ids:
+            return False
+        condition, params = self._relation_condition(relation)
+        self.cursor.execute(f'SELECT 1 FROM relacje WHERE {condition} LIMIT 1', params)
+        return self.cursor.fetchone() is not None
+    
+    @profiled
     def get_person(self, person_id: int) -> Optional[dict]:
         """
         Pobiera dane osoby po ID
@@ -165,10 +678,18 @@ class DatabaseManager:
         Returns:
             Słownik z danymi osoby lub None jeśli nie znaleziono
         """
-        self.cursor.execute('SELECT * FROM osoby WHERE id = ?', (person_id,))
-        row = self.cursor.fetchone()
-        return dict(row) if row else None
+        key = ('osoba', person_id)
+        found, person = self.cache.get(key)
+        if not found:
+            self.cursor.execute('SELECT * FROM osoby WHERE id = ?', (person_id,))
+            row = self.cursor.fetchone()
+            person = dict(row) if row else None
+            self.cache.put(key, person, tags=[person_id])
+        
+        # Kopia chroni zawartość pamięci podręcznej przed modyfikacją
+        return dict(person) if person else None
     
+    @profiled
     def get_all_persons(self) -> List[dict]:
         """
         Pobiera wszystkie osoby z bazy danych
@@ -179,6 +700,7 @@ class DatabaseManager:
         self.cursor.execute('SELECT * FROM osoby ORDER BY nazwisko, imie')
         return [dict(row) for row in self.cursor.fetchall()]
     
+    @profiled
     def add_relation(self, osoba1_id: int, osoba2_id: int, rodzaj_relacji: str) -> int:
         """
         Dodaje relację między dwiema osobami
@@ -195,10 +717,45 @@ class DatabaseManager:
             INSERT INTO relacje (osoba1_id, osoba2_id, rodzaj_relacji)
             VALUES (?, ?, ?)
         ''', (osoba1_id, osoba2_id, rodzaj_relacji))
+        relation_id = self.cursor.lastrowid
         
-        self.connection.commit()
-        return self.cursor.lastrowid
+        edge = AncestryClosure.edge(osoba1_id, osoba2_id, rodzaj_relacji)
+        if edge:
+            self.ancestry.add_edge(*edge)
+        
+        self._commit()
+        return relation_id
     
+    @profiled
+    def add_relations_bulk(self, relations: List[Tuple[int, int, str]]) -> int:
+        """
+        Dodaje wiele relacji w jednej transakcji
+        
+        Args:
+            relations: Lista krotek (osoba1_id, osoba2_id, rodzaj_relacji)
+            
+        Returns:
+            Liczba dodanych relacji
+        """
+        if not relations:
+            return 0
+        
+        self.cursor.executemany('''
+            INSERT INTO relacje (osoba1_id, osoba2_id, rodzaj_relacji)
+            VALUES (?, ?, ?)
+        ''', relations)
+        
+        edges = [edge for edge in (AncestryClosure.edge(*rel) for rel in relations) if edge]
+        if len(edges) > self.ANCESTRY_REBUILD_THRESHOLD:
+            self.ancestry.rebuild()
+        else:
+            for edge in edges:
+                self.ancestry.add_edge(*edge)
+        
+        self._commit()
+        return len(relations)
+    
+    @profiled
     def delete_relation(self, relation_id: int):
         """
         Usuwa relację
@@ -206,9 +763,18 @@ class DatabaseManager:
         Args:
             relation_id: ID relacji do usunięcia
         """
+        self.cursor.execute('SELECT osoba1_id, osoba2_id, rodzaj_relacji FROM relacje WHERE id = ?',
+                            (relation_id,))
+        row = self.cursor.fetchone()
         self.cursor.execute('DELETE FROM relacje WHERE id = ?', (relation_id,))
-        self.connection.commit()
+        
+        edge = AncestryClosure.edge(*row) if row else None
+        if edge:
+            self.ancestry.remove_edge(edge[1])
+        
+        self._commit()
     
+    @profiled
     def get_relations(self, person_id: int) -> List[dict]:
         """
         Pobiera wszystkie relacje osoby
@@ -219,6 +785,11 @@ class DatabaseManager:
         Returns:
             Lista słowników z relacjami
         """
+        key = ('relacje', person_id)
+        found, relations = self.cache.get(key)
+        if found:
+            return [dict(rel) for rel in relations]
+        
         self.cursor.execute('''
             SELECT r.*, o1.imie as osoba1_imie, o1.nazwisko as osoba1_nazwisko,
                    o2.imie as osoba2_imie, o2.nazwisko as osoba2_nazwisko
@@ -228,8 +799,19 @@ class DatabaseManager:
             WHERE r.osoba1_id = ? OR r.osoba2_id = ?
         ''', (person_id, person_id))
         
-        return [dict(row) for row in self.cursor.fetchall()]
+        relations = [dict(row) for row in self.cursor.fetchall()]
+        
+        # Wiersze zawierają imiona i nazwiska obu osób, więc wpis jest
+        # unieważniany również przy zmianie danych każdej z nich
+        tags = {person_id}
+        for rel in relations:
+            tags.add(rel['osoba1_id'])
+            tags.add(rel['osoba2_id'])
+        self.cache.put(key, relations, tags=tags)
+        
+        return [dict(rel) for rel in relations]
     
+    @profiled
     def get_all_relations(self) -> List[dict]:
         """
         Pobiera wszystkie relacje z bazy danych
@@ -247,6 +829,7 @@ class DatabaseManager:
         
         return [dict(row) for row in self.cursor.fetchall()]
     
+    @profiled
     def search_persons(self, query: str) -> List[dict]:
         """
         Wyszukuje osoby po imieniu lub nazwisku
@@ -257,16 +840,743 @@ class DatabaseManager:
         Returns:
             Lista słowników z danymi osób
         """
-        search_pattern = f'%{query}%'
-        self.cursor.execute('''
-            SELECT * FROM osoby
-            WHERE imie LIKE ? OR nazwisko LIKE ?
-            ORDER BY nazwisko, imie
-        ''', (search_pattern, search_pattern))
+        return read_persons_matching(self.connection, query)
+    
+    def _commit(self):
+        """Zatwierdza transakcję i powiadamia obserwatorów o zmianach"""
+        if self.connection.in_transaction:
+            self._unsaved_commit = True
+        self.connection.commit()
+        self.journal.notify()
+    
+    def _invalidate_cache(self, changes: Optional[List[dict]]):
+        """
+        Unieważnia wpisy pamięci podręcznej dotknięte zmianami
+        
+        Args:
+            changes: Lista zmian z dziennika (None - brak części zmian)
+        """
+        if changes is None:
+            self.cache.clear()
+            return
+        for change in changes:
+            if change['tabela'] == 'osoby':
+                # Dane osoby oraz relacje, w których występuje jej imię i nazwisko
+                self.cache.invalidate_tag(change['rekord_id'])
+            else:
+                self.cache.invalidate(('relacje', change['osoba1_id']))
+                self.cache.invalidate(('relacje', change['osoba2_id']))
+    
+    def get_cache_stats(self) -> dict:
+        """
+        Zwraca statystyki pamięci podręcznej zapytań
+        
+        Returns:
+            Słownik z liczbą trafień, chybień, usunięć i rozmiarem
+        """
+        return self.cache.get_stats()
+    
+    def subscribe_changes(self, callback):
+        """
+        Rejestruje obserwatora zmian w osobach i relacjach
+        
+        Args:
+            callback: Funkcja wywoływana z listą zmian (słowniki z polami seq,
+                      tabela, operacja, rekord_id, osoba1_id, osoba2_id, czas)
+                      albo z None, gdy części zmian brakuje w dzienniku
+        """
+        self.journal.subscribe(callback)
+    
+    def unsubscribe_changes(self, callback):
+        """
+        Wyrejestrowuje obserwatora zmian
+        
+        Args:
+            callback: Wcześniej zarejestrowana funkcja
+        """
+        self.journal.unsubscribe(callback)
+    
+    def get_last_sequence(self) -> int:
+        """
+        Zwraca numer sekwencyjny ostatniej zmiany w bazie
+        
+        Returns:
+            Numer sekwencyjny (0 jeśli nie było zmian)
+        """
+        return self.journal.get_last_sequence()
+    
+    def has_changes_since(self, sequence: int, table: str) -> bool:
+        """
+        Sprawdza, czy po danym numerze sekwencyjnym zmieniono osoby lub relacje
+        
+        Args:
+            sequence: Ostatni znany numer sekwencyjny
+            table: 'osoby' lub 'relacje'
+        
+        Returns:
+            True, jeśli w tabeli były zmiany (lub nie da się tego ustalić)
+        """
+        return self.journal.has_changes_since(sequence, table)
+    
+    @profiled
+    def get_changes_since(self, sequence: int) -> List[dict]:
+        """
+        Pobiera zmiany wykonane po danym numerze sekwencyjnym
+        
+        Args:
+            sequence: Ostatni znany numer sekwencyjny
+            
+        Returns:
+            Lista słowników ze zmianami
+        """
+        return self.journal.get_changes_since(sequence)
+    
+    @profiled
+    def count_persons(self) -> int:
+        """
+        Zwraca liczbę osób w bazie danych
+        
+        Returns:
+            Liczba osób
+        """
+        self.cursor.execute('SELECT COUNT(*) FROM osoby')
+        return self.cursor.fetchone()[0]
+    
+    @profiled
+    def dump_rows(self) -> Tuple[List[tuple], List[tuple]]:
+        """
+        Zwraca wszystkie wiersze osób i relacji (np. do zapisu migawki)
+        
+        Returns:
+            Krotka (osoby, relacje): osoby jako krotki (id, *PERSON_COLUMNS,
+            *DATE_COLUMNS, *PLACE_COLUMNS) rosnąco wg ID, relacje jako krotki
+            (osoba1_id, osoba2_id, rodzaj_relacji) w kolejności dodania
+        """
+        columns = ('id',) + self.PERSON_COLUMNS + self.DATE_COLUMNS + self.PLACE_COLUMNS
+        self.cursor.execute(f'SELECT {", ".join(columns)} FROM osoby ORDER BY id')
+        persons = [tuple(row) for row in self.cursor.fetchall()]
+        self.cursor.execute('SELECT osoba1_id, osoba2_id, rodzaj_relacji FROM relacje ORDER BY id')
+        relations = [tuple(row) for row in self.cursor.fetchall()]
+        return persons, relations
+    
+    def dump_places(self) -> Tuple[List[tuple], List[tuple]]:
+        """
+        Zwraca słownik miejsc (np. do zapisu migawki)
+        
+        Returns:
+            Krotka (miejsca, aliasy): miejsca jako krotki (id, nazwa,
+            szerokosc, dlugosc), aliasy jako krotki (klucz, miejsce_id)
+        """
+        return self.places.dump()
+    
+    @profiled
+    def restore_rows(self, persons: Iterable[tuple], relations: Iterable[tuple],
+                     places: Optional[Iterable[tuple]] = None,
+                     aliases: Optional[Iterable[tuple]] = None) -> int:
+        """
+        Wypełnia pustą bazę wierszami w układzie dump_rows (z zachowaniem ID osób)
+        
+        Kolumny pomocnicze dat są przepisywane bez ponownego rozpoznawania
+        dat, a przodkowie i indeks lat życia przeliczani raz po wstawieniu
+        wszystkich wierszy. Dziennik zmian nie dostaje wpisu dla każdego
+        wiersza; pamięć podręczna, statystyki i wyniki walidacji są po
+        odtworzeniu wyliczane od nowa (zob. ChangeJournal.suspended).
+        Słownik miejsc (z aliasami i współrzędnymi) jest odtwarzany
+        z wierszy dump_places; bez nich (np. migawka z wcześniejszej wersji)
+        miejsca osób są rozpoznawane od nowa z kolumn tekstowych.
+        
+        Args:
+            persons: Krotki (id, *PERSON_COLUMNS, *DATE_COLUMNS, *PLACE_COLUMNS)
+            relations: Krotki (osoba1_id, osoba2_id, rodzaj_relacji)
+            places: Krotki (id, nazwa, szerokosc, dlugosc) lub None
+            aliases: Krotki (klucz, miejsce_id) lub None
+        
+        Returns:
+            Liczba wstawionych osób
+        
+        Raises:
+            ValueError: Jeśli baza zawiera już osoby lub relacje
+        """
+        self.cursor.execute('SELECT EXISTS (SELECT 1 FROM osoby) OR EXISTS (SELECT 1 FROM relacje)')
+        if self.cursor.fetchone()[0]:
+            raise ValueError("Baza danych nie jest pusta")
+        
+        columns = ('id',) + self.PERSON_COLUMNS + self.DATE_COLUMNS + self.PLACE_COLUMNS
+        try:
+            with self.journal.suspended(), self.lifespans.suspended():
+                if places is not None:
+                    self.places.restore(places, aliases or ())
+                else:
+                    persons = self._resolve_person_places(persons, columns)
+                self.cursor.executemany(f'''
+                    INSERT INTO osoby ({', '.join(columns)})
+                    VALUES ({', '.join('?' for _ in columns)})
+                ''', persons)
+                count = self.cursor.rowcount
+                self.cursor.executemany('''
+                    INSERT INTO relacje (osoba1_id, osoba2_id, rodzaj_relacji)
+                    VALUES (?, ?, ?)
+                ''', relations)
+                self.ancestry.rebuild()
+        except sqlite3.Error:
+            self.connection.rollback()
+            raise
+        
+        self._commit()
+        return count
+    
+    def _resolve_person_places(self, persons: Iterable[tuple], columns: Tuple[str, ...]) -> List[tuple]:
+        """Uzupełnia klucze obce miejsc wierszy osób na podstawie nazw (każda nazwa raz)"""
+        persons = list(persons)
+        birth = columns.index('miejsce_urodzenia')
+        death = columns.index('miejsce_smierci')
+        ids = len(columns) - len(self.PLACE_COLUMNS)
+        places = self.places.resolve_many(name for row in persons for name in (row[birth], row[death]))
+        return [tuple(row[:ids]) + (places.get(row[birth]), places.get(row[death]))
+                for row in persons]
+    
+    def add_photo(self, path: str) -> str:
+        """
+        Dodaje zdjęcie do magazynu zdjęć (identyczne pliki są przechowywane raz)
+        
+        Args:
+            path: Ścieżka do zdjęcia źródłowego
+            
+        Returns:
+            Ścieżka zdjęcia w magazynie do zapisania w zdjecie_sciezka
+        """
+        stored_path = self.photos.add(path)
+        self._commit()
+        return stored_path
+    
+    def collect_photo_garbage(self) -> int:
+        """
+        Usuwa z dysku zdjęcia, do których nie odwołuje się żadna osoba
+        
+        W trybie in_memory pliki są usuwane dopiero w save, po zapisaniu
+        zmian do pliku bazy - niezapisana kopia nadal może ich wymagać.
+        
+        Returns:
+            Liczba usuniętych zdjęć
+        """
+        if self.in_memory:
+            return 0
+        removed = self.photos.collect_garbage()
+        if removed:
+            self._commit()
+        return removed
+    
+    @profiled
+    def get_timeline_rows(self, year_from: Optional[int] = None,
+                          year_to: Optional[int] = None) -> List[tuple]:
+        """
+        Pobiera lata życia osób z rozpoznawalnym rokiem urodzenia
+        
+        Zwraca krotki zamiast słowników - wynik służy do budowy tablic
+        NumPy dla osi czasu i może liczyć dziesiątki tysięcy wierszy.
+        Lata pochodzą z indeksu przedziałów życia, który ogranicza też
+        wynik do osób żyjących w podanym zakresie lat.
+        
+        Args:
+            year_from: Pierwszy rok zakresu (None = bez ograniczenia)
+            year_to: Ostatni rok zakresu (None = bez ograniczenia)
+        
+        Returns:
+            Lista krotek (id, imie, nazwisko, plec, rok_urodzenia, rok_smierci)
+        """
+        conditions = []
+        params = [LifespanTree.OPEN_END]
+        if year_from is not None:
+            conditions.append('l.rok_do >= ?')
+            params.append(year_from)
+        if year_to is not None:
+            conditions.append('l.rok_od <= ?')
+            params.append(year_to)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        
+        self.cursor.execute(f'''
+            SELECT o.id, o.imie, o.nazwisko, o.plec,
+                   CAST(l.rok_od AS INTEGER) AS rok_urodzenia,
+                   CAST(NULLIF(l.rok_do, ?) AS INTEGER)
+            FROM {LifespanTree.TABLE} l
+            JOIN osoby o ON o.id = l.id
+            {where}
+            ORDER BY rok_urodzenia
+        ''', params)
+        return [tuple(row) for row in self.cursor.fetchall()]
+    
+    @profiled
+    def persons_alive_in(self, year: int, year_to: Optional[int] = None) -> List[dict]:
+        """
+        Pobiera osoby żyjące w danym roku (lub w dowolnym roku przedziału)
+        
+        Osoby bez daty śmierci są traktowane jak żyjące do dziś.
+        
+        Args:
+            year: Rok (lub początek przedziału)
+            year_to: Koniec przedziału (None = tylko rok year)
+        
+        Returns:
+            Lista słowników z danymi osób
+        """
+        return self.lifespans.alive_between(year, year if year_to is None else year_to)
+    
+    @profiled
+    def overlapping_persons(self, person_id: int) -> List[dict]:
+        """
+        Pobiera współczesnych danej osoby (życie pokrywało się choć częściowo)
+        
+        Args:
+            person_id: ID osoby
+        
+        Returns:
+            Lista słowników z danymi osób (pusta jeśli osoba nie ma roku urodzenia)
+        """
+        return self.lifespans.overlapping(person_id)
+    
+    @profiled
+    def is_ancestor(self, ancestor_id: int, person_id: int) -> bool:
+        """
+        Sprawdza, czy osoba jest przodkiem innej osoby
+        
+        Args:
+            ancestor_id: ID potencjalnego przodka
+            person_id: ID osoby
+        
+        Returns:
+            True jeśli ancestor_id jest przodkiem person_id
+        """
+        return self.ancestry.depth(ancestor_id, person_id) is not None
+    
+    @profiled
+    def get_lineage_depth(self, ancestor_id: int, person_id: int) -> Optional[int]:
+        """
+        Zwraca liczbę pokoleń między przodkiem a potomkiem
+        
+        Args:
+            ancestor_id: ID przodka
+            person_id: ID potomka
+        
+        Returns:
+            Liczba pokoleń lub None jeśli osoby nie są w linii prostej
+        """
+        return self.ancestry.depth(ancestor_id, person_id)
+    
+    @profiled
+    def get_ancestors(self, person_id: int, max_generations: Optional[int] = None) -> List[Tuple[dict, int]]:
+        """
+        Pobiera przodków osoby z tabeli domknięcia
+        
+        Args:
+            person_id: ID osoby
+            max_generations: Maksymalna liczba pokoleń (None = wszystkie)
         
+        Returns:
+            Lista krotek (osoba, pokolenie) uporządkowana od najbliższych
+        """
+        return self.ancestry.ancestors(person_id, max_generations)
+    
+    @profiled
+    def get_descendants(self, person_id: int, max_generations: Optional[int] = None) -> List[Tuple[dict, int]]:
+        """
+        Pobiera potomków osoby z tabeli domknięcia
+        
+        Args:
+            person_id: ID osoby
+            max_generations: Maksymalna liczba pokoleń (None = wszystkie)
+        
+        Returns:
+            Lista krotek (osoba, pokolenie) uporządkowana od najbliższych
+        """
+        return self.ancestry.descendants(person_id, max_generations)
+    
+    @profiled
+    def get_generations(self) -> dict:
+        """
+        Zwraca zapisane numery pokoleń osób
+        
+        Pokolenie to długość najdłuższego łańcucha przodków osoby, więc
+        dziecko jest zawsze o co najmniej jedno pokolenie niżej niż rodzice.
+        
+        Returns:
+            Słownik ID osoby -> pokolenie (osoby bez wpisu mają pokolenie 0)
+        """
+        return self.ancestry.generations()
+    
+    @profiled
+    def get_pedigree_edges(self, person_ids: List[int]) -> List[Tuple[int, int]]:
+        """
+        Pobiera krawędzie rodzic -> dziecko rodowodu osób
+        
+        Args:
+            person_ids: ID osób (np. jednej osoby lub pary do wyliczenia pokrewieństwa)
+        
+        Returns:
+            Lista krotek (rodzic_id, dziecko_id) prowadzących do osób i ich przodków
+        """
+        return self.ancestry.pedigree_edges(person_ids)
+    
+    @profiled
+    def find_ancestry_cycles(self) -> List[Tuple[int, int]]:
+        """
+        Wyszukuje błędne relacje tworzące cykl (osoba własnym przodkiem)
+        
+        Returns:
+            Lista krotek (rodzic_id, dziecko_id) krawędzi leżących na cyklach
+        """
+        return self.ancestry.cycle_edges()
+    
+    def validate(self, full: bool = False) -> Iterator[Finding]:
+        """
+        Sprawdza spójność danych i zwraca problemy w miarę ich wykrywania
+        
+        Domyślnie sprawdzane są tylko osoby zmienione od poprzedniej walidacji
+        (wg dziennika zmian); wyniki dla pozostałych osób pozostają zapisane.
+        
+        Args:
+            full: Sprawdź całą bazę
+        
+        Yields:
+            Problemy wykryte w sprawdzanym zakresie
+        """
+        return self.validator.run(full)
+    
+    @profiled
+    def get_validation_findings(self, person_id: Optional[int] = None) -> List[Finding]:
+        """
+        Pobiera problemy zapisane przez ostatnie walidacje
+        
+        Args:
+            person_id: Tylko problemy dotyczące osoby (None = wszystkie)
+        
+        Returns:
+            Lista problemów (najpierw błędy, potem ostrzeżenia)
+        """
+        return self.validator.findings(person_id)
+    
+    @profiled
+    def get_statistics(self) -> dict:
+        """
+        Zwraca podstawowe statystyki bazy danych
+        
+        Returns:
+            Słownik z liczbą osób (wg płci), relacji (wg rodzaju)
+            oraz zakresem dat urodzenia
+        """
+        return read_statistics(self.connection)
+    
+    @profiled
+    def get_surname_counts(self) -> Dict[str, int]:
+        """
+        Zwraca liczbę osób noszących każde nazwisko
+        
+        Returns:
+            Słownik nazwisko -> liczba osób (bez pustych nazwisk)
+        """
+        return {row['nazwisko']: row['liczba'] for row in self.statistics.surnames()}
+    
+    @profiled
+    def get_surname_frequency(self, limit: Optional[int] = None) -> List[dict]:
+        """
+        Zwraca najczęstsze nazwiska
+        
+        Statystyki są czytane z tabel zbiorczych odświeżanych na podstawie
+        dziennika zmian (zob. StatisticsAggregates).
+        
+        Args:
+            limit: Maksymalna liczba nazwisk (None = wszystkie)
+        
+        Returns:
+            Lista słowników {nazwisko, liczba} od najczęstszego nazwiska
+        """
+        return self.statistics.surnames(limit)
+    
+    @profiled
+    def get_migrations(self, limit: Optional[int] = None, include_same: bool = False) -> List[dict]:
+        """
+        Zwraca przepływy osób z miejsca urodzenia do miejsca śmierci
+        
+        Args:
+            limit: Maksymalna liczba par miejsc (None = wszystkie)
+            include_same: Uwzględnij osoby zmarłe w miejscu urodzenia
+        
+        Returns:
+            Lista słowników {miejsce_urodzenia, miejsce_smierci, liczba}
+        """
+        return self.statistics.migrations(limit, include_same)
+    
+    @profiled
+    def get_birth_decades(self) -> List[dict]:
+        """
+        Zwraca liczbę urodzeń w kolejnych dekadach
+        
+        Returns:
+            Lista słowników {dekada, liczba} uporządkowana wg dekady
+        """
+        return self.statistics.birth_decades()
+    
+    @profiled
+    def find_places(self, query: str = '', limit: Optional[int] = 50) -> List[dict]:
+        """
+        Wyszukuje miejsca osób po początku nazwy lub aliasu
+        
+        Args:
+            query: Początek nazwy (bez rozróżniania wielkości liter; pusta = wszystkie)
+            limit: Maksymalna liczba miejsc (None = wszystkie)
+        
+        Returns:
+            Lista słowników {id, nazwa, szerokosc, dlugosc} wg nazwy
+        """
+        return self.places.find(query, limit)
+    
+    @profiled
+    def get_place(self, place_id: int) -> Optional[dict]:
+        """
+        Pobiera miejsce
+        
+        Args:
+            place_id: ID miejsca
+        
+        Returns:
+            Słownik {id, nazwa, szerokosc, dlugosc, aliasy} lub None
+        """
+        return self.places.get(place_id)
+    
+    def get_place_id(self, name: str) -> Optional[int]:
+        """
+        Zwraca ID miejsca o nazwie lub wariancie nazwy (bez dodawania nowego)
+        
+        Args:
+            name: Nazwa miejsca
+        
+        Returns:
+            ID miejsca lub None
+        """
+        return self.places.lookup(name)
+    
+    @profiled
+    def get_persons_by_place(self, place_id: int) -> List[dict]:
+        """
+        Pobiera osoby urodzone lub zmarłe w miejscu (również zapisanym innym wariantem nazwy)
+        
+        Args:
+            place_id: ID miejsca
+        
+        Returns:
+            Lista słowników z danymi osób wg nazwiska i imienia
+        """
+        return self.places.persons(place_id)
+    
+    @profiled
+    def get_place_counts(self, limit: Optional[int] = None) -> List[dict]:
+        """
+        Zwraca liczbę urodzeń i zgonów w miejscach
+        
+        Args:
+            limit: Maksymalna liczba miejsc (None = wszystkie)
+        
+        Returns:
+            Lista słowników {id, nazwa, urodzenia, zgony} od miejsc
+            z największą liczbą osób
+        """
+        return self.places.counts(limit)
+    
+    @profiled
+    def add_place_alias(self, place_id: int, alias: str) -> int:
+        """
+        Dodaje wariant zapisu nazwy miejsca (np. "W-wa" dla Warszawy)
+        
+        Miejsce zapisane dotąd pod tym wariantem jest scalane z podanym.
+        
+        Args:
+            place_id: ID miejsca
+            alias: Wariant nazwy
+        
+        Returns:
+            Liczba osób przepiętych ze scalonego miejsca
+        
+        Raises:
+            ValueError: Gdy miejsce nie istnieje lub alias jest pusty
+        """
+        try:
+            moved = self.places.add_alias(place_id, alias)
+        except sqlite3.Error:
+            self.connection.rollback()
+            raise
+        self._commit()
+        return moved
+    
+    @profiled
+    def merge_places(self, keep_id: int, remove_id: int) -> int:
+        """
+        Scala miejsce z zachowywanym (aliasy i osoby przechodzą na keep_id)
+        
+        Args:
+            keep_id: ID miejsca zachowywanego
+            remove_id: ID miejsca do usunięcia
+        
+        Returns:
+            Liczba przepiętych osób
+        
+        Raises:
+            ValueError: Gdy miejsca nie istnieją lub to to samo miejsce
+        """
+        try:
+            moved = self.places.merge(keep_id, remove_id)
+        except sqlite3.Error:
+            self.connection.rollback()
+            raise
+        self._commit()
+        return moved
+    
+    @profiled
+    def update_place(self, place_id: int, nazwa: Optional[str] = None,
+                     szerokosc: Optional[float] = None, dlugosc: Optional[float] = None):
+        """
+        Zmienia nazwę kanoniczną lub współrzędne miejsca
+        
+        Args:
+            place_id: ID miejsca
+            nazwa: Nowa nazwa kanoniczna (None = bez zmiany)
+            szerokosc: Szerokość geograficzna w stopniach (None = bez zmiany)
+            dlugosc: Długość geograficzna w stopniach (None = bez zmiany)
+        
+        Raises:
+            ValueError: Gdy miejsce nie istnieje lub współrzędne są poza zakresem
+        """
+        try:
+            self.places.update(place_id, nazwa, szerokosc, dlugosc)
+        except (sqlite3.Error, ValueError):
+            self.connection.rollback()
+            raise
+        self._commit()
+    
+    @profiled
+    def get_parent_candidates(self, plec: str, child_birth_year: Optional[int] = None,
+                              query: str = '', limit: int = 50, after: Optional[dict] = None,
+                              exclude_id: Optional[int] = None) -> List[dict]:
+        """
+        Pobiera stronę kandydatów na rodzica danej płci
+        
+        Kandydaci są uporządkowani wg nazwiska, imienia (bez rozróżniania
+        wielkości liter) i ID, czyli w kolejności indeksu
+        idx_osoby_plec_nazwisko, więc strona jest odczytywana z indeksu bez
+        sortowania wszystkich kandydatów. Kolejna strona zaczyna się za
+        ostatnim kandydatem poprzedniej (after), a nie po pominięciu
+        wcześniejszych wierszy. Fraza jest szukana zakresami indeksów nazwisk
+        i imion w dwóch połączonych zapytaniach, więc koszt zależy od liczby
+        osób o pasującym imieniu, a nie od wielkości bazy. Osoby bez daty
+        urodzenia są zawsze uwzględniane, bo nie da się ich wykluczyć.
+        
+        Args:
+            plec: Płeć rodzica (M/K)
+            child_birth_year: Rok urodzenia dziecka (None = bez filtra dat)
+            query: Początek imienia lub nazwiska (bez rozróżniania wielkości liter)
+            limit: Maksymalna liczba wyników
+            after: Ostatni kandydat poprzedniej strony (None = pierwsza strona)
+            exclude_id: ID osoby do pominięcia
+            
+        Returns:
+            Lista słowników z polami id, imie, nazwisko, data_urodzenia
+        """
+        conditions = ['plec = ?']
+        params = [plec]
+        
+        if child_birth_year is not None:
+            # Rodzic urodzony od PARENT_MAX_AGE do PARENT_MIN_AGE lat przed dzieckiem.
+            # COALESCE zamiast OR z IS NULL, żeby planer nie wybrał indeksu dat
+            # i nie sortował wszystkich kandydatów z zakresu
+            min_year = child_birth_year - self.PARENT_MAX_AGE
+            max_year = child_birth_year - self.PARENT_MIN_AGE
+            conditions.append('COALESCE(urodzenie_klucz BETWEEN ? AND ?, 1)')
+            params.extend([min_year * 10000, max_year * 10000 + 9999])
+        
+        if exclude_id is not None:
+            conditions.append('id != ?')
+            params.append(exclude_id)
+        
+        if after is not None:
+            # Dolna granica nazwiska pozwala zacząć odczyt indeksu za poprzednią stroną
+            conditions.append('nazwisko >= ? COLLATE NOCASE '
+                              'AND (nazwisko COLLATE NOCASE, imie COLLATE NOCASE, id) > (?, ?, ?)')
+            params.extend([after['nazwisko'], after['nazwisko'], after['imie'], after['id']])
+        
+        select = ('SELECT id, imie, nazwisko, data_urodzenia FROM osoby '
+                  f'WHERE {" AND ".join(conditions)}')
+        order = 'ORDER BY nazwisko COLLATE NOCASE, imie COLLATE NOCASE, id LIMIT ?'
+        
+        query = query.strip()
+        if query:
+            # Osobne zakresy nazwisk i imion (każdy po swoim indeksie) zamiast
+            # LIKE połączonych przez OR; każda gałąź zwraca co najwyżej stronę
+            branches = [
+                f'SELECT * FROM ({select} AND {column} >= ? COLLATE NOCASE '
+                f'AND {column} < ? COLLATE NOCASE {order})'
+                for column in ('nazwisko', 'imie')
+            ]
+            sql = f'SELECT * FROM ({" UNION ".join(branches)}) {order}'
+            params = (params + [query, query + _PREFIX_RANGE_END, limit]) * 2 + [limit]
+        else:
+            sql = f'{select} {order}'
+            params.append(limit)
+        
+        self.cursor.execute(sql, params)
         return [dict(row) for row in self.cursor.fetchall()]
     
+    @profiled
+    def save(self):
+        """
+        Zapisuje kopię bazy z pamięci do pliku (tryb in_memory)
+        
+        Cała baza jest zapisywana przez API kopii zapasowej SQLite w miejsce
+        zawartości pliku. W zwykłym trybie zmiany są zapisywane na bieżąco,
+        więc metoda nic nie robi.
+        
+        Po zapisie usuwane są zdjęcia bez odwołań (odśmiecanie jest
+        wstrzymane do zapisu); ich wiersze pozostałe w pliku zostaną
+        usunięte przy następnym odśmiecaniu.
+        """
+        if not self.in_memory:
+            return
+        
+        self.prune_journal()
+        target = sqlite3.connect(self.db_path)
+        try:
+            self.connection.backup(target)
+        finally:
+            target.close()
+        self._saved_sequence = self.journal.get_last_sequence()
+        self._unsaved_commit = False
+        
+        if self.photos.collect_garbage():
+            self.connection.commit()
+    
+    def has_unsaved_changes(self) -> bool:
+        """Sprawdza, czy kopia w pamięci ma zmiany użytkownika niezapisane do pliku"""
+        return self.in_memory and (self._unsaved_commit
+                                   or self.journal.get_last_sequence() != self._saved_sequence)
+    
+    def prune_journal(self) -> int:
+        """
+        Usuwa z dziennika zmiany przetworzone przez wszystkich odbiorców
+        
+        Odbiorcami są obserwatorzy (pamięć podręczna), walidacja i statystyki;
+        wywoływane przy zamknięciu bazy i przed zapisem kopii w pamięci.
+        
+        Returns:
+            Liczba usuniętych wpisów
+        """
+        return self.journal.prune_consumed((self.validator.get_last_sequence(),
+                                            self.statistics.get_last_sequence()))
+    
     def close(self):
-        """Zamyka połączenie z bazą danych"""
+        """Zamyka połączenie z bazą danych (kopia w pamięci nie jest zapisywana - zob. save)"""
         if self.connection:
+            if not self.in_memory:
+                try:
+                    self.prune_journal()
+                except sqlite3.Error:
+                    # Np. baza tylko do odczytu - wpisy zostaną usunięte później
+                    pass
+            profiler.detach_connection(self.connection)
             self.connection.close()
@@ -0,0 +1,180 @@
+"""
+GedcomSyncIndex - Powiązanie rekordów zewnętrznych plików GEDCOM z danymi w bazie
+"""
+
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Rodzina zapisana w indeksie: (mąż, żona, dzieci) jako xref z pliku źródłowego
+FamilyMembers = Tuple[Optional[str], Optional[str], Tuple[str, ...]]
+
+
+class GedcomSyncIndex:
+    """
+    Indeks rekordów zsynchronizowanych z plików GEDCOM
+    
+    Dla każdego źródła (pliku prowadzonego poza programem) przechowuje
+    xref osoby, ID osoby w bazie i skrót treści rekordu, a dla rodzin
+    ich skład. Przy ponownej synchronizacji pozwala to odróżnić rekordy
+    nowe, zmienione i usunięte bez porównywania całych danych. Wiersze
+    osób usuniętych z bazy znikają z indeksu dzięki wyzwalaczowi.
+    
+    Metody zmieniające dane nie zatwierdzają transakcji - są wywoływane
+    przez DatabaseManager w tej samej transakcji co zmiana osób i relacji.
+    """
+    
+    PERSONS_TABLE = 'gedcom_osoby'
+    FAMILIES_TABLE = 'gedcom_rodziny'
+    
+    def __init__(self, connection: sqlite3.Connection):
+        """
+        Inicjalizacja indeksu
+        
+        Args:
+            connection: Połączenie z bazą danych SQLite
+        """
+        self.connection = connection
+        self.create_schema()
+    
+    def create_schema(self):
+        """Tworzy tabele indeksu i wyzwalacz usuwania osób"""
+        cursor = self.connection.cursor()
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {self.PERSONS_TABLE} (
+                zrodlo TEXT NOT NULL,
+                xref TEXT NOT NULL,
+                osoba_id INTEGER NOT NULL,
+                skrot TEXT NOT NULL,
+                PRIMARY KEY (zrodlo, xref)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute(f'''
+            CREATE INDEX IF NOT EXISTS idx_gedcom_osoby_osoba
+            ON {self.PERSONS_TABLE} (osoba_id)
+        ''')
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {self.FAMILIES_TABLE} (
+                zrodlo TEXT NOT NULL,
+                xref TEXT NOT NULL,
+                maz TEXT,
+                zona TEXT,
+                dzieci TEXT NOT NULL,
+                PRIMARY KEY (zrodlo, xref)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS gedcom_osoby_delete
+            AFTER DELETE ON osoby
+            BEGIN
+                DELETE FROM {self.PERSONS_TABLE} WHERE osoba_id = OLD.id;
+            END
+        ''')
+        self.connection.commit()
+    
+    def persons(self, source: str) -> Dict[str, Tuple[int, str]]:
+        """
+        Zwraca osoby zsynchronizowane ze źródła
+        
+        Args:
+            source: Nazwa źródła
+        
+        Returns:
+            Słownik xref -> (ID osoby, skrót treści rekordu)
+        """
+        cursor = self.connection.cursor()
+        cursor.execute(f'SELECT xref, osoba_id, skrot FROM {self.PERSONS_TABLE} WHERE zrodlo = ?',
+                       (source,))
+        return {xref: (person_id, digest) for xref, person_id, digest in cursor.fetchall()}
+    
+    def families(self, source: str) -> Dict[str, FamilyMembers]:
+        """
+        Zwraca rodziny zsynchronizowane ze źródła
+        
+        Args:
+            source: Nazwa źródła
+        
+        Returns:
+            Słownik xref -> (mąż, żona, dzieci)
+        """
+        cursor = self.connection.cursor()
+        cursor.execute(f'SELECT xref, maz, zona, dzieci FROM {self.FAMILIES_TABLE} WHERE zrodlo = ?',
+                       (source,))
+        return {xref: (husband, wife, tuple(children.split()))
+                for xref, husband, wife, children in cursor.fetchall()}
+    
+    def store_persons(self, source: str, persons: Iterable[Tuple[str, int, str]]):
+        """
+        Zapisuje lub zastępuje wpisy osób
+        
+        Args:
+            source: Nazwa źródła
+            persons: Krotki (xref, ID osoby, skrót treści rekordu)
+        """
+        self.connection.executemany(f'''
+            INSERT OR REPLACE INTO {self.PERSONS_TABLE} (zrodlo, xref, osoba_id, skrot)
+            VALUES (?, ?, ?, ?)
+        ''', ((source, *person) for person in persons))
+    
+    def remove_persons(self, source: str, xrefs: Iterable[str]):
+        """
+        Usuwa wpisy osób (same osoby pozostają w bazie)
+        
+        Args:
+            source: Nazwa źródła
+            xrefs: Identyfikatory rekordów w pliku źródłowym
+        """
+        self.connection.executemany(f'DELETE FROM {self.PERSONS_TABLE} WHERE zrodlo = ? AND xref = ?',
+                                    ((source, xref) for xref in xrefs))
+    
+    def unmapped(self, person_ids: Iterable[int]) -> List[int]:
+        """
+        Zwraca osoby, do których nie odwołuje się żaden wpis indeksu
+        
+        Args:
+            person_ids: ID osób
+        
+        Returns:
+            ID osób bez wpisów w żadnym źródle (bez powtórzeń)
+        """
+        cursor = self.connection.cursor()
+        return [person_id for person_id in dict.fromkeys(person_ids)
+                if cursor.execute(f'SELECT 1 FROM {self.PERSONS_TABLE} WHERE osoba_id = ? LIMIT 1',
+                                  (person_id,)).fetchone() is None]
+    
+    def store_families(self, source: str, families: Iterable[Tuple[str, FamilyMembers]]):
+        """
+        Zapisuje lub zastępuje wpisy rodzin
+        
+        Args:
+            source: Nazwa źródła
+            families: Krotki (xref, (mąż, żona, dzieci))
+        """
+        self.connection.executemany(f'''
+            INSERT OR REPLACE INTO {self.FAMILIES_TABLE} (zrodlo, xref, maz, zona, dzieci)
+            VALUES (?, ?, ?, ?, ?)
+        ''', ((source, xref, husband, wife, ' '.join(children))
+              for xref, (husband, wife, children) in families))
+    
+    def remove_families(self, source: str, xrefs: Iterable[str]):
+        """
+        Usuwa wpisy rodzin
+        
+        Args:
+            source: Nazwa źródła
+            xrefs: Identyfikatory rodzin w pliku źródłowym
+        """
+        self.connection.executemany(f'DELETE FROM {self.FAMILIES_TABLE} WHERE zrodlo = ? AND xref = ?',
+                                    ((source, xref) for xref in xrefs))
+    
+    def reassign_person(self, old_id: int, new_id: int):
+        """
+        Przenosi wpisy osoby na inną osobę (przy scalaniu duplikatów)
+        
+        Args:
+            old_id: ID osoby usuwanej
+            new_id: ID osoby zachowywanej
+        """
+        self.connection.execute(f'UPDATE {self.PERSONS_TABLE} SET osoba_id = ? WHERE osoba_id = ?',
+                                (new_id, old_id))
+
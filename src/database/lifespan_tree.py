@@ -0,0 +1,198 @@
+"""
+LifespanTree - Indeks przedziałów życia osób oparty na R*Tree SQLite
+"""
+
+import sqlite3
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+
+class LifespanTree:
+    """
+    Indeks przedziałów [rok urodzenia, rok śmierci] w wirtualnej tabeli R*Tree
+    
+    Tabela jest utrzymywana przez wyzwalacze na osoby, więc zapytania
+    "kto żył w roku X" i "czyje życie pokrywało się z życiem danej osoby"
+    nie wymagają pobierania wszystkich osób i parsowania dat w Pythonie.
+    Lata są wyliczane z kluczy sortowania dat (urodzenie_klucz, smierc_klucz),
+    więc indeksowane są tylko osoby z rozpoznawalną datą urodzenia; osoby
+    bez daty śmierci mają koniec przedziału równy OPEN_END.
+    """
+    
+    TABLE = 'osoby_lata'
+    
+    # Koniec przedziału osób bez daty śmierci (żyjących lub o nieznanej śmierci)
+    OPEN_END = 9999
+    
+    def __init__(self, connection: sqlite3.Connection):
+        """
+        Inicjalizacja indeksu
+        
+        Args:
+            connection: Połączenie z bazą danych SQLite
+        """
+        self.connection = connection
+        if self.create_schema():
+            self.rebuild()
+    
+    TRIGGERS = ('osoby_lata_insert', 'osoby_lata_delete', 'osoby_lata_update')
+    
+    @classmethod
+    def _bounds(cls, row: str) -> str:
+        """Wyrażenie SQL z początkiem i końcem przedziału dla wiersza osoby"""
+        birth = f'{row}.urodzenie_klucz / 10000'
+        death = f'{row}.smierc_klucz / 10000'
+        # Błędne dane (śmierć przed urodzeniem) nie mogą dać pustego przedziału
+        return f"{birth}, COALESCE(MAX({death}, {birth}), {cls.OPEN_END})"
+    
+    @classmethod
+    def _has_birth_year(cls, row: str) -> str:
+        """Warunek SQL: osoba ma rozpoznawalny rok urodzenia"""
+        return f"{row}.urodzenie_klucz IS NOT NULL"
+    
+    def create_schema(self) -> bool:
+        """
+        Tworzy tabelę R*Tree i wyzwalacze aktualizujące indeks
+        
+        Returns:
+            True jeśli tabela lub wyzwalacze zostały utworzone (wymaga wypełnienia)
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                       (self.TABLE,))
+        created = cursor.fetchone() is None
+        
+        # Wyzwalacze z wcześniejszej wersji wyliczały lata z tekstu dat
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?",
+                       ('osoby_lata_update',))
+        row = cursor.fetchone()
+        if row and 'urodzenie_klucz' not in row[0]:
+            for trigger in self.TRIGGERS:
+                cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+            created = True
+        
+        cursor.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS {self.TABLE}
+            USING rtree(id, rok_od, rok_do)
+        ''')
+        
+        self._create_triggers(cursor)
+        self.connection.commit()
+        return created
+    
+    def _create_triggers(self, cursor: sqlite3.Cursor):
+        """Tworzy wyzwalacze przenoszące zmiany lat osób do indeksu"""
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS osoby_lata_insert
+            AFTER INSERT ON osoby
+            WHEN {self._has_birth_year('NEW')}
+            BEGIN
+                INSERT INTO {self.TABLE} (id, rok_od, rok_do)
+                VALUES (NEW.id, {self._bounds('NEW')});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS osoby_lata_delete
+            AFTER DELETE ON osoby
+            BEGIN
+                DELETE FROM {self.TABLE} WHERE id = OLD.id;
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS osoby_lata_update
+            AFTER UPDATE OF urodzenie_klucz, smierc_klucz ON osoby
+            BEGIN
+                DELETE FROM {self.TABLE} WHERE id = OLD.id;
+                INSERT INTO {self.TABLE} (id, rok_od, rok_do)
+                SELECT NEW.id, {self._bounds('NEW')}
+                WHERE {self._has_birth_year('NEW')};
+            END
+        ''')
+    
+    def rebuild(self):
+        """Wypełnia indeks od nowa na podstawie tabeli osoby"""
+        self._fill(self.connection.cursor())
+        self.connection.commit()
+    
+    def _fill(self, cursor: sqlite3.Cursor):
+        """Zastępuje zawartość indeksu przedziałami wszystkich osób"""
+        cursor.execute(f'DELETE FROM {self.TABLE}')
+        cursor.execute(f'''
+            INSERT INTO {self.TABLE} (id, rok_od, rok_do)
+            SELECT o.id, {self._bounds('o')} FROM osoby o
+            WHERE {self._has_birth_year('o')}
+        ''')
+    
+    @contextmanager
+    def suspended(self) -> Iterator[None]:
+        """
+        Wstrzymuje wyzwalacze indeksu na czas operacji zbiorczej
+        
+        Indeks jest wypełniany raz po operacji zamiast wiersz po wierszu.
+        Wyzwalacze są usuwane w otwartej transakcji (jak w
+        ChangeJournal.suspended), więc jej wycofanie je przywraca.
+        """
+        if not self.connection.in_transaction:
+            self.connection.execute('BEGIN')
+        for trigger in self.TRIGGERS:
+            self.connection.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        yield
+        
+        cursor = self.connection.cursor()
+        self._create_triggers(cursor)
+        self._fill(cursor)
+    
+    def alive_between(self, year_from: int, year_to: int) -> List[dict]:
+        """
+        Pobiera osoby, których życie przypada choć częściowo na przedział lat
+        
+        Args:
+            year_from: Pierwszy rok przedziału
+            year_to: Ostatni rok przedziału
+        
+        Returns:
+            Lista słowników z danymi osób (uporządkowana wg nazwiska i imienia)
+        """
+        cursor = self.connection.cursor()
+        cursor.execute(f'''
+            SELECT o.* FROM {self.TABLE} l
+            JOIN osoby o ON o.id = l.id
+            WHERE l.rok_od <= ? AND l.rok_do >= ?
+            ORDER BY o.nazwisko, o.imie
+        ''', (year_to, year_from))
+        return [dict(row) for row in cursor.fetchall()]
+    
+    def overlapping(self, person_id: int) -> List[dict]:
+        """
+        Pobiera osoby, których życie pokrywało się z życiem danej osoby
+        
+        Args:
+            person_id: ID osoby
+        
+        Returns:
+            Lista słowników z danymi osób (pusta jeśli osoba nie ma roku urodzenia)
+        """
+        cursor = self.connection.cursor()
+        cursor.execute(f'''
+            SELECT o.* FROM {self.TABLE} p
+            JOIN {self.TABLE} l ON l.rok_od <= p.rok_do AND l.rok_do >= p.rok_od
+            JOIN osoby o ON o.id = l.id
+            WHERE p.id = ? AND l.id != p.id
+            ORDER BY o.nazwisko, o.imie
+        ''', (person_id,))
+        return [dict(row) for row in cursor.fetchall()]
+    
+    def get_bounds(self, person_id: int) -> Optional[tuple]:
+        """
+        Zwraca przedział życia osoby zapisany w indeksie
+        
+        Args:
+            person_id: ID osoby
+        
+        Returns:
+            Krotka (rok_od, rok_do) lub None jeśli osoba nie jest indeksowana
+        """
+        cursor = self.connection.cursor()
+        cursor.execute(f'SELECT rok_od, rok_do FROM {self.TABLE} WHERE id = ?', (person_id,))
+        row = cursor.fetchone()
+        return (int(row[0]), int(row[1])) if row else None
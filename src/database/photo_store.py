@@ -0,0 +1,240 @@
+"""
+PhotoStore - Magazyn zdjęć adresowany zawartością z licznikiem odwołań
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+from typing import Optional
+
+from ..utils.hashing import file_hash
+from .change_journal import ChangeJournal
+
+
+class PhotoStore:
+    """
+    Przechowuje zdjęcia pod nazwami wynikającymi ze skrótu zawartości
+    
+    Każdy plik ma wiersz w tabeli zdjecia. Liczba odwołań jest utrzymywana
+    przez wyzwalacze na osoby.zdjecie_sciezka, więc identyczne zdjęcie
+    przypisane wielu osobom jest przechowywane raz, a pliki bez odwołań
+    usuwa collect_garbage(). Usuwane są tylko pliki z katalogu magazynu -
+    zdjęcia spoza niego (np. ze wspólnego katalogu "photos" używanego przez
+    wcześniejsze wersje) mogą należeć do innych baz.
+    """
+    
+    TABLE = 'zdjecia'
+    
+    def __init__(self, connection: sqlite3.Connection, photos_dir: str, journal: ChangeJournal):
+        """
+        Inicjalizacja magazynu zdjęć
+        
+        Args:
+            connection: Połączenie z bazą danych SQLite
+            photos_dir: Katalog przechowywania zdjęć
+            journal: Dziennik zmian powiadamiany o przejęciu istniejących zdjęć
+        """
+        self.connection = connection
+        self.photos_dir = photos_dir
+        self.journal = journal
+        if self.create_schema():
+            self.adopt_existing()
+    
+    def create_schema(self) -> bool:
+        """
+        Tworzy tabelę zdjęć i wyzwalacze liczące odwołania
+        
+        Returns:
+            True jeśli tabela została utworzona (pierwsze uruchomienie)
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                       (self.TABLE,))
+        created = cursor.fetchone() is None
+        
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                hash TEXT PRIMARY KEY,
+                sciezka TEXT NOT NULL UNIQUE,
+                rozmiar INTEGER NOT NULL,
+                liczba_odwolan INTEGER NOT NULL DEFAULT 0,
+                dodano TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute(f'''
+            CREATE INDEX IF NOT EXISTS idx_zdjecia_odwolania
+            ON {self.TABLE} (liczba_odwolan)
+        ''')
+        
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS zdjecia_osoby_insert
+            AFTER INSERT ON osoby
+            WHEN NEW.zdjecie_sciezka IS NOT NULL
+            BEGIN
+                UPDATE {self.TABLE} SET liczba_odwolan = liczba_odwolan + 1
+                WHERE sciezka = NEW.zdjecie_sciezka;
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS zdjecia_osoby_delete
+            AFTER DELETE ON osoby
+            WHEN OLD.zdjecie_sciezka IS NOT NULL
+            BEGIN
+                UPDATE {self.TABLE} SET liczba_odwolan = liczba_odwolan - 1
+                WHERE sciezka = OLD.zdjecie_sciezka;
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS zdjecia_osoby_update
+            AFTER UPDATE OF zdjecie_sciezka ON osoby
+            WHEN OLD.zdjecie_sciezka IS NOT NEW.zdjecie_sciezka
+            BEGIN
+                UPDATE {self.TABLE} SET liczba_odwolan = liczba_odwolan - 1
+                WHERE sciezka = OLD.zdjecie_sciezka;
+                UPDATE {self.TABLE} SET liczba_odwolan = liczba_odwolan + 1
+                WHERE sciezka = NEW.zdjecie_sciezka;
+            END
+        ''')
+        
+        self.connection.commit()
+        return created
+    
+    def add(self, path: str) -> str:
+        """
+        Dodaje zdjęcie do magazynu (bez zatwierdzania transakcji)
+        
+        Zdjęcie o tej samej zawartości jest kopiowane tylko raz. Odwołanie
+        powstaje dopiero po zapisaniu zwróconej ścieżki w osoby.zdjecie_sciezka.
+        
+        Args:
+            path: Ścieżka do zdjęcia źródłowego
+        
+        Returns:
+            Ścieżka zdjęcia w magazynie
+        """
+        cursor = self.connection.cursor()
+        
+        # Zdjęcie już znajdujące się w magazynie (np. przy edycji osoby)
+        cursor.execute(f'SELECT sciezka FROM {self.TABLE} WHERE sciezka = ?', (path,))
+        if cursor.fetchone():
+            return path
+        
+        digest = file_hash(path)
+        cursor.execute(f'SELECT sciezka FROM {self.TABLE} WHERE hash = ?', (digest,))
+        row = cursor.fetchone()
+        if row and os.path.exists(row[0]):
+            return row[0]
+        
+        extension = os.path.splitext(path)[1].lower()
+        dest_path = os.path.join(self.photos_dir, digest + extension)
+        self._copy(path, dest_path)
+        
+        cursor.execute(f'''
+            INSERT OR REPLACE INTO {self.TABLE} (hash, sciezka, rozmiar, liczba_odwolan)
+            VALUES (?, ?, ?, (SELECT COUNT(*) FROM osoby WHERE zdjecie_sciezka = ?))
+        ''', (digest, dest_path, os.path.getsize(dest_path), dest_path))
+        return dest_path
+    
+    def _copy(self, path: str, dest_path: str):
+        """Kopiuje plik przez plik tymczasowy (przerwana kopia nie zostawia śmieci)"""
+        if os.path.exists(dest_path):
+            return
+        
+        os.makedirs(self.photos_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.photos_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            shutil.copy2(path, temp_path)
+            os.replace(temp_path, dest_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+    
+    def adopt_existing(self):
+        """
+        Przenosi do magazynu zdjęcia zapisane przed jego wprowadzeniem
+        
+        Osoby wskazujące na istniejące pliki otrzymują ścieżki w magazynie;
+        oryginalne pliki pozostają nienaruszone. Obserwatorzy dziennika
+        (np. pamięć podręczna osób) są powiadamiani o zmienionych ścieżkach.
+        """
+        cursor = self.connection.cursor()
+        cursor.execute('''
+            SELECT DISTINCT zdjecie_sciezka FROM osoby
+            WHERE zdjecie_sciezka IS NOT NULL AND zdjecie_sciezka != ''
+        ''')
+        for (path,) in cursor.fetchall():
+            if not os.path.isfile(path):
+                continue
+            stored_path = self.add(path)
+            if stored_path != path:
+                cursor.execute('UPDATE osoby SET zdjecie_sciezka = ? WHERE zdjecie_sciezka = ?',
+                               (stored_path, path))
+        self.connection.commit()
+        self.journal.notify()
+    
+    def get_reference_count(self, path: str) -> Optional[int]:
+        """
+        Zwraca liczbę osób odwołujących się do zdjęcia
+        
+        Args:
+            path: Ścieżka zdjęcia w magazynie
+        
+        Returns:
+            Liczba odwołań lub None, jeśli zdjęcia nie ma w magazynie
+        """
+        cursor = self.connection.cursor()
+        cursor.execute(f'SELECT liczba_odwolan FROM {self.TABLE} WHERE sciezka = ?', (path,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+    
+    def collect_garbage(self) -> int:
+        """
+        Usuwa zdjęcia, do których nie odwołuje się żadna osoba (bez zatwierdzania)
+        
+        Returns:
+            Liczba usuniętych zdjęć
+        """
+        cursor = self.connection.cursor()
+        cursor.execute(f'SELECT hash, sciezka FROM {self.TABLE} WHERE liczba_odwolan <= 0')
+        removed = 0
+        
+        for digest, path in cursor.fetchall():
+            try:
+                if self._is_stored(path):
+                    os.unlink(path)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                # Plik zablokowany - spróbujemy przy następnym odśmiecaniu
+                continue
+            cursor.execute(f'DELETE FROM {self.TABLE} WHERE hash = ?', (digest,))
+            removed += 1
+        
+        return removed
+    
+    def _is_stored(self, path: str) -> bool:
+        """Sprawdza, czy plik leży w katalogu tego magazynu"""
+        return os.path.dirname(os.path.abspath(path)) == os.path.abspath(self.photos_dir)
+    
+    def get_stats(self) -> dict:
+        """
+        Zwraca statystyki magazynu
+        
+        Returns:
+            Słownik z liczbą zdjęć, odwołań i zajętością dysku
+        """
+        cursor = self.connection.cursor()
+        cursor.execute(f'''
+            SELECT COUNT(*), COALESCE(SUM(liczba_odwolan), 0), COALESCE(SUM(rozmiar), 0),
+                   COALESCE(SUM(rozmiar * MAX(liczba_odwolan - 1, 0)), 0)
+            FROM {self.TABLE}
+        ''')
+        photos, references, size, saved = cursor.fetchone()
+        return {
+            'zdjecia': photos,
+            'odwolania': references,
+            'rozmiar': size,
+            'zaoszczedzone': saved
+        }
@@ -0,0 +1,397 @@
+"""
+PlaceRegistry - Słownik miejsc z nazwami kanonicznymi, wariantami zapisu i współrzędnymi
+"""
+
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Górna granica zakresu kluczy zaczynających się od danego prefiksu
+_KEY_RANGE_END = '\U0010ffff'
+
+
+def place_key(name: Optional[str]) -> Optional[str]:
+    """
+    Wyznacza klucz porównania nazwy miejsca
+    
+    Różnice wielkości liter i białych znaków (np. "Warszawa" i "warszawa ")
+    nie rozróżniają miejsc; inne warianty zapisu (np. "W-wa") łączy się
+    z miejscem jako aliasy.
+    
+    Returns:
+        Klucz lub None dla pustej nazwy
+    """
+    if name is None:
+        return None
+    return ' '.join(str(name).split()).casefold() or None
+
+
+class PlaceRegistry:
+    """
+    Znormalizowana tabela miejsc, do której odwołują się osoby
+    
+    Każde miejsce ma nazwę kanoniczną, opcjonalne współrzędne (podawane
+    lokalnie, bez usług geokodowania) i zbiór kluczy aliasów. Miejsca
+    urodzenia i śmierci osób wskazują na nie kolumnami miejsce_urodzenia_id
+    i miejsce_smierci_id (indeksowanymi), a tekst wpisany przez użytkownika
+    lub odczytany z pliku GEDCOM pozostaje w kolumnach tekstowych.
+    """
+    
+    TABLE = 'miejsca'
+    ALIAS_TABLE = 'miejsca_aliasy'
+    MAPPING_TABLE = 'miejsca_teksty'
+    
+    # Kolumny osoby: tekst miejsca -> klucz obcy
+    PERSON_COLUMNS = {'miejsce_urodzenia': 'miejsce_urodzenia_id',
+                      'miejsce_smierci': 'miejsce_smierci_id'}
+    
+    def __init__(self, connection: sqlite3.Connection):
+        """
+        Inicjalizacja słownika miejsc
+        
+        Args:
+            connection: Połączenie z bazą danych SQLite
+        """
+        self.connection = connection
+        self.create_schema()
+    
+    def create_schema(self):
+        """Tworzy tabele miejsc i aliasów"""
+        cursor = self.connection.cursor()
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                nazwa TEXT NOT NULL,
+                szerokosc REAL,
+                dlugosc REAL
+            )
+        ''')
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {self.ALIAS_TABLE} (
+                klucz TEXT PRIMARY KEY,
+                miejsce_id INTEGER NOT NULL REFERENCES {self.TABLE} (id) ON DELETE CASCADE
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute(f'''
+            CREATE INDEX IF NOT EXISTS idx_miejsca_aliasy_miejsce
+            ON {self.ALIAS_TABLE} (miejsce_id)
+        ''')
+        cursor.execute(f'''
+            CREATE TEMP TABLE IF NOT EXISTS {self.MAPPING_TABLE} (
+                tekst TEXT PRIMARY KEY,
+                miejsce_id INTEGER
+            )
+        ''')
+        self.connection.commit()
+    
+    def lookup(self, name: Optional[str]) -> Optional[int]:
+        """
+        Zwraca ID miejsca o nazwie lub aliasie (bez tworzenia nowego)
+        
+        Args:
+            name: Nazwa miejsca w dowolnym wariancie zapisu
+        
+        Returns:
+            ID miejsca lub None
+        """
+        key = place_key(name)
+        if key is None:
+            return None
+        row = self.connection.execute(
+            f'SELECT miejsce_id FROM {self.ALIAS_TABLE} WHERE klucz = ?', (key,)).fetchone()
+        return row[0] if row else None
+    
+    def resolve(self, name: Optional[str]) -> Optional[int]:
+        """
+        Zwraca ID miejsca, dodając je przy pierwszym wystąpieniu nazwy
+        
+        Nie zatwierdza transakcji - miejsce jest zapisywane razem z osobą.
+        
+        Args:
+            name: Nazwa miejsca
+        
+        Returns:
+            ID miejsca lub None dla pustej nazwy
+        """
+        place_id = self.lookup(name)
+        if place_id is not None or place_key(name) is None:
+            return place_id
+        
+        cursor = self.connection.cursor()
+        cursor.execute(f'INSERT INTO {self.TABLE} (nazwa) VALUES (?)', (' '.join(str(name).split()),))
+        place_id = cursor.lastrowid
+        cursor.execute(f'INSERT INTO {self.ALIAS_TABLE} (klucz, miejsce_id) VALUES (?, ?)',
+                       (place_key(name), place_id))
+        return place_id
+    
+    def resolve_many(self, names: Iterable[Optional[str]]) -> Dict[str, int]:
+        """
+        Zwraca ID miejsc dla wielu nazw (każda różna nazwa jest wyszukiwana raz)
+        
+        Returns:
+            Słownik nazwa -> ID miejsca (bez pustych nazw)
+        """
+        places = {}
+        for name in names:
+            if name is not None and name not in places:
+                place_id = self.resolve(name)
+                if place_id is not None:
+                    places[name] = place_id
+        return places
+    
+    def link_persons(self) -> int:
+        """
+        Wiąże wszystkie osoby z miejscami na podstawie kolumn tekstowych
+        
+        Każda różna nazwa jest rozpoznawana raz, a klucze obce są ustawiane
+        zbiorczym UPDATE (migracja istniejących baz). Nazwy różniące się
+        tylko wielkością liter lub spacjami trafiają do jednego miejsca.
+        Nie zatwierdza transakcji.
+        
+        Returns:
+            Liczba różnych nazw miejsc
+        """
+        cursor = self.connection.cursor()
+        names = [row[0] for row in cursor.execute('''
+            SELECT miejsce_urodzenia FROM osoby WHERE miejsce_urodzenia IS NOT NULL
+            UNION
+            SELECT miejsce_smierci FROM osoby WHERE miejsce_smierci IS NOT NULL
+        ''').fetchall()]
+        places = self.resolve_many(names)
+        
+        cursor.execute(f'DELETE FROM {self.MAPPING_TABLE}')
+        cursor.executemany(f'INSERT INTO {self.MAPPING_TABLE} (tekst, miejsce_id) VALUES (?, ?)',
+                           places.items())
+        for text_column, id_column in self.PERSON_COLUMNS.items():
+            cursor.execute(f'''
+                UPDATE osoby SET {id_column} = (
+                    SELECT miejsce_id FROM {self.MAPPING_TABLE} WHERE tekst = osoby.{text_column}
+                )
+                WHERE {text_column} IS NOT NULL
+            ''')
+        cursor.execute(f'DELETE FROM {self.MAPPING_TABLE}')
+        return len(names)
+    
+    def dump(self) -> Tuple[List[tuple], List[tuple]]:
+        """
+        Zwraca wszystkie miejsca i aliasy (np. do zapisu migawki)
+        
+        Returns:
+            Krotka (miejsca, aliasy): miejsca jako krotki (id, nazwa,
+            szerokosc, dlugosc) rosnąco wg ID, aliasy jako krotki
+            (klucz, miejsce_id) wg klucza
+        """
+        places = self.connection.execute(
+            f'SELECT id, nazwa, szerokosc, dlugosc FROM {self.TABLE} ORDER BY id').fetchall()
+        aliases = self.connection.execute(
+            f'SELECT klucz, miejsce_id FROM {self.ALIAS_TABLE} ORDER BY klucz').fetchall()
+        return [tuple(row) for row in places], [tuple(row) for row in aliases]
+    
+    def restore(self, places: Iterable[tuple], aliases: Iterable[tuple]):
+        """
+        Zastępuje słownik miejsc wierszami w układzie dump (z zachowaniem ID)
+        
+        Wywoływane przy odtwarzaniu pustej bazy, więc żadna osoba nie
+        odwołuje się do usuwanych miejsc. Nie zatwierdza transakcji.
+        """
+        cursor = self.connection.cursor()
+        cursor.execute(f'DELETE FROM {self.ALIAS_TABLE}')
+        cursor.execute(f'DELETE FROM {self.TABLE}')
+        cursor.executemany(f'''
+            INSERT INTO {self.TABLE} (id, nazwa, szerokosc, dlugosc) VALUES (?, ?, ?, ?)
+        ''', places)
+        cursor.executemany(f'INSERT INTO {self.ALIAS_TABLE} (klucz, miejsce_id) VALUES (?, ?)',
+                           aliases)
+    
+    def get(self, place_id: int) -> Optional[dict]:
+        """
+        Pobiera miejsce wraz z kluczami aliasów
+        
+        Returns:
+            Słownik {id, nazwa, szerokosc, dlugosc, aliasy} lub None
+        """
+        cursor = self.connection.execute(
+            f'SELECT id, nazwa, szerokosc, dlugosc FROM {self.TABLE} WHERE id = ?', (place_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        place = dict(zip([column[0] for column in cursor.description], row))
+        place['aliasy'] = [alias for alias, in self.connection.execute(
+            f'SELECT klucz FROM {self.ALIAS_TABLE} WHERE miejsce_id = ? ORDER BY klucz', (place_id,))]
+        return place
+    
+    def find(self, query: str = '', limit: Optional[int] = 50) -> List[dict]:
+        """
+        Wyszukuje miejsca, których nazwa lub alias zaczyna się od frazy
+        
+        Zapytanie jest zakresem klucza głównego tabeli aliasów, więc nie
+        przegląda wszystkich miejsc ani osób. Pomijane są miejsca, do których
+        nie odwołuje się już żadna osoba (np. poprawiona literówka); ich
+        współrzędne i aliasy zostają w tabeli, gdy nazwa zostanie wpisana ponownie.
+        
+        Args:
+            query: Początek nazwy (bez rozróżniania wielkości liter)
+            limit: Maksymalna liczba miejsc (None = wszystkie)
+        
+        Returns:
+            Lista słowników {id, nazwa, szerokosc, dlugosc} wg nazwy
+        """
+        prefix = place_key(query) or ''
+        sql = f'''
+            SELECT id, nazwa, szerokosc, dlugosc FROM {self.TABLE}
+            WHERE id IN (SELECT miejsce_id FROM {self.ALIAS_TABLE} WHERE klucz >= ? AND klucz < ?)
+              AND (EXISTS (SELECT 1 FROM osoby WHERE miejsce_urodzenia_id = {self.TABLE}.id)
+                   OR EXISTS (SELECT 1 FROM osoby WHERE miejsce_smierci_id = {self.TABLE}.id))
+            ORDER BY nazwa, id
+        '''
+        params = [prefix, prefix + _KEY_RANGE_END]
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        cursor = self.connection.execute(sql, params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def persons(self, place_id: int) -> List[dict]:
+        """Osoby urodzone lub zmarłe w miejscu (wg indeksów kluczy obcych)"""
+        cursor = self.connection.execute('''
+            SELECT * FROM osoby WHERE miejsce_urodzenia_id = ? OR miejsce_smierci_id = ?
+            ORDER BY nazwisko, imie
+        ''', (place_id, place_id))
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def counts(self, limit: Optional[int] = None) -> List[dict]:
+        """
+        Zwraca liczbę urodzeń i zgonów w każdym miejscu
+        
+        Liczności są zliczane z indeksów kluczy obcych osób (GROUP BY
+        bez odczytu wierszy osób).
+        
+        Args:
+            limit: Maksymalna liczba miejsc (None = wszystkie)
+        
+        Returns:
+            Lista słowników {id, nazwa, urodzenia, zgony} od miejsc
+            z największą liczbą osób
+        """
+        sql = f'''
+            SELECT m.id, m.nazwa,
+                   COALESCE(u.liczba, 0) AS urodzenia, COALESCE(s.liczba, 0) AS zgony
+            FROM {self.TABLE} m
+            LEFT JOIN (SELECT miejsce_urodzenia_id AS id, COUNT(*) AS liczba FROM osoby
+                       WHERE miejsce_urodzenia_id IS NOT NULL
+                       GROUP BY miejsce_urodzenia_id) u ON u.id = m.id
+            LEFT JOIN (SELECT miejsce_smierci_id AS id, COUNT(*) AS liczba FROM osoby
+                       WHERE miejsce_smierci_id IS NOT NULL
+                       GROUP BY miejsce_smierci_id) s ON s.id = m.id
+            WHERE u.liczba IS NOT NULL OR s.liczba IS NOT NULL
+            ORDER BY urodzenia + zgony DESC, m.nazwa
+        '''
+        params = ()
+        if limit:
+            sql += ' LIMIT ?'
+            params = (limit,)
+        cursor = self.connection.execute(sql, params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def _require(self, place_id: int):
+        """Zgłasza ValueError, jeśli miejsce nie istnieje"""
+        if self.connection.execute(f'SELECT 1 FROM {self.TABLE} WHERE id = ?',
+                                   (place_id,)).fetchone() is None:
+            raise ValueError(f"Nie znaleziono miejsca o ID {place_id}")
+    
+    def add_alias(self, place_id: int, alias: str) -> int:
+        """
+        Dodaje wariant zapisu nazwy miejsca
+        
+        Jeśli wariant należy już do innego miejsca, tamto miejsce jest
+        scalane z podanym (np. alias "W-wa" dla Warszawy scala osobne
+        miejsce "W-wa"). Nie zatwierdza transakcji.
+        
+        Returns:
+            Liczba osób przepiętych ze scalonego miejsca
+        
+        Raises:
+            ValueError: Gdy miejsce nie istnieje lub alias jest pusty
+        """
+        self._require(place_id)
+        key = place_key(alias)
+        if key is None:
+            raise ValueError("Alias miejsca nie może być pusty")
+        
+        other_id = self.lookup(alias)
+        if other_id == place_id:
+            return 0
+        if other_id is not None:
+            return self.merge(place_id, other_id)
+        self.connection.execute(f'INSERT INTO {self.ALIAS_TABLE} (klucz, miejsce_id) VALUES (?, ?)',
+                                (key, place_id))
+        return 0
+    
+    def merge(self, keep_id: int, remove_id: int) -> int:
+        """
+        Scala miejsce z zachowywanym: aliasy i osoby przechodzą na keep_id
+        
+        Brakujące współrzędne są uzupełniane ze scalanego miejsca.
+        Nie zatwierdza transakcji.
+        
+        Returns:
+            Liczba przepiętych osób
+        
+        Raises:
+            ValueError: Gdy miejsca nie istnieją lub to to samo miejsce
+        """
+        if keep_id == remove_id:
+            raise ValueError("Nie można scalić miejsca z samym sobą")
+        self._require(keep_id)
+        self._require(remove_id)
+        
+        cursor = self.connection.cursor()
+        cursor.execute(f'''
+            UPDATE {self.TABLE} SET
+                szerokosc = (SELECT szerokosc FROM {self.TABLE} WHERE id = :remove),
+                dlugosc = (SELECT dlugosc FROM {self.TABLE} WHERE id = :remove)
+            WHERE id = :keep AND szerokosc IS NULL
+        ''', {'keep': keep_id, 'remove': remove_id})
+        cursor.execute(f'UPDATE {self.ALIAS_TABLE} SET miejsce_id = ? WHERE miejsce_id = ?',
+                       (keep_id, remove_id))
+        moved = 0
+        for id_column in self.PERSON_COLUMNS.values():
+            cursor.execute(f'UPDATE osoby SET {id_column} = ? WHERE {id_column} = ?',
+                           (keep_id, remove_id))
+            moved += cursor.rowcount
+        cursor.execute(f'DELETE FROM {self.TABLE} WHERE id = ?', (remove_id,))
+        return moved
+    
+    def update(self, place_id: int, nazwa: Optional[str] = None,
+               szerokosc: Optional[float] = None, dlugosc: Optional[float] = None):
+        """
+        Zmienia nazwę kanoniczną lub współrzędne miejsca
+        
+        Nowa nazwa staje się również aliasem miejsca. Nie zatwierdza transakcji.
+        
+        Args:
+            place_id: ID miejsca
+            nazwa: Nowa nazwa kanoniczna (None = bez zmiany)
+            szerokosc: Szerokość geograficzna w stopniach (None = bez zmiany)
+            dlugosc: Długość geograficzna w stopniach (None = bez zmiany)
+        
+        Raises:
+            ValueError: Gdy miejsce nie istnieje lub współrzędne są poza zakresem
+        """
+        self._require(place_id)
+        if szerokosc is not None and not -90 <= szerokosc <= 90:
+            raise ValueError(f"Szerokość geograficzna poza zakresem: {szerokosc}")
+        if dlugosc is not None and not -180 <= dlugosc <= 180:
+            raise ValueError(f"Długość geograficzna poza zakresem: {dlugosc}")
+        
+        if nazwa is not None:
+            self.add_alias(place_id, nazwa)
+            self.connection.execute(f'UPDATE {self.TABLE} SET nazwa = ? WHERE id = ?',
+                                    (' '.join(nazwa.split()), place_id))
+        self.connection.execute(f'''
+            UPDATE {self.TABLE} SET szerokosc = COALESCE(?, szerokosc), dlugosc = COALESCE(?, dlugosc)
+            WHERE id = ?
+        ''', (szerokosc, dlugosc, place_id))
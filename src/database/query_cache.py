@@ -0,0 +1,127 @@
+"""
+QueryCache - Pamięć podręczna LRU dla zapytań o pojedyncze rekordy
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+
+class QueryCache:
+    """Ograniczona pamięć podręczna LRU z unieważnianiem po znacznikach"""
+    
+    def __init__(self, maxsize: int = 1024):
+        """
+        Inicjalizacja pamięci podręcznej
+        
+        Args:
+            maxsize: Maksymalna liczba przechowywanych wpisów (0 wyłącza cache)
+        """
+        self.maxsize = maxsize
+        self.entries: OrderedDict = OrderedDict()
+        self.entry_tags: Dict[Hashable, Tuple[Hashable, ...]] = {}
+        self.tag_index: Dict[Hashable, Set[Hashable]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @property
+    def enabled(self) -> bool:
+        """Czy pamięć podręczna jest włączona"""
+        return self.maxsize > 0
+    
+    def get(self, key: Hashable) -> Tuple[bool, Optional[Any]]:
+        """
+        Pobiera wpis i oznacza go jako ostatnio używany
+        
+        Args:
+            key: Klucz wpisu
+        
+        Returns:
+            Krotka (czy znaleziono, wartość)
+        """
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True, self.entries[key]
+        
+        self.misses += 1
+        return False, None
+    
+    def put(self, key: Hashable, value: Any, tags: Iterable[Hashable] = ()):
+        """
+        Zapisuje wpis, usuwając najdawniej używane po przekroczeniu limitu
+        
+        Args:
+            key: Klucz wpisu
+            value: Wartość do zapamiętania
+            tags: Znaczniki, po których wpis może zostać unieważniony
+        """
+        if not self.enabled:
+            return
+        
+        if key in self.entries:
+            self._remove(key)
+        
+        tags = tuple(set(tags))
+        self.entries[key] = value
+        self.entry_tags[key] = tags
+        for tag in tags:
+            self.tag_index.setdefault(tag, set()).add(key)
+        
+        while len(self.entries) > self.maxsize:
+            oldest_key = next(iter(self.entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+    
+    def invalidate(self, key: Hashable):
+        """
+        Usuwa pojedynczy wpis
+        
+        Args:
+            key: Klucz wpisu
+        """
+        if key in self.entries:
+            self._remove(key)
+    
+    def invalidate_tag(self, tag: Hashable):
+        """
+        Usuwa wszystkie wpisy oznaczone danym znacznikiem
+        
+        Args:
+            tag: Znacznik
+        """
+        for key in list(self.tag_index.get(tag, ())):
+            self._remove(key)
+    
+    def clear(self):
+        """Usuwa wszystkie wpisy (statystyki pozostają)"""
+        self.entries.clear()
+        self.entry_tags.clear()
+        self.tag_index.clear()
+    
+    def get_stats(self) -> dict:
+        """
+        Zwraca statystyki użycia
+        
+        Returns:
+            Słownik z liczbą trafień, chybień, usunięć i rozmiarem
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self.entries),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+    
+    def _remove(self, key: Hashable):
+        """Usuwa wpis wraz z jego powiązaniami w indeksie znaczników"""
+        del self.entries[key]
+        for tag in self.entry_tags.pop(key, ()):
+            keys = self.tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.tag_index[tag]
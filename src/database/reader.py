@@ -0,0 +1,153 @@
+"""
+DatabaseReader - Odczyt bazy bez migracji i zapisu (analizy wielu baz)
+"""
+
+import os
+import sqlite3
+from typing import Dict, List
+from urllib.request import pathname2url
+
+from ..utils.dates import parse_date
+
+
+class DatabaseReader:
+    """
+    Otwiera plik bazy tylko do odczytu i wykonuje zapytania analiz
+    
+    W odróżnieniu od DatabaseManager nie tworzy tabel pomocniczych,
+    indeksów ani wyzwalaczy i nie migruje schematu, więc nie zmienia
+    analizowanych plików i działa na nośnikach tylko do odczytu. Zapytania
+    korzystają wyłącznie z tabel osoby i relacje, a kolumny dodane przez
+    późniejsze migracje (klucze dat) są używane tylko wtedy, gdy istnieją.
+    """
+    
+    def __init__(self, db_path: str):
+        """
+        Inicjalizacja odczytu bazy
+        
+        Args:
+            db_path: Ścieżka do pliku bazy danych SQLite
+        """
+        self.db_path = db_path
+        uri = f'file:{pathname2url(os.path.abspath(db_path))}?mode=ro'
+        self.connection = sqlite3.connect(uri, uri=True)
+        self.connection.row_factory = sqlite3.Row
+        self.person_columns = {row['name'] for row in
+                               self.connection.execute('PRAGMA table_info(osoby)')}
+        if not self.person_columns:
+            raise sqlite3.DatabaseError('Brak tabeli osoby')
+    
+    def get_statistics(self) -> dict:
+        """
+        Zwraca podstawowe statystyki bazy danych
+        
+        Returns:
+            Słownik jak DatabaseManager.get_statistics
+        """
+        return read_statistics(self.connection, 'urodzenie_klucz' in self.person_columns)
+    
+    def get_surname_counts(self) -> Dict[str, int]:
+        """
+        Zwraca liczbę osób noszących każde nazwisko
+        
+        Returns:
+            Słownik nazwisko -> liczba osób (bez pustych nazwisk)
+        """
+        cursor = self.connection.execute('''
+            SELECT nazwisko, COUNT(*) FROM osoby
+            WHERE nazwisko != ''
+            GROUP BY nazwisko
+        ''')
+        return {surname: count for surname, count in cursor.fetchall()}
+    
+    def search_persons(self, query: str) -> List[dict]:
+        """
+        Wyszukuje osoby po imieniu lub nazwisku
+        
+        Args:
+            query: Fraza do wyszukania
+        
+        Returns:
+            Lista słowników z danymi osób
+        """
+        return read_persons_matching(self.connection, query)
+    
+    def close(self):
+        """Zamyka połączenie z bazą danych"""
+        self.connection.close()
+
+
+def read_statistics(connection: sqlite3.Connection, date_keys: bool = True) -> dict:
+    """
+    Wylicza liczbę osób (wg płci), relacji (wg rodzaju) i zakres dat urodzenia
+    
+    Args:
+        connection: Połączenie z bazą danych SQLite
+        date_keys: Czy tabela osoby ma kolumnę urodzenie_klucz (bez niej
+                   skrajne daty są wyznaczane po parsowaniu wszystkich dat)
+    
+    Returns:
+        Słownik statystyk
+    """
+    cursor = connection.cursor()
+    cursor.execute('''
+        SELECT COUNT(*),
+               SUM(plec = 'M'), SUM(plec = 'K'),
+               SUM(data_smierci IS NOT NULL AND data_smierci != '')
+        FROM osoby
+    ''')
+    persons, men, women, deceased = cursor.fetchone()
+    
+    if date_keys:
+        # Skrajne daty wg klucza sortowania (indeks idx_osoby_urodzenie_klucz)
+        cursor.execute('''
+            SELECT
+                (SELECT data_urodzenia FROM osoby WHERE urodzenie_klucz IS NOT NULL
+                 ORDER BY urodzenie_klucz LIMIT 1),
+                (SELECT data_urodzenia FROM osoby WHERE urodzenie_klucz IS NOT NULL
+                 ORDER BY urodzenie_klucz DESC LIMIT 1)
+        ''')
+        earliest, latest = cursor.fetchone()
+    else:
+        cursor.execute("SELECT data_urodzenia FROM osoby WHERE data_urodzenia != ''")
+        dated = [(parse_date(text), text) for (text,) in cursor.fetchall()]
+        dated = sorted((date.sort_key, text) for date, text in dated if date)
+        earliest, latest = (dated[0][1], dated[-1][1]) if dated else (None, None)
+    
+    cursor.execute('''
+        SELECT rodzaj_relacji, COUNT(*) FROM relacje
+        GROUP BY rodzaj_relacji
+    ''')
+    relations_by_type = {row[0]: row[1] for row in cursor.fetchall()}
+    
+    return {
+        'osoby': persons,
+        'mezczyzni': men or 0,
+        'kobiety': women or 0,
+        'zmarli': deceased or 0,
+        'relacje': sum(relations_by_type.values()),
+        'relacje_wg_rodzaju': relations_by_type,
+        'najwczesniejsze_urodzenie': earliest,
+        'najpozniejsze_urodzenie': latest
+    }
+
+
+def read_persons_matching(connection: sqlite3.Connection, query: str) -> List[dict]:
+    """
+    Wyszukuje osoby, których imię lub nazwisko zawiera frazę
+    
+    Args:
+        connection: Połączenie z bazą danych SQLite
+        query: Fraza do wyszukania
+    
+    Returns:
+        Lista słowników z danymi osób uporządkowana wg nazwiska i imienia
+    """
+    search_pattern = f'%{query}%'
+    cursor = connection.execute('''
+        SELECT * FROM osoby
+        WHERE imie LIKE ? OR nazwisko LIKE ?
+        ORDER BY nazwisko, imie
+    ''', (search_pattern, search_pattern))
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
@@ -0,0 +1,279 @@
+"""
+StatisticsAggregates - Zbiorcze statystyki nazwisk, miejsc i dekad urodzenia
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from .change_journal import ChangeJournal
+from .places import PlaceRegistry
+
+
+@dataclass(frozen=True)
+class Aggregate:
+    """
+    Tabela liczności osób wg kolumn klucza
+    
+    Klucze są kolumnami tabeli kopii stat_osoby; osoba jest liczona tylko
+    wtedy, gdy wszystkie jej klucze są znane. Przy pełnym przeliczeniu
+    liczności są wyznaczane bezpośrednio z tabeli osoby wyrażeniami
+    source (GROUP BY po kolumnach pokrytych indeksem).
+    """
+    
+    table: str
+    keys: Tuple[str, ...]
+    source: Tuple[str, ...]
+    condition: str
+
+
+# Wartość kolumny kopii wyliczana z wiersza tabeli osoby (puste napisy = brak)
+MIRROR_COLUMNS = {
+    'nazwisko': "NULLIF(nazwisko, '')",
+    # Miejsca wg słownika miejsc - warianty zapisu nazwy to to samo miejsce
+    'miejsce_urodzenia_id': 'miejsce_urodzenia_id',
+    'miejsce_smierci_id': 'miejsce_smierci_id',
+    # Klucz daty RRRRMMDD -> pierwszy rok dekady
+    'dekada': 'urodzenie_klucz / 100000 * 10',
+}
+
+AGGREGATES = (
+    Aggregate('stat_nazwiska', ('nazwisko',), ('nazwisko',), "nazwisko != ''"),
+    Aggregate('stat_migracje', ('miejsce_urodzenia_id', 'miejsce_smierci_id'),
+              ('miejsce_urodzenia_id', 'miejsce_smierci_id'),
+              'miejsce_urodzenia_id IS NOT NULL AND miejsce_smierci_id IS NOT NULL'),
+    Aggregate('stat_dekady', ('dekada',), (MIRROR_COLUMNS['dekada'],),
+              'urodzenie_klucz IS NOT NULL'),
+)
+
+
+class StatisticsAggregates:
+    """
+    Utrzymuje tabele liczności osób wg nazwiska, pary miejsc urodzenia
+    i śmierci oraz dekady urodzenia
+    
+    Tabele są odświeżane przed każdym zapytaniem na podstawie dziennika
+    zmian: wkład zmienionych osób (zapamiętany w tabeli kopii stat_osoby)
+    jest odejmowany, a ich bieżące wartości dodawane. Zapytania czytają
+    tylko małe tabele zbiorcze, więc ich czas nie zależy od liczby osób.
+    Gdy dziennik nie obejmuje zmian od ostatniego odświeżenia albo zmian
+    jest dużo, tabele są przeliczane od nowa zapytaniami GROUP BY.
+    """
+    
+    MIRROR_TABLE = 'stat_osoby'
+    STATE_TABLE = 'statystyki_stan'
+    SCOPE_TABLE = 'statystyki_zakres'
+    
+    # Powyżej tej liczby zmienionych osób tabele są przeliczane od nowa
+    REBUILD_THRESHOLD = 50000
+    
+    # Wersja układu tabel; tabele zapisane w innej wersji (np. migracje
+    # wg tekstu miejsc zamiast ID ze słownika) są tworzone od nowa
+    SCHEMA_VERSION = 2
+    
+    def __init__(self, connection: sqlite3.Connection, journal: ChangeJournal):
+        """
+        Inicjalizacja statystyk
+        
+        Args:
+            connection: Połączenie z bazą danych SQLite
+            journal: Dziennik zmian, z którego wyznaczane są zmienione osoby
+        """
+        self.connection = connection
+        self.journal = journal
+        self.create_schema()
+    
+    def create_schema(self):
+        """Tworzy tabelę kopii, tabele zbiorcze i tabelę stanu"""
+        cursor = self.connection.cursor()
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {self.STATE_TABLE} (
+                klucz TEXT PRIMARY KEY,
+                wartosc INTEGER
+            )
+        ''')
+        row = cursor.execute(f"SELECT wartosc FROM {self.STATE_TABLE} WHERE klucz = 'wersja'").fetchone()
+        if row is None or row[0] != self.SCHEMA_VERSION:
+            for table in (self.MIRROR_TABLE,) + tuple(aggregate.table for aggregate in AGGREGATES):
+                cursor.execute(f'DROP TABLE IF EXISTS {table}')
+            cursor.execute(f'DELETE FROM {self.STATE_TABLE}')
+            cursor.execute(f"INSERT INTO {self.STATE_TABLE} (klucz, wartosc) VALUES ('wersja', ?)",
+                           (self.SCHEMA_VERSION,))
+        
+        columns = ', '.join(MIRROR_COLUMNS)
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {self.MIRROR_TABLE} (
+                id INTEGER PRIMARY KEY,
+                {columns}
+            )
+        ''')
+        for aggregate in AGGREGATES:
+            keys = ', '.join(aggregate.keys)
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS {aggregate.table} (
+                    {keys},
+                    liczba INTEGER NOT NULL,
+                    PRIMARY KEY ({keys})
+                ) WITHOUT ROWID
+            ''')
+            # Ranking wg liczności bez sortowania całej tabeli
+            cursor.execute(f'''
+                CREATE INDEX IF NOT EXISTS idx_{aggregate.table}_liczba
+                ON {aggregate.table} (liczba)
+            ''')
+        cursor.execute(f'CREATE TEMP TABLE IF NOT EXISTS {self.SCOPE_TABLE} (id INTEGER PRIMARY KEY)')
+        self.connection.commit()
+    
+    def get_last_sequence(self) -> Optional[int]:
+        """Zwraca numer ostatniej zmiany uwzględnionej w statystykach (None - brak statystyk)"""
+        row = self.connection.execute(f'''
+            SELECT wartosc FROM {self.STATE_TABLE} WHERE klucz = 'ostatnia_sekwencja'
+        ''').fetchone()
+        return row[0] if row else None
+    
+    def refresh(self, full: bool = False):
+        """
+        Uwzględnia w tabelach zbiorczych zmiany od ostatniego odświeżenia
+        
+        Args:
+            full: Przelicz tabele od nowa
+        """
+        until = self.journal.get_last_sequence()
+        since = self.get_last_sequence()
+        if since == until and not full:
+            return
+        
+        cursor = self.connection.cursor()
+        if (full or since is None or since > until
+                or not self.journal.is_complete_since(since)
+                or self._select_scope(cursor, since, until) > self.REBUILD_THRESHOLD):
+            self._rebuild(cursor)
+        else:
+            self._apply_scope(cursor)
+        
+        cursor.execute(f'''
+            INSERT OR REPLACE INTO {self.STATE_TABLE} (klucz, wartosc)
+            VALUES ('ostatnia_sekwencja', ?)
+        ''', (until,))
+        self.connection.commit()
+    
+    def _select_scope(self, cursor: sqlite3.Cursor, since: int, until: int) -> int:
+        """Wypełnia tabelę zakresu osobami zmienionymi w dzienniku; zwraca ich liczbę"""
+        cursor.execute(f'DELETE FROM {self.SCOPE_TABLE}')
+        cursor.execute(f'''
+            INSERT OR IGNORE INTO {self.SCOPE_TABLE} (id)
+            SELECT rekord_id FROM {ChangeJournal.TABLE}
+            WHERE seq > ? AND seq <= ? AND tabela = 'osoby'
+        ''', (since, until))
+        return cursor.execute(f'SELECT COUNT(*) FROM {self.SCOPE_TABLE}').fetchone()[0]
+    
+    def _rebuild(self, cursor: sqlite3.Cursor):
+        """Przelicza kopię i tabele zbiorcze z całej tabeli osoby"""
+        cursor.execute(f'DELETE FROM {self.MIRROR_TABLE}')
+        cursor.execute(f'''
+            INSERT INTO {self.MIRROR_TABLE} (id, {', '.join(MIRROR_COLUMNS)})
+            SELECT id, {', '.join(MIRROR_COLUMNS.values())} FROM osoby
+        ''')
+        for aggregate in AGGREGATES:
+            source = ', '.join(aggregate.source)
+            cursor.execute(f'DELETE FROM {aggregate.table}')
+            cursor.execute(f'''
+                INSERT INTO {aggregate.table} ({', '.join(aggregate.keys)}, liczba)
+                SELECT {source}, COUNT(*) FROM osoby
+                WHERE {aggregate.condition}
+                GROUP BY {source}
+            ''')
+    
+    def _add_scope(self, cursor: sqlite3.Cursor, sign: int):
+        """Dodaje (sign=1) lub odejmuje (sign=-1) wkład osób z zakresu zapisany w kopii"""
+        for aggregate in AGGREGATES:
+            keys = ', '.join(aggregate.keys)
+            known = ' AND '.join(f'{key} IS NOT NULL' for key in aggregate.keys)
+            cursor.execute(f'''
+                INSERT INTO {aggregate.table} ({keys}, liczba)
+                SELECT {keys}, ? * COUNT(*) FROM {self.MIRROR_TABLE}
+                WHERE id IN (SELECT id FROM {self.SCOPE_TABLE}) AND {known}
+                GROUP BY {keys}
+                ON CONFLICT ({keys}) DO UPDATE SET liczba = liczba + excluded.liczba
+            ''', (sign,))
+    
+    def _apply_scope(self, cursor: sqlite3.Cursor):
+        """Zastępuje wkład osób z zakresu ich bieżącymi wartościami"""
+        self._add_scope(cursor, -1)
+        cursor.execute(f'''
+            DELETE FROM {self.MIRROR_TABLE} WHERE id IN (SELECT id FROM {self.SCOPE_TABLE})
+        ''')
+        # Osoby usunięte nie mają już wiersza i nie wracają do kopii
+        cursor.execute(f'''
+            INSERT INTO {self.MIRROR_TABLE} (id, {', '.join(MIRROR_COLUMNS)})
+            SELECT id, {', '.join(MIRROR_COLUMNS.values())} FROM osoby
+            WHERE id IN (SELECT id FROM {self.SCOPE_TABLE})
+        ''')
+        self._add_scope(cursor, 1)
+        for aggregate in AGGREGATES:
+            cursor.execute(f'DELETE FROM {aggregate.table} WHERE liczba <= 0')
+    
+    def _ranking(self, query: str, limit: Optional[int]) -> List[dict]:
+        """Wiersze rankingu z tabeli zbiorczej (po odświeżeniu tabel)"""
+        self.refresh()
+        params = ()
+        if limit:
+            query += ' LIMIT ?'
+            params = (limit,)
+        cursor = self.connection.execute(query, params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def surnames(self, limit: Optional[int] = None) -> List[dict]:
+        """
+        Zwraca częstość nazwisk
+        
+        Args:
+            limit: Maksymalna liczba nazwisk (None = wszystkie)
+        
+        Returns:
+            Lista słowników {nazwisko, liczba} od najczęstszego nazwiska
+        """
+        return self._ranking(f'''
+            SELECT nazwisko, liczba FROM {AGGREGATES[0].table}
+            ORDER BY liczba DESC, nazwisko
+        ''', limit)
+    
+    def migrations(self, limit: Optional[int] = None, include_same: bool = False) -> List[dict]:
+        """
+        Zwraca liczbę osób wg pary miejsca urodzenia i miejsca śmierci
+        
+        Pary są liczone wg miejsc ze słownika miejsc (warianty zapisu nazwy
+        i aliasy to jedno miejsce), a zwracane z nazwami kanonicznymi.
+        
+        Args:
+            limit: Maksymalna liczba par (None = wszystkie)
+            include_same: Uwzględnij osoby zmarłe w miejscu urodzenia
+        
+        Returns:
+            Lista słowników {miejsce_urodzenia, miejsce_smierci, liczba}
+            od najliczniejszej pary
+        """
+        where = '' if include_same else 'WHERE m.miejsce_urodzenia_id != m.miejsce_smierci_id'
+        return self._ranking(f'''
+            SELECT u.nazwa AS miejsce_urodzenia, s.nazwa AS miejsce_smierci, m.liczba
+            FROM {AGGREGATES[1].table} m
+            JOIN {PlaceRegistry.TABLE} u ON u.id = m.miejsce_urodzenia_id
+            JOIN {PlaceRegistry.TABLE} s ON s.id = m.miejsce_smierci_id
+            {where}
+            ORDER BY m.liczba DESC, u.nazwa, s.nazwa
+        ''', limit)
+    
+    def birth_decades(self) -> List[dict]:
+        """
+        Zwraca liczbę urodzeń w każdej dekadzie
+        
+        Returns:
+            Lista słowników {dekada, liczba} uporządkowana wg dekady
+            (dekada to jej pierwszy rok, np. 1850)
+        """
+        self.refresh()
+        cursor = self.connection.execute(f'''
+            SELECT dekada, liczba FROM {AGGREGATES[2].table} ORDER BY dekada
+        ''')
+        return [{'dekada': decade, 'liczba': count} for decade, count in cursor.fetchall()]
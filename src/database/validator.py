@@ -0,0 +1,318 @@
+"""
+DataValidator - Wykrywanie niemożliwych i sprzecznych danych w bazie
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+from .ancestry import AncestryClosure
+from .change_journal import ChangeJournal
+from ..utils.dates import PRECISION_DAY
+
+
+# Waga problemu
+SEVERITY_ERROR = 'blad'
+SEVERITY_WARNING = 'ostrzezenie'
+
+# Krawędzie rodzic -> dziecko z ID relacji (oba zapisy relacji rodzicielskiej)
+EDGES_CTE = '''
+    krawedzie (id, rodzic_id, dziecko_id) AS (
+        SELECT id, osoba1_id, osoba2_id FROM relacje WHERE rodzaj_relacji = 'rodzic'
+        UNION ALL
+        SELECT id, osoba2_id, osoba1_id FROM relacje WHERE rodzaj_relacji = 'dziecko'
+    )
+'''
+
+
+@dataclass(frozen=True)
+class Finding:
+    """Pojedynczy problem wykryty w danych"""
+    
+    code: str
+    severity: str
+    person_id: Optional[int]
+    other_person_id: Optional[int]
+    relation_id: Optional[int]
+    message: str
+
+
+@dataclass(frozen=True)
+class Check:
+    """
+    Reguła sprawdzająca dane jednym zapytaniem SQL
+    
+    Zapytanie zwraca wiersze (osoba_id, osoba2_id, relacja_id, szczegóły).
+    Znacznik {scope} jest zastępowany warunkiem ograniczającym sprawdzenie
+    do zmienionych osób (kolumny scope_columns) albo prawdą przy pełnym
+    sprawdzeniu. Reguły bez scope_columns są zawsze wykonywane w całości.
+    """
+    
+    code: str
+    severity: str
+    description: str
+    sql: str
+    scope_columns: Tuple[str, ...] = ()
+
+
+def _year(alias: str, column: str) -> str:
+    """Wyrażenie SQL z rokiem daty zapisanej kluczem RRRRMMDD"""
+    return f'{alias}.{column}_klucz / 10000'
+
+
+def _before(alias1: str, column1: str, alias2: str, column2: str) -> str:
+    """
+    Warunek SQL: pierwsza data jest na pewno wcześniejsza niż druga
+    
+    Daty porównywane są co do roku, a co do dnia tylko gdy obie są pełne.
+    """
+    return (f"({_year(alias1, column1)} < {_year(alias2, column2)} "
+            f"OR ({alias1}.{column1}_klucz < {alias2}.{column2}_klucz "
+            f"AND {alias1}.{column1}_dokladnosc = '{PRECISION_DAY}' "
+            f"AND {alias2}.{column2}_dokladnosc = '{PRECISION_DAY}'))")
+
+
+class DataValidator:
+    """
+    Sprawdza spójność osób i relacji zbiorczymi zapytaniami SQL
+    
+    Każda reguła to jedno zapytanie po całej bazie (bez pętli po osobach).
+    Wyniki są zapisywane w tabeli problemów, a numer ostatniej sprawdzonej
+    zmiany z dziennika pozwala przy kolejnym uruchomieniu sprawdzić tylko
+    osoby zmienione od tego czasu.
+    """
+    
+    TABLE = 'problemy_danych'
+    STATE_TABLE = 'walidacja_stan'
+    SCOPE_TABLE = 'walidacja_zakres'
+    
+    def __init__(self, connection: sqlite3.Connection, journal: ChangeJournal,
+                 parent_min_age: int = 12, parent_max_age: int = 70):
+        """
+        Inicjalizacja walidatora
+        
+        Args:
+            connection: Połączenie z bazą danych SQLite
+            journal: Dziennik zmian, z którego wyznaczane są zmienione osoby
+            parent_min_age: Najniższy prawdopodobny wiek rodzica przy narodzinach dziecka
+            parent_max_age: Najwyższy prawdopodobny wiek rodzica przy narodzinach dziecka
+        """
+        self.connection = connection
+        self.journal = journal
+        self.checks = self._build_checks(parent_min_age, parent_max_age)
+        self.create_schema()
+    
+    def create_schema(self):
+        """Tworzy tabele problemów i stanu walidacji"""
+        cursor = self.connection.cursor()
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                id INTEGER PRIMARY KEY,
+                kod TEXT NOT NULL,
+                powaga TEXT NOT NULL,
+                osoba_id INTEGER,
+                osoba2_id INTEGER,
+                relacja_id INTEGER,
+                opis TEXT NOT NULL
+            )
+        ''')
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_problemy_osoba ON {self.TABLE} (osoba_id)')
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_problemy_osoba2 ON {self.TABLE} (osoba2_id)')
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {self.STATE_TABLE} (
+                klucz TEXT PRIMARY KEY,
+                wartosc INTEGER
+            )
+        ''')
+        cursor.execute(f'CREATE TEMP TABLE IF NOT EXISTS {self.SCOPE_TABLE} (id INTEGER PRIMARY KEY)')
+        self.connection.commit()
+    
+    @staticmethod
+    def _build_checks(parent_min_age: int, parent_max_age: int) -> List[Check]:
+        """Tworzy listę reguł"""
+        parent_age = f'({_year("d", "urodzenie")} - {_year("r", "urodzenie")})'
+        parent_join = f'''
+            WITH {EDGES_CTE}
+            SELECT k.dziecko_id, k.rodzic_id, k.id, {{details}}
+            FROM krawedzie k
+            JOIN osoby d ON d.id = k.dziecko_id
+            JOIN osoby r ON r.id = k.rodzic_id
+            WHERE {{{{scope}}}} AND {{condition}}
+        '''
+        return [
+            Check('relacja_z_soba', SEVERITY_ERROR, 'Relacja osoby z samą sobą', '''
+                SELECT osoba1_id, NULL, id, rodzaj_relacji FROM relacje
+                WHERE osoba1_id = osoba2_id AND {scope}
+            ''', ('osoba1_id',)),
+            Check('nieznana_osoba', SEVERITY_ERROR, 'Relacja z osobą spoza bazy', '''
+                SELECT osoba1_id, osoba2_id, id, rodzaj_relacji FROM relacje r
+                WHERE (NOT EXISTS (SELECT 1 FROM osoby WHERE id = r.osoba1_id)
+                       OR NOT EXISTS (SELECT 1 FROM osoby WHERE id = r.osoba2_id))
+                AND {scope}
+            ''', ('r.osoba1_id', 'r.osoba2_id')),
+            Check('duplikat_relacji', SEVERITY_WARNING, 'Powtórzona relacja', '''
+                WITH klucze (id, a, b, rodzaj) AS (
+                    SELECT id,
+                           CASE rodzaj_relacji WHEN 'dziecko' THEN osoba2_id
+                                WHEN 'małżonek' THEN MIN(osoba1_id, osoba2_id)
+                                ELSE osoba1_id END,
+                           CASE rodzaj_relacji WHEN 'dziecko' THEN osoba1_id
+                                WHEN 'małżonek' THEN MAX(osoba1_id, osoba2_id)
+                                ELSE osoba2_id END,
+                           CASE rodzaj_relacji WHEN 'dziecko' THEN 'rodzic' ELSE rodzaj_relacji END
+                    FROM relacje WHERE {scope}
+                ),
+                pierwsze AS (
+                    SELECT a, b, rodzaj, MIN(id) AS id FROM klucze
+                    GROUP BY a, b, rodzaj HAVING COUNT(*) > 1
+                )
+                SELECT k.a, k.b, k.id, printf('%s, pierwsza: relacja %d', k.rodzaj, p.id)
+                FROM klucze k JOIN pierwsze p USING (a, b, rodzaj)
+                WHERE k.id != p.id
+            ''', ('osoba1_id', 'osoba2_id')),
+            Check('sprzeczne_pokrewienstwo', SEVERITY_ERROR,
+                  'Osoby zapisane jako wzajemnie swoi rodzice', f'''
+                WITH {EDGES_CTE}
+                SELECT k1.rodzic_id, k1.dziecko_id, k2.id, printf('relacje %d i %d', k1.id, k2.id)
+                FROM krawedzie k1
+                JOIN krawedzie k2 ON k2.rodzic_id = k1.dziecko_id AND k2.dziecko_id = k1.rodzic_id
+                WHERE k1.id < k2.id AND k1.rodzic_id != k1.dziecko_id AND {{scope}}
+            ''', ('k1.rodzic_id', 'k1.dziecko_id')),
+            Check('zbyt_wielu_rodzicow', SEVERITY_ERROR, 'Więcej niż dwoje rodziców', f'''
+                WITH {EDGES_CTE}
+                SELECT dziecko_id, NULL, NULL, printf('%d rodziców', COUNT(DISTINCT rodzic_id))
+                FROM krawedzie WHERE {{scope}}
+                GROUP BY dziecko_id HAVING COUNT(DISTINCT rodzic_id) > 2
+            ''', ('dziecko_id',)),
+            Check('dziecko_starsze_od_rodzica', SEVERITY_ERROR,
+                  'Dziecko urodzone przed rodzicem', parent_join.format(
+                      details="printf('%s < %s', d.data_urodzenia, r.data_urodzenia)",
+                      condition=_before('d', 'urodzenie', 'r', 'urodzenie')),
+                  ('k.dziecko_id', 'k.rodzic_id')),
+            Check('wiek_rodzica', SEVERITY_WARNING, 'Nieprawdopodobny wiek rodzica', parent_join.format(
+                      details=f"printf('%d lat', {parent_age})",
+                      condition=(f'({parent_age} BETWEEN 0 AND {parent_min_age - 1} '
+                                 f'OR {parent_age} > {parent_max_age})')),
+                  ('k.dziecko_id', 'k.rodzic_id')),
+            Check('urodzenie_po_smierci_rodzica', SEVERITY_WARNING,
+                  'Dziecko urodzone po śmierci rodzica', parent_join.format(
+                      details="printf('%s > %s', d.data_urodzenia, r.data_smierci)",
+                      # Ojciec może umrzeć przed narodzinami dziecka - rok tolerancji
+                      condition=f'{_year("d", "urodzenie")} > {_year("r", "smierc")} + 1'),
+                  ('k.dziecko_id', 'k.rodzic_id')),
+            Check('smierc_przed_urodzeniem', SEVERITY_ERROR, 'Śmierć przed urodzeniem', f'''
+                SELECT o.id, NULL, NULL, printf('%s < %s', o.data_smierci, o.data_urodzenia)
+                FROM osoby o
+                WHERE {_before('o', 'smierc', 'o', 'urodzenie')} AND {{scope}}
+            ''', ('o.id',)),
+            # Cykl zależy od wszystkich krawędzi na nim, więc jest sprawdzany zawsze
+            # w całości; cykle dwóch osób zgłasza już sprzeczne_pokrewienstwo
+            Check('cykl_przodkow', SEVERITY_ERROR, 'Osoba jest własnym przodkiem', f'''
+                WITH {EDGES_CTE}
+                SELECT k.dziecko_id, k.rodzic_id, k.id, NULL FROM krawedzie k
+                WHERE k.rodzic_id != k.dziecko_id
+                AND EXISTS (SELECT 1 FROM {AncestryClosure.TABLE} p
+                            WHERE p.przodek_id = k.dziecko_id AND p.potomek_id = k.rodzic_id)
+                AND NOT EXISTS (SELECT 1 FROM krawedzie o
+                                WHERE o.rodzic_id = k.dziecko_id AND o.dziecko_id = k.rodzic_id)
+            '''),
+        ]
+    
+    def get_last_sequence(self) -> Optional[int]:
+        """Zwraca numer ostatniej zmiany uwzględnionej w walidacji (None - brak walidacji)"""
+        row = self.connection.execute(f'''
+            SELECT wartosc FROM {self.STATE_TABLE} WHERE klucz = 'ostatnia_sekwencja'
+        ''').fetchone()
+        return row[0] if row else None
+    
+    def _select_scope(self, cursor: sqlite3.Cursor, since: int, until: int) -> int:
+        """Wypełnia tabelę zakresu osobami zmienionymi w dzienniku; zwraca ich liczbę"""
+        cursor.execute(f'DELETE FROM {self.SCOPE_TABLE}')
+        cursor.execute(f'''
+            INSERT OR IGNORE INTO {self.SCOPE_TABLE} (id)
+            SELECT rekord_id FROM {ChangeJournal.TABLE}
+            WHERE seq > ? AND seq <= ? AND tabela = 'osoby'
+            UNION
+            SELECT osoba1_id FROM {ChangeJournal.TABLE}
+            WHERE seq > ? AND seq <= ? AND tabela = 'relacje'
+            UNION
+            SELECT osoba2_id FROM {ChangeJournal.TABLE}
+            WHERE seq > ? AND seq <= ? AND tabela = 'relacje'
+        ''', (since, until) * 3)
+        return cursor.execute(f'SELECT COUNT(*) FROM {self.SCOPE_TABLE}').fetchone()[0]
+    
+    def _scope_condition(self, check: Check, full: bool) -> str:
+        """Warunek SQL ograniczający regułę do zmienionych osób"""
+        if full or not check.scope_columns:
+            return '1'
+        return '(' + ' OR '.join(f'{column} IN (SELECT id FROM {self.SCOPE_TABLE})'
+                                 for column in check.scope_columns) + ')'
+    
+    def run(self, full: bool = False) -> Iterator[Finding]:
+        """
+        Wykonuje reguły i zwraca wykryte problemy w miarę ich znajdowania
+        
+        Stan walidacji jest zapisywany po przejściu wszystkich reguł.
+        
+        Args:
+            full: Sprawdź całą bazę zamiast osób zmienionych od ostatniej walidacji
+        
+        Yields:
+            Problemy wykryte w sprawdzanym zakresie
+        """
+        cursor = self.connection.cursor()
+        until = self.journal.get_last_sequence()
+        since = self.get_last_sequence()
+        if since is None or since > until or not self.journal.is_complete_since(since):
+            full = True
+        elif not full and not self._select_scope(cursor, since, until):
+            # Brak zmian - reguły pełne (np. cykle) też nie mogły zmienić wyniku
+            return
+        
+        for check in self.checks:
+            scoped = not full and bool(check.scope_columns)
+            if scoped:
+                cursor.execute(f'''
+                    DELETE FROM {self.TABLE} WHERE kod = ?
+                    AND (osoba_id IN (SELECT id FROM {self.SCOPE_TABLE})
+                         OR osoba2_id IN (SELECT id FROM {self.SCOPE_TABLE}))
+                ''', (check.code,))
+            else:
+                cursor.execute(f'DELETE FROM {self.TABLE} WHERE kod = ?', (check.code,))
+            
+            cursor.execute(check.sql.format(scope=self._scope_condition(check, full)))
+            findings = [
+                Finding(check.code, check.severity, person_id, other_id, relation_id,
+                        f'{check.description}: {details}' if details else check.description)
+                for person_id, other_id, relation_id, details in cursor.fetchall()
+            ]
+            cursor.executemany(f'''
+                INSERT INTO {self.TABLE} (kod, powaga, osoba_id, osoba2_id, relacja_id, opis)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [(f.code, f.severity, f.person_id, f.other_person_id, f.relation_id, f.message)
+                  for f in findings])
+            yield from findings
+        
+        cursor.execute(f'''
+            INSERT OR REPLACE INTO {self.STATE_TABLE} (klucz, wartosc)
+            VALUES ('ostatnia_sekwencja', ?)
+        ''', (until,))
+        self.connection.commit()
+    
+    def findings(self, person_id: Optional[int] = None) -> List[Finding]:
+        """
+        Zwraca zapisane problemy
+        
+        Args:
+            person_id: Tylko problemy dotyczące osoby (None = wszystkie)
+        
+        Returns:
+            Lista problemów uporządkowana wg wagi i kodu
+        """
+        query = f'SELECT kod, powaga, osoba_id, osoba2_id, relacja_id, opis FROM {self.TABLE}'
+        params = ()
+        if person_id is not None:
+            query += ' WHERE osoba_id = ? OR osoba2_id = ?'
+            params = (person_id, person_id)
+        query += ' ORDER BY powaga, kod, osoba_id, id'
+        return [Finding(*row) for row in self.connection.execute(query, params).fetchall()]
@@ -2,14 +2,18 @@
 AncestorTreeWidget - Widget do wyświetlania drzewa przodków
 """
 
+from collections import Counter
+
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QScrollArea
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPainter, QPen, QBrush, QColor, QFont
-import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import matplotlib.patches as mpatches
 
+from ..utils.dates import format_year
+from ..utils.profiler import profiled
+
 
 class AncestorTreeWidget(QWidget):
     """Widget do wizualizacji drzewa przodków"""
@@ -49,6 +53,7 @@ class AncestorTreeWidget(QWidget):
         scroll.setWidgetResizable(True)
         layout.addWidget(scroll)
     
+    @profiled
     def load_tree(self, person_id):
         """
         Ładuje i wyświetla drzewo przodków
@@ -62,10 +67,24 @@ class AncestorTreeWidget(QWidget):
         if not person:
             return
         
-        self.info_label.setText(f"Drzewo przodków: {person['imie']} {person['nazwisko']}")
-        
-        # Pobierz przodków
-        ancestors = self.relationship_calc.get_ancestors(person_id, max_generations=5)
+        # Pobierz przodków - przodek osiągalny kilkoma liniami występuje w każdym
+        # swoim pokoleniu, więc rodowód nie jest ucinany przy zapętleniach
+        pedigree = self.relationship_calc.get_pedigree(person_id)
+        ancestors = self.relationship_calc.get_ancestors_with_paths(person_id, max_generations=5,
+                                                                    pedigree=pedigree)
+        
+        occurrences = Counter()
+        for ancestor, _, paths in ancestors:
+            occurrences[ancestor['id']] += paths
+        repeated = {ancestor_id for ancestor_id, count in occurrences.items() if count > 1}
+        
+        info = f"Drzewo przodków: {person['imie']} {person['nazwisko']}"
+        if repeated:
+            info += (f" - implex {pedigree.implex(person_id, 5):.0%}, "
+                     f"współczynnik inbredu {pedigree.inbreeding(person_id):.4f}")
+        if pedigree.cycle_edges:
+            info += f" - uwaga: cykl w relacjach rodzicielskich (pominięte: {len(pedigree.cycle_edges)})"
+        self.info_label.setText(info)
         
         # Wyczyść figurę
         self.figure.clear()
@@ -82,10 +101,12 @@ class AncestorTreeWidget(QWidget):
         
         # Organizacja przodków według pokoleń
         generations = {}
-        for ancestor, generation in ancestors:
+        paths_count = {}
+        for ancestor, generation, paths in ancestors:
             if generation not in generations:
                 generations[generation] = []
             generations[generation].append(ancestor)
+            paths_count[(ancestor['id'], generation)] = paths
         
         # Dodaj osobę bazową (generacja 0)
         generations[0] = [person]
@@ -103,24 +124,22 @@ class AncestorTreeWidget(QWidget):
             for i, p in enumerate(persons_in_gen):
                 x = (i + 1) / (count + 1)
                 y = 1 - (gen / (max_generation + 1))
-                positions[p['id']] = (x, y)
-        
-        # Rysowanie linii
-        for gen in range(1, max_generation + 1):
-            persons_in_gen = generations.get(gen, [])
-            for p in persons_in_gen:
-                children = self.relationship_calc.get_children(p['id'])
-                for child in children:
-                    if child['id'] in positions:
-                        x1, y1 = positions[p['id']]
-                        x2, y2 = positions[child['id']]
+                positions[(p['id'], gen)] = (x, y)
+        
+        # Rysowanie linii - od osoby do każdego z jej rodziców pokolenie wyżej
+        for gen in range(max_generation):
+            for p in generations.get(gen, []):
+                for parent_id in pedigree.parents_of(p['id']):
+                    if (parent_id, gen + 1) in positions:
+                        x1, y1 = positions[(parent_id, gen + 1)]
+                        x2, y2 = positions[(p['id'], gen)]
                         ax.plot([x1, x2], [y1, y2], 'k-', alpha=0.3, linewidth=1)
         
         # Rysowanie węzłów
         for gen in range(max_generation + 1):
             persons_in_gen = generations.get(gen, [])
             for p in persons_in_gen:
-                x, y = positions[p['id']]
+                x, y = positions[(p['id'], gen)]
                 
                 # Kolor w zależności od płci
                 if p.get('plec') == 'M':
@@ -133,13 +152,20 @@ class AncestorTreeWidget(QWidget):
                 # Rysowanie prostokąta
                 width = 0.12
                 height = 0.06
+                # Przodek występujący w rodowodzie wielokrotnie ma wyróżnioną ramkę
+                is_repeated = p['id'] in repeated
                 rect = mpatches.Rectangle((x - width/2, y - height/2), width, height,
-                                         facecolor=color, edgecolor='black', linewidth=1.5)
+                                         facecolor=color,
+                                         edgecolor='darkorange' if is_repeated else 'black',
+                                         linewidth=2.5 if is_repeated else 1.5)
                 ax.add_patch(rect)
                 
                 # Tekst
                 name = f"{p['imie']} {p['nazwisko']}"
-                birth_year = p['data_urodzenia'].split('-')[0] if p.get('data_urodzenia') else '?'
+                birth_year = format_year(p.get('data_urodzenia'))
+                paths = paths_count.get((p['id'], gen), 1)
+                if paths > 1:
+                    birth_year += f", ×{paths}"
                 
                 ax.text(x, y, f"{name}\n({birth_year})",
                        ha='center', va='center', fontsize=8, weight='bold')
@@ -8,6 +8,9 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import matplotlib.patches as mpatches
 
+from ..utils.dates import format_year
+from ..utils.profiler import profiled
+
 
 class DescendantTreeWidget(QWidget):
     """Widget do wizualizacji drzewa potomków"""
@@ -47,6 +50,7 @@ class DescendantTreeWidget(QWidget):
         scroll.setWidgetResizable(True)
         layout.addWidget(scroll)
     
+    @profiled
     def load_tree(self, person_id):
         """
         Ładuje i wyświetla drzewo potomków
@@ -137,7 +141,7 @@ class DescendantTreeWidget(QWidget):
                 
                 # Tekst
                 name = f"{p['imie']} {p['nazwisko']}"
-                birth_year = p['data_urodzenia'].split('-')[0] if p.get('data_urodzenia') else '?'
+                birth_year = format_year(p.get('data_urodzenia'))
                 
                 ax.text(x, y, f"{name}\n({birth_year})",
                        ha='center', va='center', fontsize=8, weight='bold')
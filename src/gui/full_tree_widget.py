@@ -8,6 +8,10 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import matplotlib.patches as mpatches
 
+from ..business_logic.tree_layout import compute_tree_layout
+from ..utils.dates import format_year
+from ..utils.profiler import profiled
+
 
 class FullTreeWidget(QWidget):
     """Widget do wizualizacji pełnego drzewa genealogicznego"""
@@ -45,10 +49,8 @@ class FullTreeWidget(QWidget):
         scroll.setWidget(self.canvas)
         scroll.setWidgetResizable(True)
         layout.addWidget(scroll)
-        
-        # Załaduj drzewo przy inicjalizacji
-        self.load_tree()
     
+    @profiled
     def load_tree(self):
         """
         Ładuje i wyświetla pełne drzewo genealogiczne
@@ -70,24 +72,9 @@ class FullTreeWidget(QWidget):
             self.canvas.draw()
             return
         
-        # Znajdź osoby bez rodziców (osoby startowe)
-        persons_with_parents = set()
-        for rel in all_relations:
-            if rel['rodzaj_relacji'] == 'dziecko':
-                persons_with_parents.add(rel['osoba1_id'])
-        
-        root_persons = [p for p in all_persons if p['id'] not in persons_with_parents]
-        
-        if not root_persons:
-            # Jeśli wszystkie mają rodziców, wybierz najstarszą osobę
-            root_persons = sorted(all_persons, 
-                                 key=lambda p: p.get('data_urodzenia') or '9999-99-99')[:1]
-        
-        # Organizacja osób według pokoleń i rodzin
-        generations = self._organize_by_generations(root_persons, all_relations)
-        
-        # Pozycje węzłów
-        positions = self._calculate_positions(generations)
+        # Organizacja osób według pokoleń i pozycje węzłów
+        generations, positions = compute_tree_layout(all_persons, all_relations,
+                                                     self.db_manager.get_generations())
         
         # Rysowanie linii połączeń
         self._draw_connections(ax, positions, all_relations)
@@ -113,82 +100,6 @@ class FullTreeWidget(QWidget):
         self.figure.tight_layout()
         self.canvas.draw()
     
-    def _organize_by_generations(self, root_persons, relations):
-        """
-        Organizuje osoby według pokoleń
-        
-        Args:
-            root_persons: Lista osób bez rodziców
-            relations: Wszystkie relacje
-            
-        Returns:
-            Słownik: generacja -> lista osób
-        """
-        generations = {0: root_persons}
-        processed = set(p['id'] for p in root_persons)
-        
-        # Buduj słownik relacji dla szybkiego dostępu
-        children_map = {}
-        for rel in relations:
-            if rel['rodzaj_relacji'] == 'rodzic':
-                if rel['osoba1_id'] not in children_map:
-                    children_map[rel['osoba1_id']] = []
-                children_map[rel['osoba1_id']].append(rel['osoba2_id'])
-        
-        # Przetwarzaj pokolenia
-        gen = 0
-        while True:
-            current_gen = generations.get(gen, [])
-            if not current_gen:
-                break
-            
-            next_gen = []
-            for person in current_gen:
-                children_ids = children_map.get(person['id'], [])
-                for child_id in children_ids:
-                    if child_id not in processed:
-                        child = self.db_manager.get_person(child_id)
-                        if child:
-                            next_gen.append(child)
-                            processed.add(child_id)
-            
-            if next_gen:
-                generations[gen + 1] = next_gen
-                gen += 1
-            else:
-                break
-        
-        return generations
-    
-    def _calculate_positions(self, generations):
-        """
-        Oblicza pozycje węzłów na wykresie
-        
-        Args:
-            generations: Słownik: generacja -> lista osób
-            
-        Returns:
-            Słownik: person_id -> (x, y)
-        """
-        positions = {}
-        max_generation = max(generations.keys()) if generations else 0
-        
-        for gen, persons in generations.items():
-            count = len(persons)
-            for i, person in enumerate(persons):
-                # Pozycja x: rozłożenie równomierne
-                if count == 1:
-                    x = 0.5
-                else:
-                    x = i / (count - 1)
-                
-                # Pozycja y: od góry do dołu
-                y = 1 - (gen / (max_generation + 1)) if max_generation > 0 else 0.5
-                
-                positions[person['id']] = (x, y)
-        
-        return positions
-    
     def _draw_connections(self, ax, positions, relations):
         """
         Rysuje linie połączeń między osobami
@@ -252,7 +163,7 @@ class FullTreeWidget(QWidget):
                 ax.add_patch(rect)
                 
                 # Tekst z nazwiskiem panieńskim jeśli jest dostępne
-                birth_year = person['data_urodzenia'][:4] if person.get('data_urodzenia') else '?'
+                birth_year = format_year(person.get('data_urodzenia'))
                 
                 if person.get('nazwisko_panienskie'):
                     display_text = f"{person['imie']}\n{person['nazwisko']}\n({person['nazwisko_panienskie']})\n{birth_year}"
@@ -0,0 +1,76 @@
+"""
+LazyTab - Zakładka tworząca właściwy widget dopiero przy pierwszym wyświetleniu
+"""
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt6.QtCore import Qt
+
+
+class LazyTab(QWidget):
+    """
+    Zastępnik zakładki z opóźnionym tworzeniem widgetu i ładowaniem danych
+    
+    Widget (wraz z ciężkimi importami, np. matplotlib) powstaje dopiero
+    przy pierwszym pokazaniu zakładki. Dane są przeładowywane tylko wtedy,
+    gdy zakładka jest widoczna, a od poprzedniego ładowania coś się zmieniło.
+    """
+    
+    def __init__(self, factory, refresh, parent=None):
+        """
+        Inicjalizacja zakładki
+        
+        Args:
+            factory: Funkcja bez argumentów tworząca właściwy widget
+            refresh: Funkcja ładująca dane do widgetu (przyjmuje widget)
+            parent: Widget rodzica
+        """
+        super().__init__(parent)
+        self.factory = factory
+        self.refresh = refresh
+        self.widget = None
+        self.stale = True
+        
+        self.tab_layout = QVBoxLayout(self)
+        self.tab_layout.setContentsMargins(0, 0, 0, 0)
+        
+        self.placeholder = QLabel("Ładowanie...")
+        self.placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.tab_layout.addWidget(self.placeholder)
+    
+    @property
+    def is_built(self) -> bool:
+        """Czy właściwy widget został już utworzony"""
+        return self.widget is not None
+    
+    def ensure_built(self):
+        """
+        Tworzy właściwy widget, jeśli jeszcze nie istnieje
+        
+        Returns:
+            Właściwy widget
+        """
+        if self.widget is None:
+            self.widget = self.factory()
+            self.tab_layout.removeWidget(self.placeholder)
+            self.placeholder.deleteLater()
+            self.placeholder = None
+            self.tab_layout.addWidget(self.widget)
+        return self.widget
+    
+    def activate(self):
+        """Tworzy widget i ładuje dane, jeśli są nieaktualne"""
+        widget = self.ensure_built()
+        if self.stale:
+            self.stale = False
+            self.refresh(widget)
+    
+    def invalidate(self):
+        """Oznacza dane jako nieaktualne; widoczna zakładka jest od razu odświeżana"""
+        self.stale = True
+        if self.isVisible():
+            self.activate()
+    
+    def showEvent(self, event):
+        """Obsługa pokazania zakładki"""
+        super().showEvent(event)
+        self.activate()
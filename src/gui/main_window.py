@@ -10,11 +10,11 @@ from PyQt6.QtGui import QAction, QIcon
 
 from .person_list_widget import PersonListWidget
 from .person_dialog import PersonDialog
-from .ancestor_tree_widget import AncestorTreeWidget
-from .descendant_tree_widget import DescendantTreeWidget
-from .full_tree_widget import FullTreeWidget
-from .timeline_widget import TimelineWidget
+from .lazy_tab import LazyTab
+from .profiler_dialog import ProfilerDialog
+from .validation_dialog import ValidationDialog
 from ..business_logic.relationship_calculator import RelationshipCalculator
+from ..utils.profiler import profiler
 
 
 class MainWindow(QMainWindow):
@@ -31,6 +31,7 @@ class MainWindow(QMainWindow):
         self.db_manager = db_manager
         self.relationship_calc = RelationshipCalculator(db_manager)
         self.current_person_id = None
+        self.last_seen_sequence = None
         
         self.init_ui()
         self.load_data()
@@ -63,21 +64,27 @@ class MainWindow(QMainWindow):
         self.person_list_widget.person_deleted.connect(self.on_delete_person)
         self.tabs.addTab(self.person_list_widget, "Lista Osób")
         
+        # Zakładki z wykresami (matplotlib) są tworzone przy pierwszym otwarciu
+        
         # Tab - Drzewo przodków
-        self.ancestor_tree_widget = AncestorTreeWidget(self.db_manager, self.relationship_calc)
-        self.tabs.addTab(self.ancestor_tree_widget, "Drzewo Przodków")
+        self.ancestor_tab = LazyTab(self._create_ancestor_tree, self._refresh_person_tree)
+        self.tabs.addTab(self.ancestor_tab, "Drzewo Przodków")
         
         # Tab - Drzewo potomków
-        self.descendant_tree_widget = DescendantTreeWidget(self.db_manager, self.relationship_calc)
-        self.tabs.addTab(self.descendant_tree_widget, "Drzewo Potomków")
+        self.descendant_tab = LazyTab(self._create_descendant_tree, self._refresh_person_tree)
+        self.tabs.addTab(self.descendant_tab, "Drzewo Potomków")
         
         # Tab - Pełne drzewo
-        self.full_tree_widget = FullTreeWidget(self.db_manager, self.relationship_calc)
-        self.tabs.addTab(self.full_tree_widget, "Pełne Drzewo")
+        self.full_tree_tab = LazyTab(self._create_full_tree, lambda widget: widget.load_tree())
+        self.tabs.addTab(self.full_tree_tab, "Pełne Drzewo")
         
         # Tab - Oś czasu
-        self.timeline_widget = TimelineWidget(self.db_manager)
-        self.tabs.addTab(self.timeline_widget, "Oś Czasu")
+        self.timeline_tab = LazyTab(self._create_timeline, lambda widget: widget.load_timeline())
+        self.tabs.addTab(self.timeline_tab, "Oś Czasu")
+        
+        # Tab - Statystyki
+        self.statistics_tab = LazyTab(self._create_statistics, lambda widget: widget.load_statistics())
+        self.tabs.addTab(self.statistics_tab, "Statystyki")
         
         main_layout.addWidget(self.tabs)
         
@@ -86,6 +93,36 @@ class MainWindow(QMainWindow):
         self.setStatusBar(self.statusBar)
         self.statusBar.showMessage("Gotowy")
     
+    def _create_ancestor_tree(self):
+        """Tworzy widget drzewa przodków"""
+        from .ancestor_tree_widget import AncestorTreeWidget
+        return AncestorTreeWidget(self.db_manager, self.relationship_calc)
+    
+    def _create_descendant_tree(self):
+        """Tworzy widget drzewa potomków"""
+        from .descendant_tree_widget import DescendantTreeWidget
+        return DescendantTreeWidget(self.db_manager, self.relationship_calc)
+    
+    def _create_full_tree(self):
+        """Tworzy widget pełnego drzewa"""
+        from .full_tree_widget import FullTreeWidget
+        return FullTreeWidget(self.db_manager, self.relationship_calc)
+    
+    def _create_timeline(self):
+        """Tworzy widget osi czasu"""
+        from .timeline_widget import TimelineWidget
+        return TimelineWidget(self.db_manager)
+    
+    def _create_statistics(self):
+        """Tworzy widget statystyk"""
+        from .statistics_widget import StatisticsWidget
+        return StatisticsWidget(self.db_manager)
+    
+    def _refresh_person_tree(self, widget):
+        """Ładuje drzewo przodków lub potomków wybranej osoby"""
+        if self.current_person_id:
+            widget.load_tree(self.current_person_id)
+    
     def create_menu(self):
         """Tworzy menu aplikacji"""
         menubar = self.menuBar()
@@ -138,6 +175,21 @@ class MainWindow(QMainWindow):
         delete_person_action.triggered.connect(self.on_delete_selected_person)
         person_menu.addAction(delete_person_action)
         
+        # Menu Narzędzia
+        tools_menu = menubar.addMenu("&Narzędzia")
+        
+        # Profiler zapytań
+        profiler_action = QAction("&Profiler zapytań", self)
+        profiler_action.setStatusTip("Pomiary czasu zapytań i operacji")
+        profiler_action.triggered.connect(self.show_profiler)
+        tools_menu.addAction(profiler_action)
+        
+        # Walidacja danych
+        validation_action = QAction("&Sprawdź poprawność danych", self)
+        validation_action.setStatusTip("Wykrywa niespójności w danych osób i relacji")
+        validation_action.triggered.connect(self.show_validation)
+        tools_menu.addAction(validation_action)
+        
         # Menu Pomoc
         help_menu = menubar.addMenu("&Pomoc")
         
@@ -180,17 +232,34 @@ class MainWindow(QMainWindow):
         toolbar.addAction(refresh_action)
     
     def load_data(self):
-        """Ładuje dane do wszystkich widgetów"""
-        self.person_list_widget.load_persons()
-        self.timeline_widget.load_timeline()
-        self.full_tree_widget.load_tree()
-        
-        if self.current_person_id:
-            self.ancestor_tree_widget.load_tree(self.current_person_id)
-            self.descendant_tree_widget.load_tree(self.current_person_id)
+        """
+        Ładuje dane do widgetów, których dotyczą zmiany od ostatniego ładowania
         
-        # Aktualizacja statusu
-        person_count = len(self.db_manager.get_all_persons())
+        Dziennik zmian bazy pozwala pominąć przeładowanie widoków, gdy dane
+        się nie zmieniły (np. po odświeżeniu bez edycji).
+        """
+        with profiler.action("odświeżenie danych"):
+            if self.last_seen_sequence is None:
+                persons_changed = relations_changed = True
+            else:
+                since = self.last_seen_sequence
+                persons_changed = self.db_manager.has_changes_since(since, 'osoby')
+                relations_changed = self.db_manager.has_changes_since(since, 'relacje')
+            
+            self.last_seen_sequence = self.db_manager.get_last_sequence()
+            
+            if persons_changed:
+                self.person_list_widget.load_persons()
+                self.timeline_tab.invalidate()
+                self.statistics_tab.invalidate()
+            
+            if persons_changed or relations_changed:
+                self.full_tree_tab.invalidate()
+                self.ancestor_tab.invalidate()
+                self.descendant_tab.invalidate()
+            
+            # Aktualizacja statusu
+            person_count = self.db_manager.count_persons()
         self.statusBar.showMessage(f"Załadowano {person_count} osób")
     
     def on_person_selected(self, person_id: int):
@@ -201,10 +270,11 @@ class MainWindow(QMainWindow):
             person_id: ID wybranej osoby
         """
         self.current_person_id = person_id
-        self.ancestor_tree_widget.load_tree(person_id)
-        self.descendant_tree_widget.load_tree(person_id)
+        with profiler.action("wybór osoby"):
+            self.ancestor_tab.invalidate()
+            self.descendant_tab.invalidate()
+            person = self.db_manager.get_person(person_id)
         
-        person = self.db_manager.get_person(person_id)
         if person:
             self.statusBar.showMessage(f"Wybrano: {person['imie']} {person['nazwisko']}")
     
@@ -279,7 +349,8 @@ class MainWindow(QMainWindow):
             try:
                 from ..utils.gedcom_handler import GedcomHandler
                 handler = GedcomHandler(self.db_manager)
-                handler.import_file(filename)
+                with profiler.action("import GEDCOM"):
+                    handler.import_file(filename)
                 self.load_data()
                 QMessageBox.information(self, "Sukces", "Dane zostały zaimportowane")
             except Exception as e:
@@ -298,11 +369,23 @@ class MainWindow(QMainWindow):
             try:
                 from ..utils.gedcom_handler import GedcomHandler
                 handler = GedcomHandler(self.db_manager)
-                handler.export_file(filename)
+                with profiler.action("eksport GEDCOM"):
+                    handler.export_file(filename)
                 QMessageBox.information(self, "Sukces", "Dane zostały wyeksportowane")
             except Exception as e:
                 QMessageBox.critical(self, "Błąd", f"Nie udało się wyeksportować pliku: {str(e)}")
     
+    def show_profiler(self):
+        """Wyświetla panel profilera zapytań"""
+        dialog = ProfilerDialog(self)
+        dialog.exec()
+    
+    def show_validation(self):
+        """Wyświetla wyniki walidacji danych"""
+        dialog = ValidationDialog(self.db_manager, self)
+        dialog.person_activated.connect(self.on_person_selected)
+        dialog.exec()
+    
     def show_about(self):
         """Wyświetla okno O aplikacji"""
         QMessageBox.about(
@@ -0,0 +1,184 @@
+"""
+ParentPicker - Pole wyboru rodzica z podpowiedziami ładowanymi na żądanie
+"""
+
+from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLineEdit, QCompleter, QPushButton
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer, pyqtSignal
+
+from ..utils.dates import format_year
+
+
+class ParentCandidateModel(QAbstractListModel):
+    """Model listy kandydatów na rodzica pobieranych stronami z bazy danych"""
+    
+    PAGE_SIZE = 50
+    
+    def __init__(self, db_manager, plec, parent=None):
+        """
+        Inicjalizacja modelu
+        
+        Args:
+            db_manager: Instancja DatabaseManager
+            plec: Płeć kandydatów (M/K)
+            parent: Obiekt rodzica
+        """
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.plec = plec
+        self.query = ''
+        self.child_birth_year = None
+        self.candidates = []
+        self.has_more = False
+    
+    def set_filter(self, query, child_birth_year=None):
+        """
+        Ustawia filtr i ładuje pierwszą stronę wyników
+        
+        Args:
+            query: Początek imienia lub nazwiska
+            child_birth_year: Rok urodzenia dziecka (None = bez filtra dat)
+        """
+        self.beginResetModel()
+        self.query = query
+        self.child_birth_year = child_birth_year
+        self.candidates = self._fetch_page()
+        self.has_more = len(self.candidates) == self.PAGE_SIZE
+        self.endResetModel()
+    
+    def _fetch_page(self, after=None):
+        """Pobiera z bazy danych stronę kandydatów następujących po podanym"""
+        return self.db_manager.get_parent_candidates(
+            self.plec, self.child_birth_year, self.query,
+            limit=self.PAGE_SIZE, after=after
+        )
+    
+    def rowCount(self, parent=QModelIndex()):
+        """Zwraca liczbę załadowanych kandydatów"""
+        if parent.isValid():
+            return 0
+        return len(self.candidates)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        """Zwraca dane kandydata dla widoku"""
+        if not index.isValid() or index.row() >= len(self.candidates):
+            return None
+        
+        person = self.candidates[index.row()]
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return self.format_person(person)
+        if role == Qt.ItemDataRole.UserRole:
+            return person['id']
+        return None
+    
+    def canFetchMore(self, parent=QModelIndex()):
+        """Sprawdza czy w bazie są kolejne strony wyników"""
+        return not parent.isValid() and self.has_more
+    
+    def fetchMore(self, parent=QModelIndex()):
+        """Dociąga kolejną stronę wyników przy przewijaniu listy"""
+        if parent.isValid():
+            return
+        
+        page = self._fetch_page(self.candidates[-1])
+        self.has_more = len(page) == self.PAGE_SIZE
+        if page:
+            start = len(self.candidates)
+            self.beginInsertRows(QModelIndex(), start, start + len(page) - 1)
+            self.candidates.extend(page)
+            self.endInsertRows()
+    
+    @staticmethod
+    def format_person(person):
+        """Zwraca tekst wyświetlany dla kandydata"""
+        name = f"{person['imie']} {person['nazwisko']}"
+        if person.get('data_urodzenia'):
+            name += f" ({format_year(person['data_urodzenia'])})"
+        return name
+
+
+class ParentPicker(QWidget):
+    """Pole tekstowe z podpowiedziami do wyboru rodzica"""
+    
+    selection_changed = pyqtSignal(object)  # Signal z ID wybranej osoby lub None
+    
+    SEARCH_DELAY_MS = 200
+    
+    def __init__(self, db_manager, plec, birth_year_provider=None, parent=None):
+        """
+        Inicjalizacja widgetu
+        
+        Args:
+            db_manager: Instancja DatabaseManager
+            plec: Płeć rodzica (M/K)
+            birth_year_provider: Funkcja zwracająca rok urodzenia dziecka lub None
+            parent: Widget rodzica
+        """
+        super().__init__(parent)
+        self.birth_year_provider = birth_year_provider
+        self.selected_id = None
+        
+        self.model = ParentCandidateModel(db_manager, plec, self)
+        
+        self.init_ui()
+    
+    def init_ui(self):
+        """Inicjalizacja interfejsu użytkownika"""
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        
+        self.line_edit = QLineEdit()
+        self.line_edit.setPlaceholderText("Nie wybrano - wpisz imię lub nazwisko...")
+        layout.addWidget(self.line_edit)
+        
+        self.clear_button = QPushButton("Wyczyść")
+        self.clear_button.clicked.connect(self.clear)
+        layout.addWidget(self.clear_button)
+        
+        # Model jest już przefiltrowany w bazie, completer tylko go wyświetla
+        self.completer = QCompleter(self.model, self)
+        self.completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.completer.activated[QModelIndex].connect(self.on_candidate_activated)
+        self.line_edit.setCompleter(self.completer)
+        
+        # Opóźnione wyszukiwanie, aby nie pytać bazy przy każdym znaku
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.refresh_candidates)
+        self.line_edit.textEdited.connect(self.on_text_edited)
+    
+    def on_text_edited(self, text):
+        """Obsługa wpisywania tekstu - unieważnia wybór i planuje wyszukiwanie"""
+        self._set_selected(None)
+        self.search_timer.start()
+    
+    def refresh_candidates(self):
+        """Ładuje pierwszą stronę kandydatów dla wpisanego tekstu"""
+        birth_year = self.birth_year_provider() if self.birth_year_provider else None
+        self.model.set_filter(self.line_edit.text(), birth_year)
+        self.completer.complete()
+    
+    def on_candidate_activated(self, index):
+        """Obsługa wyboru kandydata z listy podpowiedzi"""
+        source_index = self.completer.completionModel().mapToSource(index)
+        self._set_selected(self.model.data(source_index, Qt.ItemDataRole.UserRole))
+    
+    def clear(self):
+        """Czyści wybór"""
+        self.line_edit.clear()
+        self._set_selected(None)
+    
+    def _set_selected(self, person_id):
+        """Ustawia wybraną osobę i emituje sygnał przy zmianie"""
+        if person_id != self.selected_id:
+            self.selected_id = person_id
+            self.selection_changed.emit(person_id)
+    
+    def currentData(self):
+        """
+        Zwraca ID wybranej osoby (interfejs zgodny z QComboBox)
+        
+        Returns:
+            ID osoby lub None
+        """
+        return self.selected_id
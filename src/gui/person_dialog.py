@@ -5,15 +5,23 @@ PersonDialog - Dialog do edycji danych osoby
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
                             QLineEdit, QTextEdit, QDateEdit, QComboBox,
                             QPushButton, QLabel, QFileDialog, QMessageBox)
-from PyQt6.QtCore import QDate, Qt
+from PyQt6.QtCore import QDate, Qt, pyqtSignal
 from PyQt6.QtGui import QPixmap
 import os
-import shutil
+
+from .parent_picker import ParentPicker
+from ..utils.dates import parse_date
+from ..utils.thumbnail_cache import thumbnail_cache
 
 
 class PersonDialog(QDialog):
     """Dialog do dodawania i edycji danych osoby"""
     
+    PHOTO_SIZE = 100
+    
+    # Miniatura wygenerowana w tle (ścieżka zdjęcia, dane PNG)
+    thumbnail_ready = pyqtSignal(str, bytes)
+    
     def __init__(self, db_manager, person_id=None, parent=None):
         """
         Inicjalizacja dialogu
@@ -27,6 +35,9 @@ class PersonDialog(QDialog):
         self.db_manager = db_manager
         self.person_id = person_id
         self.photo_path = None
+        # Daty częściowe lub przybliżone wczytane do pól (pole -> (QDate, tekst))
+        self.inexact_dates = {}
+        self.thumbnail_ready.connect(self.on_thumbnail_ready)
         
         self.init_ui()
         
@@ -114,23 +125,16 @@ class PersonDialog(QDialog):
         form_layout.addRow("Notatki:", self.notatki_edit)
         
         # Rodzice (tylko dla nowej osoby)
-        if not person_id:
+        # Kandydaci ładowani są z bazy dopiero podczas wpisywania, więc
+        # otwarcie dialogu nie zależy od liczby osób w bazie
+        if not self.person_id:
             # Matka
-            mother_layout = QHBoxLayout()
-            self.mother_combo = QComboBox()
-            self.mother_combo.addItem("Nie wybrano", None)
-            mother_layout.addWidget(self.mother_combo)
-            form_layout.addRow("Matka (opcjonalnie):", mother_layout)
+            self.mother_picker = ParentPicker(self.db_manager, 'K', self.get_birth_year)
+            form_layout.addRow("Matka (opcjonalnie):", self.mother_picker)
             
             # Ojciec
-            father_layout = QHBoxLayout()
-            self.father_combo = QComboBox()
-            self.father_combo.addItem("Nie wybrano", None)
-            father_layout.addWidget(self.father_combo)
-            form_layout.addRow("Ojciec (opcjonalnie):", father_layout)
-            
-            # Załaduj listę osób do wyboru rodziców
-            self.load_parent_options()
+            self.father_picker = ParentPicker(self.db_manager, 'M', self.get_birth_year)
+            form_layout.addRow("Ojciec (opcjonalnie):", self.father_picker)
         
         layout.addLayout(form_layout)
         
@@ -155,22 +159,16 @@ class PersonDialog(QDialog):
         """Włącza/wyłącza pole daty śmierci"""
         self.data_smierci_edit.setEnabled(text == "Zmarła")
     
-    def load_parent_options(self):
-        """Ładuje listę potencjalnych rodziców do wyboru"""
-        persons = self.db_manager.get_all_persons()
-        
-        for person in persons:
-            name = f"{person['imie']} {person['nazwisko']}"
-            if person.get('data_urodzenia'):
-                name += f" ({person['data_urodzenia'][:4]})"
-            
-            # Dodaj do listy matek (płeć K)
-            if person.get('plec') == 'K':
-                self.mother_combo.addItem(name, person['id'])
-            
-            # Dodaj do listy ojców (płeć M)
-            if person.get('plec') == 'M':
-                self.father_combo.addItem(name, person['id'])
+    def get_birth_year(self):
+        """
+        Zwraca rok urodzenia wprowadzany w formularzu
+        
+        Returns:
+            Rok urodzenia lub None jeśli data nie jest znana
+        """
+        if self.data_urodzenia_check.currentText() == "Znana":
+            return self.data_urodzenia_edit.date().year()
+        return None
     
     def choose_photo(self):
         """Wybiera zdjęcie osoby"""
@@ -183,13 +181,51 @@ class PersonDialog(QDialog):
         
         if filename:
             self.photo_path = filename
-            pixmap = QPixmap(filename)
-            scaled_pixmap = pixmap.scaled(
-                100, 100,
+            self.show_photo(filename)
+    
+    def show_photo(self, path: str):
+        """
+        Wyświetla miniaturę zdjęcia; brakująca miniatura jest generowana w tle
+        
+        Args:
+            path: Ścieżka do zdjęcia
+        """
+        data = thumbnail_cache.get(path, self.PHOTO_SIZE)
+        if data is not None:
+            self._set_photo_pixmap(data)
+            return
+        
+        self.photo_label.setText("Wczytywanie...")
+        thumbnail_cache.request(path, self.PHOTO_SIZE, self._emit_thumbnail)
+    
+    def _emit_thumbnail(self, path: str, data):
+        """Przekazuje miniaturę z wątku roboczego do wątku GUI"""
+        try:
+            self.thumbnail_ready.emit(path, data or b'')
+        except RuntimeError:
+            # Dialog został zamknięty przed wygenerowaniem miniatury
+            pass
+    
+    def on_thumbnail_ready(self, path: str, data: bytes):
+        """Obsługa miniatury wygenerowanej w tle"""
+        if path != self.photo_path:
+            return
+        if data:
+            self._set_photo_pixmap(data)
+        else:
+            self.photo_label.setText("Brak podglądu")
+    
+    def _set_photo_pixmap(self, data: bytes):
+        """Ustawia miniaturę w etykiecie zdjęcia"""
+        pixmap = QPixmap()
+        pixmap.loadFromData(data)
+        if pixmap.width() > self.PHOTO_SIZE or pixmap.height() > self.PHOTO_SIZE:
+            pixmap = pixmap.scaled(
+                self.PHOTO_SIZE, self.PHOTO_SIZE,
                 Qt.AspectRatioMode.KeepAspectRatio,
                 Qt.TransformationMode.SmoothTransformation
             )
-            self.photo_label.setPixmap(scaled_pixmap)
+        self.photo_label.setPixmap(pixmap)
     
     def load_person_data(self):
         """Ładuje dane osoby do edycji"""
@@ -210,13 +246,11 @@ class PersonDialog(QDialog):
         
         if person['data_urodzenia']:
             self.data_urodzenia_check.setCurrentText("Znana")
-            date = QDate.fromString(person['data_urodzenia'], "yyyy-MM-dd")
-            self.data_urodzenia_edit.setDate(date)
+            self._load_date(self.data_urodzenia_edit, person['data_urodzenia'])
         
         if person['data_smierci']:
             self.data_smierci_check.setCurrentText("Zmarła")
-            date = QDate.fromString(person['data_smierci'], "yyyy-MM-dd")
-            self.data_smierci_edit.setDate(date)
+            self._load_date(self.data_smierci_edit, person['data_smierci'])
         
         if person['miejsce_urodzenia']:
             self.miejsce_urodzenia_edit.setText(person['miejsce_urodzenia'])
@@ -229,13 +263,38 @@ class PersonDialog(QDialog):
         
         if person['zdjecie_sciezka'] and os.path.exists(person['zdjecie_sciezka']):
             self.photo_path = person['zdjecie_sciezka']
-            pixmap = QPixmap(person['zdjecie_sciezka'])
-            scaled_pixmap = pixmap.scaled(
-                100, 100,
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            self.photo_label.setPixmap(scaled_pixmap)
+            self.show_photo(self.photo_path)
+    
+    def _load_date(self, edit, value):
+        """
+        Ustawia datę w polu edycji
+        
+        Pole obsługuje tylko pełne daty, więc data częściowa lub przybliżona
+        jest pokazywana jako najbliższa pełna data i zapamiętywana - jeśli
+        użytkownik jej nie zmieni, zostanie zapisana bez utraty dokładności.
+        
+        Args:
+            edit: Pole QDateEdit
+            value: Data z bazy danych
+        """
+        date = parse_date(value)
+        if date is not None:
+            edit.setDate(QDate(date.year, date.month or 1, date.day or 1))
+            if date.is_exact:
+                return
+            text = date.to_display()
+        else:
+            text = str(value)
+        
+        self.inexact_dates[edit] = (edit.date(), str(value))
+        edit.setToolTip(f"Zapisana data: {text}")
+    
+    def _date_text(self, edit):
+        """Zwraca datę z pola edycji do zapisania w bazie danych"""
+        loaded = self.inexact_dates.get(edit)
+        if loaded and loaded[0] == edit.date():
+            return loaded[1]
+        return edit.date().toString("yyyy-MM-dd")
     
     def save_person(self):
         """Zapisuje dane osoby"""
@@ -252,31 +311,21 @@ class PersonDialog(QDialog):
         
         data_urodzenia = None
         if self.data_urodzenia_check.currentText() == "Znana":
-            data_urodzenia = self.data_urodzenia_edit.date().toString("yyyy-MM-dd")
+            data_urodzenia = self._date_text(self.data_urodzenia_edit)
         
         data_smierci = None
         if self.data_smierci_check.currentText() == "Zmarła":
-            data_smierci = self.data_smierci_edit.date().toString("yyyy-MM-dd")
+            data_smierci = self._date_text(self.data_smierci_edit)
         
         miejsce_urodzenia = self.miejsce_urodzenia_edit.text().strip() or None
         miejsce_smierci = self.miejsce_smierci_edit.text().strip() or None
         notatki = self.notatki_edit.toPlainText().strip() or None
         
-        # Kopiuj zdjęcie do katalogu data/photos
+        # Dodaj zdjęcie do magazynu zdjęć (identyczne pliki są przechowywane raz)
         zdjecie_sciezka = None
         if self.photo_path and os.path.exists(self.photo_path):
             try:
-                photos_dir = os.path.join('data', 'photos')
-                os.makedirs(photos_dir, exist_ok=True)
-                
-                filename = os.path.basename(self.photo_path)
-                dest_path = os.path.join(photos_dir, filename)
-                
-                # Jeśli plik już istnieje i nie jest tym samym plikiem
-                if self.photo_path != dest_path:
-                    shutil.copy2(self.photo_path, dest_path)
-                
-                zdjecie_sciezka = dest_path
+                zdjecie_sciezka = self.db_manager.add_photo(self.photo_path)
             except Exception as e:
                 QMessageBox.warning(self, "Ostrzeżenie", f"Nie udało się skopiować zdjęcia: {str(e)}")
         
@@ -297,14 +346,14 @@ class PersonDialog(QDialog):
                 )
                 
                 # Dodaj relacje z rodzicami jeśli wybrano (tylko dla nowej osoby)
-                if hasattr(self, 'mother_combo'):
-                    mother_id = self.mother_combo.currentData()
+                if hasattr(self, 'mother_picker'):
+                    mother_id = self.mother_picker.currentData()
                     if mother_id:
                         self.db_manager.add_relation(mother_id, new_person_id, 'rodzic')
                         self.db_manager.add_relation(new_person_id, mother_id, 'dziecko')
                 
-                if hasattr(self, 'father_combo'):
-                    father_id = self.father_combo.currentData()
+                if hasattr(self, 'father_picker'):
+                    father_id = self.father_picker.currentData()
                     if father_id:
                         self.db_manager.add_relation(father_id, new_person_id, 'rodzic')
                         self.db_manager.add_relation(new_person_id, father_id, 'dziecko')
@@ -7,6 +7,23 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
                             QHeaderView, QAbstractItemView)
 from PyQt6.QtCore import Qt, pyqtSignal
 
+from ..utils.dates import format_date
+from ..utils.profiler import profiled
+
+
+class DateItem(QTableWidgetItem):
+    """Komórka z datą sortowana wg klucza liczbowego, a nie tekstu"""
+    
+    def __init__(self, text, sort_key):
+        super().__init__(text)
+        # Daty nieznane na końcu
+        self.sort_key = sort_key if sort_key is not None else float('inf')
+    
+    def __lt__(self, other):
+        if isinstance(other, DateItem):
+            return self.sort_key < other.sort_key
+        return super().__lt__(other)
+
 
 class PersonListWidget(QWidget):
     """Widget wyświetlający listę osób z funkcją wyszukiwania"""
@@ -100,6 +117,7 @@ class PersonListWidget(QWidget):
         
         layout.addLayout(button_layout)
     
+    @profiled
     def load_persons(self, persons=None):
         """
         Ładuje listę osób do tabeli
@@ -120,7 +138,8 @@ class PersonListWidget(QWidget):
             self.table.setItem(row_position, 0, QTableWidgetItem(str(person['id'])))
             self.table.setItem(row_position, 1, QTableWidgetItem(person['imie']))
             self.table.setItem(row_position, 2, QTableWidgetItem(person['nazwisko']))
-            self.table.setItem(row_position, 3, QTableWidgetItem(person['data_urodzenia'] or ''))
+            self.table.setItem(row_position, 3, DateItem(format_date(person['data_urodzenia']),
+                                                         person.get('urodzenie_klucz')))
             self.table.setItem(row_position, 4, QTableWidgetItem(person['plec'] or ''))
             self.table.setItem(row_position, 5, QTableWidgetItem(person['miejsce_urodzenia'] or ''))
         
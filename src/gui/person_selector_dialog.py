@@ -7,6 +7,8 @@ from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QListWidget,
                             QListWidgetItem)
 from PyQt6.QtCore import Qt
 
+from ..utils.dates import format_year
+
 
 class PersonSelectorDialog(QDialog):
     """Dialog do wyboru osoby z listy"""
@@ -80,7 +82,7 @@ class PersonSelectorDialog(QDialog):
             if self.exclude_person_id and person['id'] == self.exclude_person_id:
                 continue
             
-            birth_year = person['data_urodzenia'].split('-')[0] if person['data_urodzenia'] else '?'
+            birth_year = format_year(person['data_urodzenia'])
             text = f"{person['imie']} {person['nazwisko']} ({birth_year})"
             
             item = QListWidgetItem(text)
@@ -0,0 +1,176 @@
+"""
+ProfilerDialog - Panel diagnostyczny z pomiarami zapytań i operacji
+"""
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTableWidget,
+                            QTableWidgetItem, QPushButton, QCheckBox, QLabel,
+                            QHeaderView, QAbstractItemView, QFileDialog, QMessageBox,
+                            QSplitter)
+from PyQt6.QtCore import Qt
+
+from ..utils.profiler import profiler
+
+
+class ProfilerDialog(QDialog):
+    """Panel wyświetlający pomiary profilera pogrupowane według akcji"""
+    
+    def __init__(self, parent=None):
+        """
+        Inicjalizacja dialogu
+        
+        Args:
+            parent: Widget rodzica
+        """
+        super().__init__(parent)
+        self.summary = {'actions': {}, 'statements': []}
+        
+        self.init_ui()
+        self.refresh()
+    
+    def init_ui(self):
+        """Inicjalizacja interfejsu użytkownika"""
+        self.setWindowTitle("Profiler zapytań")
+        self.setMinimumSize(800, 600)
+        
+        layout = QVBoxLayout(self)
+        
+        # Włączanie profilera
+        self.enabled_check = QCheckBox("Zbieraj pomiary")
+        self.enabled_check.setChecked(profiler.enabled)
+        self.enabled_check.toggled.connect(self.on_enabled_toggled)
+        layout.addWidget(self.enabled_check)
+        
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        
+        # Akcje użytkownika
+        self.actions_table = self._create_table(["Akcja", "Wywołania", "Czas [ms]", "Zapytania SQL"])
+        self.actions_table.itemSelectionChanged.connect(self.on_action_selected)
+        splitter.addWidget(self.actions_table)
+        
+        # Funkcje w wybranej akcji
+        self.functions_table = self._create_table(
+            ["Funkcja", "Wywołania", "Czas [ms]", "Średnio [ms]", "Maks. [ms]", "Wiersze", "Zapytania SQL"]
+        )
+        splitter.addWidget(self.functions_table)
+        
+        # Najczęstsze zapytania SQL
+        self.statements_table = self._create_table(["Zapytanie SQL", "Liczba"])
+        splitter.addWidget(self.statements_table)
+        
+        layout.addWidget(splitter)
+        
+        self.info_label = QLabel()
+        layout.addWidget(self.info_label)
+        
+        # Przyciski
+        button_layout = QHBoxLayout()
+        
+        refresh_button = QPushButton("Odśwież")
+        refresh_button.clicked.connect(self.refresh)
+        button_layout.addWidget(refresh_button)
+        
+        reset_button = QPushButton("Wyczyść")
+        reset_button.clicked.connect(self.on_reset_clicked)
+        button_layout.addWidget(reset_button)
+        
+        json_button = QPushButton("Zapisz JSON...")
+        json_button.clicked.connect(self.on_dump_json_clicked)
+        button_layout.addWidget(json_button)
+        
+        flamegraph_button = QPushButton("Zapisz flamegraph...")
+        flamegraph_button.clicked.connect(self.on_dump_collapsed_clicked)
+        button_layout.addWidget(flamegraph_button)
+        
+        button_layout.addStretch()
+        
+        close_button = QPushButton("Zamknij")
+        close_button.clicked.connect(self.accept)
+        button_layout.addWidget(close_button)
+        
+        layout.addLayout(button_layout)
+    
+    def _create_table(self, headers):
+        """Tworzy tabelę tylko do odczytu z podanymi nagłówkami"""
+        table = QTableWidget()
+        table.setColumnCount(len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        return table
+    
+    def _fill_table(self, table, rows):
+        """Wypełnia tabelę wierszami wartości"""
+        table.setRowCount(0)
+        for values in rows:
+            row_position = table.rowCount()
+            table.insertRow(row_position)
+            for column, value in enumerate(values):
+                table.setItem(row_position, column, QTableWidgetItem(str(value)))
+    
+    def refresh(self):
+        """Odświeża tabele na podstawie bieżących pomiarów"""
+        self.summary = profiler.get_summary()
+        actions = sorted(self.summary['actions'].items(), key=lambda item: -item[1]['total_ms'])
+        
+        self._fill_table(self.actions_table, [
+            (name, stats['calls'], stats['total_ms'], stats['queries'])
+            for name, stats in actions
+        ])
+        self._fill_table(self.statements_table, [
+            (statement['sql'], statement['count']) for statement in self.summary['statements']
+        ])
+        self.functions_table.setRowCount(0)
+        
+        status = "włączony" if profiler.enabled else "wyłączony"
+        self.info_label.setText(f"Profiler {status} - akcji: {len(actions)}")
+    
+    def on_action_selected(self):
+        """Wyświetla funkcje wywołane w ramach wybranej akcji"""
+        selected = self.actions_table.selectedItems()
+        if not selected:
+            return
+        
+        action = self.actions_table.item(selected[0].row(), 0).text()
+        functions = self.summary['actions'].get(action, {}).get('functions', {})
+        self._fill_table(self.functions_table, [
+            (name, stats['calls'], stats['total_ms'], stats['mean_ms'], stats['max_ms'],
+             stats['rows'], stats['queries'])
+            for name, stats in functions.items()
+        ])
+    
+    def on_enabled_toggled(self, checked):
+        """Włącza lub wyłącza profiler"""
+        if checked:
+            profiler.enable()
+        else:
+            profiler.disable()
+        self.refresh()
+    
+    def on_reset_clicked(self):
+        """Usuwa zebrane pomiary"""
+        profiler.reset()
+        self.refresh()
+    
+    def on_dump_json_clicked(self):
+        """Zapisuje pomiary do pliku JSON (format zgodny z chrome://tracing)"""
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "Zapisz pomiary", "profil.json", "Pliki JSON (*.json)"
+        )
+        if filename:
+            try:
+                profiler.dump_json(filename)
+            except OSError as e:
+                QMessageBox.critical(self, "Błąd", f"Nie udało się zapisać pliku: {str(e)}")
+    
+    def on_dump_collapsed_clicked(self):
+        """Zapisuje stosy wywołań w formacie dla flamegraph.pl"""
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "Zapisz stosy wywołań", "profil.folded", "Wszystkie pliki (*)"
+        )
+        if filename:
+            try:
+                profiler.dump_collapsed(filename)
+            except OSError as e:
+                QMessageBox.critical(self, "Błąd", f"Nie udało się zapisać pliku: {str(e)}")
@@ -0,0 +1,109 @@
+"""
+StatisticsWidget - Widget ze statystykami nazwisk, migracji i dekad urodzenia
+"""
+
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QLabel,
+                            QTableWidget, QTableWidgetItem, QHeaderView,
+                            QAbstractItemView, QCheckBox)
+from PyQt6.QtCore import Qt
+
+from ..utils.profiler import profiled
+
+
+class StatisticsWidget(QWidget):
+    """Widget wyświetlający statystyki zbiorcze bazy"""
+    
+    # Liczba wierszy rankingów nazwisk i migracji
+    RANKING_LIMIT = 100
+    
+    def __init__(self, db_manager, parent=None):
+        """
+        Inicjalizacja widgetu
+        
+        Args:
+            db_manager: Instancja DatabaseManager
+            parent: Widget rodzica
+        """
+        super().__init__(parent)
+        self.db_manager = db_manager
+        
+        self.init_ui()
+    
+    def init_ui(self):
+        """Inicjalizacja interfejsu użytkownika"""
+        layout = QVBoxLayout(self)
+        
+        self.info_label = QLabel("Statystyki")
+        self.info_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.info_label)
+        
+        tables_layout = QHBoxLayout()
+        
+        self.surname_table = self._create_table(["Nazwisko", "Osoby"])
+        tables_layout.addWidget(self._group("Najczęstsze nazwiska", self.surname_table))
+        
+        self.migration_table = self._create_table(["Miejsce urodzenia", "Miejsce śmierci", "Osoby"])
+        migration_group = self._group("Migracje", self.migration_table)
+        self.same_place_check = QCheckBox("Uwzględnij zmarłych w miejscu urodzenia")
+        self.same_place_check.toggled.connect(self.load_migrations)
+        migration_group.layout().addWidget(self.same_place_check)
+        tables_layout.addWidget(migration_group, 2)
+        
+        self.decade_table = self._create_table(["Dekada", "Urodzenia"])
+        tables_layout.addWidget(self._group("Urodzenia wg dekad", self.decade_table))
+        
+        layout.addLayout(tables_layout)
+    
+    @staticmethod
+    def _create_table(headers) -> QTableWidget:
+        """Tworzy tabelę tylko do odczytu z podanymi nagłówkami"""
+        table = QTableWidget()
+        table.setColumnCount(len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        return table
+    
+    @staticmethod
+    def _group(title: str, table: QTableWidget) -> QGroupBox:
+        """Umieszcza tabelę w ramce z tytułem"""
+        group = QGroupBox(title)
+        group_layout = QVBoxLayout(group)
+        group_layout.addWidget(table)
+        return group
+    
+    @staticmethod
+    def _fill(table: QTableWidget, rows, columns):
+        """Wypełnia tabelę wartościami kolumn słowników"""
+        table.setRowCount(len(rows))
+        for row, record in enumerate(rows):
+            for column, key in enumerate(columns):
+                item = QTableWidgetItem(str(record[key]))
+                if isinstance(record[key], int):
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                table.setItem(row, column, item)
+    
+    @profiled
+    def load_statistics(self):
+        """Ładuje wszystkie statystyki"""
+        surnames = self.db_manager.get_surname_frequency(self.RANKING_LIMIT)
+        self._fill(self.surname_table, surnames, ('nazwisko', 'liczba'))
+        
+        self.load_migrations()
+        
+        decades = self.db_manager.get_birth_decades()
+        self._fill(self.decade_table, decades, ('dekada', 'liczba'))
+        
+        self.info_label.setText(
+            f"Osoby: {self.db_manager.count_persons()} | "
+            f"urodzenia z datą: {sum(decade['liczba'] for decade in decades)}"
+        )
+    
+    def load_migrations(self):
+        """Ładuje ranking par miejsca urodzenia i śmierci"""
+        migrations = self.db_manager.get_migrations(self.RANKING_LIMIT,
+                                                    include_same=self.same_place_check.isChecked())
+        self._fill(self.migration_table, migrations,
+                   ('miejsce_urodzenia', 'miejsce_smierci', 'liczba'))
@@ -2,17 +2,36 @@
 TimelineWidget - Widget do wizualizacji osi czasu
 """
 
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QScrollArea
-from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QCheckBox,
+                            QSpinBox, QPushButton)
+from PyQt6.QtCore import Qt, QTimer
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
+from matplotlib.collections import PolyCollection
 from matplotlib.figure import Figure
-import matplotlib.patches as mpatches
-from datetime import datetime
+import numpy as np
+
+from ..business_logic.timeline_data import build_timeline_data
+from ..utils.profiler import profiled
+
+
+# Kolory pasków wg kodu płci (nieznana, M, K)
+GENDER_COLORS = np.array([
+    (0.83, 0.83, 0.83, 1.0),   # lightgray
+    (0.68, 0.85, 0.90, 1.0),   # lightblue
+    (1.00, 0.75, 0.80, 1.0),   # pink
+])
 
 
 class TimelineWidget(QWidget):
     """Widget do wizualizacji osi czasu życia osób"""
     
+    # Powyżej tej liczby widocznych osób nie są rysowane podpisy
+    LABEL_LIMIT = 60
+    
+    # Opóźnienie przerysowania po przewinięciu lub powiększeniu [ms]
+    REDRAW_DELAY_MS = 40
+    
     def __init__(self, db_manager, parent=None):
         """
         Inicjalizacja widgetu
@@ -23,6 +42,15 @@ class TimelineWidget(QWidget):
         """
         super().__init__(parent)
         self.db_manager = db_manager
+        self.data = None
+        self.ax = None
+        self.bars = None
+        self.labels = []
+        self.visible_window = None
+        self.drawn_rows = np.empty(0, dtype=np.int64)
+        # Wiersze osób, do których zawężono oś czasu (None = wszystkie) i opis filtra
+        self.filter_rows = None
+        self.filter_text = ''
         
         self.init_ui()
     
@@ -35,121 +63,186 @@ class TimelineWidget(QWidget):
         self.info_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.info_label)
         
-        # Canvas matplotlib
+        # Zawężenie do współczesnych wg indeksu lat życia w bazie: osoby żyjące
+        # w wybranym roku albo współcześni osoby klikniętej na wykresie
+        filter_layout = QHBoxLayout()
+        self.year_check = QCheckBox("Tylko żyjący w roku:")
+        self.year_check.toggled.connect(self.apply_year_filter)
+        filter_layout.addWidget(self.year_check)
+        self.year_spin = QSpinBox()
+        self.year_spin.setRange(1, 9998)
+        self.year_spin.setValue(1900)
+        self.year_spin.valueChanged.connect(self.on_year_changed)
+        filter_layout.addWidget(self.year_spin)
+        self.clear_filter_button = QPushButton("Pokaż wszystkich")
+        self.clear_filter_button.clicked.connect(self.clear_filter)
+        filter_layout.addWidget(self.clear_filter_button)
+        filter_layout.addStretch()
+        filter_layout.addWidget(QLabel("Kliknij pasek, aby pokazać współczesnych osoby"))
+        layout.addLayout(filter_layout)
+        
+        # Canvas matplotlib z paskiem przewijania/powiększania
         self.figure = Figure(figsize=(12, 8))
         self.canvas = FigureCanvas(self.figure)
-        
-        # Scroll area
-        scroll = QScrollArea()
-        scroll.setWidget(self.canvas)
-        scroll.setWidgetResizable(True)
-        layout.addWidget(scroll)
+        layout.addWidget(NavigationToolbar(self.canvas, self))
+        layout.addWidget(self.canvas)
+        self.canvas.mpl_connect('pick_event', self.on_bar_picked)
+        
+        # Przerysowanie po zmianie zakresu jest odkładane, aby nie
+        # przeliczać widoku przy każdym ruchu myszy
+        self.redraw_timer = QTimer(self)
+        self.redraw_timer.setSingleShot(True)
+        self.redraw_timer.setInterval(self.REDRAW_DELAY_MS)
+        self.redraw_timer.timeout.connect(self.update_window)
+    
+    def _show_message(self, ax, message):
+        """Wyświetla komunikat zamiast wykresu"""
+        ax.text(0.5, 0.5, message, ha='center', va='center', fontsize=12)
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.axis('off')
+        self.canvas.draw()
     
+    @profiled
     def load_timeline(self):
         """Ładuje i wyświetla oś czasu"""
-        persons = self.db_manager.get_all_persons()
+        self.data = build_timeline_data(self.db_manager.get_timeline_rows())
         
         # Wyczyść figurę
         self.figure.clear()
-        ax = self.figure.add_subplot(111)
-        
-        if not persons:
-            ax.text(0.5, 0.5, 'Brak osób w bazie danych',
-                   ha='center', va='center', fontsize=12)
-            ax.set_xlim(0, 1)
-            ax.set_ylim(0, 1)
-            ax.axis('off')
-            self.canvas.draw()
+        self.ax = ax = self.figure.add_subplot(111)
+        self.bars = None
+        self.labels = []
+        self.visible_window = None
+        self.drawn_rows = np.empty(0, dtype=np.int64)
+        self.filter_rows = None
+        self.filter_text = ''
+        
+        if not len(self.data):
+            message = ('Brak osób w bazie danych' if not self.db_manager.count_persons()
+                       else 'Brak osób z datami urodzenia')
+            self._show_message(ax, message)
+            self.info_label.setText("Oś czasu")
             return
         
-        # Filtruj osoby z datami urodzenia
-        persons_with_dates = []
-        for p in persons:
-            if p.get('data_urodzenia'):
-                try:
-                    birth_year = int(p['data_urodzenia'].split('-')[0])
-                    death_year = None
-                    if p.get('data_smierci'):
-                        death_year = int(p['data_smierci'].split('-')[0])
-                    else:
-                        death_year = datetime.now().year
-                    
-                    persons_with_dates.append({
-                        'person': p,
-                        'birth_year': birth_year,
-                        'death_year': death_year
-                    })
-                except (ValueError, IndexError):
-                    pass
-        
-        if not persons_with_dates:
-            ax.text(0.5, 0.5, 'Brak osób z datami urodzenia',
-                   ha='center', va='center', fontsize=12)
-            ax.set_xlim(0, 1)
-            ax.set_ylim(0, 1)
-            ax.axis('off')
-            self.canvas.draw()
-            return
-        
-        # Sortuj osoby według roku urodzenia
-        persons_with_dates.sort(key=lambda x: x['birth_year'])
-        
-        # Znajdź zakres lat
-        min_year = min(p['birth_year'] for p in persons_with_dates)
-        max_year = max(p['death_year'] for p in persons_with_dates)
-        
-        # Dodaj margines
+        # Zakres lat z marginesem
+        min_year, max_year = self.data.year_range
         year_margin = max(10, (max_year - min_year) * 0.05)
-        min_year -= year_margin
-        max_year += year_margin
-        
-        # Rysowanie osi czasu
-        y_pos = 0
-        y_spacing = 1
-        
-        for data in persons_with_dates:
-            p = data['person']
-            birth_year = data['birth_year']
-            death_year = data['death_year']
-            
-            # Kolor w zależności od płci
-            if p.get('plec') == 'M':
-                color = 'lightblue'
-            elif p.get('plec') == 'K':
-                color = 'pink'
-            else:
-                color = 'lightgray'
-            
-            # Rysowanie linii życia
-            ax.barh(y_pos, death_year - birth_year, left=birth_year,
-                   height=0.5, color=color, edgecolor='black', linewidth=0.5)
-            
-            # Etykieta
-            name = f"{p['imie']} {p['nazwisko']}"
-            ax.text(min_year - 5, y_pos, name,
-                   va='center', ha='right', fontsize=8)
-            
-            # Lata
-            years_text = f"{birth_year}"
-            if p.get('data_smierci'):
-                years_text += f"-{death_year}"
-            else:
-                years_text += "-"
-            
-            ax.text(max_year + 5, y_pos, years_text,
-                   va='center', ha='left', fontsize=7, style='italic')
-            
-            y_pos += y_spacing
+        self.year_spin.blockSignals(True)
+        self.year_spin.setRange(min_year, max_year)
+        self.year_spin.blockSignals(False)
+        
+        # Jedna kolekcja prostokątów zamiast osobnego barh dla każdej osoby
+        self.bars = PolyCollection([], edgecolors='black', linewidths=0.5, picker=True)
+        ax.add_collection(self.bars)
         
         # Ustawienia osi
-        ax.set_xlim(min_year - 50, max_year + 50)
-        ax.set_ylim(-y_spacing, y_pos)
+        ax.set_xlim(min_year - year_margin, max_year + year_margin)
         ax.set_xlabel('Rok', fontsize=10)
         ax.set_yticks([])
         ax.grid(True, axis='x', alpha=0.3)
         ax.set_title('Oś czasu życia osób', fontsize=12, weight='bold')
         
+        # Filtr roku po przeładowaniu danych jest wyznaczany od nowa
+        if self.year_check.isChecked():
+            self.apply_year_filter()
+        self.update_window()
+        ax.callbacks.connect('xlim_changed', lambda _ax: self.redraw_timer.start())
+        
         self.figure.tight_layout()
-        self.canvas.draw()
+        self.canvas.draw_idle()
+    
+    @profiled
+    def update_window(self):
+        """Rysuje tylko osoby żyjące w widocznym zakresie lat"""
+        if self.bars is None:
+            return
+        
+        year_from, year_to = self.ax.get_xlim()
+        window = (round(year_from, 3), round(year_to, 3))
+        if window == self.visible_window:
+            return
+        self.visible_window = window
+        
+        rows = self.data.visible_rows(year_from, year_to)
+        if self.filter_rows is not None:
+            rows = np.intersect1d(rows, self.filter_rows, assume_unique=True)
+        self.drawn_rows = rows
+        self.bars.set_verts(self.data.bar_vertices(rows))
+        self.bars.set_facecolor(GENDER_COLORS[self.data.gender[rows]])
+        
+        for label in self.labels:
+            label.remove()
+        self.labels = []
+        
+        if len(rows):
+            # Wiersze są numerami osób w kolejności urodzenia - układ nie zmienia
+            # się przy przewijaniu, widoczny jest tylko fragment osi Y
+            self.ax.set_ylim(rows.min() - 1, rows.max() + 1)
+            if len(rows) <= self.LABEL_LIMIT:
+                self._draw_labels(rows, year_from)
+        
+        filter_text = f", {self.filter_text}" if self.filter_rows is not None else ''
+        self.info_label.setText(
+            f"Oś czasu - {len(self.data)} osób (widocznych: {len(rows)}, "
+            f"lata {int(year_from)}-{int(year_to)}{filter_text})"
+        )
+        self.canvas.draw_idle()
+    
+    def _set_filter(self, rows, text=''):
+        """Zawęża oś czasu do podanych wierszy (None = wszystkie osoby)"""
+        self.filter_rows = rows
+        self.filter_text = text
+        self.visible_window = None
+        self.update_window()
+    
+    def apply_year_filter(self):
+        """Pokazuje tylko osoby żyjące w wybranym roku (zapytanie do indeksu R*Tree)"""
+        if self.data is None:
+            return
+        if not self.year_check.isChecked():
+            self._set_filter(None)
+            return
+        year = self.year_spin.value()
+        alive = self.db_manager.persons_alive_in(year)
+        self._set_filter(self.data.rows_of(person['id'] for person in alive),
+                         f"żyjący w roku {year}")
+    
+    def on_year_changed(self, _year):
+        """Odświeża filtr roku po zmianie wybranego roku"""
+        if self.year_check.isChecked():
+            self.apply_year_filter()
+    
+    def on_bar_picked(self, event):
+        """Pokazuje osoby, których życie pokrywało się z życiem klikniętej osoby"""
+        if event.artist is not self.bars or not len(event.ind):
+            return
+        row = self.drawn_rows[event.ind[0]]
+        person_id = int(self.data.ids[row])
+        contemporaries = self.db_manager.overlapping_persons(person_id)
         
-        self.info_label.setText(f"Oś czasu - {len(persons_with_dates)} osób")
+        self._uncheck_year_filter()
+        self._set_filter(self.data.rows_of([person_id] + [person['id'] for person in contemporaries]),
+                         f"współcześni: {self.data.names[row]}")
+    
+    def _uncheck_year_filter(self):
+        """Odznacza filtr roku bez przeliczania widoku"""
+        self.year_check.blockSignals(True)
+        self.year_check.setChecked(False)
+        self.year_check.blockSignals(False)
+    
+    def clear_filter(self):
+        """Przywraca wszystkie osoby na osi czasu"""
+        self._uncheck_year_filter()
+        self._set_filter(None)
+    
+    def _draw_labels(self, rows, year_from):
+        """Dodaje podpisy z imieniem, nazwiskiem i latami życia"""
+        for row in rows:
+            birth = int(self.data.birth[row])
+            years_text = f"{birth}-" if self.data.open_ended[row] else f"{birth}-{int(self.data.end[row])}"
+            x = max(birth, year_from)
+            self.labels.append(self.ax.text(
+                x, row, f" {self.data.names[row]} ({years_text})",
+                va='center', ha='left', fontsize=7, clip_on=True
+            ))
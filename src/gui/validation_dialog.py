@@ -0,0 +1,124 @@
+"""
+ValidationDialog - Lista problemów wykrytych przez walidację danych
+"""
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTableWidget,
+                            QTableWidgetItem, QPushButton, QLabel, QHeaderView,
+                            QAbstractItemView, QApplication)
+from PyQt6.QtCore import pyqtSignal
+
+from ..database.validator import SEVERITY_ERROR
+from ..utils.profiler import profiler
+
+
+class ValidationDialog(QDialog):
+    """Dialog uruchamiający walidację i wyświetlający zapisane problemy"""
+    
+    # Emitowany po dwukrotnym kliknięciu problemu (ID osoby)
+    person_activated = pyqtSignal(int)
+    
+    # Co tyle wykrytych problemów odświeżany jest licznik w trakcie walidacji
+    PROGRESS_INTERVAL = 200
+    
+    def __init__(self, db_manager, parent=None):
+        """
+        Inicjalizacja dialogu
+        
+        Args:
+            db_manager: Instancja DatabaseManager
+            parent: Widget rodzica
+        """
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.findings = []
+        
+        self.init_ui()
+        self.show_findings()
+    
+    def init_ui(self):
+        """Inicjalizacja interfejsu użytkownika"""
+        self.setWindowTitle("Poprawność danych")
+        self.setMinimumSize(800, 500)
+        
+        layout = QVBoxLayout(self)
+        
+        self.table = QTableWidget()
+        headers = ["Opis", "Waga", "Osoba", "Druga osoba"]
+        self.table.setColumnCount(len(headers))
+        self.table.setHorizontalHeaderLabels(headers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.cellDoubleClicked.connect(self.on_row_double_clicked)
+        layout.addWidget(self.table)
+        
+        self.info_label = QLabel()
+        layout.addWidget(self.info_label)
+        
+        # Przyciski
+        button_layout = QHBoxLayout()
+        
+        changes_button = QPushButton("Sprawdź zmiany")
+        changes_button.setToolTip("Sprawdza osoby zmienione od poprzedniej walidacji")
+        changes_button.clicked.connect(lambda: self.run_validation(full=False))
+        button_layout.addWidget(changes_button)
+        
+        full_button = QPushButton("Sprawdź wszystko")
+        full_button.clicked.connect(lambda: self.run_validation(full=True))
+        button_layout.addWidget(full_button)
+        
+        button_layout.addStretch()
+        
+        close_button = QPushButton("Zamknij")
+        close_button.clicked.connect(self.accept)
+        button_layout.addWidget(close_button)
+        
+        layout.addLayout(button_layout)
+    
+    def run_validation(self, full: bool):
+        """
+        Uruchamia walidację, pokazując postęp w miarę wykrywania problemów
+        
+        Args:
+            full: Sprawdź całą bazę zamiast zmian od poprzedniej walidacji
+        """
+        found = 0
+        with profiler.action("walidacja danych"):
+            for found, _ in enumerate(self.db_manager.validate(full=full), start=1):
+                if found % self.PROGRESS_INTERVAL == 0:
+                    self.info_label.setText(f"Sprawdzanie... wykryte problemy: {found}")
+                    QApplication.processEvents()
+        self.show_findings(f"Sprawdzono {'całą bazę' if full else 'zmiany'} - nowe wyniki: {found}")
+    
+    def show_findings(self, status: str = ""):
+        """Wyświetla problemy zapisane przez walidacje"""
+        self.findings = self.db_manager.get_validation_findings()
+        names = {}
+        
+        def name(person_id):
+            if person_id is None:
+                return ""
+            if person_id not in names:
+                person = self.db_manager.get_person(person_id)
+                names[person_id] = (f"{person['imie']} {person['nazwisko']}" if person
+                                    else f"(brak osoby {person_id})")
+            return names[person_id]
+        
+        self.table.setRowCount(len(self.findings))
+        for row, finding in enumerate(self.findings):
+            severity = "Błąd" if finding.severity == SEVERITY_ERROR else "Ostrzeżenie"
+            values = (finding.message, severity, name(finding.person_id), name(finding.other_person_id))
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QTableWidgetItem(value))
+        
+        errors = sum(1 for finding in self.findings if finding.severity == SEVERITY_ERROR)
+        summary = f"Błędy: {errors}, ostrzeżenia: {len(self.findings) - errors}"
+        self.info_label.setText(f"{status} | {summary}" if status else summary)
+    
+    def on_row_double_clicked(self, row, column):
+        """Przechodzi do osoby, której dotyczy problem"""
+        finding = self.findings[row]
+        person_id = finding.other_person_id if column == 3 else finding.person_id
+        if person_id is not None and self.db_manager.get_person(person_id):
+            self.person_activated.emit(person_id)
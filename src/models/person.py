@@ -6,6 +6,8 @@ from dataclasses import dataclass
 from typing import Optional
 from datetime import date
 
+from ..utils.dates import year_of
+
 
 @dataclass
 class Person:
@@ -29,21 +31,11 @@ class Person:
     
     def get_birth_year(self) -> Optional[int]:
         """Zwraca rok urodzenia jeśli dostępny"""
-        if self.data_urodzenia:
-            try:
-                return int(self.data_urodzenia.split('-')[0])
-            except (ValueError, IndexError):
-                return None
-        return None
+        return year_of(self.data_urodzenia)
     
     def get_death_year(self) -> Optional[int]:
         """Zwraca rok śmierci jeśli dostępny"""
-        if self.data_smierci:
-            try:
-                return int(self.data_smierci.split('-')[0])
-            except (ValueError, IndexError):
-                return None
-        return None
+        return year_of(self.data_smierci)
     
     def is_alive(self) -> bool:
         """Sprawdza czy osoba żyje"""
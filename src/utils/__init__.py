@@ -3,5 +3,6 @@ Moduł narzędzi pomocniczych
 """
 
 from .gedcom_handler import GedcomHandler
+from .thumbnail_cache import ThumbnailCache
 
-__all__ = ['GedcomHandler']
+__all__ = ['GedcomHandler', 'ThumbnailCache']
@@ -0,0 +1,287 @@
+"""
+Daty genealogiczne - daty częściowe, przybliżone i przedziały
+
+Daty są przechowywane jako tekst w postaci kanonicznej (ISO z opcjonalnym
+kwalifikatorem GEDCOM, np. "1850-03-12", "1850-03", "ABT 1850",
+"BET 1850 AND 1855"), a obok niego - liczbowy klucz sortowania RRRRMMDD,
+dokładność i kwalifikator wyliczone raz przy zapisie.
+"""
+
+import calendar
+import re
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union
+
+
+# Dokładność daty
+PRECISION_DAY = 'dzien'
+PRECISION_MONTH = 'miesiac'
+PRECISION_YEAR = 'rok'
+
+# Kwalifikatory (jak w GEDCOM)
+QUALIFIER_ABOUT = 'ABT'
+QUALIFIER_CALCULATED = 'CAL'
+QUALIFIER_ESTIMATED = 'EST'
+QUALIFIER_BEFORE = 'BEF'
+QUALIFIER_AFTER = 'AFT'
+QUALIFIER_BETWEEN = 'BET'
+
+QUALIFIERS = (QUALIFIER_ABOUT, QUALIFIER_CALCULATED, QUALIFIER_ESTIMATED,
+              QUALIFIER_BEFORE, QUALIFIER_AFTER, QUALIFIER_BETWEEN)
+
+MONTHS = ('JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN',
+          'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC')
+
+# Polskie zapisy kwalifikatorów (wyświetlanie i wprowadzanie)
+QUALIFIER_LABELS = {
+    QUALIFIER_ABOUT: 'ok.',
+    QUALIFIER_CALCULATED: 'wyl.',
+    QUALIFIER_ESTIMATED: 'szac.',
+    QUALIFIER_BEFORE: 'przed',
+    QUALIFIER_AFTER: 'po',
+}
+
+# Krótkie oznaczenia roku w etykietach drzew
+QUALIFIER_MARKS = {
+    QUALIFIER_ABOUT: '~',
+    QUALIFIER_CALCULATED: '~',
+    QUALIFIER_ESTIMATED: '~',
+    QUALIFIER_BEFORE: '<',
+    QUALIFIER_AFTER: '>',
+}
+
+_PREFIXES = {
+    'ABT': QUALIFIER_ABOUT, 'ABOUT': QUALIFIER_ABOUT, 'OK.': QUALIFIER_ABOUT,
+    'OK': QUALIFIER_ABOUT, 'OKOŁO': QUALIFIER_ABOUT, 'CA.': QUALIFIER_ABOUT,
+    'CAL': QUALIFIER_CALCULATED, 'WYL.': QUALIFIER_CALCULATED,
+    'EST': QUALIFIER_ESTIMATED, 'SZAC.': QUALIFIER_ESTIMATED,
+    'BEF': QUALIFIER_BEFORE, 'PRZED': QUALIFIER_BEFORE, 'TO': QUALIFIER_BEFORE,
+    'AFT': QUALIFIER_AFTER, 'PO': QUALIFIER_AFTER, 'FROM': QUALIFIER_AFTER,
+}
+
+_RANGES = (('BET', 'AND'), ('FROM', 'TO'), ('MIĘDZY', 'A'))
+
+_ISO_DATE = re.compile(r'^(\d{1,4})(?:-(\d{1,2})(?:-(\d{1,2}))?)?$')
+
+
+@dataclass(frozen=True)
+class GenealogicalDate:
+    """Data z dokładnością do dnia, miesiąca lub roku, z opcjonalnym kwalifikatorem"""
+    
+    year: int
+    month: Optional[int] = None
+    day: Optional[int] = None
+    qualifier: Optional[str] = None
+    # Koniec przedziału dla kwalifikatora BET
+    end: Optional['GenealogicalDate'] = None
+    
+    @property
+    def precision(self) -> str:
+        """Dokładność daty (PRECISION_DAY/MONTH/YEAR)"""
+        if self.day is not None:
+            return PRECISION_DAY
+        if self.month is not None:
+            return PRECISION_MONTH
+        return PRECISION_YEAR
+    
+    @property
+    def sort_key(self) -> int:
+        """Klucz sortowania RRRRMMDD (nieznany miesiąc lub dzień = 00)"""
+        return self.year * 10000 + (self.month or 0) * 100 + (self.day or 0)
+    
+    @property
+    def is_exact(self) -> bool:
+        """Czy data jest pełną datą dzienną bez kwalifikatora"""
+        return self.qualifier is None and self.precision == PRECISION_DAY
+    
+    def _iso(self) -> str:
+        """Data bez kwalifikatora w formacie RRRR[-MM[-DD]]"""
+        text = f"{self.year:04d}"
+        if self.month is not None:
+            text += f"-{self.month:02d}"
+            if self.day is not None:
+                text += f"-{self.day:02d}"
+        return text
+    
+    def _gedcom(self) -> str:
+        """Data bez kwalifikatora w formacie GEDCOM [DD] [MMM] RRRR"""
+        parts = []
+        if self.day is not None:
+            parts.append(str(self.day))
+        if self.month is not None:
+            parts.append(MONTHS[self.month - 1])
+        parts.append(str(self.year))
+        return ' '.join(parts)
+    
+    def to_text(self) -> str:
+        """Postać kanoniczna przechowywana w bazie danych"""
+        if self.qualifier == QUALIFIER_BETWEEN:
+            return f"BET {self._iso()} AND {self.end._iso()}"
+        if self.qualifier:
+            return f"{self.qualifier} {self._iso()}"
+        return self._iso()
+    
+    def to_gedcom(self) -> str:
+        """Postać zgodna ze specyfikacją GEDCOM"""
+        if self.qualifier == QUALIFIER_BETWEEN:
+            return f"BET {self._gedcom()} AND {self.end._gedcom()}"
+        if self.qualifier:
+            return f"{self.qualifier} {self._gedcom()}"
+        return self._gedcom()
+    
+    def to_display(self) -> str:
+        """Postać do wyświetlenia w interfejsie"""
+        if self.qualifier == QUALIFIER_BETWEEN:
+            return f"między {self._iso()} a {self.end._iso()}"
+        if self.qualifier:
+            return f"{QUALIFIER_LABELS[self.qualifier]} {self._iso()}"
+        return self._iso()
+    
+    def year_label(self) -> str:
+        """Krótki zapis roku do etykiet (np. "~1850", "1850-1855")"""
+        if self.qualifier == QUALIFIER_BETWEEN:
+            return f"{self.year}-{self.end.year}"
+        return f"{QUALIFIER_MARKS.get(self.qualifier, '')}{self.year}"
+
+
+def _parse_plain(text: str) -> Optional[GenealogicalDate]:
+    """Parsuje datę bez kwalifikatora (ISO lub GEDCOM)"""
+    match = _ISO_DATE.match(text)
+    if match:
+        year, month, day = (int(group) if group else None for group in match.groups())
+    else:
+        parts = text.split()
+        if not 1 <= len(parts) <= 3 or not parts[-1].isdecimal():
+            return None
+        year, month, day = int(parts[-1]), None, None
+        if len(parts) >= 2:
+            if parts[-2] not in MONTHS:
+                return None
+            month = MONTHS.index(parts[-2]) + 1
+        if len(parts) == 3:
+            if not parts[0].isdecimal():
+                return None
+            day = int(parts[0])
+    
+    # Zerowy miesiąc lub dzień oznacza brak tej części daty
+    if not month:
+        month, day = None, None
+    elif not day:
+        day = None
+    
+    # Ten sam zakres lat co w postaci ISO, by zapis kanoniczny dało się odczytać
+    if not 0 < year <= 9999 or (month is not None and month > 12):
+        return None
+    if day is not None and day > calendar.monthrange(year, month)[1]:
+        return None
+    return GenealogicalDate(year, month, day)
+
+
+def parse_date(value: Union[str, int, None]) -> Optional[GenealogicalDate]:
+    """
+    Parsuje datę zapisaną w formacie ISO, GEDCOM lub z polskim kwalifikatorem
+    
+    Args:
+        value: Tekst daty (kolumna DATE może zwrócić sam rok jako liczbę)
+    
+    Returns:
+        Obiekt GenealogicalDate lub None jeśli daty nie da się rozpoznać
+    """
+    if value is None:
+        return None
+    text = ' '.join(str(value).upper().split())
+    if text.startswith('@#'):
+        # Znacznik kalendarza GEDCOM (np. "@#DGREGORIAN@ 1850")
+        text = text.partition(' ')[2]
+    if not text:
+        return None
+    
+    for start, separator in _RANGES:
+        prefix = f"{start} "
+        infix = f" {separator} "
+        if text.startswith(prefix) and infix in text:
+            first, second = text[len(prefix):].split(infix, 1)
+            begin, end = _parse_plain(first), _parse_plain(second)
+            if begin is None or end is None or end.sort_key < begin.sort_key:
+                return None
+            return GenealogicalDate(begin.year, begin.month, begin.day,
+                                    QUALIFIER_BETWEEN, end)
+    
+    qualifier = None
+    head, _, rest = text.partition(' ')
+    if head in _PREFIXES and rest:
+        qualifier, text = _PREFIXES[head], rest
+    
+    date = _parse_plain(text)
+    if date is None or qualifier is None:
+        return date
+    return GenealogicalDate(date.year, date.month, date.day, qualifier)
+
+
+def date_fields(value: Union[str, int, None]) -> Tuple[Optional[str], Optional[int],
+                                                       Optional[str], Optional[str]]:
+    """
+    Wylicza tekst kanoniczny i kolumny pomocnicze daty z jednego parsowania
+    
+    Args:
+        value: Tekst daty
+    
+    Returns:
+        Krotka (tekst jak normalize_date, *wartości jak date_columns)
+    """
+    if value is None or str(value).strip() == '':
+        return None, None, None, None
+    date = parse_date(value)
+    if date is None:
+        # Nierozpoznany tekst jest zachowywany bez zmian
+        return str(value).strip(), None, None, None
+    return date.to_text(), date.sort_key, date.precision, date.qualifier
+
+
+def normalize_date(value: Union[str, int, None]) -> Optional[str]:
+    """
+    Sprowadza datę do postaci kanonicznej
+    
+    Nierozpoznany tekst jest zwracany bez zmian, żeby nie utracić danych.
+    
+    Args:
+        value: Tekst daty
+    
+    Returns:
+        Tekst w postaci kanonicznej lub None dla pustej daty
+    """
+    return date_fields(value)[0]
+
+
+def date_columns(value: Union[str, int, None]) -> Tuple[Optional[int], Optional[str], Optional[str]]:
+    """
+    Wylicza kolumny pomocnicze daty zapisywane obok tekstu
+    
+    Args:
+        value: Tekst daty
+    
+    Returns:
+        Krotka (klucz sortowania, dokładność, kwalifikator); same None dla
+        daty pustej lub nierozpoznanej
+    """
+    return date_fields(value)[1:]
+
+
+def year_of(value: Union[str, int, None]) -> Optional[int]:
+    """Zwraca rok daty (początek przedziału) lub None"""
+    date = parse_date(value)
+    return date.year if date else None
+
+
+def format_year(value: Union[str, int, None], missing: str = '?') -> str:
+    """Zwraca krótki zapis roku do etykiet lub wartość zastępczą"""
+    date = parse_date(value)
+    return date.year_label() if date else missing
+
+
+def format_date(value: Union[str, int, None]) -> str:
+    """Zwraca datę do wyświetlenia (nierozpoznany tekst bez zmian)"""
+    date = parse_date(value)
+    if date:
+        return date.to_display()
+    return '' if value is None else str(value)
@@ -2,6 +2,12 @@
 GedcomHandler - Obsługuje import i eksport danych w formacie GEDCOM
 """
 
+import os
+from typing import Dict, List, Optional
+
+from .dates import normalize_date, parse_date
+from .gedcom_parser import GedcomParser, family_relations
+
 
 class GedcomHandler:
     """Obsługuje import i eksport danych genealogicznych w formacie GEDCOM"""
@@ -15,120 +21,77 @@ class GedcomHandler:
         """
         self.db_manager = db_manager
     
-    def import_file(self, filename: str):
+    def import_file(self, filename: str, workers: Optional[int] = None):
         """
-        Importuje dane z pliku GEDCOM
+        Importuje osoby (INDI) i relacje z rodzin (FAM) z pliku GEDCOM
+        
+        Plik jest parsowany fragmentami (duże pliki w puli procesów), a osoby
+        są zapisywane hurtowo w kolejności z pliku, więc identyfikatory
+        otrzymują tę samą kolejność niezależnie od liczby procesów. Odwołania
+        rodzin do osób (xref) są rozwiązywane po zapisaniu wszystkich osób.
         
         Args:
             filename: Ścieżka do pliku GEDCOM
+            workers: Liczba procesów parsujących (domyślnie liczba procesorów)
+        """
+        person_map = {}  # Mapowanie GEDCOM ID -> DB ID
+        families = []
+        
+        for persons, chunk_families in GedcomParser(workers).parse(filename):
+            # Osoba bez imienia lub nazwiska jest pomijana; przy powtórzonym
+            # xref obowiązuje pierwszy rekord
+            new_persons = []
+            for person in persons:
+                if person.imie and person.nazwisko and person.xref not in person_map:
+                    person_map[person.xref] = None
+                    new_persons.append(person)
             
-        Note:
-            To jest uproszczona implementacja. Pełna implementacja GEDCOM
-            wymagałaby bardziej zaawansowanego parsera.
+            ids = self.db_manager.add_persons_bulk([person._asdict() for person in new_persons])
+            person_map.update(zip((person.xref for person in new_persons), ids))
+            families.extend(chunk_families)
+        
+        self.db_manager.add_relations_bulk(family_relations(families, person_map))
+    
+    def sync_file(self, filename: str, source: Optional[str] = None, delete: bool = False,
+                  workers: Optional[int] = None) -> dict:
         """
-        # Uproszczona implementacja - w pełnej wersji należałoby użyć
-        # dedykowanej biblioteki do parsowania GEDCOM
+        Synchronizuje bazę z plikiem GEDCOM prowadzonym poza programem
         
-        with open(filename, 'r', encoding='utf-8') as f:
-            content = f.read()
+        W przeciwieństwie do import_file ponowna synchronizacja tego samego
+        źródła nie dubluje osób: rekordy są rozpoznawane po xref, dodawane
+        są tylko nowe, a aktualizowane tylko zmienione od poprzedniej
+        synchronizacji (zob. DatabaseManager.sync_gedcom).
         
-        # Podstawowe parsowanie
-        lines = content.split('\n')
-        current_person = None
-        person_map = {}  # Mapowanie GEDCOM ID -> DB ID
+        Args:
+            filename: Ścieżka do pliku GEDCOM
+            source: Nazwa źródła (domyślnie nazwa pliku)
+            delete: Czy usuwać osoby i rodziny, których nie ma już w pliku
+            workers: Liczba procesów parsujących (domyślnie liczba procesorów)
         
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            
-            if not line:
-                i += 1
-                continue
-            
-            parts = line.split(' ', 2)
-            
-            if len(parts) >= 2 and parts[1] == 'INDI':
-                # Rozpoczęcie nowej osoby
-                gedcom_id = parts[0].strip('@')
-                current_person = {
-                    'gedcom_id': gedcom_id,
-                    'imie': '',
-                    'nazwisko': '',
-                    'data_urodzenia': None,
-                    'data_smierci': None,
-                    'plec': None
-                }
-                
-                # Parsuj dane osoby
-                i += 1
-                while i < len(lines):
-                    sub_line = lines[i].strip()
-                    if not sub_line or sub_line[0] == '0':
-                        break
-                    
-                    sub_parts = sub_line.split(' ', 2)
-                    
-                    if len(sub_parts) >= 2:
-                        if sub_parts[1] == 'NAME' and len(sub_parts) >= 3:
-                            # Parsuj imię i nazwisko
-                            name = sub_parts[2].replace('/', '').strip()
-                            name_parts = name.split()
-                            if name_parts:
-                                current_person['imie'] = name_parts[0]
-                                if len(name_parts) > 1:
-                                    current_person['nazwisko'] = ' '.join(name_parts[1:])
-                        
-                        elif sub_parts[1] == '_MARNM' and len(sub_parts) >= 3:
-                            # Nazwisko panieńskie (niestandardowy tag GEDCOM)
-                            current_person['nazwisko_panienskie'] = sub_parts[2].strip()
-                        
-                        elif sub_parts[1] == 'SEX' and len(sub_parts) >= 3:
-                            sex = sub_parts[2].strip()
-                            current_person['plec'] = 'M' if sex == 'M' else 'K' if sex == 'F' else None
-                        
-                        elif sub_parts[1] == 'BIRT':
-                            # Data urodzenia w następnej linii
-                            i += 1
-                            if i < len(lines):
-                                date_line = lines[i].strip()
-                                if 'DATE' in date_line:
-                                    date_str = date_line.split('DATE', 1)[1].strip()
-                                    current_person['data_urodzenia'] = self._parse_gedcom_date(date_str)
-                        
-                        elif sub_parts[1] == 'DEAT':
-                            # Data śmierci w następnej linii
-                            i += 1
-                            if i < len(lines):
-                                date_line = lines[i].strip()
-                                if 'DATE' in date_line:
-                                    date_str = date_line.split('DATE', 1)[1].strip()
-                                    current_person['data_smierci'] = self._parse_gedcom_date(date_str)
-                    
-                    i += 1
-                
-                # Zapisz osobę do bazy
-                if current_person['imie'] and current_person['nazwisko']:
-                    person_id = self.db_manager.add_person(
-                        current_person['imie'],
-                        current_person['nazwisko'],
-                        current_person['data_urodzenia'],
-                        current_person['data_smierci'],
-                        current_person['plec'],
-                        nazwisko_panienskie=current_person.get('nazwisko_panienskie')
-                    )
-                    person_map[current_person['gedcom_id']] = person_id
-                
-                continue
-            
-            i += 1
+        Returns:
+            Podsumowanie zmian (zob. DatabaseManager.sync_gedcom)
+        """
+        persons, families = [], []
+        for chunk_persons, chunk_families in GedcomParser(workers).parse(filename):
+            persons.extend(person._asdict() for person in chunk_persons
+                           if person.imie and person.nazwisko)
+            families.extend(chunk_families)
         
-        # W drugiej iteracji dodaj relacje
-        # To jest uproszczone - pełna implementacja wymagałaby parsowania rekordów FAM
+        return self.db_manager.sync_gedcom(source or os.path.basename(filename),
+                                           persons, families, delete)
+    
+    # Najdłuższa wartość w jednym wierszu (GEDCOM ogranicza wiersz do 255 znaków)
+    MAX_VALUE_LENGTH = 200
     
     def export_file(self, filename: str):
         """
         Eksportuje dane do pliku GEDCOM
         
+        Zapisywane są wszystkie pola osoby odczytywane przez import (miejsca,
+        notatki z wierszami CONT/CONC, zdjęcie jako OBJE/FILE). Relacje są
+        grupowane w rodziny: małżonkowie z ich wspólnymi dziećmi oraz
+        rodzice dzieci bez zapisanego małżeństwa.
+        
         Args:
             filename: Ścieżka do pliku GEDCOM
         """
@@ -147,9 +110,7 @@ class GedcomHandler:
         
         # Eksport osób
         for person in persons:
-            person_id = f"@I{person['id']}@"
-            
-            lines.append(f"0 {person_id} INDI")
+            lines.append(f"0 @I{person['id']}@ INDI")
             lines.append(f"1 NAME {person['imie']} /{person['nazwisko']}/")
             
             if person.get('nazwisko_panienskie'):
@@ -159,46 +120,31 @@ class GedcomHandler:
                 sex = 'M' if person['plec'] == 'M' else 'F'
                 lines.append(f"1 SEX {sex}")
             
-            if person.get('data_urodzenia'):
-                lines.append("1 BIRT")
-                lines.append(f"2 DATE {self._format_gedcom_date(person['data_urodzenia'])}")
-                
-                if person.get('miejsce_urodzenia'):
-                    lines.append(f"2 PLAC {person['miejsce_urodzenia']}")
-            
-            if person.get('data_smierci'):
-                lines.append("1 DEAT")
-                lines.append(f"2 DATE {self._format_gedcom_date(person['data_smierci'])}")
-                
-                if person.get('miejsce_smierci'):
-                    lines.append(f"2 PLAC {person['miejsce_smierci']}")
+            for event, date_column, place_column in (('BIRT', 'data_urodzenia', 'miejsce_urodzenia'),
+                                                     ('DEAT', 'data_smierci', 'miejsce_smierci')):
+                if person.get(date_column) or person.get(place_column):
+                    lines.append(f"1 {event}")
+                    if person.get(date_column):
+                        lines.append(f"2 DATE {self._format_gedcom_date(person[date_column])}")
+                    if person.get(place_column):
+                        lines.append(f"2 PLAC {person[place_column]}")
             
             if person.get('notatki'):
-                lines.append(f"1 NOTE {person['notatki']}")
+                lines.extend(self._text_lines(1, 'NOTE', person['notatki']))
+            
+            if person.get('zdjecie_sciezka'):
+                lines.append("1 OBJE")
+                lines.append(f"2 FILE {person['zdjecie_sciezka']}")
         
         # Eksport rodzin (relacji)
-        family_counter = 1
-        processed_couples = set()
-        
-        for relation in relations:
-            if relation['rodzaj_relacji'] == 'małżonek':
-                couple_key = tuple(sorted([relation['osoba1_id'], relation['osoba2_id']]))
-                
-                if couple_key not in processed_couples:
-                    processed_couples.add(couple_key)
-                    
-                    family_id = f"@F{family_counter}@"
-                    family_counter += 1
-                    
-                    lines.append(f"0 {family_id} FAM")
-                    lines.append(f"1 HUSB @I{relation['osoba1_id']}@")
-                    lines.append(f"1 WIFE @I{relation['osoba2_id']}@")
-                    
-                    # Znajdź dzieci tego małżeństwa
-                    for rel in relations:
-                        if rel['rodzaj_relacji'] == 'rodzic':
-                            if rel['osoba1_id'] in couple_key:
-                                lines.append(f"1 CHIL @I{rel['osoba2_id']}@")
+        sexes = {person['id']: person.get('plec') for person in persons}
+        for family_counter, (parents, children) in enumerate(self._families(relations, sexes), 1):
+            lines.append(f"0 @F{family_counter}@ FAM")
+            for tag, parent_id in zip(('HUSB', 'WIFE'), parents):
+                if parent_id:
+                    lines.append(f"1 {tag} @I{parent_id}@")
+            for child_id in children:
+                lines.append(f"1 CHIL @I{child_id}@")
         
         # Zakończenie
         lines.append("0 TRLR")
@@ -207,64 +153,111 @@ class GedcomHandler:
         with open(filename, 'w', encoding='utf-8') as f:
             f.write('\n'.join(lines))
     
-    def _parse_gedcom_date(self, date_str: str) -> str:
+    @staticmethod
+    def _families(relations: List[dict], sexes: Dict[int, Optional[str]]) -> List[tuple]:
         """
-        Parsuje datę z formatu GEDCOM do formatu YYYY-MM-DD
+        Grupuje relacje w rodziny GEDCOM
+        
+        Rodzinę tworzy każda para małżonków oraz każdy zbiór rodziców
+        (jeden lub dwoje) wspólnych dzieci. Dziecko trafia do rodziny
+        swoich dwojga pierwszych rodziców, a kolejni rodzice tworzą
+        osobne rodziny jednego rodzica.
         
         Args:
-            date_str: Data w formacie GEDCOM
-            
+            relations: Relacje z get_all_relations
+            sexes: Płeć osób według ID
+        
         Returns:
-            Data w formacie YYYY-MM-DD lub None
+            Lista krotek ((mąż, żona), dzieci) w kolejności relacji
         """
-        # Uproszczone parsowanie - obsługuje tylko format "DD MMM YYYY"
-        months = {
-            'JAN': '01', 'FEB': '02', 'MAR': '03', 'APR': '04',
-            'MAY': '05', 'JUN': '06', 'JUL': '07', 'AUG': '08',
-            'SEP': '09', 'OCT': '10', 'NOV': '11', 'DEC': '12'
-        }
+        parents_of = {}
+        families = {}
+        for relation in relations:
+            osoba1_id, osoba2_id = relation['osoba1_id'], relation['osoba2_id']
+            if relation['rodzaj_relacji'] == 'małżonek':
+                families.setdefault(tuple(sorted((osoba1_id, osoba2_id))), [])
+            else:
+                parent_id, child_id = ((osoba1_id, osoba2_id) if relation['rodzaj_relacji'] == 'rodzic'
+                                       else (osoba2_id, osoba1_id))
+                child_parents = parents_of.setdefault(child_id, [])
+                if parent_id not in child_parents:
+                    child_parents.append(parent_id)
         
-        parts = date_str.strip().split()
+        for child_id, child_parents in parents_of.items():
+            keys = [tuple(sorted(child_parents[:2]))] + [(parent_id,) for parent_id in child_parents[2:]]
+            for key in keys:
+                families.setdefault(key, []).append(child_id)
         
-        if len(parts) >= 3:
-            try:
-                day = parts[0].zfill(2)
-                month = months.get(parts[1].upper(), '01')
-                year = parts[2]
-                return f"{year}-{month}-{day}"
-            except (ValueError, IndexError):
-                pass
-        elif len(parts) == 1:
-            # Tylko rok
-            try:
-                return f"{parts[0]}-01-01"
-            except ValueError:
-                pass
+        result = []
+        for key, children in families.items():
+            # Mąż przed żoną; bez znanej płci kolejność według ID
+            parents = sorted(key, key=lambda person_id: sexes.get(person_id) == 'K')
+            if len(parents) == 1:
+                parents = [None, parents[0]] if sexes.get(parents[0]) == 'K' else [parents[0], None]
+            result.append((tuple(parents), children))
+        return result
+    
+    @classmethod
+    def _text_lines(cls, level: int, tag: str, text: str) -> List[str]:
+        """
+        Zapisuje tekst jako wiersz GEDCOM z wierszami kontynuacji
         
-        return None
+        Kolejne wiersze tekstu są zapisywane jako CONT, a zbyt długie
+        wiersze są dzielone na części CONC (nie na spacji, bo część
+        czytników obcina spacje na końcu wiersza).
+        
+        Args:
+            level: Poziom wiersza
+            tag: Tag wiersza (np. NOTE)
+            text: Tekst do zapisania
+        
+        Returns:
+            Wiersze GEDCOM
+        """
+        lines = []
+        for index, paragraph in enumerate(text.replace('\r\n', '\n').split('\n')):
+            parts = []
+            while len(paragraph) > cls.MAX_VALUE_LENGTH:
+                split = cls.MAX_VALUE_LENGTH
+                while split > 1 and (paragraph[split - 1] == ' ' or paragraph[split] == ' '):
+                    split -= 1
+                parts.append(paragraph[:split])
+                paragraph = paragraph[split:]
+            parts.append(paragraph)
+            
+            for part_index, part in enumerate(parts):
+                if index == 0 and part_index == 0:
+                    line_level, line_tag = level, tag
+                else:
+                    line_level, line_tag = level + 1, 'CONC' if part_index else 'CONT'
+                lines.append(f"{line_level} {line_tag} {part}" if part else f"{line_level} {line_tag}")
+        return lines
+    
+    def _parse_gedcom_date(self, date_str: str) -> Optional[str]:
+        """
+        Parsuje datę GEDCOM do postaci kanonicznej (zob. utils.dates)
+        
+        Daty częściowe i przybliżone zachowują swoją dokładność ("1850",
+        "ABT 1850", "BET 1850 AND 1855"). Nierozpoznany tekst jest
+        zachowywany bez zmian.
+        
+        Args:
+            date_str: Data w formacie GEDCOM
+            
+        Returns:
+            Data w postaci kanonicznej lub None
+        """
+        return normalize_date(date_str)
     
     def _format_gedcom_date(self, date_str: str) -> str:
         """
-        Formatuje datę z formatu YYYY-MM-DD do formatu GEDCOM
+        Formatuje datę z postaci kanonicznej do formatu GEDCOM
         
         Args:
-            date_str: Data w formacie YYYY-MM-DD
+            date_str: Data w postaci kanonicznej
             
         Returns:
             Data w formacie GEDCOM
         """
-        months = [
-            'JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN',
-            'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC'
-        ]
-        
-        try:
-            parts = date_str.split('-')
-            if len(parts) == 3:
-                year, month, day = parts
-                month_name = months[int(month) - 1]
-                return f"{int(day)} {month_name} {year}"
-        except (ValueError, IndexError):
-            pass
-        
-        return date_str
+        date = parse_date(date_str)
+        return date.to_gedcom() if date else str(date_str)
@@ -0,0 +1,355 @@
+"""
+GedcomParser - Parsowanie pliku GEDCOM fragmentami (również w puli procesów)
+"""
+
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .dates import normalize_date
+from .gedcom_reader import GedcomReader
+
+
+class PersonRecord(NamedTuple):
+    """Osoba odczytana z rekordu INDI"""
+    
+    xref: str
+    imie: str
+    nazwisko: str
+    nazwisko_panienskie: Optional[str]
+    data_urodzenia: Optional[str]
+    data_smierci: Optional[str]
+    plec: Optional[str]
+    miejsce_urodzenia: Optional[str]
+    miejsce_smierci: Optional[str]
+    notatki: Optional[str]
+    zdjecie_sciezka: Optional[str]
+
+
+class FamilyRecord(NamedTuple):
+    """Rodzina odczytana z rekordu FAM (odwołania do osób jako xref)"""
+    
+    xref: str
+    husband: Optional[str]
+    wife: Optional[str]
+    children: Tuple[str, ...]
+
+
+# Wynik parsowania fragmentu: osoby i rodziny w kolejności z pliku
+ChunkResult = Tuple[List[PersonRecord], List[FamilyRecord]]
+
+
+def _split_line(line: str) -> Optional[Tuple[int, Optional[str], str, str]]:
+    """
+    Dzieli wiersz GEDCOM na (poziom, xref, tag, wartość)
+    
+    Spacje na końcu wartości są zachowywane - mają znaczenie przy łączeniu
+    wierszy kontynuacji CONC.
+    
+    Returns:
+        Krotka lub None dla wiersza pustego albo bez numeru poziomu
+    """
+    parts = line.lstrip().rstrip('\r\n').split(' ', 2)
+    if len(parts) < 2 or not parts[0].isdigit():
+        return None
+    level = int(parts[0])
+    if parts[1].startswith('@') and len(parts) == 3:
+        tag, _, value = parts[2].partition(' ')
+        return level, parts[1], tag, value
+    return level, None, parts[1], parts[2] if len(parts) == 3 else ''
+
+
+# Wiersze kontynuacji i separator dołączanej wartości
+CONTINUATION_TAGS = {'CONC': '', 'CONT': '\n'}
+
+
+# Wiersz rekordu: (tag wiersza nadrzędnego lub None na poziomie 1, tag, wartość)
+RecordLine = Tuple[Optional[str], str, str]
+
+
+def iter_records(lines: Iterable[str]) -> Iterator[Tuple[Optional[str], str, List[RecordLine]]]:
+    """
+    Dzieli wiersze na rekordy poziomu 0
+    
+    Wiersze kontynuacji (CONC - dopisanie, CONT - nowy wiersz tekstu) są
+    dołączane do wartości wiersza, którego dotyczą, a każdy wiersz otrzymuje
+    tag wiersza nadrzędnego, więc np. DATE pod BIRT i DATE pod DEAT są
+    rozróżniane bez śledzenia stanu przez kod odczytujący pola.
+    
+    Args:
+        lines: Wiersze fragmentu pliku zaczynającego się od wiersza poziomu 0
+    
+    Yields:
+        Krotki (xref, tag rekordu, wiersze podrzędne jako RecordLine)
+    """
+    xref, tag, record_lines = None, None, []
+    path = []  # Tagi wierszy nadrzędnych według poziomu
+    last_level = 0
+    for line in lines:
+        parsed = _split_line(line)
+        if parsed is None:
+            continue
+        level, line_xref, line_tag, value = parsed
+        if level == 0:
+            if tag is not None:
+                yield xref, tag, record_lines
+            xref, tag, record_lines = line_xref, line_tag, []
+            path = [line_tag]
+            last_level = 0
+        elif tag is None:
+            continue
+        elif line_tag in CONTINUATION_TAGS:
+            # Kontynuacja wartości ostatniego wiersza poziomu wyżej
+            if record_lines and last_level == level - 1:
+                parent, previous_tag, previous = record_lines[-1]
+                record_lines[-1] = (parent, previous_tag,
+                                    previous + CONTINUATION_TAGS[line_tag] + value)
+        else:
+            del path[level:]
+            parent = path[level - 1] if level > 1 and len(path) >= level else None
+            path.append(line_tag)
+            record_lines.append((parent, line_tag, value))
+            last_level = level
+    if tag is not None:
+        yield xref, tag, record_lines
+
+
+def _first(field: str, convert=None):
+    """Obsługa tagu zapisująca pierwszą niepustą wartość do pola"""
+    def handle(fields: dict, value: str):
+        value = value.strip()
+        if value and field not in fields:
+            fields[field] = convert(value) if convert else value
+    return handle
+
+
+def _name(fields: dict, value: str):
+    """Pierwsza forma imienia i nazwiska ("Jan Maria /Kowalski/")"""
+    if 'imie' in fields:
+        return
+    if '/' in value:
+        given, _, rest = value.partition('/')
+        imie, nazwisko = given.strip(), rest.partition('/')[0].strip()
+    else:
+        name_parts = value.split()
+        imie, nazwisko = (name_parts[0], ' '.join(name_parts[1:])) if name_parts else ('', '')
+    if imie or nazwisko:
+        fields['imie'], fields['nazwisko'] = imie, nazwisko
+
+
+def _sex(fields: dict, value: str):
+    """Płeć GEDCOM (M/F) jako M/K"""
+    sex = value.strip()
+    if 'plec' not in fields and sex in ('M', 'F'):
+        fields['plec'] = 'M' if sex == 'M' else 'K'
+
+
+def _note(fields: dict, value: str):
+    """Notatka w rekordzie osoby (kolejne notatki są łączone)"""
+    # Odwołanie do osobnego rekordu NOTE (@N1@) nie jest rozwiązywane
+    if not value.strip() or (value.startswith('@') and value.rstrip().endswith('@')):
+        return
+    fields['notatki'] = f"{fields['notatki']}\n\n{value}" if 'notatki' in fields else value
+
+
+def _reference(field: str):
+    """Obsługa odwołania do osoby (@I1@), pierwsze wystąpienie"""
+    def handle(fields: dict, value: str):
+        reference = value.strip().strip('@')
+        if reference and field not in fields:
+            fields[field] = reference
+    return handle
+
+
+def _child(fields: dict, value: str):
+    """Dziecko w rodzinie (bez powtórzeń)"""
+    reference = value.strip().strip('@')
+    children = fields.setdefault('children', [])
+    if reference and reference not in children:
+        children.append(reference)
+
+
+# Obsługa wierszy rekordu INDI: (tag nadrzędny, tag) -> funkcja(pola, wartość)
+INDI_TAGS = {
+    (None, 'NAME'): _name,
+    (None, '_MARNM'): _first('nazwisko_panienskie'),
+    (None, 'SEX'): _sex,
+    (None, 'NOTE'): _note,
+    ('BIRT', 'DATE'): _first('data_urodzenia', normalize_date),
+    ('BIRT', 'PLAC'): _first('miejsce_urodzenia'),
+    ('DEAT', 'DATE'): _first('data_smierci', normalize_date),
+    ('DEAT', 'PLAC'): _first('miejsce_smierci'),
+    ('OBJE', 'FILE'): _first('zdjecie_sciezka')
+}
+
+# Obsługa wierszy rekordu FAM
+FAM_TAGS = {
+    (None, 'HUSB'): _reference('husband'),
+    (None, 'WIFE'): _reference('wife'),
+    (None, 'CHIL'): _child
+}
+
+
+def _read_fields(tags: dict, lines: List[RecordLine]) -> dict:
+    """Odczytuje pola rekordu, przekazując każdy wiersz do obsługi jego tagu"""
+    fields = {}
+    for parent, tag, value in lines:
+        handler = tags.get((parent, tag))
+        if handler is not None:
+            handler(fields, value)
+    return fields
+
+
+def parse_person(xref: str, lines: List[RecordLine]) -> PersonRecord:
+    """Odczytuje osobę z wierszy rekordu INDI"""
+    fields = _read_fields(INDI_TAGS, lines)
+    return PersonRecord(xref.strip('@'), fields.pop('imie', ''), fields.pop('nazwisko', ''),
+                        **{field: fields.get(field) for field in PersonRecord._fields[3:]})
+
+
+def parse_family(xref: str, lines: List[RecordLine]) -> FamilyRecord:
+    """Odczytuje rodzinę z wierszy rekordu FAM"""
+    fields = _read_fields(FAM_TAGS, lines)
+    return FamilyRecord(xref.strip('@'), fields.get('husband'), fields.get('wife'),
+                        tuple(fields.get('children', ())))
+
+
+# Odczyt rekordów poziomu 0 według tagu
+RECORD_PARSERS = {
+    'INDI': parse_person,
+    'FAM': parse_family
+}
+
+
+def parse_lines(lines: Iterable[str]) -> ChunkResult:
+    """
+    Parsuje wiersze fragmentu pliku GEDCOM
+    
+    Args:
+        lines: Wiersze fragmentu zaczynającego się od rekordu poziomu 0
+    
+    Returns:
+        Krotka (osoby, rodziny) w kolejności z pliku
+    """
+    results = {tag: [] for tag in RECORD_PARSERS}
+    for xref, tag, record_lines in iter_records(lines):
+        parser = RECORD_PARSERS.get(tag)
+        if parser is not None and xref is not None:
+            results[tag].append(parser(xref, record_lines))
+    return results['INDI'], results['FAM']
+
+
+def parse_chunk(text: str) -> ChunkResult:
+    """
+    Parsuje fragment pliku GEDCOM podany jako tekst
+    
+    Args:
+        text: Fragment zaczynający się od rekordu poziomu 0
+    
+    Returns:
+        Krotka (osoby, rodziny) w kolejności z pliku
+    """
+    return parse_lines(text.split('\n'))
+
+
+def parse_file_range(path: str, start: int, end: int, encoding: str) -> ChunkResult:
+    """
+    Parsuje zakres bajtów pliku (funkcja wykonywana w procesie roboczym)
+    
+    Args:
+        path: Ścieżka do pliku GEDCOM
+        start: Początek zakresu (początek wiersza poziomu 0)
+        end: Koniec zakresu (wyłącznie)
+        encoding: Kodowanie wykryte dla całego pliku
+    """
+    with GedcomReader(path, encoding) as reader:
+        return parse_lines(reader.lines(start, end))
+
+
+def family_relations(families: Iterable[tuple], person_map: Dict[str, int]) -> List[Tuple[int, int, str]]:
+    """
+    Zamienia rodziny na relacje małżonków i rodziców z dziećmi
+    
+    Args:
+        families: Rodziny (xref, mąż, żona, dzieci) w kolejności z pliku
+        person_map: Mapowanie xref osoby -> ID w bazie
+    
+    Returns:
+        Lista krotek (osoba1_id, osoba2_id, rodzaj_relacji) bez powtórzeń
+    """
+    relations = {}
+    for _, husband, wife, children in families:
+        husband_id = person_map.get(husband)
+        wife_id = person_map.get(wife)
+        if husband_id and wife_id:
+            relations.setdefault((husband_id, wife_id, 'małżonek'))
+        for child_xref in children:
+            child_id = person_map.get(child_xref)
+            if not child_id:
+                continue
+            for parent_id in (husband_id, wife_id):
+                if parent_id:
+                    relations.setdefault((parent_id, child_id, 'rodzic'))
+    return list(relations)
+
+
+class GedcomParser:
+    """
+    Parsuje plik GEDCOM fragmentami o zbliżonym rozmiarze
+    
+    Fragmenty są wyznaczane na granicach rekordów poziomu 0, więc każdy
+    można sparsować niezależnie. Duże pliki są parsowane w puli procesów;
+    wyniki są zwracane w kolejności fragmentów w pliku, niezależnie od
+    kolejności zakończenia pracy procesów.
+    """
+    
+    # Przybliżony rozmiar fragmentu pliku parsowanego jako jedno zadanie
+    CHUNK_SIZE = 4 * 1024 * 1024
+    
+    # Mniejsze pliki są parsowane w bieżącym procesie
+    PARALLEL_MIN_SIZE = 16 * 1024 * 1024
+    
+    def __init__(self, workers: Optional[int] = None):
+        """
+        Inicjalizacja parsera
+        
+        Args:
+            workers: Liczba procesów roboczych (domyślnie liczba procesorów)
+        """
+        self.workers = workers or os.cpu_count() or 1
+    
+    def parse(self, path: str) -> Iterator[ChunkResult]:
+        """
+        Parsuje plik GEDCOM
+        
+        Args:
+            path: Ścieżka do pliku GEDCOM
+        
+        Yields:
+            Wyniki kolejnych fragmentów pliku (osoby, rodziny)
+        """
+        with GedcomReader(path) as reader:
+            encoding = reader.encoding
+            size = reader.size
+            ranges = reader.split_ranges(self.CHUNK_SIZE)
+            
+            if self.workers <= 1 or len(ranges) <= 1 or size < self.PARALLEL_MIN_SIZE:
+                for start, end in ranges:
+                    yield parse_lines(reader.lines(start, end))
+                return
+        
+        # Procesy uruchamiane od nowa (spawn) - rozwidlenie procesu z wątkami
+        # interfejsu i otwartym połączeniem SQLite nie jest bezpieczne.
+        # Liczba zadań w toku jest ograniczona, aby wyniki czekające na zapis
+        # nie zajmowały pamięci rzędu rozmiaru pliku.
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as executor:
+            pending = deque()
+            for start, end in ranges:
+                pending.append(executor.submit(parse_file_range, path, start, end, encoding))
+                if len(pending) >= 2 * self.workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
@@ -0,0 +1,292 @@
+"""
+GedcomReader - Odczyt pliku GEDCOM zmapowanego w pamięci z wykrywaniem kodowania
+"""
+
+import codecs
+import mmap
+import re
+import unicodedata
+from typing import Iterator, List, Optional, Tuple
+
+
+# Znaczniki kolejności bajtów i odpowiadające im kodowania
+BOMS = [
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be')
+]
+
+# Wartości HEAD/CHAR i odpowiadające im kodowania Pythona
+CHARSETS = {
+    'UTF-8': 'utf-8',
+    'UTF8': 'utf-8',
+    'UNICODE': 'utf-8',
+    'ANSEL': 'ansel',
+    'ANSI': 'cp1250',
+    'CP1250': 'cp1250',
+    'WINDOWS-1250': 'cp1250',
+    'WINDOWS1250': 'cp1250',
+    'ISO-8859-2': 'iso8859-2',
+    'LATIN2': 'iso8859-2',
+    'IBMPC': 'cp852',
+    'CP852': 'cp852'
+}
+
+# Rozmiar początku pliku przeszukiwanego w poszukiwaniu HEAD/CHAR
+HEAD_SCAN_SIZE = 64 * 1024
+
+_CHAR_PATTERN = re.compile(rb'(?:^|\n)\s*1\s+CHAR\s+([^\r\n]+)')
+
+
+# ANSEL (ANSI Z39.47) - znaki specjalne
+ANSEL_CHARS = {
+    0xA1: 'Ł', 0xA2: 'Ø', 0xA3: 'Đ', 0xA4: 'Þ', 0xA5: 'Æ',
+    0xA6: 'Œ', 0xA7: 'ʹ', 0xA8: '·', 0xA9: '♭', 0xAA: '®',
+    0xAB: '±', 0xAC: 'Ơ', 0xAD: 'Ư', 0xAE: 'ʼ', 0xB0: 'ʻ',
+    0xB1: 'ł', 0xB2: 'ø', 0xB3: 'đ', 0xB4: 'þ', 0xB5: 'æ',
+    0xB6: 'œ', 0xB7: 'ʺ', 0xB8: 'ı', 0xB9: '£', 0xBA: 'ð',
+    0xBC: 'ơ', 0xBD: 'ư', 0xC0: '°', 0xC1: 'ℓ', 0xC2: '℗',
+    0xC3: '©', 0xC4: '♯', 0xC5: '¿', 0xC6: '¡', 0xCF: 'ß'
+}
+
+# ANSEL - znaki diakrytyczne, zapisywane PRZED literą bazową
+ANSEL_COMBINING = {
+    0xE0: '\u0309', 0xE1: '\u0300', 0xE2: '\u0301', 0xE3: '\u0302', 0xE4: '\u0303',
+    0xE5: '\u0304', 0xE6: '\u0306', 0xE7: '\u0307', 0xE8: '\u0308', 0xE9: '\u030c',
+    0xEA: '\u030a', 0xEB: '\ufe20', 0xEC: '\ufe21', 0xED: '\u0315', 0xEE: '\u030b',
+    0xEF: '\u0310', 0xF0: '\u0327', 0xF1: '\u0328', 0xF2: '\u0323', 0xF3: '\u0324',
+    0xF4: '\u0325', 0xF5: '\u0333', 0xF6: '\u0332', 0xF7: '\u0326', 0xF8: '\u031c',
+    0xF9: '\u032e', 0xFA: '\ufe22', 0xFB: '\ufe23', 0xFE: '\u0313'
+}
+
+# Bajty odczytane jako latin-1 -> znaki Unicode; nieznane bajty górnej połowy
+# zostają jako znaki U+0080-U+00FF i są obsługiwane według trybu błędów
+_ANSEL_TABLE = {**ANSEL_CHARS, **ANSEL_COMBINING}
+_ANSEL_UNDEFINED = re.compile('[\x80-\xff]')
+
+# Ciąg znaków diakrytycznych i następująca po nim litera bazowa (w tym samym wierszu)
+_ANSEL_MARKS = re.compile('([\xe0-\xfe]+)([^\xe0-\xfe\r\n])')
+_ANSEL_TRAILING_MARKS = re.compile(r'[\xe0-\xfe]+\Z')
+
+
+class AnselIncrementalDecoder(codecs.IncrementalDecoder):
+    """
+    Dekoder przyrostowy ANSEL
+    
+    W ANSEL znaki diakrytyczne poprzedzają literę bazową ("ogonek + a"),
+    a w Unicode po niej następują, więc znaki diakrytyczne z końca bloku
+    są przechowywane do następnego wywołania. Wynik jest w postaci NFC
+    ("ą" zamiast "a" + U+0328).
+    """
+    
+    def __init__(self, errors: str = 'strict'):
+        super().__init__(errors)
+        self.pending = ''
+    
+    def decode(self, input, final: bool = False) -> str:
+        text = self.pending + bytes(input).decode('latin-1')
+        self.pending = ''
+        if not final:
+            trailing = _ANSEL_TRAILING_MARKS.search(text)
+            if trailing:
+                self.pending = trailing.group()
+                text = text[:trailing.start()]
+        
+        text = _ANSEL_MARKS.sub(r'\2\1', text).translate(_ANSEL_TABLE)
+        text = _ANSEL_UNDEFINED.sub(self._undefined, text)
+        return unicodedata.normalize('NFC', text)
+    
+    def _undefined(self, match) -> str:
+        """Obsługa bajtu spoza tablicy ANSEL według trybu błędów"""
+        if self.errors == 'ignore':
+            return ''
+        if self.errors == 'replace':
+            return '\ufffd'
+        byte = match.group().encode('latin-1')
+        raise UnicodeDecodeError('ansel', byte, 0, 1, 'undefined character')
+    
+    def reset(self):
+        self.pending = ''
+    
+    def getstate(self) -> Tuple[bytes, int]:
+        return self.pending.encode('latin-1'), 0
+    
+    def setstate(self, state: Tuple[bytes, int]):
+        self.pending = state[0].decode('latin-1')
+
+
+def incremental_decoder(encoding: str, errors: str = 'replace') -> codecs.IncrementalDecoder:
+    """
+    Tworzy dekoder przyrostowy dla kodowania (również ANSEL)
+    
+    Args:
+        encoding: Nazwa kodowania Pythona lub 'ansel'
+        errors: Tryb obsługi błędów dekodowania
+    """
+    if encoding == 'ansel':
+        return AnselIncrementalDecoder(errors)
+    return codecs.getincrementaldecoder(encoding)(errors)
+
+
+def detect_encoding(buffer) -> Tuple[str, int]:
+    """
+    Wykrywa kodowanie pliku GEDCOM
+    
+    Kolejno: znacznik BOM, układ bajtów zerowych UTF-16 (plik zaczyna się
+    od cyfry "0"), deklaracja HEAD/CHAR. Plik bez deklaracji lub z
+    deklaracją ASCII jest odczytywany jako UTF-8, jeśli początek pliku jest
+    poprawnym UTF-8, a w przeciwnym razie jako Windows-1250.
+    
+    Args:
+        buffer: Zawartość pliku (np. mmap)
+    
+    Returns:
+        Krotka (kodowanie, długość BOM w bajtach)
+    """
+    head = bytes(buffer[:HEAD_SCAN_SIZE])
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding, len(bom)
+    if head.startswith(b'0\x00'):
+        return 'utf-16-le', 0
+    if head.startswith(b'\x000'):
+        return 'utf-16-be', 0
+    
+    # Deklaracja CHAR w rekordzie HEAD (do pierwszego kolejnego rekordu)
+    header_end = head.find(b'\n0 ')
+    match = _CHAR_PATTERN.search(head if header_end == -1 else head[:header_end])
+    if match:
+        charset = match.group(1).strip().decode('ascii', 'replace').upper()
+        if charset in CHARSETS:
+            return CHARSETS[charset], 0
+    
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(head)
+        return 'utf-8', 0
+    except UnicodeDecodeError:
+        return 'cp1250', 0
+
+
+class GedcomReader:
+    """
+    Plik GEDCOM zmapowany w pamięci
+    
+    Kodowanie jest wykrywane przy otwarciu. Wiersze są dekodowane blokami
+    wprost ze zmapowanego bufora (bez kopiowania całego pliku) dekoderem
+    przyrostowym, który przenosi niepełne znaki między blokami, więc koszt
+    zależy od odczytanego zakresu, a nie od rozmiaru pliku.
+    """
+    
+    # Rozmiar bloku przekazywanego do dekodera
+    BLOCK_SIZE = 1024 * 1024
+    
+    def __init__(self, path: str, encoding: Optional[str] = None):
+        """
+        Otwiera plik
+        
+        Args:
+            path: Ścieżka do pliku GEDCOM
+            encoding: Kodowanie (domyślnie wykrywane z zawartości)
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Pustego pliku nie można zmapować
+            self._map = None
+        self.buffer = self._map if self._map is not None else b''
+        
+        detected, bom_length = detect_encoding(self.buffer)
+        self.encoding = encoding or detected
+        self.data_start = bom_length
+        self.size = len(self.buffer)
+        self.newline = '\n'.encode(self._base_encoding())
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Zamyka mapowanie i plik"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+    
+    def _base_encoding(self) -> str:
+        """Kodowanie znaków ASCII (ANSEL jest ich nadzbiorem)"""
+        return 'ascii' if self.encoding == 'ansel' else self.encoding
+    
+    def find_record(self, position: int) -> int:
+        """
+        Znajduje początek pierwszego rekordu poziomu 0 za pozycją
+        
+        Args:
+            position: Pozycja w bajtach
+        
+        Returns:
+            Pozycja początku rekordu lub rozmiar pliku, jeśli go nie ma
+        """
+        pattern = '\n0 '.encode(self._base_encoding())
+        unit = len(self.newline)
+        while True:
+            index = self.buffer.find(pattern, position)
+            if index == -1:
+                return self.size
+            # W UTF-16 dopasowanie musi zaczynać się na granicy znaku
+            if (index - self.data_start) % unit == 0:
+                return index + unit
+            position = index + 1
+    
+    def split_ranges(self, chunk_size: int) -> List[Tuple[int, int]]:
+        """
+        Dzieli plik na zakresy zaczynające się od granic rekordów poziomu 0
+        
+        Args:
+            chunk_size: Przybliżony rozmiar zakresu w bajtach
+        
+        Returns:
+            Lista zakresów (początek, koniec) pokrywających dane pliku
+        """
+        ranges = []
+        start = self.data_start
+        while start < self.size:
+            end = self.find_record(start + chunk_size) if start + chunk_size < self.size else self.size
+            ranges.append((start, end))
+            start = end
+        return ranges
+    
+    def lines(self, start: Optional[int] = None, end: Optional[int] = None) -> Iterator[str]:
+        """
+        Zwraca zdekodowane wiersze zakresu pliku
+        
+        Args:
+            start: Początek zakresu w bajtach (domyślnie początek danych za BOM)
+            end: Koniec zakresu (wyłącznie; domyślnie koniec pliku)
+        
+        Yields:
+            Wiersze bez znaku nowego wiersza (z ewentualnym "\\r")
+        """
+        start = self.data_start if start is None else start
+        end = self.size if end is None else end
+        if start >= end:
+            return
+        
+        decoder = incremental_decoder(self.encoding)
+        view = memoryview(self.buffer)
+        pending = ''
+        try:
+            for block_start in range(start, end, self.BLOCK_SIZE):
+                block = view[block_start:min(end, block_start + self.BLOCK_SIZE)]
+                lines = (pending + decoder.decode(block)).split('\n')
+                block.release()
+                pending = lines.pop()
+                yield from lines
+            pending += decoder.decode(b'', final=True)
+            if pending:
+                yield pending
+        finally:
+            view.release()
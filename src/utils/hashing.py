@@ -0,0 +1,40 @@
+"""
+Skróty zawartości plików
+"""
+
+import hashlib
+from typing import Iterable
+
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_hash(path: str) -> str:
+    """
+    Oblicza skrót SHA-256 zawartości pliku
+    
+    Args:
+        path: Ścieżka do pliku
+    
+    Returns:
+        Skrót w postaci szesnastkowej
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def record_hash(values: Iterable) -> str:
+    """
+    Oblicza skrót treści rekordu (np. osoby z pliku GEDCOM)
+    
+    Args:
+        values: Wartości pól rekordu w stałej kolejności (None jako pusta wartość)
+    
+    Returns:
+        Skrót w postaci szesnastkowej
+    """
+    text = '\x1f'.join('' if value is None else str(value) for value in values)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
@@ -0,0 +1,283 @@
+"""
+Profiler - Opcjonalne pomiary czasu zapytań i operacji na gorących ścieżkach
+"""
+
+import functools
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+class _Stats:
+    """Zagregowane statystyki jednej funkcji lub akcji"""
+    
+    __slots__ = ('calls', 'total_s', 'max_s', 'rows', 'queries')
+    
+    def __init__(self):
+        self.calls = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.rows = 0
+        self.queries = 0
+    
+    def add(self, duration: float, rows: Optional[int] = None):
+        """Dodaje pomiar pojedynczego wywołania"""
+        self.calls += 1
+        self.total_s += duration
+        self.max_s = max(self.max_s, duration)
+        if rows:
+            self.rows += rows
+    
+    def to_dict(self) -> dict:
+        """Konwertuje statystyki do słownika"""
+        return {
+            'calls': self.calls,
+            'total_ms': round(self.total_s * 1000, 3),
+            'mean_ms': round(self.total_s * 1000 / self.calls, 3) if self.calls else 0.0,
+            'max_ms': round(self.max_s * 1000, 3),
+            'rows': self.rows,
+            'queries': self.queries
+        }
+
+
+class Profiler:
+    """
+    Zbiera czasy wywołań, liczbę zwróconych wierszy i liczbę zapytań SQL
+    
+    Pomiary są grupowane według akcji użytkownika (np. "wybór osoby").
+    Wyłączony profiler sprowadza się do sprawdzenia jednej flagi w dekoratorze.
+    """
+    
+    MAX_EVENTS = 100000
+    
+    def __init__(self):
+        """Inicjalizacja profilera"""
+        self.enabled = False
+        self.connections = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.origin = time.perf_counter()
+        self.reset()
+    
+    def reset(self):
+        """Usuwa zebrane pomiary"""
+        with self.lock:
+            # akcja -> funkcja -> statystyki
+            self.functions: Dict[str, Dict[str, _Stats]] = defaultdict(lambda: defaultdict(_Stats))
+            self.actions: Dict[str, _Stats] = defaultdict(_Stats)
+            self.statements: Dict[str, int] = defaultdict(int)
+            # Stosy wywołań w formacie "collapsed" (flamegraph.pl, speedscope)
+            self.stacks: Dict[str, float] = defaultdict(float)
+            self.events: List[dict] = []
+    
+    def enable(self):
+        """Włącza zbieranie pomiarów"""
+        self.enabled = True
+        for connection in list(self.connections):
+            connection.set_trace_callback(self._on_statement)
+    
+    def disable(self):
+        """Wyłącza zbieranie pomiarów (zebrane dane pozostają)"""
+        self.enabled = False
+        for connection in list(self.connections):
+            connection.set_trace_callback(None)
+    
+    def attach_connection(self, connection):
+        """
+        Rejestruje połączenie SQLite, którego zapytania mają być liczone
+        
+        Args:
+            connection: Połączenie sqlite3
+        """
+        if connection not in self.connections:
+            self.connections.append(connection)
+        if self.enabled:
+            connection.set_trace_callback(self._on_statement)
+    
+    def detach_connection(self, connection):
+        """
+        Wyrejestrowuje połączenie (wywoływane przed jego zamknięciem)
+        
+        Args:
+            connection: Połączenie sqlite3
+        """
+        if connection in self.connections:
+            self.connections.remove(connection)
+            connection.set_trace_callback(None)
+    
+    def _stack(self) -> List[str]:
+        """Zwraca stos bieżących pomiarów dla wątku"""
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+    
+    def _current_action(self) -> str:
+        """Zwraca nazwę bieżącej akcji użytkownika"""
+        return getattr(self.local, 'action', None) or '(bez akcji)'
+    
+    def _on_statement(self, statement: str):
+        """Wywoływane przez sqlite3 dla każdego wykonanego zapytania"""
+        stack = self._stack()
+        action = self._current_action()
+        with self.lock:
+            self.actions[action].queries += 1
+            if stack:
+                self.functions[action][stack[-1]].queries += 1
+            self.statements[' '.join(statement.split())[:120]] += 1
+    
+    @contextmanager
+    def action(self, name: str):
+        """
+        Grupuje pomiary wykonane w bloku pod nazwą akcji użytkownika
+        
+        Args:
+            name: Nazwa akcji, np. "wybór osoby"
+        """
+        if not self.enabled:
+            yield
+            return
+        
+        previous = getattr(self.local, 'action', None)
+        self.local.action = name
+        try:
+            with self.span(f"akcja: {name}", is_action=True):
+                yield
+        finally:
+            self.local.action = previous
+    
+    @contextmanager
+    def span(self, name: str, is_action: bool = False):
+        """
+        Mierzy czas wykonania bloku kodu
+        
+        Args:
+            name: Nazwa mierzonego fragmentu
+            is_action: Czy blok jest akcją użytkownika
+        """
+        stack = self._stack()
+        stack.append(name)
+        result = {'rows': None}
+        start = time.perf_counter()
+        try:
+            yield result
+        finally:
+            duration = time.perf_counter() - start
+            path = ';'.join(stack)
+            stack.pop()
+            action = self._current_action()
+            with self.lock:
+                if is_action:
+                    self.actions[action].add(duration)
+                else:
+                    self.functions[action][name].add(duration, result['rows'])
+                self.stacks[path] += duration
+                if len(self.events) < self.MAX_EVENTS:
+                    self.events.append({
+                        'name': name, 'cat': action, 'ph': 'X',
+                        'ts': round((start - self.origin) * 1e6, 1),
+                        'dur': round(duration * 1e6, 1),
+                        'pid': 1, 'tid': threading.get_ident(),
+                        'args': {'rows': result['rows']}
+                    })
+    
+    def get_summary(self) -> dict:
+        """
+        Zwraca zagregowane pomiary
+        
+        Returns:
+            Słownik: akcje (z funkcjami posortowanymi wg łącznego czasu)
+            oraz najczęściej wykonywane zapytania SQL
+        """
+        with self.lock:
+            actions = {}
+            for action in set(self.actions) | set(self.functions):
+                functions = self.functions.get(action, {})
+                actions[action] = {
+                    **self.actions[action].to_dict(),
+                    'functions': {
+                        name: stats.to_dict()
+                        for name, stats in sorted(functions.items(),
+                                                  key=lambda item: -item[1].total_s)
+                    }
+                }
+            statements = sorted(self.statements.items(), key=lambda item: -item[1])
+            return {
+                'actions': actions,
+                'statements': [{'sql': sql, 'count': count} for sql, count in statements[:50]]
+            }
+    
+    def dump_json(self, filename: str):
+        """
+        Zapisuje pomiary do pliku JSON
+        
+        Plik zawiera podsumowanie oraz listę "traceEvents", dzięki czemu
+        można go otworzyć bezpośrednio w chrome://tracing lub speedscope.
+        
+        Args:
+            filename: Ścieżka do pliku
+        """
+        summary = self.get_summary()
+        with self.lock:
+            summary['traceEvents'] = list(self.events)
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=1)
+    
+    def dump_collapsed(self, filename: str):
+        """
+        Zapisuje stosy wywołań w formacie "collapsed" dla flamegraph.pl
+        
+        Args:
+            filename: Ścieżka do pliku
+        """
+        with self.lock:
+            lines = [f"{path} {int(total * 1e6)}" for path, total in sorted(self.stacks.items())]
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+
+
+# Wspólna instancja używana przez dekorator i GUI
+profiler = Profiler()
+
+
+def _count_rows(result) -> Optional[int]:
+    """Określa liczbę wierszy zwróconych przez funkcję"""
+    if result is None:
+        return 0
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    if isinstance(result, dict):
+        return 1
+    return None
+
+
+def profiled(func=None, *, name: Optional[str] = None):
+    """
+    Dekorator mierzący czas wykonania i liczbę zwróconych wierszy
+    
+    Gdy profiler jest wyłączony, koszt ogranicza się do sprawdzenia flagi.
+    
+    Args:
+        func: Dekorowana funkcja
+        name: Nazwa w raportach (domyślnie Klasa.metoda)
+    """
+    def decorate(f):
+        label = name or f.__qualname__
+        
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return f(*args, **kwargs)
+            with profiler.span(label) as span:
+                result = f(*args, **kwargs)
+                span['rows'] = _count_rows(result)
+                return result
+        
+        return wrapper
+    
+    if func is not None:
+        return decorate(func)
+    return decorate
@@ -0,0 +1,475 @@
+"""
+Snapshot - Zwarta binarna migawka drzewa do szybkiego wczytania i przenoszenia
+"""
+
+import struct
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..business_logic.pedigree import Pedigree
+from ..database.db_manager import DatabaseManager
+
+
+# Nagłówek pliku: sygnatura, wersja formatu, kompresja danych
+MAGIC = b'DRZEWO\x00S'
+VERSION = 2
+# Wersje możliwe do wczytania (wersja 1 nie zawiera słownika miejsc)
+SUPPORTED_VERSIONS = (1, 2)
+HEADER = struct.Struct('<8sHB5x')
+
+# Nagłówek sekcji: nazwa, typ danych numpy, rozmiar danych w bajtach;
+# dane sekcji są wyrównane do 8 bajtów
+SECTION = struct.Struct('<56s8sQ')
+ALIGNMENT = 8
+
+# Rodzaje kompresji zapisywane w nagłówku
+COMPRESSIONS = {None: 0, 'zlib': 1, 'zstd': 2}
+ZLIB_LEVEL = 1
+ZSTD_LEVEL = 3
+
+# Kolumna całkowita (klucze dat RRRRMMDD mieszczą się w int32): wartość oznaczająca NULL
+NULL_INTEGER = np.iinfo(np.int32).min
+
+# Kolumna zmiennoprzecinkowa (współrzędne miejsc): NULL zapisywany jako NaN
+FLOAT_COLUMNS = ('szerokosc', 'dlugosc')
+
+# Sufiks sekcji z tablicą napisów kolumny tekstowej
+STRINGS_SUFFIX = '.napisy'
+
+# Kolumny osób, relacji i słownika miejsc zapisywane w migawce
+# (kolejność jak w dump_rows i dump_places)
+PERSON_COLUMNS = (DatabaseManager.PERSON_COLUMNS + DatabaseManager.DATE_COLUMNS
+                  + DatabaseManager.PLACE_COLUMNS)
+RELATION_COLUMNS = ('osoba1_id', 'osoba2_id', 'rodzaj_relacji')
+PLACE_COLUMNS = ('id', 'nazwa', 'szerokosc', 'dlugosc')
+ALIAS_COLUMNS = ('klucz', 'miejsce_id')
+# Kolumny całkowite osób i słownika miejsc (pozostałe poza FLOAT_COLUMNS są tekstowe)
+INTEGER_COLUMNS = (('urodzenie_klucz', 'smierc_klucz') + DatabaseManager.PLACE_COLUMNS
+                   + ('id', 'miejsce_id'))
+
+
+class StringColumn:
+    """
+    Kolumna tekstowa z internowaniem napisów
+    
+    Każda różna wartość jest zapisana raz w tablicy napisów (UTF-8, każdy
+    zakończony bajtem zerowym), a wiersze przechowują jej numer (int32,
+    -1 dla NULL). Imiona, nazwiska, miejsca i dokładności dat powtarzają
+    się wielokrotnie, więc kolumna zajmuje ułamek rozmiaru tekstu.
+    Tablica jest dekodowana dopiero przy pierwszym odczycie wartości.
+    """
+    
+    def __init__(self, codes: np.ndarray, blob: bytes):
+        """
+        Inicjalizacja kolumny
+        
+        Args:
+            codes: Numery napisów kolejnych wierszy
+            blob: Napisy zakończone bajtem zerowym
+        """
+        self.codes = codes
+        self.blob = blob
+        self._table = None
+    
+    @classmethod
+    def from_values(cls, values: Iterable) -> 'StringColumn':
+        """
+        Tworzy kolumnę z wartości (inne niż napisy, np. daty-liczby, są zapisywane jako tekst)
+        
+        Raises:
+            ValueError: Jeśli napis zawiera bajt zerowy
+        """
+        index = {}
+        codes = []
+        for value in values:
+            if value is None:
+                codes.append(-1)
+                continue
+            value = value if isinstance(value, str) else str(value)
+            code = index.get(value)
+            if code is None:
+                if '\0' in value:
+                    raise ValueError("Napis zawiera znak o kodzie 0")
+                code = index[value] = len(index)
+            codes.append(code)
+        blob = ''.join(value + '\0' for value in index).encode('utf-8')
+        return cls(np.array(codes, dtype=np.int32), blob)
+    
+    @property
+    def table(self) -> List[str]:
+        """Różne wartości kolumny w kolejności numerów"""
+        if self._table is None:
+            self._table = self.blob.decode('utf-8').split('\0')[:-1]
+        return self._table
+    
+    def code_of(self, value: str) -> int:
+        """Zwraca numer napisu lub -1, jeśli nie występuje w kolumnie"""
+        try:
+            return self.table.index(value)
+        except ValueError:
+            return -1
+    
+    def __len__(self) -> int:
+        return len(self.codes)
+    
+    def __getitem__(self, row: int) -> Optional[str]:
+        code = int(self.codes[row])
+        return self.table[code] if code >= 0 else None
+    
+    def tolist(self) -> List[Optional[str]]:
+        """Zwraca wartości wszystkich wierszy"""
+        table = self.table + [None]  # numer -1 wskazuje ostatni element
+        return [table[code] for code in self.codes.tolist()]
+
+
+def _integer_list(values: np.ndarray) -> List[Optional[int]]:
+    """Zwraca wartości kolumny całkowitej z NULL jako None"""
+    return [None if value == NULL_INTEGER else value for value in values.tolist()]
+
+
+def _float_list(values: np.ndarray) -> List[Optional[float]]:
+    """Zwraca wartości kolumny zmiennoprzecinkowej z NULL (NaN) jako None"""
+    return [None if value != value else value for value in values.tolist()]
+
+
+def _column_array(column: str, values: Iterable):
+    """Tworzy kolumnę migawki z wartości wiersza bazy"""
+    if column in FLOAT_COLUMNS:
+        return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+    if column in INTEGER_COLUMNS:
+        return np.array([NULL_INTEGER if value is None else value for value in values],
+                        dtype=np.int32)
+    return StringColumn.from_values(values)
+
+
+def _column_rows(columns: Dict[str, object], names: Tuple[str, ...]) -> List[tuple]:
+    """Zwraca wiersze złożone z kolumn migawki"""
+    values = []
+    for name in names:
+        data = columns[name]
+        if isinstance(data, StringColumn):
+            values.append(data.tolist())
+        elif name in FLOAT_COLUMNS:
+            values.append(_float_list(data))
+        else:
+            values.append(_integer_list(data))
+    return list(zip(*values))
+
+
+class Snapshot:
+    """
+    Migawka drzewa: osoby w układzie kolumnowym i relacje jako tablice krawędzi
+    
+    Osoby są uporządkowane rosnąco wg ID, relacje są trzema równoległymi
+    tablicami (osoba1_id, osoba2_id i numer rodzaju relacji). Po wczytaniu
+    tablice liczbowe wskazują wprost na bufor pliku (bez kopiowania
+    i tworzenia obiektów Pythona dla wierszy), a indeks rodziców potrzebny
+    do rodowodów i współczynników pokrewieństwa jest budowany operacjami
+    numpy przy pierwszym użyciu.
+    
+    Słownik miejsc (miejsca ze współrzędnymi i aliasy) jest zapisywany
+    kolumnowo razem z kluczami obcymi miejsc osób. Ścieżki zdjęć są
+    zapisywane, ale same pliki zdjęć nie są częścią migawki.
+    """
+    
+    def __init__(self, ids: np.ndarray, columns: Dict[str, object],
+                 relations: Tuple[np.ndarray, np.ndarray, StringColumn],
+                 places: Optional[Dict[str, object]] = None,
+                 aliases: Optional[Dict[str, object]] = None):
+        """
+        Inicjalizacja migawki
+        
+        Args:
+            ids: ID osób (int32, rosnąco)
+            columns: Kolumny osób: StringColumn lub tablica int32 (NULL_INTEGER jako NULL)
+            relations: Krotka (osoba1_id, osoba2_id, rodzaj_relacji)
+            places: Kolumny miejsc (PLACE_COLUMNS) lub None (migawka w wersji 1)
+            aliases: Kolumny aliasów miejsc (ALIAS_COLUMNS) lub None
+        """
+        self.ids = ids
+        self.columns = columns
+        self.relations = relations
+        self.places = places
+        self.aliases = aliases
+        self._parents = None
+    
+    @classmethod
+    def from_database(cls, db_manager: DatabaseManager) -> 'Snapshot':
+        """Tworzy migawkę z całej zawartości bazy"""
+        persons, relations = db_manager.dump_rows()
+        values = list(zip(*persons)) or [()] * (len(PERSON_COLUMNS) + 1)
+        columns = {column: _column_array(column, column_values)
+                   for column, column_values in zip(PERSON_COLUMNS, values[1:])}
+        
+        places, aliases = db_manager.dump_places()
+        places = list(zip(*places)) or [()] * len(PLACE_COLUMNS)
+        aliases = list(zip(*aliases)) or [()] * len(ALIAS_COLUMNS)
+        
+        osoba1, osoba2, kinds = list(zip(*relations)) or [(), (), ()]
+        return cls(np.array(values[0], dtype=np.int32), columns,
+                   (np.array(osoba1, dtype=np.int32), np.array(osoba2, dtype=np.int32),
+                    StringColumn.from_values(kinds)),
+                   {column: _column_array(column, column_values)
+                    for column, column_values in zip(PLACE_COLUMNS, places)},
+                   {column: _column_array(column, column_values)
+                    for column, column_values in zip(ALIAS_COLUMNS, aliases)})
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def _sections(self) -> List[Tuple[str, np.ndarray]]:
+        """Sekcje pliku: nazwa i tablica danych"""
+        sections = [('osoby.id', self.ids)]
+        tables = [('osoby', self.columns),
+                  ('relacje', dict(zip(RELATION_COLUMNS, self.relations)))]
+        if self.places is not None:
+            tables += [('miejsca', self.places), ('miejsca_aliasy', self.aliases)]
+        for table, columns in tables:
+            for column, data in columns.items():
+                name = f'{table}.{column}'
+                if isinstance(data, StringColumn):
+                    sections.append((name, data.codes))
+                    sections.append((name + STRINGS_SUFFIX, np.frombuffer(data.blob, dtype=np.uint8)))
+                else:
+                    sections.append((name, data))
+        return sections
+    
+    def save(self, path: str, compression: Optional[str] = 'zlib'):
+        """
+        Zapisuje migawkę do pliku
+        
+        Args:
+            path: Ścieżka pliku
+            compression: 'zlib', 'zstd' (wymaga pakietu zstandard) lub None
+        """
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Nieznany rodzaj kompresji: {compression}")
+        
+        parts = []
+        for name, data in self._sections():
+            data = np.ascontiguousarray(data)
+            parts.append(SECTION.pack(name.encode('ascii'), data.dtype.str.encode('ascii'),
+                                      data.nbytes))
+            parts.append(data.tobytes())
+            parts.append(b'\0' * (-data.nbytes % ALIGNMENT))
+        payload = _compress(b''.join(parts), compression)
+        
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, COMPRESSIONS[compression]))
+            f.write(payload)
+    
+    @classmethod
+    def load(cls, path: str) -> 'Snapshot':
+        """
+        Wczytuje migawkę z pliku
+        
+        Raises:
+            ValueError: Jeśli plik nie jest migawką w obsługiwanej wersji
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < HEADER.size:
+            raise ValueError("Plik nie jest migawką drzewa")
+        magic, version, compression = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Plik nie jest migawką drzewa")
+        if version not in SUPPORTED_VERSIONS:
+            raise ValueError(f"Nieobsługiwana wersja migawki: {version}")
+        payload = _decompress(memoryview(data)[HEADER.size:], compression)
+        
+        sections = {}
+        position = 0
+        while position < len(payload):
+            name, dtype, size = SECTION.unpack_from(payload, position)
+            position += SECTION.size
+            dtype = np.dtype(dtype.rstrip(b'\0').decode('ascii'))
+            sections[name.rstrip(b'\0').decode('ascii')] = np.frombuffer(
+                payload, dtype=dtype, count=size // dtype.itemsize, offset=position)
+            position += size + (-size % ALIGNMENT)
+        
+        def column(name: str):
+            if name + STRINGS_SUFFIX in sections:
+                return StringColumn(sections[name], sections[name + STRINGS_SUFFIX].tobytes())
+            return sections[name]
+        
+        ids = sections['osoby.id']
+        columns = {}
+        for name in sections:
+            table, _, column_name = name.partition('.')
+            if (table == 'osoby' and column_name != 'id'
+                    and not column_name.endswith(STRINGS_SUFFIX)):
+                columns[column_name] = column(name)
+        relations = tuple(column(f'relacje.{name}') for name in RELATION_COLUMNS)
+        places = aliases = None
+        if 'miejsca.id' in sections:
+            places = {name: column(f'miejsca.{name}') for name in PLACE_COLUMNS}
+            aliases = {name: column(f'miejsca_aliasy.{name}') for name in ALIAS_COLUMNS}
+        return cls(ids, columns, relations, places, aliases)
+    
+    def person(self, person_id: int) -> Optional[dict]:
+        """
+        Zwraca osobę z migawki
+        
+        Args:
+            person_id: ID osoby
+        
+        Returns:
+            Słownik z polami osoby lub None
+        """
+        row = int(np.searchsorted(self.ids, person_id))
+        if row == len(self.ids) or self.ids[row] != person_id:
+            return None
+        person = {'id': person_id}
+        for column, data in self.columns.items():
+            if isinstance(data, StringColumn):
+                person[column] = data[row]
+            else:
+                person[column] = None if data[row] == NULL_INTEGER else int(data[row])
+        return person
+    
+    def person_rows(self) -> List[tuple]:
+        """Zwraca osoby jako krotki (id, *PERSON_COLUMNS, *DATE_COLUMNS, *PLACE_COLUMNS)"""
+        values = []
+        for column in PERSON_COLUMNS:
+            data = self.columns.get(column)
+            if data is None:
+                values.append([None] * len(self.ids))
+            elif isinstance(data, StringColumn):
+                values.append(data.tolist())
+            else:
+                values.append(_integer_list(data))
+        return list(zip(self.ids.tolist(), *values))
+    
+    def relation_rows(self) -> List[tuple]:
+        """Zwraca relacje jako krotki (osoba1_id, osoba2_id, rodzaj_relacji)"""
+        osoba1, osoba2, kinds = self.relations
+        return list(zip(osoba1.tolist(), osoba2.tolist(), kinds.tolist()))
+    
+    def place_rows(self) -> Optional[Tuple[List[tuple], List[tuple]]]:
+        """
+        Zwraca słownik miejsc jak DatabaseManager.dump_places
+        
+        Returns:
+            Krotka (miejsca, aliasy) lub None dla migawki bez miejsc (wersja 1)
+        """
+        if self.places is None:
+            return None
+        return _column_rows(self.places, PLACE_COLUMNS), _column_rows(self.aliases, ALIAS_COLUMNS)
+    
+    def restore(self, db_manager: DatabaseManager) -> int:
+        """
+        Odtwarza zawartość pustej bazy z migawki (wstawianie zbiorcze z zachowaniem ID)
+        
+        Returns:
+            Liczba odtworzonych osób
+        """
+        places, aliases = self.place_rows() or (None, None)
+        return db_manager.restore_rows(self.person_rows(), self.relation_rows(), places, aliases)
+    
+    def _parent_index(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Indeks rodziców: ID dzieci (rosnąco) i równoległe ID rodziców
+        
+        Relacja 'rodzic' wskazuje rodzica w osoba1_id, a 'dziecko' w osoba2_id.
+        """
+        if self._parents is None:
+            osoba1, osoba2, kinds = self.relations
+            is_parent = kinds.codes == kinds.code_of('rodzic')
+            is_child = kinds.codes == kinds.code_of('dziecko')
+            children = np.concatenate((osoba2[is_parent], osoba1[is_child]))
+            parents = np.concatenate((osoba1[is_parent], osoba2[is_child]))
+            order = np.argsort(children, kind='stable')
+            self._parents = (children[order], parents[order])
+        return self._parents
+    
+    def parents_of(self, person_id: int) -> List[int]:
+        """Zwraca ID rodziców osoby (rosnąco)"""
+        children, parents = self._parent_index()
+        start = np.searchsorted(children, person_id, side='left')
+        end = np.searchsorted(children, person_id, side='right')
+        return sorted(set(parents[start:end].tolist()))
+    
+    def pedigree_edges(self, person_ids: Iterable[int]) -> List[Tuple[int, int]]:
+        """
+        Zwraca krawędzie rodowodu osób - do nich i do wszystkich ich przodków
+        
+        Returns:
+            Lista krotek (rodzic_id, dziecko_id)
+        """
+        edges = []
+        stack = list(dict.fromkeys(person_ids))
+        seen = set(stack)
+        while stack:
+            child_id = stack.pop()
+            for parent_id in self.parents_of(child_id):
+                edges.append((parent_id, child_id))
+                if parent_id not in seen:
+                    seen.add(parent_id)
+                    stack.append(parent_id)
+        return edges
+    
+    def pedigree(self, *person_ids: int) -> Pedigree:
+        """Buduje rodowód osób (jak RelationshipCalculator.get_pedigree, bez zapytań do bazy)"""
+        return Pedigree(person_ids, self.pedigree_edges(person_ids))
+
+
+def _compress(data: bytes, compression: Optional[str]) -> bytes:
+    """Kompresuje dane migawki"""
+    if compression == 'zlib':
+        return zlib.compress(data, ZLIB_LEVEL)
+    if compression == 'zstd':
+        return _zstandard().ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return data
+
+
+def _decompress(data: memoryview, compression: int) -> bytes:
+    """Dekompresuje dane migawki"""
+    if compression == COMPRESSIONS['zlib']:
+        return zlib.decompress(data)
+    if compression == COMPRESSIONS['zstd']:
+        return _zstandard().ZstdDecompressor().decompress(data)
+    if compression == COMPRESSIONS[None]:
+        return bytes(data)
+    raise ValueError(f"Nieznany rodzaj kompresji migawki: {compression}")
+
+
+def _zstandard():
+    """Zwraca moduł zstandard (opcjonalny - bez niego dostępna jest kompresja zlib)"""
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("Kompresja zstd wymaga pakietu zstandard") from None
+    return zstandard
+
+
+def save_snapshot(db_manager: DatabaseManager, path: str,
+                  compression: Optional[str] = 'zlib') -> Snapshot:
+    """
+    Zapisuje migawkę całej bazy do pliku
+    
+    Args:
+        db_manager: Manager bazy danych
+        path: Ścieżka pliku migawki
+        compression: 'zlib', 'zstd' (wymaga pakietu zstandard) lub None
+    
+    Returns:
+        Zapisana migawka
+    """
+    snapshot = Snapshot.from_database(db_manager)
+    snapshot.save(path, compression)
+    return snapshot
+
+
+def load_snapshot(path: str) -> Snapshot:
+    """
+    Wczytuje migawkę z pliku
+    
+    Args:
+        path: Ścieżka pliku migawki
+    
+    Returns:
+        Wczytana migawka
+    """
+    return Snapshot.load(path)
@@ -0,0 +1,252 @@
+"""
+ThumbnailCache - Miniatury zdjęć generowane w tle i przechowywane na dysku
+"""
+
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+from ..database.query_cache import QueryCache
+from .hashing import file_hash
+
+
+# Dostępne rozmiary miniatur (dłuższy bok w pikselach)
+SIZE_BUCKETS = (64, 128, 256, 512)
+
+
+def bucket_for(size: int) -> int:
+    """
+    Zwraca najmniejszy rozmiar miniatury nie mniejszy niż żądany
+    
+    Args:
+        size: Żądany rozmiar w pikselach
+    
+    Returns:
+        Rozmiar z SIZE_BUCKETS
+    """
+    for bucket in SIZE_BUCKETS:
+        if size <= bucket:
+            return bucket
+    return SIZE_BUCKETS[-1]
+
+
+class ThumbnailCache:
+    """
+    Generuje miniatury w wątkach roboczych i przechowuje je na dysku
+    
+    Miniatury są identyfikowane skrótem zawartości zdjęcia i rozmiarem,
+    więc identyczne pliki pod różnymi ścieżkami dzielą miniaturę. Ostatnio
+    używane miniatury (zakodowane jako PNG) są trzymane w pamięci.
+    """
+    
+    def __init__(self, cache_dir: str = os.path.join('data', 'thumbnails'),
+                 memory_size: int = 256, max_workers: int = 2):
+        """
+        Inicjalizacja pamięci miniatur
+        
+        Args:
+            cache_dir: Katalog miniatur na dysku
+            memory_size: Liczba miniatur przechowywanych w pamięci
+            max_workers: Liczba wątków generujących miniatury
+        """
+        self.cache_dir = cache_dir
+        self.memory = QueryCache(memory_size)
+        self.max_workers = max_workers
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.lock = threading.Lock()
+        # (ścieżka, mtime, rozmiar pliku) -> skrót zawartości
+        self.digests: Dict[Tuple[str, int, int], str] = {}
+        self.pending: Dict[Tuple[Tuple[str, int, int], int], Future] = {}
+    
+    def _source_key(self, path: str) -> Tuple[str, int, int]:
+        """Zwraca klucz pliku źródłowego zmieniający się wraz z jego zawartością"""
+        stat = os.stat(path)
+        return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+    
+    def _digest(self, path: str, source_key: Tuple[str, int, int]) -> str:
+        """Zwraca (zapamiętany) skrót zawartości pliku"""
+        with self.lock:
+            digest = self.digests.get(source_key)
+        if digest is None:
+            digest = file_hash(path)
+            with self.lock:
+                self.digests[source_key] = digest
+        return digest
+    
+    def thumbnail_path(self, digest: str, bucket: int) -> str:
+        """
+        Zwraca ścieżkę miniatury na dysku
+        
+        Args:
+            digest: Skrót zawartości zdjęcia
+            bucket: Rozmiar miniatury
+        """
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}_{bucket}.png")
+    
+    def get(self, path: str, size: int) -> Optional[bytes]:
+        """
+        Zwraca gotową miniaturę bez generowania jej (nie blokuje wątku GUI)
+        
+        Args:
+            path: Ścieżka do zdjęcia
+            size: Żądany rozmiar w pikselach
+        
+        Returns:
+            Zawartość miniatury (PNG) lub None, jeśli trzeba ją wygenerować
+        """
+        try:
+            source_key = self._source_key(path)
+        except OSError:
+            return None
+        
+        bucket = bucket_for(size)
+        with self.lock:
+            digest = self.digests.get(source_key)
+            if digest is None:
+                return None
+            found, data = self.memory.get((digest, bucket))
+        if found:
+            return data
+        
+        return self._read_from_disk(digest, bucket)
+    
+    def load(self, path: str, size: int) -> bytes:
+        """
+        Zwraca miniaturę, generując ją w razie potrzeby (wywołanie blokujące)
+        
+        Args:
+            path: Ścieżka do zdjęcia
+            size: Żądany rozmiar w pikselach
+        
+        Returns:
+            Zawartość miniatury (PNG)
+        
+        Raises:
+            OSError: Gdy pliku nie można odczytać lub nie jest obrazem
+        """
+        source_key = self._source_key(path)
+        bucket = bucket_for(size)
+        digest = self._digest(path, source_key)
+        
+        with self.lock:
+            found, data = self.memory.get((digest, bucket))
+        if found:
+            return data
+        
+        data = self._read_from_disk(digest, bucket)
+        if data is None:
+            data = self._generate(path, digest, bucket)
+        return data
+    
+    def request(self, path: str, size: int,
+                callback: Optional[Callable[[str, Optional[bytes]], None]] = None) -> Future:
+        """
+        Zleca wygenerowanie miniatury w tle
+        
+        Callback jest wywoływany w wątku roboczym z argumentami (ścieżka,
+        zawartość miniatury lub None w razie błędu). Kod GUI powinien
+        przekazać wynik do wątku głównego, np. przez sygnał Qt.
+        
+        Args:
+            path: Ścieżka do zdjęcia
+            size: Żądany rozmiar w pikselach
+            callback: Funkcja wywoływana po zakończeniu
+        
+        Returns:
+            Obiekt Future z zawartością miniatury
+        """
+        try:
+            key = (self._source_key(path), bucket_for(size))
+        except OSError as e:
+            future = Future()
+            future.set_exception(e)
+        else:
+            with self.lock:
+                future = self.pending.get(key)
+                submitted = future is None
+                if submitted:
+                    if self.executor is None:
+                        self.executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                           thread_name_prefix='miniatury')
+                    future = self.executor.submit(self.load, path, size)
+                    self.pending[key] = future
+            # Poza blokadą - zakończone zlecenie wywołuje callback natychmiast
+            if submitted:
+                future.add_done_callback(lambda f: self._forget_pending(key))
+        
+        if callback is not None:
+            def notify(done: Future):
+                callback(path, None if done.exception() else done.result())
+            future.add_done_callback(notify)
+        
+        return future
+    
+    def _forget_pending(self, key):
+        """Usuwa zakończone zlecenie z listy oczekujących"""
+        with self.lock:
+            self.pending.pop(key, None)
+    
+    def _read_from_disk(self, digest: str, bucket: int) -> Optional[bytes]:
+        """Wczytuje miniaturę z dysku i zapamiętuje ją w pamięci"""
+        try:
+            with open(self.thumbnail_path(digest, bucket), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        
+        with self.lock:
+            self.memory.put((digest, bucket), data, tags=[digest])
+        return data
+    
+    def _generate(self, path: str, digest: str, bucket: int) -> bytes:
+        """Dekoduje zdjęcie, zmniejsza je i zapisuje miniaturę na dysku"""
+        # Pillow importowany dopiero przy pierwszej miniaturze
+        from PIL import Image, ImageOps
+        
+        with Image.open(path) as image:
+            # Dla JPEG dekoduje od razu w zmniejszonej skali (znacznie szybciej)
+            image.draft('RGB', (bucket, bucket))
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((bucket, bucket))
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+            
+            target = self.thumbnail_path(digest, bucket)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(target), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    image.save(f, format='PNG', optimize=True)
+                os.replace(temp_path, target)
+            finally:
+                if os.path.exists(temp_path):
+                    os.unlink(temp_path)
+        
+        with open(target, 'rb') as f:
+            data = f.read()
+        with self.lock:
+            self.memory.put((digest, bucket), data, tags=[digest])
+        return data
+    
+    def get_stats(self) -> dict:
+        """Zwraca statystyki pamięci miniatur"""
+        with self.lock:
+            return {**self.memory.get_stats(), 'pending': len(self.pending)}
+    
+    def shutdown(self, wait: bool = False):
+        """
+        Zatrzymuje wątki robocze
+        
+        Args:
+            wait: Czy czekać na zakończenie rozpoczętych zleceń
+        """
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+# Wspólna instancja używana przez dialogi i widoki drzew
+thumbnail_cache = ThumbnailCache()
@@ -0,0 +1,123 @@
+"""
+Testy jednostkowe dla tabeli domknięcia przodków
+"""
+
+import unittest
+import os
+import sqlite3
+import tempfile
+from src.database.db_manager import DatabaseManager
+
+
+class TestAncestryClosure(unittest.TestCase):
+    """Testy dla klasy AncestryClosure"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'drzewo.db')
+        self.db_manager = DatabaseManager(self.db_path)
+        
+        # Dziadek -> ojciec -> syn, matka spoza rodziny dziadka
+        self.dziadek = self.db_manager.add_person('Adam', 'Nowak', '1900', None, 'M')
+        self.ojciec = self.db_manager.add_person('Jan', 'Nowak', '1930', None, 'M')
+        self.matka = self.db_manager.add_person('Maria', 'Nowak', '1932', None, 'K')
+        self.syn = self.db_manager.add_person('Piotr', 'Nowak', '1960', None, 'M')
+        
+        self.db_manager.add_relation(self.dziadek, self.ojciec, 'rodzic')
+        self.db_manager.add_relation(self.syn, self.ojciec, 'dziecko')
+        self.db_manager.add_relation(self.matka, self.syn, 'rodzic')
+        self.db_manager.add_relation(self.ojciec, self.matka, 'małżonek')
+    
+    def tearDown(self):
+        """Sprzątanie po każdym teście"""
+        self.db_manager.close()
+        self.temp_dir.cleanup()
+    
+    def _closure(self):
+        """Zawartość tabeli domknięcia"""
+        cursor = self.db_manager.connection.cursor()
+        cursor.execute('SELECT przodek_id, potomek_id, glebokosc FROM przodkowie')
+        return set(map(tuple, cursor.fetchall()))
+    
+    def test_is_ancestor(self):
+        """Test sprawdzania przodków dla obu zapisów relacji rodzicielskiej"""
+        self.assertTrue(self.db_manager.is_ancestor(self.dziadek, self.syn))
+        self.assertTrue(self.db_manager.is_ancestor(self.matka, self.syn))
+        self.assertFalse(self.db_manager.is_ancestor(self.syn, self.dziadek))
+        self.assertFalse(self.db_manager.is_ancestor(self.ojciec, self.matka))
+        self.assertEqual(self.db_manager.get_lineage_depth(self.dziadek, self.syn), 2)
+        self.assertEqual(self.db_manager.get_lineage_depth(self.ojciec, self.syn), 1)
+    
+    def test_ancestors_and_descendants(self):
+        """Test pobierania przodków i potomków z głębokością"""
+        ancestors = [(person['id'], depth) for person, depth in self.db_manager.get_ancestors(self.syn)]
+        self.assertEqual(ancestors, [(self.ojciec, 1), (self.matka, 1), (self.dziadek, 2)])
+        
+        nearest = self.db_manager.get_ancestors(self.syn, max_generations=1)
+        self.assertEqual({person['id'] for person, _ in nearest}, {self.ojciec, self.matka})
+        
+        descendants = [(person['id'], depth) for person, depth in self.db_manager.get_descendants(self.dziadek)]
+        self.assertEqual(descendants, [(self.ojciec, 1), (self.syn, 2)])
+    
+    def test_generations(self):
+        """Test pokolenia jako najdłuższego łańcucha przodków"""
+        generations = self.db_manager.get_generations()
+        
+        # Matka bez rodziców ma pokolenie 0, a syn jest poniżej obojga rodziców
+        self.assertEqual(generations, {self.ojciec: 1, self.syn: 2})
+    
+    def test_delete_relation_with_alternative_path(self):
+        """Test usunięcia relacji, gdy przodek jest osiągalny inną drogą"""
+        # Dziadek jest również bezpośrednim rodzicem matki
+        relation = self.db_manager.add_relation(self.dziadek, self.matka, 'rodzic')
+        self.assertEqual(self.db_manager.get_generations()[self.matka], 1)
+        
+        father_relation = [r for r in self.db_manager.get_relations(self.ojciec)
+                           if r['rodzaj_relacji'] == 'rodzic' and r['osoba1_id'] == self.dziadek]
+        self.db_manager.delete_relation(father_relation[0]['id'])
+        
+        self.assertFalse(self.db_manager.is_ancestor(self.dziadek, self.ojciec))
+        self.assertEqual(self.db_manager.get_lineage_depth(self.dziadek, self.syn), 2)
+        self.assertEqual(self.db_manager.get_generations(), {self.matka: 1, self.syn: 2})
+        
+        self.db_manager.delete_relation(relation)
+        self.assertFalse(self.db_manager.is_ancestor(self.dziadek, self.syn))
+        self.assertEqual(self.db_manager.get_generations(), {self.syn: 1})
+    
+    def test_delete_person(self):
+        """Test usunięcia osoby z linii prostej"""
+        self.db_manager.delete_person(self.ojciec)
+        
+        self.assertFalse(self.db_manager.is_ancestor(self.dziadek, self.syn))
+        self.assertEqual(self._closure(), {(self.matka, self.syn, 1)})
+        self.assertEqual(self.db_manager.get_generations(), {self.syn: 1})
+    
+    def test_bulk_matches_incremental(self):
+        """Test zgodności przebudowy z aktualizacjami przyrostowymi"""
+        incremental = self._closure()
+        generations = self.db_manager.get_generations()
+        
+        self.db_manager.ancestry.rebuild()
+        
+        self.assertEqual(self._closure(), incremental)
+        self.assertEqual(self.db_manager.get_generations(), generations)
+    
+    def test_migration_fills_closure(self):
+        """Test wypełnienia tabel przy otwarciu bazy bez domknięcia"""
+        expected = self._closure()
+        self.db_manager.close()
+        
+        connection = sqlite3.connect(self.db_path)
+        connection.execute('DROP TABLE przodkowie')
+        connection.execute('DROP TABLE pokolenia')
+        connection.commit()
+        connection.close()
+        
+        self.db_manager = DatabaseManager(self.db_path)
+        self.assertEqual(self._closure(), expected)
+        self.assertEqual(self.db_manager.get_generations(), {self.ojciec: 1, self.syn: 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
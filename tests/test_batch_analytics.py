@@ -0,0 +1,136 @@
+"""
+Testy jednostkowe dla analiz wsadowych wielu baz
+"""
+
+import unittest
+import io
+import json
+import os
+import sqlite3
+import tempfile
+from src.business_logic.batch_analytics import BatchAnalytics, find_databases
+from src.cli import main, EXIT_OK, EXIT_ERROR
+from src.database.db_manager import DatabaseManager
+
+
+# Osoby (imię, nazwisko, data urodzenia, płeć) w bazach kolejnych rodzin
+FAMILIES = {
+    'kowalscy.db': [('Jan', 'Kowalski', '1850', 'M'), ('Anna', 'Kowalska', '1855', 'K'),
+                    ('Piotr', 'Kowalski', '1880', 'M')],
+    'nowakowie.db': [('Adam', 'Nowak', 'ABT 1790', 'M'), ('Maria', 'Kowalska', '1801', 'K')],
+    'wisniewscy.db': [('Józef', 'Wiśniewski', '1920-05-01', 'M')]
+}
+
+
+class TestBatchAnalytics(unittest.TestCase):
+    """Testy analiz łączących wyniki z wielu baz"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        for filename, persons in FAMILIES.items():
+            db_manager = DatabaseManager(os.path.join(self.temp_dir.name, filename))
+            ids = [db_manager.add_person(imie, nazwisko, born, None, plec)
+                   for imie, nazwisko, born, plec in persons]
+            for child_id in ids[2:]:
+                db_manager.add_relation(ids[0], child_id, 'rodzic')
+            if len(ids) > 1:
+                db_manager.add_relation(ids[0], ids[1], 'małżonek')
+            db_manager.close()
+        self.paths = find_databases(self.temp_dir.name)
+    
+    def tearDown(self):
+        """Sprzątanie po każdym teście"""
+        self.temp_dir.cleanup()
+    
+    def test_find_databases(self):
+        """Test wyszukiwania plików baz w katalogu"""
+        self.assertEqual([os.path.basename(path) for path in self.paths], sorted(FAMILIES))
+    
+    def test_statistics(self):
+        """Test sumowania statystyk i skrajnych dat urodzenia"""
+        batch = BatchAnalytics(self.paths, workers=1).run('stats')
+        
+        self.assertEqual(batch.result['bazy'], 3)
+        self.assertEqual((batch.result['osoby'], batch.result['mezczyzni'], batch.result['kobiety']),
+                         (6, 4, 2))
+        self.assertEqual(batch.result['relacje_wg_rodzaju'], {'rodzic': 1, 'małżonek': 2})
+        self.assertEqual(batch.result['najwczesniejsze_urodzenie'], 'ABT 1790')
+        self.assertEqual(batch.result['najpozniejsze_urodzenie'], '1920-05-01')
+        self.assertEqual([report.path for report in batch.files], self.paths)
+        self.assertEqual(batch.errors, [])
+    
+    def test_surnames_and_search_in_process_pool(self):
+        """Test częstości nazwisk i wyszukiwania w puli procesów"""
+        analytics = BatchAnalytics(self.paths, workers=2)
+        
+        surnames = analytics.run('surnames', limit=2).result
+        self.assertEqual(surnames, [{'nazwisko': 'Kowalska', 'osoby': 2, 'bazy': 2},
+                                    {'nazwisko': 'Kowalski', 'osoby': 2, 'bazy': 1}])
+        
+        found = analytics.run('search', query='Kowal').result
+        self.assertEqual([(os.path.basename(p['db']), p['imie']) for p in found],
+                         [('kowalscy.db', 'Anna'), ('nowakowie.db', 'Maria'),
+                          ('kowalscy.db', 'Jan'), ('kowalscy.db', 'Piotr')])
+    
+    def test_databases_are_not_modified(self):
+        """Test analizy bez zapisu do plików i bez migracji starszego schematu"""
+        legacy = os.path.join(self.temp_dir.name, 'stara.db')
+        connection = sqlite3.connect(legacy)
+        connection.executescript('''
+            CREATE TABLE osoby (id INTEGER PRIMARY KEY, imie TEXT, nazwisko TEXT,
+                                data_urodzenia DATE, data_smierci DATE, plec TEXT);
+            CREATE TABLE relacje (id INTEGER PRIMARY KEY, osoba1_id INTEGER,
+                                  osoba2_id INTEGER, rodzaj_relacji TEXT);
+            INSERT INTO osoby VALUES (1, 'Ewa', 'Kowalska', '1700', NULL, 'K'),
+                                     (2, 'Jan', 'Kowalski', 'ABT 1690', NULL, 'M');
+        ''')
+        connection.close()
+        paths = self.paths + [legacy]
+        before = {path: os.stat(path).st_mtime_ns for path in paths}
+        
+        analytics = BatchAnalytics(paths, workers=1)
+        stats = analytics.run('stats').result
+        self.assertEqual((stats['osoby'], stats['najwczesniejsze_urodzenie']), (8, 'ABT 1690'))
+        self.assertEqual(analytics.run('surnames').result[0],
+                         {'nazwisko': 'Kowalska', 'osoby': 3, 'bazy': 3})
+        self.assertEqual(len(analytics.run('search', query='Ewa').result), 1)
+        
+        self.assertEqual({path: os.stat(path).st_mtime_ns for path in paths}, before)
+        connection = sqlite3.connect(legacy)
+        tables = connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+        connection.close()
+        self.assertEqual(sorted(tables), [('osoby',), ('relacje',)])
+    
+    def test_failed_database(self):
+        """Test raportu bazy, której nie udało się otworzyć"""
+        broken = os.path.join(self.temp_dir.name, 'uszkodzona.db')
+        with open(broken, 'wb') as f:
+            f.write(b'to nie jest baza SQLite' * 100)
+        missing = os.path.join(self.temp_dir.name, 'brak.db')
+        
+        batch = BatchAnalytics(self.paths + [broken, missing], workers=1).run('stats')
+        self.assertEqual(batch.result['osoby'], 6)
+        self.assertEqual([report.path for report in batch.errors], [broken, missing])
+        self.assertFalse(os.path.exists(missing))
+        
+        with self.assertRaises(ValueError):
+            BatchAnalytics(self.paths).run('nieznana')
+    
+    def test_cli(self):
+        """Test polecenia batch dla katalogu baz"""
+        out = io.StringIO()
+        exit_code = main(['--db-dir', self.temp_dir.name, 'batch', 'search', '--query', 'Nowak',
+                          '--workers', '1'], out=out)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        
+        self.assertEqual(exit_code, EXIT_OK)
+        self.assertEqual([(r['imie'], r['nazwisko']) for r in records], [('Adam', 'Nowak')])
+        
+        exit_code = main(['--db', os.path.join(self.temp_dir.name, 'brak.db'),
+                          'batch', 'stats'], out=io.StringIO())
+        self.assertEqual(exit_code, EXIT_ERROR)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+"""
+Testy jednostkowe dla dziennika zmian
+"""
+
+import unittest
+import os
+import tempfile
+from src.database.db_manager import DatabaseManager
+
+
+class TestChangeJournal(unittest.TestCase):
+    """Testy dziennika zmian DatabaseManager"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+        self.db_manager = DatabaseManager(self.temp_db.name)
+    
+    def tearDown(self):
+        """Sprzątanie po każdym teście"""
+        self.db_manager.close()
+        if os.path.exists(self.temp_db.name):
+            os.unlink(self.temp_db.name)
+    
+    def test_changes_are_recorded_in_order(self):
+        """Test rejestrowania zmian z numerami sekwencyjnymi"""
+        start = self.db_manager.get_last_sequence()
+        
+        parent_id = self.db_manager.add_person('Jan', 'Kowalski', None, None, 'M')
+        child_id = self.db_manager.add_person('Anna', 'Kowalska', None, None, 'K')
+        relation_id = self.db_manager.add_relation(parent_id, child_id, 'rodzic')
+        self.db_manager.update_person(child_id, 'Anna', 'Nowak')
+        self.db_manager.delete_person(parent_id)
+        
+        changes = self.db_manager.get_changes_since(start)
+        summary = [(c['tabela'], c['operacja'], c['rekord_id']) for c in changes]
+        
+        self.assertEqual(summary, [
+            ('osoby', 'INSERT', parent_id),
+            ('osoby', 'INSERT', child_id),
+            ('relacje', 'INSERT', relation_id),
+            ('osoby', 'UPDATE', child_id),
+            ('relacje', 'DELETE', relation_id),
+            ('osoby', 'DELETE', parent_id),
+        ])
+        
+        sequences = [c['seq'] for c in changes]
+        self.assertEqual(sequences, sorted(sequences))
+        
+        # Zmiany relacji zawierają obie osoby
+        self.assertEqual((changes[2]['osoba1_id'], changes[2]['osoba2_id']), (parent_id, child_id))
+    
+    def test_observers_receive_deltas(self):
+        """Test powiadamiania obserwatorów o nowych zmianach"""
+        received = []
+        self.db_manager.subscribe_changes(received.append)
+        
+        person_id = self.db_manager.add_person('Jan', 'Kowalski', None, None, 'M')
+        self.db_manager.update_person(person_id, 'Jan', 'Nowak')
+        
+        self.assertEqual(len(received), 2)
+        self.assertEqual(received[0][0]['operacja'], 'INSERT')
+        self.assertEqual(received[1][0]['operacja'], 'UPDATE')
+        
+        self.db_manager.unsubscribe_changes(received.append)
+        self.db_manager.delete_person(person_id)
+        self.assertEqual(len(received), 2)
+    
+    def test_prune(self):
+        """Test usuwania przetworzonych wpisów dziennika"""
+        self.db_manager.add_person('Jan', 'Kowalski', None, None, 'M')
+        last = self.db_manager.get_last_sequence()
+        
+        self.db_manager.journal.prune(last)
+        self.assertEqual(self.db_manager.get_changes_since(0), [])
+        
+        # Numeracja nie jest używana ponownie po usunięciu wpisów
+        self.db_manager.add_person('Anna', 'Nowak', None, None, 'K')
+        self.assertGreater(self.db_manager.get_last_sequence(), last)
+    
+    
+    def test_prune_keeps_unconsumed_changes(self):
+        """Test usuwania tylko zmian przetworzonych przez wszystkich odbiorców"""
+        self.db_manager.add_person('Jan', 'Kowalski', None, None, 'M')
+        self.db_manager.get_surname_counts()
+        consumed = self.db_manager.get_last_sequence()
+        self.db_manager.add_person('Anna', 'Nowak', None, None, 'K')
+        
+        # Walidacja nigdy nie była wykonana, statystyki nie znają drugiej osoby
+        self.db_manager.prune_journal()
+        self.assertEqual(self.db_manager.get_changes_since(0),
+                         self.db_manager.get_changes_since(consumed))
+        self.assertEqual(len(self.db_manager.get_changes_since(0)), 1)
+        self.assertTrue(self.db_manager.journal.is_complete_since(consumed))
+        self.assertEqual(self.db_manager.get_surname_counts(), {'Kowalski': 1, 'Nowak': 1})
+        
+        # Po odświeżeniu statystyk dziennik jest pusty, a numeracja zachowana
+        last = self.db_manager.get_last_sequence()
+        self.db_manager.prune_journal()
+        self.assertEqual(self.db_manager.get_changes_since(0), [])
+        self.assertEqual(self.db_manager.get_last_sequence(), last)
+        self.assertFalse(self.db_manager.has_changes_since(last, 'osoby'))
+        
+        # Najstarsze wpisy są usuwane niezależnie od odbiorców
+        self.db_manager.journal.MAX_ENTRIES = 1
+        for name in ('Ewa', 'Piotr', 'Adam'):
+            self.db_manager.add_person(name, 'Wiśniewski')
+        self.db_manager.prune_journal()
+        self.assertEqual(len(self.db_manager.get_changes_since(0)), 1)
+        self.assertEqual(self.db_manager.get_surname_counts()['Wiśniewski'], 3)
+    
+    def test_has_changes_since(self):
+        """Test sprawdzania zmian w tabeli od danego numeru"""
+        start = self.db_manager.get_last_sequence()
+        person_id = self.db_manager.add_person('Jan', 'Kowalski', None, None, 'M')
+        self.assertTrue(self.db_manager.has_changes_since(start, 'osoby'))
+        self.assertFalse(self.db_manager.has_changes_since(start, 'relacje'))
+        
+        child_id = self.db_manager.add_person('Anna', 'Kowalska', None, None, 'K')
+        middle = self.db_manager.get_last_sequence()
+        self.db_manager.add_relation(person_id, child_id, 'rodzic')
+        self.assertFalse(self.db_manager.has_changes_since(middle, 'osoby'))
+        self.assertTrue(self.db_manager.has_changes_since(middle, 'relacje'))
+        
+        # Zmiany usunięte z dziennika są traktowane jak zmiany w każdej tabeli
+        self.db_manager.journal.prune(self.db_manager.get_last_sequence())
+        self.assertTrue(self.db_manager.has_changes_since(start, 'relacje'))
+    
+    def test_cache_cleared_after_pruning_by_other_connection(self):
+        """Test odrzucenia pamięci podręcznej, gdy inne połączenie usunęło nieprzetworzone zmiany"""
+        person_id = self.db_manager.add_person('Jan', 'Kowalski', None, None, 'M')
+        self.assertEqual(self.db_manager.get_person(person_id)['nazwisko'], 'Kowalski')
+        
+        other = DatabaseManager(self.temp_db.name)
+        try:
+            other.update_person(person_id, 'Jan', 'Nowak')
+            other.journal.prune(other.get_last_sequence())
+        finally:
+            other.close()
+        
+        received = []
+        self.db_manager.subscribe_changes(received.append)
+        self.db_manager.add_person('Anna', 'Nowak', None, None, 'K')
+        self.assertEqual(received, [None])
+        self.assertEqual(self.db_manager.get_person(person_id)['nazwisko'], 'Nowak')
+    
+    def test_observers_receive_batches(self):
+        """Test powiadamiania o dużej liczbie zmian porcjami"""
+        received = []
+        self.db_manager.subscribe_changes(received.append)
+        self.db_manager.journal.NOTIFY_BATCH = 2
+        self.db_manager.add_persons_bulk([{'imie': str(i), 'nazwisko': 'Nowak'} for i in range(5)])
+        
+        self.assertEqual([len(changes) for changes in received], [2, 2, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,245 @@
+"""
+Testy jednostkowe dla interfejsu wiersza poleceń
+"""
+
+import unittest
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from src.cli import main, EXIT_OK, EXIT_NOT_FOUND, EXIT_ERROR
+from src.database.db_manager import DatabaseManager
+
+
+class TestCli(unittest.TestCase):
+    """Testy dla modułu src.cli"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'drzewo.db')
+        
+        db_manager = DatabaseManager(self.db_path)
+        self.grandfather_id = db_manager.add_person('Jan', 'Kowalski', '1900-01-01', None, 'M')
+        self.father_id = db_manager.add_person('Piotr', 'Kowalski', '1930-01-01', None, 'M')
+        self.child_id = db_manager.add_person('Anna', 'Kowalska', '1960-01-01', None, 'K')
+        db_manager.add_relation(self.grandfather_id, self.father_id, 'rodzic')
+        db_manager.add_relation(self.father_id, self.child_id, 'rodzic')
+        db_manager.close()
+    
+    def tearDown(self):
+        """Sprzątanie po każdym teście"""
+        self.temp_dir.cleanup()
+    
+    def run_cli(self, *args, db_paths=None):
+        """Uruchamia CLI i zwraca (kod wyjścia, lista rekordów)"""
+        argv = []
+        for db_path in db_paths or [self.db_path]:
+            argv += ['--db', db_path]
+        out = io.StringIO()
+        exit_code = main(argv + list(args), out=out)
+        return exit_code, [json.loads(line) for line in out.getvalue().splitlines()]
+    
+    def test_ancestors(self):
+        """Test wypisywania przodków"""
+        exit_code, records = self.run_cli('ancestors', str(self.child_id))
+        
+        self.assertEqual(exit_code, EXIT_OK)
+        self.assertEqual([(r['id'], r['pokolenie']) for r in records],
+                         [(self.father_id, 1), (self.grandfather_id, 2)])
+    
+    def test_path_and_relate(self):
+        """Test ścieżki relacji i stopnia pokrewieństwa"""
+        exit_code, records = self.run_cli('path', str(self.grandfather_id), str(self.child_id))
+        self.assertEqual(exit_code, EXIT_OK)
+        self.assertEqual([r['krok'] for r in records], [0, 1, 2])
+        
+        exit_code, records = self.run_cli('relate', str(self.child_id), str(self.grandfather_id))
+        self.assertEqual(records[0]['relacja'], 'dziadek/babcia')
+    
+    def test_kinship_and_cycles(self):
+        """Test współczynnika pokrewieństwa i wykrywania cykli"""
+        exit_code, records = self.run_cli('kinship', str(self.grandfather_id), str(self.child_id))
+        self.assertEqual(exit_code, EXIT_OK)
+        self.assertEqual(records[0]['wspolczynnik_pokrewienstwa'], 0.125)
+        
+        exit_code, records = self.run_cli('cycles')
+        self.assertEqual(exit_code, EXIT_OK)
+        self.assertEqual(records, [])
+    
+    def test_validate(self):
+        """Test walidacji pełnej i przyrostowej"""
+        db_manager = DatabaseManager(self.db_path)
+        db_manager.add_relation(self.child_id, self.child_id, 'małżonek')
+        db_manager.close()
+        
+        exit_code, records = self.run_cli('validate')
+        self.assertEqual(exit_code, EXIT_OK)
+        self.assertEqual([(r['kod'], r['osoba_id']) for r in records],
+                         [('relacja_z_soba', self.child_id)])
+        
+        exit_code, records = self.run_cli('validate')
+        self.assertEqual(records, [])
+        
+        exit_code, records = self.run_cli('validate', '--full')
+        self.assertEqual(len(records), 1)
+    
+    def test_duplicates_and_merge(self):
+        """Test wyszukiwania duplikatów i scalania osób"""
+        db_manager = DatabaseManager(self.db_path)
+        duplicate_id = db_manager.add_person('Piotr', 'Kowalsky', '1930', None, 'M')
+        db_manager.add_relation(duplicate_id, self.child_id, 'rodzic')
+        db_manager.close()
+        
+        exit_code, records = self.run_cli('duplicates')
+        self.assertEqual(exit_code, EXIT_OK)
+        self.assertEqual([(r['osoba1_id'], r['osoba2_id']) for r in records],
+                         [(self.father_id, duplicate_id)])
+        
+        exit_code, records = self.run_cli('merge', str(self.father_id), str(duplicate_id))
+        self.assertEqual(exit_code, EXIT_OK)
+        self.assertEqual(records[0]['przepiete_relacje'], 0)
+        
+        exit_code, records = self.run_cli('duplicates')
+        self.assertEqual(records, [])
+    
+    def test_missing_person(self):
+        """Test kodu wyjścia dla nieistniejącej osoby"""
+        exit_code, records = self.run_cli('descendants', '999')
+        
+        self.assertEqual(exit_code, EXIT_NOT_FOUND)
+        self.assertEqual(records, [])
+    
+    def test_stats_over_many_databases(self):
+        """Test oznaczania wyników bazą danych przy wielu plikach"""
+        other_path = os.path.join(self.temp_dir.name, 'inna.db')
+        DatabaseManager(other_path).close()
+        
+        exit_code, records = self.run_cli('stats', db_paths=[self.db_path, other_path])
+        
+        self.assertEqual(exit_code, EXIT_OK)
+        self.assertEqual({r['db']: r['osoby'] for r in records}, {self.db_path: 3, other_path: 0})
+        self.assertEqual(records[0]['relacje_wg_rodzaju'], {'rodzic': 2})
+    
+    def test_damaged_database_does_not_stop_others(self):
+        """Test pominięcia uszkodzonego pliku bazy z błędem na stderr"""
+        bad_path = os.path.join(self.temp_dir.name, 'uszkodzona.db')
+        with open(bad_path, 'wb') as f:
+            f.write(b'to nie jest baza SQLite' * 100)
+        
+        errors = io.StringIO()
+        with contextlib.redirect_stderr(errors):
+            exit_code, records = self.run_cli('stats', db_paths=[bad_path, self.db_path])
+        
+        self.assertEqual(exit_code, EXIT_ERROR)
+        self.assertEqual([(r['db'], r['osoby']) for r in records], [(self.db_path, 3)])
+        self.assertEqual(json.loads(errors.getvalue())['db'], bad_path)
+    
+    def test_surname_and_place_statistics(self):
+        """Test rankingu nazwisk, migracji i dekad urodzenia"""
+        exit_code, records = self.run_cli('surnames', '--limit', '1')
+        self.assertEqual(exit_code, EXIT_OK)
+        self.assertEqual(records, [{'nazwisko': 'Kowalski', 'liczba': 2}])
+        
+        exit_code, records = self.run_cli('migrations', '--include-same')
+        self.assertEqual((exit_code, records), (EXIT_OK, []))
+        
+        exit_code, records = self.run_cli('decades')
+        self.assertEqual([r['dekada'] for r in records], [1900, 1930, 1960])
+    
+    def test_places(self):
+        """Test wyszukiwania miejsc, aliasu i współrzędnych z pliku CSV"""
+        db_manager = DatabaseManager(self.db_path)
+        db_manager.add_person('Ewa', 'Nowak', miejsce_urodzenia='Warszawa')
+        db_manager.add_person('Adam', 'Nowak', miejsce_urodzenia='W-wa', miejsce_smierci='warszawa')
+        db_manager.close()
+        
+        exit_code, records = self.run_cli('places', 'w')
+        self.assertEqual([r['nazwa'] for r in records], ['W-wa', 'Warszawa'])
+        warszawa = records[1]['id']
+        
+        exit_code, records = self.run_cli('place-alias', str(warszawa), 'W-WA')
+        self.assertEqual((exit_code, records[0]['przepiete_osoby']), (EXIT_OK, 1))
+        
+        coords_path = os.path.join(self.temp_dir.name, 'miejsca.csv')
+        with open(coords_path, 'w', encoding='utf-8') as f:
+            f.write('nazwa,szerokosc,dlugosc\nw-wa,52.23,21.01\nGdańsk,54.35,18.65\n')
+        exit_code, records = self.run_cli('place-coords', coords_path)
+        self.assertEqual(records, [{'nazwa': 'w-wa', 'miejsce_id': warszawa},
+                                   {'nazwa': 'Gdańsk', 'miejsce_id': None}])
+        
+        exit_code, records = self.run_cli('places', '--counts')
+        self.assertEqual(records, [{'id': warszawa, 'nazwa': 'Warszawa', 'urodzenia': 2, 'zgony': 1}])
+        self.assertEqual(self.run_cli('place-alias', str(warszawa + 10), 'X')[0], EXIT_ERROR)
+    
+    def test_export_import_roundtrip(self):
+        """Test eksportu i importu GEDCOM"""
+        gedcom_path = os.path.join(self.temp_dir.name, 'drzewo.ged')
+        target_path = os.path.join(self.temp_dir.name, 'kopia.db')
+        
+        self.run_cli('export', gedcom_path)
+        exit_code, records = self.run_cli('import', gedcom_path, db_paths=[target_path])
+        
+        self.assertEqual(exit_code, EXIT_OK)
+        self.assertEqual(records[0]['zaimportowane_osoby'], 3)
+        
+        exit_code, records = self.run_cli('search', 'Kowal', db_paths=[target_path])
+        self.assertEqual(len(records), 3)
+    
+    def test_sync_does_not_duplicate(self):
+        """Test ponownej synchronizacji z tym samym plikiem GEDCOM"""
+        gedcom_path = os.path.join(self.temp_dir.name, 'drzewo.ged')
+        target_path = os.path.join(self.temp_dir.name, 'kopia.db')
+        
+        self.run_cli('export', gedcom_path)
+        exit_code, records = self.run_cli('sync', gedcom_path, db_paths=[target_path])
+        self.assertEqual(exit_code, EXIT_OK)
+        self.assertEqual(records[0]['dodane'], 3)
+        
+        exit_code, records = self.run_cli('sync', gedcom_path, '--delete', db_paths=[target_path])
+        self.assertEqual((records[0]['dodane'], records[0]['bez_zmian']), (0, 3))
+        exit_code, records = self.run_cli('stats', db_paths=[target_path])
+        self.assertEqual(records[0]['osoby'], 3)
+    
+    def test_snapshot_restore(self):
+        """Test zapisu migawki i odtworzenia z niej nowej bazy"""
+        snapshot_path = os.path.join(self.temp_dir.name, 'drzewo.snap')
+        target_path = os.path.join(self.temp_dir.name, 'kopia.db')
+        
+        exit_code, records = self.run_cli('snapshot', snapshot_path, '--compression', 'none')
+        self.assertEqual(exit_code, EXIT_OK)
+        self.assertEqual(records[0]['osoby'], 3)
+        
+        exit_code, records = self.run_cli('restore', snapshot_path, db_paths=[target_path])
+        self.assertEqual((exit_code, records[0]['osoby']), (EXIT_OK, 3))
+        exit_code, records = self.run_cli('ancestors', str(self.child_id), db_paths=[target_path])
+        self.assertEqual([r['id'] for r in records], [self.father_id, self.grandfather_id])
+        
+        # Odtworzenie do niepustej bazy jest błędem
+        exit_code, records = self.run_cli('restore', snapshot_path, db_paths=[target_path])
+        self.assertEqual((exit_code, records), (EXIT_ERROR, []))
+    
+    def test_in_memory(self):
+        """Test polecenia na kopii bazy w pamięci z zapisem zmian"""
+        argv = ['--db', self.db_path, '--in-memory']
+        out = io.StringIO()
+        self.assertEqual(main(argv + ['merge', str(self.father_id), str(self.grandfather_id)], out=out),
+                         EXIT_OK)
+        
+        exit_code, records = self.run_cli('stats')
+        self.assertEqual(records[0]['osoby'], 2)
+    
+    def test_does_not_import_gui(self):
+        """Test braku importu PyQt6 i matplotlib"""
+        code = "import sys, src.cli; print(any(m in sys.modules for m in ('PyQt6', 'matplotlib')))"
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        
+        self.assertEqual(output.stdout.strip(), 'False')
+
+
+if __name__ == '__main__':
+    unittest.main()
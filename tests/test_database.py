@@ -136,6 +136,159 @@ class TestDatabaseManager(unittest.TestCase):
         
         person = self.db_manager.get_person(person_id)
         self.assertEqual(person['nazwisko_panienskie'], 'Kowalska')
+    
+    def test_get_parent_candidates(self):
+        """Test pobierania kandydatów na rodzica"""
+        self.db_manager.add_person('Jan', 'Kowalski', '1950-01-01', None, 'M')
+        self.db_manager.add_person('Adam', 'Nowak', '1800-01-01', None, 'M')
+        self.db_manager.add_person('Piotr', 'Kowal', None, None, 'M')
+        self.db_manager.add_person('Anna', 'Kowalska', '1952-01-01', None, 'K')
+        
+        # Filtr płci
+        candidates = self.db_manager.get_parent_candidates('M')
+        self.assertEqual(len(candidates), 3)
+        
+        # Filtr zakresu lat - osoby bez daty są zawsze uwzględniane
+        candidates = self.db_manager.get_parent_candidates('M', child_birth_year=1980)
+        names = sorted(c['imie'] for c in candidates)
+        self.assertEqual(names, ['Jan', 'Piotr'])
+        
+        # Wyszukiwanie po początku nazwiska lub imienia bez rozróżniania wielkości liter
+        candidates = self.db_manager.get_parent_candidates('M', query='kowal')
+        self.assertEqual([c['nazwisko'] for c in candidates], ['Kowal', 'Kowalski'])
+        candidates = self.db_manager.get_parent_candidates('M', query='AD')
+        self.assertEqual([c['imie'] for c in candidates], ['Adam'])
+        
+        # Stronicowanie od ostatniego kandydata poprzedniej strony
+        first_page = self.db_manager.get_parent_candidates('M', limit=2)
+        second_page = self.db_manager.get_parent_candidates('M', limit=2, after=first_page[-1])
+        self.assertEqual([c['nazwisko'] for c in first_page + second_page],
+                         ['Kowal', 'Kowalski', 'Nowak'])
+    
+    def test_parent_candidates_pages(self):
+        """Test stron kandydatów o tym samym nazwisku i imieniu oraz frazy z obu kolumn"""
+        for _ in range(3):
+            self.db_manager.add_person('Jan', 'kowalski', None, None, 'M')
+            self.db_manager.add_person('Kowal', 'Nowak', None, None, 'M')
+        self.db_manager.add_person('Jan', 'Kowalski', None, None, 'M')
+        expected = self.db_manager.get_parent_candidates('M', query='Kowal', limit=10)
+        self.assertEqual(len(expected), 7)
+        self.assertEqual(expected, sorted(expected, key=lambda c: (c['nazwisko'].lower(), c['id'])))
+        
+        pages = [self.db_manager.get_parent_candidates('M', query='Kowal', limit=2)]
+        while pages[-1]:
+            pages.append(self.db_manager.get_parent_candidates('M', query='Kowal', limit=2,
+                                                               after=pages[-1][-1]))
+        self.assertEqual([c for page in pages for c in page], expected)
+
+
+class TestInMemoryDatabase(unittest.TestCase):
+    """Testy pracy na kopii bazy w pamięci"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'drzewo.db')
+        db_manager = DatabaseManager(self.db_path)
+        self.parent_id = db_manager.add_person('Jan', 'Kowalski', '1900', None, 'M')
+        self.child_id = db_manager.add_person('Piotr', 'Kowalski', '1930', None, 'M')
+        db_manager.add_relation(self.parent_id, self.child_id, 'rodzic')
+        db_manager.close()
+    
+    def tearDown(self):
+        """Sprzątanie po każdym teście"""
+        self.temp_dir.cleanup()
+    
+    def _index_names(self, connection) -> set:
+        """Nazwy indeksów i wyzwalaczy bazy"""
+        rows = connection.execute("SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger')")
+        return {row[0] for row in rows}
+    
+    def test_copy_with_indexes(self):
+        """Test kopii zawierającej dane, indeksy, wyzwalacze i tabelę przodków"""
+        disk = DatabaseManager(self.db_path)
+        memory = DatabaseManager(self.db_path, in_memory=True)
+        try:
+            self.assertEqual(self._index_names(memory.connection), self._index_names(disk.connection))
+            self.assertEqual(memory.dump_rows(), disk.dump_rows())
+            self.assertTrue(memory.is_ancestor(self.parent_id, self.child_id))
+            self.assertFalse(memory.has_unsaved_changes())
+        finally:
+            disk.close()
+            memory.close()
+    
+    def test_changes_written_on_save(self):
+        """Test zapisu zmian do pliku dopiero po save"""
+        memory = DatabaseManager(self.db_path, in_memory=True)
+        try:
+            grandchild_id = memory.add_person('Anna', 'Kowalska', '1960', None, 'K')
+            memory.add_relation(self.child_id, grandchild_id, 'rodzic')
+            self.assertTrue(memory.has_unsaved_changes())
+            
+            disk = DatabaseManager(self.db_path)
+            self.assertEqual(disk.count_persons(), 2)
+            disk.close()
+            
+            memory.save()
+            self.assertFalse(memory.has_unsaved_changes())
+        finally:
+            memory.close()
+        
+        disk = DatabaseManager(self.db_path)
+        try:
+            self.assertEqual(disk.count_persons(), 3)
+            self.assertTrue(disk.is_ancestor(self.parent_id, grandchild_id))
+        finally:
+            disk.close()
+    
+    def test_queries_are_not_unsaved_changes(self):
+        """Test braku zmian do zapisania po odczytach zapisujących pamięci podręczne"""
+        memory = DatabaseManager(self.db_path, in_memory=True)
+        try:
+            memory.get_surname_counts()
+            memory.get_migrations()
+            self.assertFalse(memory.has_unsaved_changes())
+            
+            
+            # Zmiana miejsca nie trafia do dziennika, ale jest zmianą użytkownika
+            memory.add_person('Ewa', 'Nowak', miejsce_urodzenia='Kraków')
+            memory.save()
+            memory.update_place(memory.get_place_id('Kraków'), szerokosc=50.06)
+            self.assertTrue(memory.has_unsaved_changes())
+        finally:
+            memory.close()
+    
+    def test_photo_removed_after_save(self):
+        """Test usunięcia pliku zdjęcia dopiero po zapisaniu kopii w pamięci"""
+        source = os.path.join(self.temp_dir.name, 'skan.jpg')
+        with open(source, 'wb') as f:
+            f.write(b'skan')
+        
+        memory = DatabaseManager(self.db_path, in_memory=True)
+        try:
+            stored_path = memory.add_photo(source)
+            person_id = memory.add_person('Ewa', 'Nowak', zdjecie_sciezka=stored_path)
+            memory.save()
+            
+            memory.delete_person(person_id)
+            self.assertTrue(os.path.exists(stored_path))
+            memory.save()
+            self.assertFalse(os.path.exists(stored_path))
+        finally:
+            memory.close()
+    
+    def test_missing_file(self):
+        """Test pustej bazy w pamięci bez tworzenia pliku przed zapisem"""
+        path = os.path.join(self.temp_dir.name, 'nowa.db')
+        memory = DatabaseManager(path, in_memory=True)
+        try:
+            self.assertEqual(memory.count_persons(), 0)
+            memory.add_person('Jan', 'Nowak')
+            self.assertFalse(os.path.exists(path))
+            memory.save()
+        finally:
+            memory.close()
+        self.assertTrue(os.path.exists(path))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,168 @@
+"""
+Testy jednostkowe dla dat genealogicznych
+"""
+
+import unittest
+import os
+import sqlite3
+import tempfile
+from src.database.db_manager import DatabaseManager
+from src.utils.dates import (
+    parse_date, normalize_date, date_columns, date_fields, format_year,
+    PRECISION_DAY, PRECISION_MONTH, PRECISION_YEAR, QUALIFIER_ABOUT, QUALIFIER_BETWEEN
+)
+from src.utils.gedcom_handler import GedcomHandler
+
+
+class TestParseDate(unittest.TestCase):
+    """Testy parsowania dat"""
+    
+    def test_exact_and_partial_dates(self):
+        """Test dat pełnych i częściowych w formacie ISO i GEDCOM"""
+        self.assertEqual(normalize_date('12 MAR 1850'), '1850-03-12')
+        self.assertEqual(normalize_date('MAR 1850'), '1850-03')
+        self.assertEqual(normalize_date('1850'), '1850')
+        self.assertEqual(normalize_date(1850), '1850')
+        self.assertEqual(date_columns('1850-03-12'), (18500312, PRECISION_DAY, None))
+        self.assertEqual(date_columns('1850-03'), (18500300, PRECISION_MONTH, None))
+        self.assertEqual(date_columns('1850'), (18500000, PRECISION_YEAR, None))
+    
+    def test_qualified_dates(self):
+        """Test dat przybliżonych i przedziałów"""
+        self.assertEqual(normalize_date('ok. 1850'), 'ABT 1850')
+        self.assertEqual(date_columns('ABT 1850'), (18500000, PRECISION_YEAR, QUALIFIER_ABOUT))
+        self.assertEqual(normalize_date('FROM 1850 TO 1860'), 'BET 1850 AND 1860')
+        
+        date = parse_date('BET 1850 AND 1855')
+        self.assertEqual(date.qualifier, QUALIFIER_BETWEEN)
+        self.assertEqual(date.to_gedcom(), 'BET 1850 AND 1855')
+        self.assertEqual(date.to_display(), 'między 1850 a 1855')
+        self.assertEqual(format_year('BEF 3 MAR 1850'), '<1850')
+    
+    def test_invalid_dates(self):
+        """Test zachowania nierozpoznanego tekstu"""
+        self.assertIsNone(parse_date('1850-02-30'))
+        self.assertIsNone(parse_date('BET 1860 AND 1850'))
+        self.assertIsNone(parse_date('1 JAN 12345'))
+        self.assertEqual(normalize_date('1 JAN 12345'), '1 JAN 12345')
+        self.assertEqual(normalize_date('1 JAN 9999'), '9999-01-01')
+        self.assertEqual(normalize_date('nieznana'), 'nieznana')
+        self.assertIsNone(normalize_date(''))
+        self.assertEqual(date_columns('nieznana'), (None, None, None))
+        # Cyfry inne niż dziesiętne (np. indeks górny) nie są liczbą
+        for value in ('1850²', '²', '1 JAN ²', '² JAN 1850'):
+            self.assertEqual(date_fields(value), (value, None, None, None))
+        self.assertEqual(format_year(None), '?')
+    
+    def test_fields_match_separate_functions(self):
+        """Test zgodności tekstu i kolumn z jednego parsowania z osobnymi funkcjami"""
+        for value in ('12 MAR 1850', 'ok. 1850', 'FROM 1850 TO 1860', 1850, 'nieznana', ' ', None):
+            self.assertEqual(date_fields(value), (normalize_date(value),) + date_columns(value))
+        self.assertEqual(date_fields(' MAR 1850 '), ('1850-03', 18500300, PRECISION_MONTH, None))
+    
+    def test_sort_keys_order_dates(self):
+        """Test porządku kluczy sortowania"""
+        values = ['1850-03-12', 'ABT 1849', '1850', 'MAR 1850', '1851']
+        ordered = sorted(values, key=lambda value: parse_date(value).sort_key)
+        self.assertEqual(ordered, ['ABT 1849', '1850', 'MAR 1850', '1850-03-12', '1851'])
+
+
+class TestDateColumns(unittest.TestCase):
+    """Testy kolumn pomocniczych dat w bazie danych"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'drzewo.db')
+        self.db_manager = DatabaseManager(self.db_path)
+    
+    def tearDown(self):
+        """Sprzątanie po każdym teście"""
+        self.db_manager.close()
+        self.temp_dir.cleanup()
+    
+    def test_columns_computed_on_write(self):
+        """Test wyliczania kolumn przy dodawaniu i aktualizacji osoby"""
+        person_id = self.db_manager.add_person('Jan', 'Kowalski', '12 MAR 1850', 'ok. 1910', 'M')
+        
+        person = self.db_manager.get_person(person_id)
+        self.assertEqual(person['data_urodzenia'], '1850-03-12')
+        self.assertEqual(person['data_smierci'], 'ABT 1910')
+        self.assertEqual(person['urodzenie_klucz'], 18500312)
+        self.assertEqual(person['smierc_kwalifikator'], QUALIFIER_ABOUT)
+        
+        self.db_manager.update_person(person_id, 'Jan', 'Kowalski', '1851', None, 'M')
+        person = self.db_manager.get_person(person_id)
+        self.assertEqual(person['urodzenie_klucz'], 18510000)
+        self.assertEqual(person['urodzenie_dokladnosc'], PRECISION_YEAR)
+        self.assertIsNone(person['smierc_klucz'])
+        
+        [bulk_id] = self.db_manager.add_persons_bulk([
+            {'imie': 'Anna', 'nazwisko': 'Nowak', 'data_urodzenia': 'BET 1840 AND 1845'}
+        ])
+        self.assertEqual(self.db_manager.get_person(bulk_id)['urodzenie_klucz'], 18400000)
+    
+    def test_unrecognised_date_kept_as_text(self):
+        """Test zapisu nierozpoznanej daty bez zmian i bez kolumn pomocniczych"""
+        person_id = self.db_manager.add_person('Jan', 'Kowalski', '1850²', '1 JAN ²', 'M')
+        
+        person = self.db_manager.get_person(person_id)
+        self.assertEqual((person['data_urodzenia'], person['data_smierci']), ('1850²', '1 JAN ²'))
+        self.assertIsNone(person['urodzenie_klucz'])
+        self.assertIsNone(person['smierc_klucz'])
+    
+    def test_existing_database_is_migrated(self):
+        """Test wypełnienia kolumn dla bazy utworzonej przed ich wprowadzeniem"""
+        self.db_manager.close()
+        os.remove(self.db_path)
+        connection = sqlite3.connect(self.db_path)
+        connection.execute('''
+            CREATE TABLE osoby (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, imie TEXT NOT NULL,
+                nazwisko TEXT NOT NULL, data_urodzenia DATE, data_smierci DATE,
+                plec TEXT, miejsce_urodzenia TEXT, miejsce_smierci TEXT,
+                notatki TEXT, zdjecie_sciezka TEXT
+            )
+        ''')
+        connection.execute("INSERT INTO osoby (imie, nazwisko, data_urodzenia) "
+                           "VALUES ('Jan', 'Kowalski', '1850-03-12')")
+        connection.commit()
+        connection.close()
+        
+        self.db_manager = DatabaseManager(self.db_path)
+        
+        person = self.db_manager.get_all_persons()[0]
+        self.assertEqual(person['urodzenie_klucz'], 18500312)
+        self.assertEqual(len(self.db_manager.persons_alive_in(1850)), 1)
+    
+    def test_parent_candidates_use_sort_key(self):
+        """Test filtrowania kandydatów na rodziców po kluczu daty"""
+        self.db_manager.add_person('Jan', 'Kowalski', 'ABT 1850', None, 'M')
+        self.db_manager.add_person('Piotr', 'Kowalski', '1700', None, 'M')
+        
+        candidates = self.db_manager.get_parent_candidates('M', child_birth_year=1880)
+        self.assertEqual([c['imie'] for c in candidates], ['Jan'])
+    
+    def test_gedcom_keeps_partial_dates(self):
+        """Test zachowania dokładności dat przy imporcie i eksporcie GEDCOM"""
+        source = os.path.join(self.temp_dir.name, 'drzewo.ged')
+        with open(source, 'w', encoding='utf-8') as f:
+            f.write('0 HEAD\n0 @I1@ INDI\n1 NAME Jan /Kowalski/\n1 BIRT\n2 DATE ABT 1850\n'
+                    '1 DEAT\n2 DATE MAR 1910\n0 TRLR\n')
+        
+        handler = GedcomHandler(self.db_manager)
+        handler.import_file(source)
+        person = self.db_manager.get_all_persons()[0]
+        self.assertEqual(person['data_urodzenia'], 'ABT 1850')
+        self.assertEqual(person['data_smierci'], '1910-03')
+        
+        target = os.path.join(self.temp_dir.name, 'eksport.ged')
+        handler.export_file(target)
+        with open(target, encoding='utf-8') as f:
+            content = f.read()
+        self.assertIn('2 DATE ABT 1850', content)
+        self.assertIn('2 DATE MAR 1910', content)
+
+
+if __name__ == '__main__':
+    unittest.main()
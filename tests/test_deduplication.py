@@ -0,0 +1,150 @@
+"""
+Testy jednostkowe dla wykrywania duplikatów i scalania osób
+"""
+
+import unittest
+import os
+import tempfile
+from src.business_logic.deduplication import (DuplicateFinder, build_records, normalize_surname,
+                                              phonetic_code, score_pair)
+from src.database.db_manager import DatabaseManager
+
+
+class TestPhoneticCode(unittest.TestCase):
+    """Testy dla kodu fonetycznego i normalizacji nazwisk"""
+    
+    def test_spelling_variants(self):
+        """Test wspólnego kodu dla różnych zapisów tej samej głoski"""
+        self.assertEqual(phonetic_code('Wójcik'), phonetic_code('Woycik'))
+        self.assertEqual(phonetic_code('Szmit'), phonetic_code('Schmidt'))
+        self.assertEqual(phonetic_code('Żak'), phonetic_code('Rzak'))
+        self.assertEqual(phonetic_code('Józef'), phonetic_code('Joseph'))
+        self.assertNotEqual(phonetic_code('Nowak'), phonetic_code('Kowal'))
+        self.assertEqual(phonetic_code(None), '')
+    
+    def test_surname_forms(self):
+        """Test sprowadzania żeńskich i rodowych form nazwisk"""
+        self.assertEqual(normalize_surname('Kowalska'), 'kowalski')
+        self.assertEqual(normalize_surname('Wiśniewska'), 'wisniewski')
+        self.assertEqual(normalize_surname('Nowakówna'), 'nowak')
+        self.assertEqual(normalize_surname('Nowakowa'), 'nowak')
+        self.assertEqual(normalize_surname('Ska'), 'ska')
+
+
+class TestScoring(unittest.TestCase):
+    """Testy dla kluczy blokujących i oceny par"""
+    
+    def _person(self, person_id, imie, nazwisko, **fields):
+        """Słownik osoby jak z get_all_persons"""
+        return {'id': person_id, 'imie': imie, 'nazwisko': nazwisko, **fields}
+    
+    def test_blocking_keys(self):
+        """Test kluczy blokujących z nazwiskiem panieńskim i sąsiednią dekadą"""
+        records = build_records([
+            self._person(1, 'Anna', 'Kowalska', nazwisko_panienskie='Nowak', urodzenie_klucz=18990000),
+            self._person(2, 'Aniela', 'Nowakówna', urodzenie_klucz=19010000),
+            self._person(3, 'Anna', 'Nowak'),
+            self._person(4, 'Jan', 'Wiśniewski', urodzenie_klucz=19010000)
+        ], [])
+        
+        self.assertTrue(records[0].keys & records[1].keys)
+        self.assertTrue(records[0].keys & records[2].keys)
+        self.assertFalse(records[1].keys & records[2].keys)
+        self.assertFalse(records[0].keys & records[3].keys)
+    
+    def test_score_pair(self):
+        """Test oceny par i wykluczeń"""
+        records = build_records([
+            self._person(1, 'Jan', 'Kowalski', plec='M', urodzenie_klucz=19000501,
+                         miejsce_urodzenia='Kraków'),
+            self._person(2, 'Jan', 'Kowalsky', plec='M', urodzenie_klucz=19000000,
+                         miejsce_urodzenia='Krakow'),
+            self._person(3, 'Jan', 'Kowalski', plec='M', urodzenie_klucz=19400000),
+            self._person(4, 'Jan', 'Kowalski', plec='K', urodzenie_klucz=19000501),
+            self._person(5, 'Jan', 'Kowalski', plec='M')
+        ], [{'osoba1_id': 3, 'osoba2_id': 5}])
+        
+        candidate = score_pair(records[1], records[0])
+        self.assertEqual((candidate.person1_id, candidate.person2_id), (1, 2))
+        self.assertGreaterEqual(candidate.score, DuplicateFinder.DEFAULT_THRESHOLD)
+        self.assertEqual(candidate.components['miejsca'], 1.0)
+        self.assertLess(score_pair(records[0], records[2]).score, DuplicateFinder.DEFAULT_THRESHOLD)
+        self.assertIsNone(score_pair(records[0], records[3]))
+        self.assertIsNone(score_pair(records[2], records[4]))
+
+
+class TestDuplicateFinder(unittest.TestCase):
+    """Testy wyszukiwania duplikatów i scalania w bazie danych"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_manager = DatabaseManager(os.path.join(self.temp_dir.name, 'drzewo.db'))
+        
+        # Rodzina z pierwszego pliku i ten sam ojciec zaimportowany z drugiego
+        self.ojciec = self.db_manager.add_person('Józef', 'Wójcik', '1890-03-12', None, 'M',
+                                                 'Kraków', notatki='Kowal')
+        self.matka = self.db_manager.add_person('Maria', 'Wójcik', '1895', None, 'K',
+                                                nazwisko_panienskie='Nowak')
+        self.syn = self.db_manager.add_person('Jan', 'Wójcik', '1920', None, 'M')
+        self.dziadek = self.db_manager.add_person('Karol', 'Wojcik', '1860', None, 'M')
+        self.duplikat = self.db_manager.add_person('Jozef', 'Woycik', '1890', '1950', 'M',
+                                                   'Krakow', notatki='Z drugiego pliku')
+        self.db_manager.add_relation(self.ojciec, self.syn, 'rodzic')
+        self.db_manager.add_relation(self.matka, self.syn, 'rodzic')
+        self.db_manager.add_relation(self.ojciec, self.matka, 'małżonek')
+        self.db_manager.add_relation(self.syn, self.duplikat, 'dziecko')
+        self.db_manager.add_relation(self.dziadek, self.duplikat, 'rodzic')
+        self.db_manager.add_relation(self.matka, self.duplikat, 'małżonek')
+    
+    def tearDown(self):
+        """Sprzątanie po każdym teście"""
+        self.db_manager.close()
+        self.temp_dir.cleanup()
+    
+    def test_find(self):
+        """Test znalezienia zdublowanego ojca"""
+        candidates = DuplicateFinder(self.db_manager, workers=1).find()
+        
+        self.assertEqual([(c.person1_id, c.person2_id) for c in candidates],
+                         [(self.ojciec, self.duplikat)])
+        self.assertEqual(candidates[0].components['krewni'], 1.0)
+    
+    def test_find_in_process_pool(self):
+        """Test oceny bloków w puli procesów"""
+        self.db_manager.add_person('Józef', 'Wójcik', '1892', None, 'M')
+        finder = DuplicateFinder(self.db_manager, threshold=0.0, workers=2)
+        finder.PARALLEL_MIN_PAIRS = 0
+        finder.TASK_PAIRS = 1
+        serial = DuplicateFinder(self.db_manager, threshold=0.0, workers=1).find()
+        
+        self.assertEqual(finder.find(), serial)
+        self.assertEqual(len(serial), 3)
+    
+    def test_merge_persons(self):
+        """Test scalania duplikatu z przepięciem relacji"""
+        moved = self.db_manager.merge_persons(self.ojciec, self.duplikat)
+        
+        self.assertEqual(moved, 1)
+        self.assertIsNone(self.db_manager.get_person(self.duplikat))
+        person = self.db_manager.get_person(self.ojciec)
+        self.assertEqual(person['data_urodzenia'], '1890-03-12')
+        self.assertEqual(person['smierc_klucz'], 19500000)
+        self.assertEqual(person['notatki'], 'Kowal\n\nZ drugiego pliku')
+        
+        relations = self.db_manager.get_relations(self.ojciec)
+        self.assertEqual(len(relations), 3)
+        self.assertTrue(self.db_manager.is_ancestor(self.dziadek, self.syn))
+        self.assertEqual(self.db_manager.get_lineage_depth(self.dziadek, self.syn), 2)
+        self.assertEqual(DuplicateFinder(self.db_manager).find(), [])
+    
+    def test_merge_invalid(self):
+        """Test scalania nieistniejącej osoby lub osoby z samą sobą"""
+        with self.assertRaises(ValueError):
+            self.db_manager.merge_persons(self.ojciec, self.ojciec)
+        with self.assertRaises(ValueError):
+            self.db_manager.merge_persons(self.ojciec, 999)
+
+
+if __name__ == '__main__':
+    unittest.main()
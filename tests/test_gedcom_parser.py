@@ -0,0 +1,188 @@
+"""
+Testy jednostkowe dla parsowania i importu plików GEDCOM
+"""
+
+import unittest
+import os
+import tempfile
+from src.database.db_manager import DatabaseManager
+from src.utils.gedcom_handler import GedcomHandler
+from src.utils.gedcom_parser import FamilyRecord, GedcomParser, PersonRecord, parse_chunk
+
+
+GEDCOM = '''0 HEAD
+1 CHAR UTF-8
+0 @I1@ INDI
+1 NAME Jan /Kowalski/
+1 NAME Johann /Kowalsky/
+1 SEX M
+1 BIRT
+2 PLAC Kraków
+2 DATE 12 MAR 1850
+1 DEAT
+2 DATE 1910
+0 @I2@ INDI
+1 NAME Maria /Kowalska/
+1 _MARNM Nowak
+1 SEX F
+0 @I3@ INDI
+1 NAME Piotr /Kowalski/
+1 SEX M
+0 @I4@ INDI
+1 SEX M
+0 @I1@ INDI
+1 NAME Powtórzony /Rekord/
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 CHIL @I3@
+1 CHIL @I3@
+1 CHIL @I4@
+0 TRLR
+'''
+
+
+class TestGedcomParser(unittest.TestCase):
+    """Testy dla modułu gedcom_parser"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'drzewo.ged')
+    
+    def tearDown(self):
+        """Sprzątanie po każdym teście"""
+        self.temp_dir.cleanup()
+    
+    def _write(self, content: str, newline: str = '\n'):
+        """Zapisuje plik GEDCOM"""
+        with open(self.path, 'w', encoding='utf-8', newline=newline) as f:
+            f.write(content)
+    
+    def test_parse_chunk(self):
+        """Test odczytu osób i rodzin z rekordów poziomu 0"""
+        persons, families = parse_chunk(GEDCOM)
+        
+        self.assertEqual(persons[0], PersonRecord('I1', 'Jan', 'Kowalski', None, '1850-03-12', '1910',
+                                                  'M', 'Kraków', None, None, None))
+        self.assertEqual(persons[1].nazwisko_panienskie, 'Nowak')
+        self.assertEqual(persons[1].plec, 'K')
+        self.assertEqual(persons[3].imie, '')
+        self.assertEqual(families, [FamilyRecord('F1', 'I1', 'I2', ('I3', 'I4'))])
+    
+    def test_nested_tags_and_continuation(self):
+        """Test rozróżniania tagów według wiersza nadrzędnego i łączenia CONC/CONT"""
+        persons, _ = parse_chunk(
+            '0 @I1@ INDI\n1 NAME Jan Maria /Nowak/\n1 BIRT\n2 PLAC Kraków\n2 DATE 1850\n'
+            '1 EVEN\n2 DATE 1870\n2 PLAC Wiedeń\n1 DEAT\n2 PLAC Lwów\n'
+            '1 NOTE Pierwszy wiersz, dłu\n2 CONC gi tekst \n2 CONT\n2 CONT Trzeci wiersz\n'
+            '1 NOTE @N1@\n1 OBJE\n2 FORM jpg\n2 FILE zdjecia/jan.jpg\n3 FORM jpg\n'
+            '1 NOTE Druga notatka\n'
+        )
+        person = persons[0]
+        
+        self.assertEqual((person.imie, person.nazwisko), ('Jan Maria', 'Nowak'))
+        self.assertEqual((person.data_urodzenia, person.miejsce_urodzenia), ('1850', 'Kraków'))
+        self.assertEqual((person.data_smierci, person.miejsce_smierci), (None, 'Lwów'))
+        self.assertEqual(person.notatki,
+                         'Pierwszy wiersz, długi tekst \n\nTrzeci wiersz\n\nDruga notatka')
+        self.assertEqual(person.zdjecie_sciezka, 'zdjecia/jan.jpg')
+    
+    def test_parallel_parse_keeps_order(self):
+        """Test zgodności parsowania w puli procesów z parsowaniem w jednym procesie"""
+        records = ''.join(f'0 @I{i}@ INDI\r\n1 NAME Osoba{i} /Nowak/\r\n1 BIRT\r\n2 DATE {1800 + i}\r\n'
+                          for i in range(300))
+        self._write('\ufeff0 HEAD\r\n' + records + '0 TRLR\r\n', newline='')
+        
+        serial = GedcomParser(workers=1)
+        parallel = GedcomParser(workers=2)
+        for parser in (serial, parallel):
+            parser.CHUNK_SIZE = 1000
+        parallel.PARALLEL_MIN_SIZE = 0
+        
+        serial_persons = [p for persons, _ in serial.parse(self.path) for p in persons]
+        parallel_persons = [p for persons, _ in parallel.parse(self.path) for p in persons]
+        self.assertEqual(parallel_persons, serial_persons)
+        self.assertEqual([p.xref for p in serial_persons], [f'I{i}' for i in range(300)])
+        self.assertEqual(serial_persons[5].data_urodzenia, '1805')
+
+
+class TestGedcomImport(unittest.TestCase):
+    """Testy importu GEDCOM do bazy danych"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_manager = DatabaseManager(os.path.join(self.temp_dir.name, 'drzewo.db'))
+        self.path = os.path.join(self.temp_dir.name, 'drzewo.ged')
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(GEDCOM)
+    
+    def tearDown(self):
+        """Sprzątanie po każdym teście"""
+        self.db_manager.close()
+        self.temp_dir.cleanup()
+    
+    def test_import_families(self):
+        """Test importu osób i relacji z rekordów FAM"""
+        GedcomHandler(self.db_manager).import_file(self.path, workers=1)
+        
+        persons = {p['imie']: p['id'] for p in self.db_manager.get_all_persons()}
+        self.assertEqual(set(persons), {'Jan', 'Maria', 'Piotr'})
+        self.assertEqual(persons['Jan'] < persons['Maria'] < persons['Piotr'], True)
+        
+        relations = {(r['osoba1_id'], r['osoba2_id'], r['rodzaj_relacji'])
+                     for r in self.db_manager.get_all_relations()}
+        self.assertEqual(relations, {(persons['Jan'], persons['Maria'], 'małżonek'),
+                                     (persons['Jan'], persons['Piotr'], 'rodzic'),
+                                     (persons['Maria'], persons['Piotr'], 'rodzic')})
+        self.assertTrue(self.db_manager.is_ancestor(persons['Maria'], persons['Piotr']))
+    
+    def test_export_import_roundtrip(self):
+        """Test bezstratnego eksportu i ponownego importu pól osób i relacji"""
+        db = self.db_manager
+        ojciec = db.add_person('Jan Maria', 'Kowalski', 'ABT 1850', '1910-03-02', 'M', 'Kraków', 'Lwów',
+                               'Kowal.\nMieszkał przy ulicy  Długiej.\n' + 'Bardzo długa notatka ' * 30,
+                               'zdjecia/jan.jpg')
+        matka = db.add_person('Maria', 'Kowalska', None, None, 'K', None, 'Wiedeń',
+                              nazwisko_panienskie='Nowak')
+        syn = db.add_person('Piotr', 'Kowalski', '1880', None, 'M', 'Kraków')
+        corka = db.add_person('Anna', 'Kowalska', None, None, 'K')
+        wnuk = db.add_person('Adam', 'Kowalski', None, None, None, notatki=' wcięcie ')
+        db.add_relation(ojciec, matka, 'małżonek')
+        db.add_relation(ojciec, syn, 'rodzic')
+        db.add_relation(syn, matka, 'dziecko')
+        db.add_relation(corka, ojciec, 'dziecko')
+        db.add_relation(corka, wnuk, 'rodzic')
+        
+        target_path = os.path.join(self.temp_dir.name, 'eksport.ged')
+        GedcomHandler(db).export_file(target_path)
+        target = DatabaseManager(os.path.join(self.temp_dir.name, 'kopia.db'))
+        try:
+            GedcomHandler(target).import_file(target_path)
+            
+            columns = DatabaseManager.PERSON_COLUMNS + DatabaseManager.DATE_COLUMNS
+            self.assertEqual([[p[c] for c in columns] for p in target.get_all_persons()],
+                             [[p[c] for c in columns] for p in db.get_all_persons()])
+            
+            self.assertEqual(self._named_relations(target), self._named_relations(db))
+        finally:
+            target.close()
+    
+    @staticmethod
+    def _named_relations(manager: DatabaseManager) -> set:
+        """Relacje jako (rodzic, dziecko) albo para małżonków, według imion"""
+        names = {p['id']: p['imie'] for p in manager.get_all_persons()}
+        relations = set()
+        for relation in manager.get_all_relations():
+            osoba1, osoba2 = names[relation['osoba1_id']], names[relation['osoba2_id']]
+            if relation['rodzaj_relacji'] == 'małżonek':
+                relations.add(frozenset((osoba1, osoba2)))
+            else:
+                relations.add((osoba1, osoba2) if relation['rodzaj_relacji'] == 'rodzic'
+                              else (osoba2, osoba1))
+        return relations
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Testy jednostkowe dla odczytu plików GEDCOM w różnych kodowaniach
+"""
+
+import unittest
+import codecs
+import os
+import tempfile
+from src.database.db_manager import DatabaseManager
+from src.utils.gedcom_handler import GedcomHandler
+from src.utils.gedcom_parser import GedcomParser
+from src.utils.gedcom_reader import AnselIncrementalDecoder, GedcomReader, detect_encoding
+
+
+# "Zażółć" i "Łukasz Wąs" w ANSEL (znaki diakrytyczne przed literą)
+ANSEL_ZAZOLC = b'Za\xe7z\xe2o\xb1\xe2c'
+ANSEL_NAME = b'\xa1ukasz /W\xf1as/'
+
+
+class TestEncodingDetection(unittest.TestCase):
+    """Testy wykrywania kodowania i dekodera ANSEL"""
+    
+    def test_detect_encoding(self):
+        """Test wykrywania z BOM, układu UTF-16 i deklaracji CHAR"""
+        self.assertEqual(detect_encoding(codecs.BOM_UTF8 + b'0 HEAD'), ('utf-8', 3))
+        self.assertEqual(detect_encoding(codecs.BOM_UTF16_LE + '0 HEAD'.encode('utf-16-le')),
+                         ('utf-16-le', 2))
+        self.assertEqual(detect_encoding('0 HEAD'.encode('utf-16-be')), ('utf-16-be', 0))
+        self.assertEqual(detect_encoding(b'0 HEAD\r\n1 CHAR ANSEL\r\n0 TRLR'), ('ansel', 0))
+        self.assertEqual(detect_encoding(b'0 HEAD\n1 CHAR WINDOWS-1250\n'), ('cp1250', 0))
+        self.assertEqual(detect_encoding('0 HEAD\n1 NOTE Łódź\n'.encode('utf-8')), ('utf-8', 0))
+        self.assertEqual(detect_encoding('0 HEAD\n1 NOTE Łódź\n'.encode('cp1250')), ('cp1250', 0))
+        # Deklaracja CHAR z rekordu innego niż HEAD jest pomijana
+        self.assertEqual(detect_encoding(b'0 HEAD\n0 @N1@ NOTE\n1 CHAR ANSEL\n'), ('utf-8', 0))
+    
+    def test_ansel_decoder(self):
+        """Test dekodowania ANSEL z przeniesieniem znaków diakrytycznych między blokami"""
+        self.assertEqual(AnselIncrementalDecoder().decode(ANSEL_ZAZOLC, final=True), 'Zażółć')
+        self.assertEqual(AnselIncrementalDecoder().decode(ANSEL_NAME, final=True), 'Łukasz /Wąs/')
+        
+        decoder = AnselIncrementalDecoder()
+        parts = [decoder.decode(ANSEL_ZAZOLC[i:i + 1]) for i in range(len(ANSEL_ZAZOLC))]
+        parts.append(decoder.decode(b'', final=True))
+        self.assertEqual(''.join(parts), 'Zażółć')
+        
+        # Znak diakrytyczny przed końcem wiersza na granicy bloku nie przechodzi do następnego wiersza
+        decoder = AnselIncrementalDecoder()
+        text = decoder.decode(b'ab\xe2\n') + decoder.decode(b'eX', final=True)
+        self.assertEqual(text, AnselIncrementalDecoder().decode(b'ab\xe2\neX', final=True))
+        self.assertEqual(text.splitlines()[1], 'eX')
+        
+        self.assertEqual(AnselIncrementalDecoder('replace').decode(b'a\xbeb'), 'a\ufffdb')
+        with self.assertRaises(UnicodeDecodeError):
+            AnselIncrementalDecoder().decode(b'a\xbeb')
+
+
+class TestGedcomReader(unittest.TestCase):
+    """Testy odczytu wierszy i podziału pliku na zakresy"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'drzewo.ged')
+    
+    def tearDown(self):
+        """Sprzątanie po każdym teście"""
+        self.temp_dir.cleanup()
+    
+    def _write(self, data: bytes):
+        """Zapisuje plik GEDCOM"""
+        with open(self.path, 'wb') as f:
+            f.write(data)
+    
+    def _gedcom(self, count: int, charset: str) -> str:
+        """Plik z podaną liczbą osób"""
+        records = ''.join(f'0 @I{i}@ INDI\r\n1 NAME Łukasz{i} /Wąs/\r\n' for i in range(count))
+        return f'0 HEAD\r\n1 CHAR {charset}\r\n{records}0 TRLR\r\n'
+    
+    def test_lines_across_blocks(self):
+        """Test dekodowania wierszy blokami mniejszymi niż znak wielobajtowy"""
+        text = self._gedcom(5, 'UNICODE')
+        for data in (codecs.BOM_UTF8 + text.encode('utf-8'),
+                     codecs.BOM_UTF16_LE + text.encode('utf-16-le'),
+                     text.encode('utf-16-be')):
+            self._write(data)
+            with GedcomReader(self.path) as reader:
+                reader.BLOCK_SIZE = 3
+                self.assertEqual([line.rstrip('\r') for line in reader.lines()],
+                                 text.replace('\r\n', '\n').rstrip('\n').split('\n'))
+    
+    def test_split_ranges(self):
+        """Test podziału pliku UTF-16 na granicach rekordów poziomu 0"""
+        text = self._gedcom(20, 'UNICODE')
+        self._write(codecs.BOM_UTF16_LE + text.encode('utf-16-le'))
+        with GedcomReader(self.path) as reader:
+            ranges = reader.split_ranges(60)
+            
+            self.assertEqual(ranges[0][0], 2)
+            self.assertEqual(ranges[-1][1], reader.size)
+            self.assertGreater(len(ranges), 1)
+            for (_, previous_end), (start, end) in zip(ranges, ranges[1:]):
+                self.assertEqual(previous_end, start)
+                self.assertEqual(list(reader.lines(start, end))[0][:2], '0 ')
+            self.assertEqual(''.join(line + '\n' for start, end in ranges
+                                     for line in reader.lines(start, end)), text)
+    
+    def test_empty_file(self):
+        """Test odczytu pustego pliku"""
+        self._write(b'')
+        with GedcomReader(self.path) as reader:
+            self.assertEqual(list(reader.lines()), [])
+            self.assertEqual(reader.split_ranges(10), [])
+    
+    def test_parse_encodings(self):
+        """Test parsowania tego samego drzewa zapisanego w różnych kodowaniach"""
+        expected = [('Łukasz0', 'Wąs'), ('Łukasz1', 'Wąs'), ('Łukasz2', 'Wąs')]
+        ansel = self._gedcom(3, 'ANSEL').encode('ascii', 'ignore').replace(
+            b'ukasz', b'\xa1ukasz').replace(b'/Ws/', b'/W\xf1as/')
+        for data in (ansel,
+                     self._gedcom(3, 'WINDOWS-1250').encode('cp1250'),
+                     self._gedcom(3, 'UNICODE').encode('utf-16-le')):
+            self._write(data)
+            parser = GedcomParser(workers=1)
+            parser.CHUNK_SIZE = 40
+            persons = [p for persons, _ in parser.parse(self.path) for p in persons]
+            self.assertEqual([(p.imie, p.nazwisko) for p in persons], expected)
+    
+    def test_import_cp1250(self):
+        """Test importu pliku Windows-1250 bez deklaracji CHAR"""
+        self._write('0 HEAD\n0 @I1@ INDI\n1 NAME Józef /Żółć/\n1 BIRT\n2 PLAC Łódź\n0 TRLR\n'
+                    .encode('cp1250'))
+        db_manager = DatabaseManager(os.path.join(self.temp_dir.name, 'drzewo.db'))
+        try:
+            GedcomHandler(db_manager).import_file(self.path)
+            person = db_manager.get_all_persons()[0]
+            self.assertEqual((person['imie'], person['nazwisko']), ('Józef', 'Żółć'))
+        finally:
+            db_manager.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Testy jednostkowe dla synchronizacji z zewnętrznym plikiem GEDCOM
+"""
+
+import unittest
+import os
+import tempfile
+from src.database.db_manager import DatabaseManager
+from src.utils.gedcom_handler import GedcomHandler
+
+
+BASE = {
+    'I1': '0 @I1@ INDI\n1 NAME Jan /Kowalski/\n1 SEX M\n1 BIRT\n2 DATE 1850\n',
+    'I2': '0 @I2@ INDI\n1 NAME Maria /Kowalska/\n1 SEX F\n',
+    'I3': '0 @I3@ INDI\n1 NAME Piotr /Kowalski/\n1 SEX M\n',
+    'F1': '0 @F1@ FAM\n1 HUSB @I1@\n1 WIFE @I2@\n1 CHIL @I3@\n'
+}
+
+
+class TestGedcomSync(unittest.TestCase):
+    """Testy synchronizacji rekordów po xref i skrócie treści"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_manager = DatabaseManager(os.path.join(self.temp_dir.name, 'drzewo.db'))
+        self.path = os.path.join(self.temp_dir.name, 'badacz.ged')
+        self.handler = GedcomHandler(self.db_manager)
+    
+    def tearDown(self):
+        """Sprzątanie po każdym teście"""
+        self.db_manager.close()
+        self.temp_dir.cleanup()
+    
+    def _sync(self, records: dict, delete: bool = False) -> dict:
+        """Zapisuje plik z podanych rekordów i synchronizuje bazę"""
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('0 HEAD\n1 CHAR UTF-8\n' + ''.join(records.values()) + '0 TRLR\n')
+        return self.handler.sync_file(self.path, delete=delete, workers=1)
+    
+    def _ids(self) -> dict:
+        """Mapowanie imienia na ID osoby"""
+        return {p['imie']: p['id'] for p in self.db_manager.get_all_persons()}
+    
+    def _relations(self) -> set:
+        """Relacje jako krotki (imię, imię, rodzaj)"""
+        names = {person_id: imie for imie, person_id in self._ids().items()}
+        return {(names[r['osoba1_id']], names[r['osoba2_id']], r['rodzaj_relacji'])
+                for r in self.db_manager.get_all_relations()}
+    
+    def test_resync_unchanged(self):
+        """Test ponownej synchronizacji bez zmian w pliku"""
+        summary = self._sync(BASE)
+        self.assertEqual((summary['dodane'], summary['relacje_dodane']), (3, 3))
+        
+        summary = self._sync(BASE, delete=True)
+        self.assertEqual(summary, {'dodane': 0, 'zmienione': 0, 'usuniete': 0, 'bez_zmian': 3,
+                                   'relacje_dodane': 0, 'relacje_usuniete': 0})
+        self.assertEqual(self.db_manager.count_persons(), 3)
+    
+    def test_changed_and_new_records(self):
+        """Test aktualizacji zmienionej osoby i dodania dziecka do rodziny"""
+        self._sync(BASE)
+        ids = self._ids()
+        # Zmiana wprowadzona w programie w osobie o niezmienionym rekordzie
+        maria = self.db_manager.get_person(ids['Maria'])
+        maria['notatki'] = 'Uzupełnione lokalnie'
+        self.db_manager.update_person(ids['Maria'], **{k: maria[k] for k in DatabaseManager.PERSON_COLUMNS})
+        
+        records = dict(BASE)
+        records['I1'] = BASE['I1'].replace('1850', '12 MAR 1850')
+        records['I4'] = '0 @I4@ INDI\n1 NAME Anna /Kowalska/\n1 SEX F\n'
+        records['F1'] = BASE['F1'] + '1 CHIL @I4@\n'
+        summary = self._sync(records)
+        
+        self.assertEqual((summary['dodane'], summary['zmienione'], summary['bez_zmian']), (1, 1, 2))
+        self.assertEqual(summary['relacje_dodane'], 2)
+        self.assertEqual(self._ids()['Jan'], ids['Jan'])
+        self.assertEqual(self.db_manager.get_person(ids['Jan'])['urodzenie_klucz'], 18500312)
+        self.assertEqual(self.db_manager.get_person(ids['Maria'])['notatki'], 'Uzupełnione lokalnie')
+        self.assertTrue(self.db_manager.is_ancestor(ids['Jan'], self._ids()['Anna']))
+    
+    def test_removed_records(self):
+        """Test usuwania rekordów tylko na żądanie i relacji ze zmienionej rodziny"""
+        self._sync(BASE)
+        ids = self._ids()
+        self.db_manager.add_relation(ids['Jan'], ids['Piotr'], 'małżonek')
+        
+        records = {'I1': BASE['I1'], 'I2': BASE['I2'], 'F1': '0 @F1@ FAM\n1 HUSB @I1@\n1 WIFE @I2@\n'}
+        summary = self._sync(records)
+        self.assertEqual((summary['usuniete'], summary['relacje_usuniete']), (0, 2))
+        self.assertEqual(self.db_manager.count_persons(), 3)
+        # Relacja dodana w programie nie pochodzi z rodziny i pozostaje
+        self.assertEqual(self._relations(), {('Jan', 'Maria', 'małżonek'), ('Jan', 'Piotr', 'małżonek')})
+        self.assertFalse(self.db_manager.is_ancestor(ids['Jan'], ids['Piotr']))
+        
+        summary = self._sync({'I1': BASE['I1']}, delete=True)
+        self.assertEqual((summary['usuniete'], summary['relacje_usuniete']), (2, 0))
+        self.assertEqual(set(self._ids()), {'Jan'})
+        
+        summary = self._sync(BASE)
+        self.assertEqual((summary['dodane'], summary['relacje_dodane']), (2, 3))
+    
+    def test_merge_keeps_source_mapping(self):
+        """Test synchronizacji po scaleniu osoby z duplikatem spoza pliku"""
+        self._sync(BASE)
+        ids = self._ids()
+        local = self.db_manager.add_person('Janek', 'Kowalski', '1850', None, 'M')
+        self.db_manager.merge_persons(local, ids['Jan'])
+        
+        summary = self._sync(BASE)
+        self.assertEqual((summary['dodane'], summary['bez_zmian']), (0, 3))
+        self.assertEqual(self.db_manager.count_persons(), 3)
+    
+    def test_delete_keeps_person_merged_with_other_record(self):
+        """Test usunięcia z pliku duplikatu scalonego z osobą innego rekordu"""
+        records = dict(BASE, I4='0 @I4@ INDI\n1 NAME Jan /Kowalski/\n1 SEX M\n')
+        self._sync(records)
+        jan_ids = [p['id'] for p in self.db_manager.get_all_persons() if p['imie'] == 'Jan']
+        self.db_manager.merge_persons(*jan_ids)
+        
+        summary = self._sync(BASE, delete=True)
+        self.assertEqual(summary['usuniete'], 0)
+        self.assertEqual(self.db_manager.get_person(jan_ids[0])['imie'], 'Jan')
+        self.assertEqual(self._sync(BASE)['bez_zmian'], 3)
+        
+        # Osoba znika po usunięciu z pliku ostatniego odwołującego się rekordu
+        summary = self._sync({'I2': BASE['I2'], 'I3': BASE['I3']}, delete=True)
+        self.assertEqual(summary['usuniete'], 1)
+        self.assertIsNone(self.db_manager.get_person(jan_ids[0]))
+    
+    def test_separate_sources(self):
+        """Test niezależnych xref różnych źródeł"""
+        self._sync(BASE)
+        summary = self.handler.sync_file(self.path, source='inny badacz', workers=1)
+        
+        self.assertEqual(summary['dodane'], 3)
+        self.assertEqual(self.db_manager.count_persons(), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+Testy jednostkowe dla generatora syntetycznych drzew genealogicznych
+"""
+
+import unittest
+import os
+import tempfile
+from src.database.db_manager import DatabaseManager
+from src.business_logic.relationship_calculator import RelationshipCalculator
+from benchmarks.generator import GeneratorConfig, GenealogyGenerator
+
+
+class TestGenealogyGenerator(unittest.TestCase):
+    """Testy dla klasy GenealogyGenerator"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+        self.db_manager = DatabaseManager(self.temp_db.name)
+    
+    def tearDown(self):
+        """Sprzątanie po każdym teście"""
+        self.db_manager.close()
+        if os.path.exists(self.temp_db.name):
+            os.unlink(self.temp_db.name)
+    
+    def test_population_and_bulk_insert(self):
+        """Test generowania drzewa zadanej wielkości"""
+        config = GeneratorConfig(population=300, generations=5, seed=1)
+        tree = GenealogyGenerator(config).generate(self.db_manager)
+        
+        self.assertEqual(len(tree.person_ids), 300)
+        self.assertEqual(self.db_manager.count_persons(), 300)
+        self.assertEqual(len(self.db_manager.get_all_relations()), tree.relation_count)
+        self.assertEqual(sum(len(g) for g in tree.generations), 300)
+        
+        # Osoby z ostatniego pokolenia mają przodków w bazie
+        calc = RelationshipCalculator(self.db_manager)
+        with_ancestors = [pid for pid in tree.generations[-1] if calc.get_ancestors(pid)]
+        self.assertTrue(with_ancestors)
+    
+    def test_same_seed_gives_same_tree(self):
+        """Test powtarzalności generowania dla tego samego ziarna"""
+        trees = []
+        for _ in range(2):
+            db_manager = DatabaseManager(':memory:')
+            GenealogyGenerator(GeneratorConfig(population=200, seed=7)).generate(db_manager)
+            trees.append((db_manager.get_all_persons(), db_manager.get_all_relations()))
+            db_manager.close()
+        
+        self.assertEqual(trees[0], trees[1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Testy jednostkowe dla indeksu przedziałów życia
+"""
+
+import unittest
+import os
+import tempfile
+from src.database.db_manager import DatabaseManager
+from src.database.lifespan_tree import LifespanTree
+
+
+class TestLifespanTree(unittest.TestCase):
+    """Testy dla klasy LifespanTree"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'drzewo.db')
+        self.db_manager = DatabaseManager(self.db_path)
+        
+        self.jan = self.db_manager.add_person('Jan', 'Kowalski', '1850-02-01', '1910-06-30', 'M')
+        self.anna = self.db_manager.add_person('Anna', 'Kowalska', '1880', '1950', 'K')
+        self.piotr = self.db_manager.add_person('Piotr', 'Kowalski', '1920-01-01', None, 'M')
+        self.ewa = self.db_manager.add_person('Ewa', 'Nowak', None, '1900', 'K')
+    
+    def tearDown(self):
+        """Sprzątanie po każdym teście"""
+        self.db_manager.close()
+        self.temp_dir.cleanup()
+    
+    def _ids(self, persons):
+        """Zbiór ID osób"""
+        return {person['id'] for person in persons}
+    
+    def test_persons_alive_in(self):
+        """Test wyszukiwania osób żyjących w danym roku"""
+        self.assertEqual(self._ids(self.db_manager.persons_alive_in(1850)), {self.jan})
+        self.assertEqual(self._ids(self.db_manager.persons_alive_in(1900)), {self.jan, self.anna})
+        self.assertEqual(self._ids(self.db_manager.persons_alive_in(1910, 1920)),
+                         {self.jan, self.anna, self.piotr})
+        self.assertEqual(self._ids(self.db_manager.persons_alive_in(2000)), {self.piotr})
+        self.assertEqual(self.db_manager.persons_alive_in(1800), [])
+    
+    def test_overlapping_persons(self):
+        """Test wyszukiwania współczesnych danej osoby"""
+        self.assertEqual(self._ids(self.db_manager.overlapping_persons(self.anna)),
+                         {self.jan, self.piotr})
+        self.assertEqual(self._ids(self.db_manager.overlapping_persons(self.jan)), {self.anna})
+        self.assertEqual(self.db_manager.overlapping_persons(self.ewa), [])
+    
+    def test_index_follows_changes(self):
+        """Test aktualizacji indeksu przez wyzwalacze"""
+        self.db_manager.update_person(self.ewa, 'Ewa', 'Nowak', '1840', '1900', 'K')
+        self.db_manager.update_person(self.piotr, 'Piotr', 'Kowalski', None, None, 'M')
+        self.db_manager.delete_person(self.jan)
+        
+        self.assertEqual(self._ids(self.db_manager.persons_alive_in(1890)), {self.ewa, self.anna})
+        self.assertIsNone(self.db_manager.lifespans.get_bounds(self.piotr))
+        self.assertIsNone(self.db_manager.lifespans.get_bounds(self.jan))
+    
+    def test_invalid_and_open_ended_bounds(self):
+        """Test przedziałów dla osób bez daty śmierci i z błędną datą śmierci"""
+        wrong = self.db_manager.add_person('Adam', 'Nowak', '1900', '1890', 'M')
+        
+        self.assertEqual(self.db_manager.lifespans.get_bounds(wrong), (1900, 1900))
+        self.assertEqual(self.db_manager.lifespans.get_bounds(self.piotr),
+                         (1920, LifespanTree.OPEN_END))
+    
+    def test_existing_database_is_indexed(self):
+        """Test wypełnienia indeksu dla bazy utworzonej przed jego wprowadzeniem"""
+        self.db_manager.connection.execute(f'DROP TABLE {LifespanTree.TABLE}')
+        self.db_manager.connection.commit()
+        self.db_manager.close()
+        
+        self.db_manager = DatabaseManager(self.db_path)
+        
+        self.assertEqual(self._ids(self.db_manager.persons_alive_in(1900)), {self.jan, self.anna})
+    
+    def test_timeline_rows_range(self):
+        """Test ograniczenia danych osi czasu do zakresu lat"""
+        rows = self.db_manager.get_timeline_rows(1915, 1930)
+        
+        self.assertEqual([row[0] for row in rows], [self.anna, self.piotr])
+        self.assertEqual(rows[1][5], None)
+
+
+if __name__ == '__main__':
+    unittest.main()
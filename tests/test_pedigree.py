@@ -0,0 +1,134 @@
+"""
+Testy jednostkowe dla rodowodu (implex, cykle, współczynniki pokrewieństwa)
+"""
+
+import unittest
+import os
+import tempfile
+from src.business_logic.pedigree import Pedigree
+from src.business_logic.relationship_calculator import RelationshipCalculator
+from src.database.db_manager import DatabaseManager
+
+
+# Dziadkowie 1 i 2, ich dzieci 3 i 4, współmałżonkowie 5 i 6,
+# kuzyni 7 i 8 oraz dziecko kuzynów 9
+COUSIN_MARRIAGE = [(1, 3), (2, 3), (1, 4), (2, 4), (3, 7), (5, 7), (4, 8), (6, 8), (7, 9), (8, 9)]
+
+
+class TestPedigree(unittest.TestCase):
+    """Testy dla klasy Pedigree"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.pedigree = Pedigree([9], COUSIN_MARRIAGE)
+    
+    def test_topological_order(self):
+        """Test uporządkowania przodków przed potomkami"""
+        position = self.pedigree.position
+        for parent_id, child_id in COUSIN_MARRIAGE:
+            self.assertLess(position[parent_id], position[child_id])
+        self.assertEqual(self.pedigree.cycle_edges, [])
+    
+    def test_path_counts(self):
+        """Test liczenia dróg do przodka występującego w dwóch liniach"""
+        counts = self.pedigree.path_counts(9)
+        
+        self.assertEqual(counts[7], {1: 1})
+        self.assertEqual(counts[3], {2: 1})
+        self.assertEqual(counts[1], {3: 2})
+        self.assertEqual(counts[2], {3: 2})
+        self.assertEqual(set(self.pedigree.path_counts(9, max_generations=2)), {3, 4, 5, 6, 7, 8})
+    
+    def test_generation_stats(self):
+        """Test zapełnienia pokoleń i współczynnika implexu"""
+        stats = self.pedigree.generation_stats(9, 4)
+        
+        self.assertEqual([(s.generation, s.slots, s.filled, s.distinct) for s in stats],
+                         [(1, 2, 2, 2), (2, 4, 4, 4), (3, 8, 4, 2), (4, 16, 0, 0)])
+        self.assertEqual(stats[2].implex, 0.5)
+        self.assertEqual(stats[3].implex, 0.0)
+        self.assertAlmostEqual(self.pedigree.implex(9), 1 - 8 / 10)
+    
+    def test_kinship_and_inbreeding(self):
+        """Test współczynników pokrewieństwa i inbredu"""
+        pedigree = Pedigree([9, 5], COUSIN_MARRIAGE)
+        
+        self.assertEqual(pedigree.kinship(3, 4), 0.25)
+        self.assertEqual(pedigree.kinship(1, 7), 0.125)
+        self.assertEqual(pedigree.kinship(7, 8), 0.0625)
+        self.assertEqual(pedigree.kinship(1, 2), 0.0)
+        self.assertEqual(pedigree.kinship(5, 9), 0.125)
+        self.assertEqual(pedigree.inbreeding(9), 0.0625)
+        self.assertEqual(pedigree.inbreeding(7), 0.0)
+        self.assertEqual(pedigree.kinship(9, 9), (1 + 0.0625) / 2)
+    
+    def test_cycle_is_reported_and_skipped(self):
+        """Test wykrycia cyklu w błędnych danych"""
+        pedigree = Pedigree([1], [(2, 1), (3, 2), (1, 3), (4, 1)])
+        
+        self.assertEqual(pedigree.cycle_edges, [(1, 3)])
+        self.assertEqual(pedigree.path_counts(1), {2: {1: 1}, 3: {2: 1}, 4: {1: 1}})
+        self.assertEqual(pedigree.kinship(1, 3), 0.125)
+    
+    def test_deep_pedigree(self):
+        """Test rodowodu głębszego niż limit rekurencji"""
+        edges = [(person_id + 1, person_id) for person_id in range(5000)]
+        pedigree = Pedigree([0], edges)
+        
+        self.assertEqual(pedigree.path_counts(0)[5000], {5000: 1})
+        self.assertEqual(pedigree.kinship(0, 1000), 0.5 ** 1001)
+
+
+class TestPedigreeQueries(unittest.TestCase):
+    """Testy rodowodu pobieranego z bazy danych"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_manager = DatabaseManager(os.path.join(self.temp_dir.name, 'drzewo.db'))
+        self.calc = RelationshipCalculator(self.db_manager)
+        
+        self.ids = {}
+        for number in range(1, 10):
+            self.ids[number] = self.db_manager.add_person(f'Osoba{number}', 'Nowak', None, None, None)
+        self.db_manager.add_relations_bulk([(self.ids[parent], self.ids[child], 'rodzic')
+                                            for parent, child in COUSIN_MARRIAGE])
+    
+    def tearDown(self):
+        """Sprzątanie po każdym teście"""
+        self.db_manager.close()
+        self.temp_dir.cleanup()
+    
+    def test_ancestors_with_paths(self):
+        """Test przodka wspólnego dla obu linii w rodowodzie"""
+        ancestors = self.calc.get_ancestors_with_paths(self.ids[9], max_generations=3)
+        
+        self.assertEqual(len(ancestors), 8)
+        by_id = {person['id']: (generation, paths) for person, generation, paths in ancestors}
+        self.assertEqual(by_id[self.ids[1]], (3, 2))
+        self.assertEqual(by_id[self.ids[7]], (1, 1))
+        self.assertEqual([generation for _, generation, _ in ancestors], [1, 1, 2, 2, 2, 2, 3, 3])
+    
+    def test_coefficients(self):
+        """Test współczynników wyliczanych z bazy"""
+        self.assertEqual(self.calc.calculate_kinship(self.ids[7], self.ids[8]), 0.0625)
+        self.assertEqual(self.calc.calculate_inbreeding(self.ids[9]), 0.0625)
+        self.assertEqual(self.calc.get_pedigree_collapse(self.ids[9], 3)[2].distinct, 2)
+    
+    def test_find_cycles(self):
+        """Test wykrywania relacji tworzących cykl"""
+        self.assertEqual(self.calc.find_cycles(), [])
+        
+        self.db_manager.add_relation(self.ids[9], self.ids[1], 'rodzic')
+        
+        cycle_ids = {(parent['id'], child['id']) for parent, child in self.calc.find_cycles()}
+        self.assertIn((self.ids[9], self.ids[1]), cycle_ids)
+        self.assertIn((self.ids[1], self.ids[3]), cycle_ids)
+        self.assertNotIn((self.ids[5], self.ids[7]), cycle_ids)
+        
+        pedigree = self.calc.get_pedigree(self.ids[9])
+        self.assertEqual(len(pedigree.cycle_edges), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
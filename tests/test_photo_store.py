@@ -0,0 +1,133 @@
+"""
+Testy jednostkowe dla magazynu zdjęć
+"""
+
+import unittest
+import os
+import tempfile
+from src.database.db_manager import DatabaseManager
+
+
+class TestPhotoStore(unittest.TestCase):
+    """Testy dla klasy PhotoStore"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'drzewo.db')
+        self.photos_dir = os.path.join(self.temp_dir.name, 'drzewo.photos')
+        self.db_manager = DatabaseManager(self.db_path)
+        
+        # Dwa różne pliki o tej samej nazwie i kopia pierwszego
+        self.scan_a = self._write('a/scan.jpg', b'pierwszy skan')
+        self.scan_b = self._write('b/scan.jpg', b'drugi skan')
+        self.scan_a_copy = self._write('c/kopia.JPG', b'pierwszy skan')
+    
+    def tearDown(self):
+        """Sprzątanie po każdym teście"""
+        self.db_manager.close()
+        self.temp_dir.cleanup()
+    
+    def _write(self, name, content):
+        """Tworzy plik w katalogu tymczasowym"""
+        path = os.path.join(self.temp_dir.name, 'zrodla', name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+    
+    def _add_person(self, photo_path):
+        """Dodaje osobę ze zdjęciem"""
+        stored_path = self.db_manager.add_photo(photo_path)
+        return self.db_manager.add_person('Jan', 'Kowalski', zdjecie_sciezka=stored_path), stored_path
+    
+    def test_same_basename_does_not_overwrite(self):
+        """Test przechowywania różnych plików o tej samej nazwie"""
+        _, path_a = self._add_person(self.scan_a)
+        _, path_b = self._add_person(self.scan_b)
+        
+        self.assertNotEqual(path_a, path_b)
+        with open(path_a, 'rb') as f:
+            self.assertEqual(f.read(), b'pierwszy skan')
+        with open(path_b, 'rb') as f:
+            self.assertEqual(f.read(), b'drugi skan')
+    
+    def test_identical_photos_are_stored_once(self):
+        """Test deduplikacji i liczenia odwołań"""
+        _, path = self._add_person(self.scan_a)
+        _, copy_path = self._add_person(self.scan_a_copy)
+        
+        self.assertEqual(path, copy_path)
+        self.assertEqual(len(os.listdir(self.photos_dir)), 1)
+        self.assertEqual(self.db_manager.photos.get_reference_count(path), 2)
+        self.assertEqual(self.db_manager.photos.get_stats()['zaoszczedzone'], len(b'pierwszy skan'))
+    
+    def test_delete_person_collects_orphaned_photo(self):
+        """Test usuwania zdjęcia po usunięciu ostatniej osoby, która go używa"""
+        first_id, path = self._add_person(self.scan_a)
+        second_id, _ = self._add_person(self.scan_a_copy)
+        
+        self.db_manager.delete_person(first_id)
+        self.assertTrue(os.path.exists(path))
+        
+        self.db_manager.delete_person(second_id)
+        self.assertFalse(os.path.exists(path))
+        self.assertIsNone(self.db_manager.photos.get_reference_count(path))
+    
+    def test_update_person_releases_previous_photo(self):
+        """Test zwalniania poprzedniego zdjęcia po zmianie zdjęcia osoby"""
+        person_id, old_path = self._add_person(self.scan_a)
+        new_path = self.db_manager.add_photo(self.scan_b)
+        
+        self.db_manager.update_person(person_id, 'Jan', 'Kowalski', zdjecie_sciezka=new_path)
+        
+        self.assertFalse(os.path.exists(old_path))
+        self.assertEqual(self.db_manager.photos.get_reference_count(new_path), 1)
+    
+    def test_existing_photos_are_adopted(self):
+        """Test przejęcia zdjęć z bazy utworzonej przed wprowadzeniem magazynu"""
+        self.db_manager.add_person('Anna', 'Nowak', zdjecie_sciezka=self.scan_a)
+        self.db_manager.connection.execute('DROP TABLE zdjecia')
+        self.db_manager.connection.commit()
+        self.db_manager.close()
+        
+        self.db_manager = DatabaseManager(self.db_path)
+        
+        person = self.db_manager.get_all_persons()[0]
+        self.assertEqual(os.path.dirname(person['zdjecie_sciezka']), self.photos_dir)
+        self.assertEqual(self.db_manager.photos.get_reference_count(person['zdjecie_sciezka']), 1)
+        self.assertTrue(os.path.exists(self.scan_a))
+        # Pamięć podręczna osób została powiadomiona o zmienionych ścieżkach
+        self.assertEqual(self.db_manager.journal.last_notified_sequence,
+                         self.db_manager.get_last_sequence())
+    
+    def test_databases_in_one_directory_do_not_share_photos(self):
+        """Test osobnych katalogów zdjęć baz z tego samego katalogu"""
+        person_id, path = self._add_person(self.scan_a)
+        other = DatabaseManager(os.path.join(self.temp_dir.name, 'inna.db'))
+        try:
+            other_path = other.add_photo(self.scan_a)
+            other.add_person('Anna', 'Nowak', zdjecie_sciezka=other_path)
+            self.assertNotEqual(os.path.dirname(other_path), self.photos_dir)
+            
+            self.db_manager.delete_person(person_id)
+            self.assertFalse(os.path.exists(path))
+            self.assertTrue(os.path.exists(other_path))
+        finally:
+            other.close()
+    
+    def test_photos_outside_store_are_not_removed(self):
+        """Test pozostawienia plików ze wspólnego katalogu wcześniejszych wersji"""
+        shared_path = self._write('photos/scan.jpg', b'wspolny skan')
+        self.db_manager.connection.execute('''
+            INSERT INTO zdjecia (hash, sciezka, rozmiar) VALUES ('wspolny', ?, 1)
+        ''', (shared_path,))
+        person_id = self.db_manager.add_person('Anna', 'Nowak', zdjecie_sciezka=shared_path)
+        
+        self.db_manager.delete_person(person_id)
+        self.assertTrue(os.path.exists(shared_path))
+        self.assertIsNone(self.db_manager.photos.get_reference_count(shared_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+"""
+Testy jednostkowe dla słownika miejsc
+"""
+
+import unittest
+import os
+import sqlite3
+import tempfile
+from src.database.db_manager import DatabaseManager
+from src.database.places import place_key
+
+
+class TestPlaces(unittest.TestCase):
+    """Testy miejsc osób, wariantów nazw i migracji istniejących baz"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'drzewo.db')
+        self.db_manager = DatabaseManager(self.db_path)
+        
+        add = self.db_manager.add_person
+        self.jan = add('Jan', 'Kowalski', '1850', '1920', 'M', 'Warszawa', 'Kraków')
+        self.maria = add('Maria', 'Kowalska', '1852', None, 'K', 'warszawa ', None)
+        self.piotr = add('Piotr', 'Kowalski', '1875', None, 'M', 'W-wa', 'Warszawa')
+        self.anna = add('Anna', 'Nowak', None, None, 'K', '  ', 'Łódź')
+    
+    def tearDown(self):
+        """Sprzątanie po każdym teście"""
+        self.db_manager.close()
+        self.temp_dir.cleanup()
+    
+    def _place_ids(self, person_id: int) -> tuple:
+        """Klucze obce miejsc urodzenia i śmierci osoby"""
+        person = self.db_manager.get_person(person_id)
+        return tuple(person[column] for column in DatabaseManager.PLACE_COLUMNS)
+    
+    def test_place_key(self):
+        """Test klucza nazwy pomijającego wielkość liter i białe znaki"""
+        self.assertEqual(place_key('  Nowy   Sącz '), place_key('nowy sącz'))
+        self.assertEqual(place_key('ŁÓDŹ'), place_key('Łódź'))
+        self.assertIsNone(place_key(' \t'))
+        self.assertIsNone(place_key(None))
+    
+    def test_persons_linked_to_places(self):
+        """Test wspólnego miejsca dla nazw różniących się wielkością liter i spacjami"""
+        warszawa = self.db_manager.get_place_id('WARSZAWA')
+        self.assertEqual(self._place_ids(self.jan)[0], warszawa)
+        self.assertEqual(self._place_ids(self.maria), (warszawa, None))
+        self.assertEqual(self._place_ids(self.anna)[0], None)
+        # Tekst wpisany przez użytkownika pozostaje bez zmian
+        self.assertEqual(self.db_manager.get_person(self.maria)['miejsce_urodzenia'], 'warszawa ')
+        self.assertEqual(self.db_manager.get_place(warszawa)['nazwa'], 'Warszawa')
+        
+        self.assertEqual([p['id'] for p in self.db_manager.get_persons_by_place(warszawa)],
+                         [self.maria, self.jan, self.piotr])
+        self.assertEqual([p['nazwa'] for p in self.db_manager.find_places('w')], ['W-wa', 'Warszawa'])
+        self.assertEqual([p['nazwa'] for p in self.db_manager.find_places('ŁÓ')], ['Łódź'])
+        
+        # Zmiana miejsca w edycji osoby
+        person = self.db_manager.get_person(self.anna)
+        person['miejsce_urodzenia'] = 'Kraków'
+        self.db_manager.update_person(self.anna, **{k: person[k] for k in DatabaseManager.PERSON_COLUMNS})
+        self.assertEqual(self._place_ids(self.anna)[0], self.db_manager.get_place_id('kraków'))
+    
+    def test_alias_merges_places(self):
+        """Test scalenia miejsca zapisanego wariantem nazwy"""
+        warszawa = self.db_manager.get_place_id('Warszawa')
+        wwa = self.db_manager.get_place_id('W-wa')
+        self.db_manager.update_place(wwa, szerokosc=52.23, dlugosc=21.01)
+        
+        self.assertEqual(self.db_manager.add_place_alias(warszawa, 'w-wa'), 1)
+        self.assertIsNone(self.db_manager.get_place(wwa))
+        self.assertEqual(self._place_ids(self.piotr), (warszawa, warszawa))
+        place = self.db_manager.get_place(warszawa)
+        self.assertEqual(place['aliasy'], ['w-wa', 'warszawa'])
+        self.assertEqual((place['szerokosc'], place['dlugosc']), (52.23, 21.01))
+        
+        # Nowe osoby z wariantem nazwy trafiają do scalonego miejsca
+        ewa = self.db_manager.add_person('Ewa', 'Nowak', miejsce_urodzenia='W-WA')
+        self.assertEqual(self._place_ids(ewa)[0], warszawa)
+        self.assertEqual(self.db_manager.get_place_counts(limit=1),
+                         [{'id': warszawa, 'nazwa': 'Warszawa', 'urodzenia': 4, 'zgony': 1}])
+    
+    def test_unused_place_not_suggested(self):
+        """Test pominięcia miejsca, do którego nie odwołuje się już żadna osoba"""
+        ewa = self.db_manager.add_person('Ewa', 'Nowak', miejsce_urodzenia='Krakoww')
+        self.assertEqual([p['nazwa'] for p in self.db_manager.find_places('Krak')], ['Krakoww', 'Kraków'])
+        
+        person = self.db_manager.get_person(ewa)
+        person['miejsce_urodzenia'] = 'Kraków'
+        self.db_manager.update_person(ewa, **{k: person[k] for k in DatabaseManager.PERSON_COLUMNS})
+        self.assertEqual([p['nazwa'] for p in self.db_manager.find_places('Krak')], ['Kraków'])
+        self.assertEqual([p['nazwa'] for p in self.db_manager.get_place_counts()
+                          if p['nazwa'].startswith('Krak')], ['Kraków'])
+        
+        # Miejsce ponownie użyte wraca do podpowiedzi z tym samym identyfikatorem
+        typo = self.db_manager.get_place_id('Krakoww')
+        self.db_manager.add_person('Adam', 'Nowak', miejsce_smierci='krakoww')
+        self.assertEqual([p['id'] for p in self.db_manager.find_places('Krakoww')], [typo])
+    
+    def test_invalid_place_changes(self):
+        """Test odrzucenia nieznanego miejsca, pustego aliasu i błędnych współrzędnych"""
+        warszawa = self.db_manager.get_place_id('Warszawa')
+        with self.assertRaises(ValueError):
+            self.db_manager.add_place_alias(warszawa + 100, 'X')
+        with self.assertRaises(ValueError):
+            self.db_manager.add_place_alias(warszawa, ' ')
+        with self.assertRaises(ValueError):
+            self.db_manager.update_place(warszawa, szerokosc=91)
+        with self.assertRaises(ValueError):
+            self.db_manager.merge_places(warszawa, warszawa)
+    
+    def test_bulk_import_and_merge(self):
+        """Test miejsc osób dodanych zbiorczo i scalonych"""
+        ids = self.db_manager.add_persons_bulk([
+            {'imie': 'Adam', 'nazwisko': 'Nowak', 'miejsce_urodzenia': 'Gdańsk', 'miejsce_smierci': 'gdańsk'},
+            {'imie': 'Ewa', 'nazwisko': 'Nowak', 'miejsce_smierci': 'Kraków'},
+        ])
+        gdansk = self.db_manager.get_place_id('Gdańsk')
+        self.assertEqual(self._place_ids(ids[0]), (gdansk, gdansk))
+        self.assertEqual(self._place_ids(ids[1]), (None, self.db_manager.get_place_id('Kraków')))
+        
+        # Brakujące miejsce śmierci uzupełnione z duplikatu
+        self.db_manager.merge_persons(self.maria, ids[0])
+        self.assertEqual(self._place_ids(self.maria), (self.db_manager.get_place_id('Warszawa'), gdansk))
+    
+    def test_migration_of_existing_database(self):
+        """Test migracji bazy bez tabeli miejsc (deduplikacja istniejących nazw)"""
+        self.db_manager.close()
+        connection = sqlite3.connect(self.db_path)
+        connection.execute('DROP INDEX idx_osoby_miejsca_id')
+        for column in DatabaseManager.PLACE_COLUMNS:
+            connection.execute(f'DROP INDEX idx_osoby_{column}')
+            connection.execute(f'ALTER TABLE osoby DROP COLUMN {column}')
+        connection.execute('DROP TABLE miejsca_aliasy')
+        connection.execute('DROP TABLE miejsca')
+        connection.commit()
+        connection.close()
+        
+        self.db_manager = DatabaseManager(self.db_path)
+        places = self.db_manager.find_places(limit=None)
+        self.assertEqual([p['nazwa'] for p in places], ['Kraków', 'W-wa', 'Warszawa', 'Łódź'])
+        warszawa = self.db_manager.get_place_id('Warszawa')
+        self.assertEqual(self._place_ids(self.maria), (warszawa, None))
+        self.assertEqual(self._place_ids(self.piotr)[1], warszawa)
+        self.assertEqual(self._place_ids(self.anna)[0], None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Testy jednostkowe dla profilera zapytań
+"""
+
+import unittest
+import os
+import json
+import tempfile
+from src.database.db_manager import DatabaseManager
+from src.utils.profiler import profiler
+
+
+class TestProfiler(unittest.TestCase):
+    """Testy dla profilera i dekoratora profiled"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+        self.db_manager = DatabaseManager(self.temp_db.name, cache_size=0)
+        self.person_id = self.db_manager.add_person('Jan', 'Kowalski', None, None, 'M')
+        profiler.reset()
+    
+    def tearDown(self):
+        """Sprzątanie po każdym teście"""
+        profiler.disable()
+        profiler.reset()
+        self.db_manager.close()
+        if os.path.exists(self.temp_db.name):
+            os.unlink(self.temp_db.name)
+    
+    def test_disabled_profiler_records_nothing(self):
+        """Test braku pomiarów przy wyłączonym profilerze"""
+        with profiler.action("wybór osoby"):
+            self.db_manager.get_person(self.person_id)
+        
+        self.assertEqual(profiler.get_summary()['actions'], {})
+    
+    def test_action_aggregates_functions_and_queries(self):
+        """Test grupowania wywołań i zapytań SQL według akcji"""
+        profiler.enable()
+        with profiler.action("wybór osoby"):
+            self.db_manager.get_person(self.person_id)
+            self.db_manager.get_all_persons()
+        
+        action = profiler.get_summary()['actions']['wybór osoby']
+        self.assertEqual(action['calls'], 1)
+        self.assertGreaterEqual(action['queries'], 2)
+        
+        functions = action['functions']
+        self.assertEqual(functions['DatabaseManager.get_person']['calls'], 1)
+        self.assertEqual(functions['DatabaseManager.get_person']['queries'], 1)
+        self.assertEqual(functions['DatabaseManager.get_all_persons']['rows'], 1)
+    
+    def test_calls_outside_action(self):
+        """Test pomiarów wykonanych poza akcją użytkownika"""
+        profiler.enable()
+        self.db_manager.search_persons('Jan')
+        
+        functions = profiler.get_summary()['actions']['(bez akcji)']['functions']
+        self.assertIn('DatabaseManager.search_persons', functions)
+    
+    def test_dump_files(self):
+        """Test zapisu pomiarów do plików JSON i collapsed"""
+        profiler.enable()
+        with profiler.action("odświeżenie danych"):
+            self.db_manager.get_all_persons()
+        
+        with tempfile.TemporaryDirectory() as workdir:
+            json_path = os.path.join(workdir, 'profil.json')
+            collapsed_path = os.path.join(workdir, 'profil.folded')
+            profiler.dump_json(json_path)
+            profiler.dump_collapsed(collapsed_path)
+            
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            with open(collapsed_path, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        
+        self.assertIn('odświeżenie danych', data['actions'])
+        self.assertTrue(data['traceEvents'])
+        self.assertIn('akcja: odświeżenie danych;DatabaseManager.get_all_persons',
+                      [line.rsplit(' ', 1)[0] for line in lines])
+
+
+if __name__ == '__main__':
+    unittest.main()
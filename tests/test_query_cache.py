@@ -0,0 +1,115 @@
+"""
+Testy jednostkowe dla pamięci podręcznej zapytań
+"""
+
+import unittest
+import os
+import tempfile
+from src.database.db_manager import DatabaseManager
+from src.database.query_cache import QueryCache
+
+
+class TestQueryCache(unittest.TestCase):
+    """Testy dla klasy QueryCache"""
+    
+    def test_lru_eviction(self):
+        """Test usuwania najdawniej używanych wpisów"""
+        cache = QueryCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        
+        self.assertEqual(cache.get('a'), (True, 1))
+        self.assertEqual(cache.get('b'), (False, None))
+        self.assertEqual(cache.get_stats()['evictions'], 1)
+    
+    def test_invalidate_tag(self):
+        """Test unieważniania wpisów po znaczniku"""
+        cache = QueryCache()
+        cache.put('x', 1, tags=[1, 2])
+        cache.put('y', 2, tags=[2])
+        cache.put('z', 3, tags=[3])
+        
+        cache.invalidate_tag(2)
+        
+        self.assertFalse(cache.get('x')[0])
+        self.assertFalse(cache.get('y')[0])
+        self.assertTrue(cache.get('z')[0])
+
+
+class TestDatabaseManagerCache(unittest.TestCase):
+    """Testy pamięci podręcznej w DatabaseManager"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+        self.db_manager = DatabaseManager(self.temp_db.name, cache_size=16)
+        
+        self.parent_id = self.db_manager.add_person('Jan', 'Kowalski', None, None, 'M')
+        self.child_id = self.db_manager.add_person('Anna', 'Kowalska', None, None, 'K')
+        self.db_manager.add_relation(self.parent_id, self.child_id, 'rodzic')
+    
+    def tearDown(self):
+        """Sprzątanie po każdym teście"""
+        self.db_manager.close()
+        if os.path.exists(self.temp_db.name):
+            os.unlink(self.temp_db.name)
+    
+    def test_repeated_reads_hit_cache(self):
+        """Test obsługi powtórnych odczytów z pamięci"""
+        self.db_manager.get_person(self.parent_id)
+        self.db_manager.get_person(self.parent_id)
+        self.db_manager.get_relations(self.parent_id)
+        self.db_manager.get_relations(self.parent_id)
+        
+        stats = self.db_manager.get_cache_stats()
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 2)
+    
+    def test_returned_values_are_copies(self):
+        """Test ochrony wpisów przed modyfikacją przez wywołującego"""
+        person = self.db_manager.get_person(self.parent_id)
+        person['imie'] = 'Zmienione'
+        
+        self.assertEqual(self.db_manager.get_person(self.parent_id)['imie'], 'Jan')
+    
+    def test_update_person_invalidates_related_entries(self):
+        """Test unieważniania danych osoby i relacji zawierających jej nazwisko"""
+        self.db_manager.get_person(self.parent_id)
+        self.db_manager.get_relations(self.child_id)
+        
+        self.db_manager.update_person(self.parent_id, 'Jan', 'Nowak')
+        
+        self.assertEqual(self.db_manager.get_person(self.parent_id)['nazwisko'], 'Nowak')
+        relations = self.db_manager.get_relations(self.child_id)
+        self.assertEqual(relations[0]['osoba1_nazwisko'], 'Nowak')
+    
+    def test_relation_changes_invalidate_both_persons(self):
+        """Test unieważniania relacji obu osób po zmianie relacji"""
+        other_id = self.db_manager.add_person('Piotr', 'Nowak', None, None, 'M')
+        self.db_manager.get_relations(self.child_id)
+        self.db_manager.get_relations(other_id)
+        
+        relation_id = self.db_manager.add_relation(other_id, self.child_id, 'rodzic')
+        self.assertEqual(len(self.db_manager.get_relations(self.child_id)), 2)
+        self.assertEqual(len(self.db_manager.get_relations(other_id)), 1)
+        
+        self.db_manager.delete_relation(relation_id)
+        self.assertEqual(len(self.db_manager.get_relations(self.child_id)), 1)
+        self.assertEqual(len(self.db_manager.get_relations(other_id)), 0)
+    
+    def test_delete_person_invalidates_cache(self):
+        """Test unieważniania po usunięciu osoby"""
+        self.db_manager.get_person(self.child_id)
+        self.db_manager.get_relations(self.parent_id)
+        
+        self.db_manager.delete_person(self.child_id)
+        
+        self.assertIsNone(self.db_manager.get_person(self.child_id))
+        self.assertEqual(self.db_manager.get_relations(self.parent_id), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
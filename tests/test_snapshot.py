@@ -0,0 +1,217 @@
+"""
+Testy jednostkowe dla binarnej migawki drzewa
+"""
+
+import unittest
+import importlib.util
+import os
+import sqlite3
+import tempfile
+from src.business_logic.relationship_calculator import RelationshipCalculator
+from src.database.db_manager import DatabaseManager
+from src.utils.snapshot import Snapshot, StringColumn, load_snapshot, save_snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+    """Testy zapisu, wczytania i odtworzenia bazy z migawki"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_manager = DatabaseManager(os.path.join(self.temp_dir.name, 'drzewo.db'))
+        self.path = os.path.join(self.temp_dir.name, 'drzewo.snap')
+        
+        add = self.db_manager.add_person
+        # Dziadkowie, ich dzieci z małżonkami i kuzyni, którzy się pobrali
+        self.grandfather = add('Jan', 'Kowalski', '1850', None, 'M', 'Łódź')
+        self.grandmother = add('Maria', 'Kowalska', 'ABT 1852', '1920-03-01', 'K',
+                               nazwisko_panienskie='Nowak', notatki='Wiersz 1\nWiersz 2')
+        self.son = add('Piotr', 'Kowalski', '1875', None, 'M')
+        self.daughter = add('Anna', 'Wiśniewska', '1878', None, 'K')
+        self.son_wife = add('Zofia', 'Kowalska', None, None, 'K')
+        self.daughter_husband = add('Adam', 'Wiśniewski', None, None, 'M')
+        self.cousin1 = add('Józef', 'Kowalski', '1900', None, 'M')
+        self.cousin2 = add('Helena', 'Wiśniewska', '1902', None, 'K')
+        self.child = add('Stefan', 'Kowalski', '1925', None, 'M')
+        self.db_manager.delete_person(add('Usunięty', 'X'))
+        
+        relate = self.db_manager.add_relation
+        for parent_id, child_id in ((self.grandfather, self.son), (self.grandmother, self.son),
+                                    (self.son, self.cousin1), (self.son_wife, self.cousin1),
+                                    (self.cousin1, self.child), (self.cousin2, self.child)):
+            relate(parent_id, child_id, 'rodzic')
+        # Ta sama krawędź zapisana z perspektywy dziecka
+        relate(self.daughter, self.grandfather, 'dziecko')
+        relate(self.daughter, self.grandmother, 'dziecko')
+        relate(self.cousin2, self.daughter, 'dziecko')
+        relate(self.cousin2, self.daughter_husband, 'dziecko')
+        relate(self.grandfather, self.grandmother, 'małżonek')
+        relate(self.cousin1, self.cousin2, 'małżonek')
+    
+    def tearDown(self):
+        """Sprzątanie po każdym teście"""
+        self.db_manager.close()
+        self.temp_dir.cleanup()
+    
+    def test_restore_roundtrip(self):
+        """Test odtworzenia bazy z zachowaniem ID, kolumn dat i przodków"""
+        for compression in ('zlib', None):
+            save_snapshot(self.db_manager, self.path, compression)
+            target = DatabaseManager(os.path.join(self.temp_dir.name, f'kopia_{compression}.db'))
+            try:
+                self.assertEqual(load_snapshot(self.path).restore(target), 9)
+                self.assertEqual(target.dump_rows(), self.db_manager.dump_rows())
+                self.assertEqual(target.get_generations(), self.db_manager.get_generations())
+                self.assertTrue(target.is_ancestor(self.grandmother, self.child))
+                # Nowe osoby otrzymują ID za odtworzonymi
+                self.assertGreater(target.add_person('Nowa', 'Osoba'), self.child)
+            finally:
+                target.close()
+    
+    def test_restore_replaces_journal_entries_with_gap(self):
+        """Test odtworzenia bez wpisów dziennika dla każdego wiersza"""
+        save_snapshot(self.db_manager, self.path)
+        target = DatabaseManager(os.path.join(self.temp_dir.name, 'kopia.db'))
+        try:
+            target.delete_person(target.add_person('Tymczasowa', 'Osoba', '1880'))
+            target.get_surname_counts()
+            list(target.validate())
+            since = target.get_last_sequence()
+            deltas = []
+            target.subscribe_changes(deltas.append)
+            
+            load_snapshot(self.path).restore(target)
+            # Obserwatorzy i odbiorcy dziennika przeliczają stan od nowa
+            self.assertEqual(deltas, [None])
+            self.assertEqual(target.get_changes_since(0), [])
+            self.assertTrue(target.has_changes_since(since, 'relacje'))
+            self.assertEqual(target.get_surname_counts(), self.db_manager.get_surname_counts())
+            self.assertEqual(list(target.validate()), list(self.db_manager.validate()))
+            # Indeks lat życia wypełniony po wstawieniu osób
+            self.assertEqual(target.persons_alive_in(1880), self.db_manager.persons_alive_in(1880))
+            
+            # Wyzwalacze dziennika działają dalej
+            since = target.get_last_sequence()
+            person_id = target.add_person('Nowa', 'Osoba', '1990')
+            self.assertEqual([(c['operacja'], c['rekord_id']) for c in target.get_changes_since(since)],
+                             [('INSERT', person_id)])
+            self.assertEqual(deltas[-1][0]['rekord_id'], person_id)
+            self.assertIn(person_id, [p['id'] for p in target.persons_alive_in(1995)])
+        finally:
+            target.close()
+    
+    def test_failed_restore_keeps_triggers(self):
+        """Test przywrócenia wyzwalaczy po wycofaniu nieudanego odtworzenia"""
+        target = DatabaseManager(os.path.join(self.temp_dir.name, 'kopia.db'))
+        try:
+            row = self.db_manager.dump_rows()[0][0]
+            with self.assertRaises(sqlite3.IntegrityError):
+                target.restore_rows([row, row], [])
+            
+            since = target.get_last_sequence()
+            person_id = target.add_person('Nowa', 'Osoba', '1990')
+            self.assertEqual([c['rekord_id'] for c in target.get_changes_since(since)], [person_id])
+            self.assertEqual([p['id'] for p in target.persons_alive_in(1995)], [person_id])
+        finally:
+            target.close()
+    
+    def test_restore_places(self):
+        """Test odtworzenia słownika miejsc z aliasami i współrzędnymi"""
+        lodz = self.db_manager.get_place_id('Łódź')
+        self.db_manager.add_person('Ewa', 'Nowak', miejsce_urodzenia='Lodz', miejsce_smierci='Kraków')
+        self.db_manager.add_place_alias(lodz, 'Lodz')
+        self.db_manager.update_place(lodz, szerokosc=51.77, dlugosc=19.46)
+        save_snapshot(self.db_manager, self.path)
+        
+        target = DatabaseManager(os.path.join(self.temp_dir.name, 'kopia.db'))
+        try:
+            load_snapshot(self.path).restore(target)
+            self.assertEqual(target.dump_places(), self.db_manager.dump_places())
+            self.assertEqual(target.dump_rows(), self.db_manager.dump_rows())
+            self.assertEqual(target.get_place(lodz)['szerokosc'], 51.77)
+            self.assertEqual(target.get_migrations(), self.db_manager.get_migrations())
+            # Nowe miejsca otrzymują ID za odtworzonymi
+            target.add_person('Adam', 'Nowak', miejsce_urodzenia='Gdańsk')
+            self.assertGreater(target.get_place_id('Gdańsk'), target.get_place_id('Kraków'))
+        finally:
+            target.close()
+    
+    def test_restore_without_places(self):
+        """Test odtworzenia z migawki bez słownika miejsc (wersja 1)"""
+        snapshot = Snapshot.from_database(self.db_manager)
+        columns = {column: data for column, data in snapshot.columns.items()
+                   if column not in DatabaseManager.PLACE_COLUMNS}
+        Snapshot(snapshot.ids, columns, snapshot.relations).save(self.path)
+        
+        target = DatabaseManager(os.path.join(self.temp_dir.name, 'kopia.db'))
+        try:
+            load_snapshot(self.path).restore(target)
+            self.assertEqual(target.get_person(self.grandfather)['miejsce_urodzenia_id'],
+                             target.get_place_id('łódź'))
+        finally:
+            target.close()
+    
+    def test_person_and_pedigree(self):
+        """Test odczytu osoby i rodowodu z wczytanej migawki bez bazy"""
+        save_snapshot(self.db_manager, self.path)
+        snapshot = load_snapshot(self.path)
+        
+        self.assertEqual(len(snapshot), 9)
+        person = snapshot.person(self.grandmother)
+        self.assertEqual(person, {'id': self.grandmother, **{
+            key: value for key, value in self.db_manager.get_person(self.grandmother).items()
+            if key != 'id'}})
+        self.assertIsNone(snapshot.person(self.child + 1))
+        self.assertEqual(snapshot.parents_of(self.child), [self.cousin1, self.cousin2])
+        
+        calculator = RelationshipCalculator(self.db_manager)
+        pedigree = snapshot.pedigree(self.child)
+        self.assertEqual(pedigree.parents, calculator.get_pedigree(self.child).parents)
+        self.assertEqual(pedigree.inbreeding(self.child),
+                         calculator.calculate_inbreeding(self.child))
+        self.assertGreater(pedigree.inbreeding(self.child), 0)
+    
+    def test_string_interning(self):
+        """Test zapisu powtarzających się wartości raz w tablicy napisów"""
+        column = StringColumn.from_values(['Kowalski', None, 'Kowalski', 'Łódź', 1850])
+        
+        self.assertEqual(column.table, ['Kowalski', 'Łódź', '1850'])
+        self.assertEqual(column.codes.tolist(), [0, -1, 0, 1, 2])
+        self.assertEqual(column.tolist(), ['Kowalski', None, 'Kowalski', 'Łódź', '1850'])
+        with self.assertRaises(ValueError):
+            StringColumn.from_values(['a\0b'])
+    
+    def test_empty_database(self):
+        """Test migawki pustej bazy"""
+        target = DatabaseManager(os.path.join(self.temp_dir.name, 'pusta.db'))
+        try:
+            save_snapshot(target, self.path)
+            snapshot = load_snapshot(self.path)
+            self.assertEqual(len(snapshot), 0)
+            self.assertEqual(snapshot.pedigree_edges([1]), [])
+        finally:
+            target.close()
+    
+    def test_invalid_input(self):
+        """Test odrzucenia innego pliku, nieznanej kompresji i niepustej bazy"""
+        with open(self.path, 'wb') as f:
+            f.write(b'0 HEAD\n0 TRLR\n')
+        with self.assertRaises(ValueError):
+            load_snapshot(self.path)
+        with self.assertRaises(ValueError):
+            save_snapshot(self.db_manager, self.path, 'lzma')
+        
+        save_snapshot(self.db_manager, self.path)
+        with self.assertRaises(ValueError):
+            Snapshot.load(self.path).restore(self.db_manager)
+    
+    @unittest.skipIf(importlib.util.find_spec('zstandard') is not None,
+                     'pakiet zstandard jest zainstalowany')
+    def test_zstd_requires_package(self):
+        """Test czytelnego błędu kompresji zstd bez pakietu zstandard"""
+        with self.assertRaises(ValueError):
+            save_snapshot(self.db_manager, self.path, 'zstd')
+
+
+if __name__ == '__main__':
+    unittest.main()
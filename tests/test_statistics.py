@@ -0,0 +1,151 @@
+"""
+Testy jednostkowe dla statystyk nazwisk, migracji i dekad urodzenia
+"""
+
+import unittest
+import os
+import sqlite3
+import tempfile
+from collections import Counter
+from src.database.db_manager import DatabaseManager
+
+
+class TestStatistics(unittest.TestCase):
+    """Testy tabel zbiorczych odświeżanych z dziennika zmian"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'drzewo.db')
+        self.db_manager = DatabaseManager(self.db_path)
+        
+        add = self.db_manager.add_person
+        self.jan = add('Jan', 'Kowalski', '1850', '1920', 'M', 'Łódź', 'Warszawa')
+        self.maria = add('Maria', 'Kowalska', 'ABT 1852', None, 'K', 'Łódź', 'Warszawa')
+        self.piotr = add('Piotr', 'Kowalski', '1875-03-01', None, 'M', 'Warszawa', 'Warszawa')
+        self.anna = add('Anna', 'Nowak', None, None, 'K', 'Kraków', None)
+        self.adam = add('Adam', 'Kowalski', '1849', None, 'M', '', 'Kraków')
+    
+    def tearDown(self):
+        """Sprzątanie po każdym teście"""
+        self.db_manager.close()
+        self.temp_dir.cleanup()
+    
+    def _expected(self) -> tuple:
+        """Statystyki wyliczone w Pythonie ze wszystkich osób"""
+        surnames, migrations, decades = Counter(), Counter(), Counter()
+        for person in self.db_manager.get_all_persons():
+            if person['nazwisko']:
+                surnames[person['nazwisko']] += 1
+            places = [person[column] for column in DatabaseManager.PLACE_COLUMNS]
+            if None not in places:
+                migrations[tuple(self.db_manager.get_place(place)['nazwa'] for place in places)] += 1
+            if person['urodzenie_klucz'] is not None:
+                decades[person['urodzenie_klucz'] // 100000 * 10] += 1
+        return dict(surnames), dict(migrations), dict(decades)
+    
+    def _actual(self) -> tuple:
+        """Statystyki odczytane z tabel zbiorczych"""
+        migrations = self.db_manager.get_migrations(include_same=True)
+        return (self.db_manager.get_surname_counts(),
+                {(m['miejsce_urodzenia'], m['miejsce_smierci']): m['liczba'] for m in migrations},
+                {d['dekada']: d['liczba'] for d in self.db_manager.get_birth_decades()})
+    
+    def test_queries(self):
+        """Test rankingów nazwisk i migracji oraz urodzeń wg dekad"""
+        self.assertEqual(self.db_manager.get_surname_frequency(), [
+            {'nazwisko': 'Kowalski', 'liczba': 3},
+            {'nazwisko': 'Kowalska', 'liczba': 1},
+            {'nazwisko': 'Nowak', 'liczba': 1},
+        ])
+        self.assertEqual(self.db_manager.get_surname_frequency(limit=1)[0]['nazwisko'], 'Kowalski')
+        # Osoby zmarłe w miejscu urodzenia i bez jednego z miejsc są pomijane
+        self.assertEqual(self.db_manager.get_migrations(), [
+            {'miejsce_urodzenia': 'Łódź', 'miejsce_smierci': 'Warszawa', 'liczba': 2},
+        ])
+        self.assertEqual(len(self.db_manager.get_migrations(include_same=True)), 2)
+        self.assertEqual(self.db_manager.get_birth_decades(), [
+            {'dekada': 1840, 'liczba': 1},
+            {'dekada': 1850, 'liczba': 2},
+            {'dekada': 1870, 'liczba': 1},
+        ])
+    
+    def test_incremental_refresh(self):
+        """Test uwzględnienia dodania, zmiany, scalenia i usunięcia osób"""
+        self.assertEqual(self._actual(), self._expected())
+        statistics = self.db_manager.statistics
+        
+        person = self.db_manager.get_person(self.piotr)
+        person.update(nazwisko='Nowak', data_urodzenia='1901', miejsce_smierci='Kraków')
+        self.db_manager.update_person(self.piotr, **{key: person[key] for key in DatabaseManager.PERSON_COLUMNS})
+        self.db_manager.delete_person(self.maria)
+        self.db_manager.add_person('Zofia', 'Nowak', '1903', None, 'K', 'Łódź', 'Warszawa')
+        self.db_manager.merge_persons(self.jan, self.adam)
+        
+        self.assertEqual(self._actual(), self._expected())
+        self.assertEqual(statistics.get_last_sequence(), self.db_manager.get_last_sequence())
+        self.assertNotIn(1870, self._actual()[2])
+        
+        # Wynik przyrostowy jest taki sam jak po przeliczeniu od nowa
+        incremental = self._actual()
+        statistics.refresh(full=True)
+        self.assertEqual(self._actual(), incremental)
+    
+    def test_migrations_by_place(self):
+        """Test migracji liczonych wg miejsc ze słownika, a nie tekstu nazw"""
+        self.db_manager.add_person('Ewa', 'Nowak', None, None, 'K', 'Warszawa', 'warszawa ')
+        self.db_manager.add_person('Adam', 'Nowak', None, None, 'M', 'W-wa', 'ŁÓDŹ')
+        self.assertEqual(self.db_manager.get_migrations(), [
+            {'miejsce_urodzenia': 'Łódź', 'miejsce_smierci': 'Warszawa', 'liczba': 2},
+            {'miejsce_urodzenia': 'W-wa', 'miejsce_smierci': 'Łódź', 'liczba': 1},
+        ])
+        
+        # Alias scala miejsca, a ich pary są liczone razem
+        self.db_manager.add_place_alias(self.db_manager.get_place_id('Warszawa'), 'W-wa')
+        self.assertEqual(self.db_manager.get_migrations(), [
+            {'miejsce_urodzenia': 'Łódź', 'miejsce_smierci': 'Warszawa', 'liczba': 2},
+            {'miejsce_urodzenia': 'Warszawa', 'miejsce_smierci': 'Łódź', 'liczba': 1},
+        ])
+        self.assertEqual(self._actual(), self._expected())
+    
+    def test_tables_of_previous_version_are_rebuilt(self):
+        """Test odtworzenia tabel zbiorczych zapisanych w poprzednim układzie"""
+        self.db_manager.get_surname_counts()
+        self.db_manager.close()
+        connection = sqlite3.connect(self.db_path)
+        connection.executescript('''
+            DROP TABLE stat_migracje;
+            CREATE TABLE stat_migracje (miejsce_urodzenia, miejsce_smierci, liczba INTEGER NOT NULL,
+                                        PRIMARY KEY (miejsce_urodzenia, miejsce_smierci)) WITHOUT ROWID;
+            DELETE FROM statystyki_stan WHERE klucz = 'wersja';
+        ''')
+        connection.close()
+        
+        self.db_manager = DatabaseManager(self.db_path)
+        self.assertEqual(self._actual(), self._expected())
+    
+    def test_rebuild_after_pruned_journal(self):
+        """Test przeliczenia od nowa, gdy dziennik nie obejmuje wszystkich zmian"""
+        self.db_manager.get_surname_counts()
+        self.db_manager.add_person('Ewa', 'Zielińska', '1930')
+        self.db_manager.journal.prune(self.db_manager.get_last_sequence())
+        self.db_manager.add_person('Ewa', 'Zielińska', '1931')
+        
+        self.assertEqual(self._actual(), self._expected())
+        self.assertEqual(self.db_manager.get_surname_counts()['Zielińska'], 2)
+    
+    def test_persisted_between_sessions(self):
+        """Test odczytu statystyk zapisanych w bazie i zmian z innego połączenia"""
+        self.db_manager.get_surname_counts()
+        other = DatabaseManager(self.db_path)
+        try:
+            other.add_person('Ewa', 'Nowak', '1930')
+        finally:
+            other.close()
+        
+        self.assertEqual(self.db_manager.get_surname_counts()['Nowak'], 2)
+        self.assertEqual(self._actual(), self._expected())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Testy jednostkowe dla pamięci miniatur zdjęć
+"""
+
+import unittest
+import os
+import tempfile
+from src.utils.thumbnail_cache import ThumbnailCache, bucket_for
+
+try:
+    from PIL import Image
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+
+class TestThumbnailHelpers(unittest.TestCase):
+    """Testy funkcji pomocniczych"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+    
+    def tearDown(self):
+        """Sprzątanie po każdym teście"""
+        self.temp_dir.cleanup()
+    
+    def test_bucket_for(self):
+        """Test doboru rozmiaru miniatury"""
+        self.assertEqual(bucket_for(10), 64)
+        self.assertEqual(bucket_for(100), 128)
+        self.assertEqual(bucket_for(128), 128)
+        self.assertEqual(bucket_for(5000), 512)
+    
+    def test_request_missing_file(self):
+        """Test obsługi nieistniejącego pliku"""
+        cache = ThumbnailCache(os.path.join(self.temp_dir.name, 'thumbs'))
+        results = []
+        
+        future = cache.request(os.path.join(self.temp_dir.name, 'brak.jpg'), 100,
+                               lambda path, data: results.append(data))
+        
+        self.assertIsInstance(future.exception(), OSError)
+        self.assertEqual(results, [None])
+        self.assertIsNone(cache.get('brak.jpg', 100))
+
+
+@unittest.skipUnless(HAS_PIL, "Pillow nie jest zainstalowany")
+class TestThumbnailCache(unittest.TestCase):
+    """Testy generowania miniatur"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, 'thumbs')
+        self.cache = ThumbnailCache(self.cache_dir, memory_size=4)
+        self.photo = os.path.join(self.temp_dir.name, 'zdjecie.jpg')
+        Image.new('RGB', (1200, 800), (200, 120, 40)).save(self.photo)
+    
+    def tearDown(self):
+        """Sprzątanie po każdym teście"""
+        self.cache.shutdown(wait=True)
+        self.temp_dir.cleanup()
+    
+    def test_generates_bucketed_thumbnail(self):
+        """Test generowania miniatury w tle i jej ponownego użycia"""
+        self.assertIsNone(self.cache.get(self.photo, 100))
+        
+        data = self.cache.request(self.photo, 100).result(timeout=30)
+        
+        thumbnail = os.path.join(self.temp_dir.name, 'miniatura.png')
+        with open(thumbnail, 'wb') as f:
+            f.write(data)
+        with Image.open(thumbnail) as image:
+            self.assertEqual(image.size, (128, 85))
+        self.assertEqual(self.cache.get(self.photo, 100), data)
+    
+    def test_identical_photos_share_thumbnail(self):
+        """Test współdzielenia miniatury przez identyczne pliki"""
+        copy = os.path.join(self.temp_dir.name, 'kopia.jpg')
+        with open(self.photo, 'rb') as src, open(copy, 'wb') as dst:
+            dst.write(src.read())
+        
+        self.cache.load(self.photo, 64)
+        self.cache.load(copy, 64)
+        
+        files = [name for _, _, names in os.walk(self.cache_dir) for name in names]
+        self.assertEqual(len(files), 1)
+    
+    def test_disk_cache_survives_restart(self):
+        """Test wczytywania miniatur zapisanych przez poprzednią instancję"""
+        data = self.cache.load(self.photo, 256)
+        
+        other = ThumbnailCache(self.cache_dir)
+        self.assertEqual(other.load(self.photo, 256), data)
+        self.assertEqual(other.get_stats()['size'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
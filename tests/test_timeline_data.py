@@ -0,0 +1,110 @@
+"""
+Testy jednostkowe dla danych osi czasu
+"""
+
+import unittest
+import os
+import random
+import tempfile
+import numpy as np
+from src.business_logic.timeline_data import (
+    build_timeline_data, GENDER_MALE, GENDER_FEMALE, GENDER_UNKNOWN
+)
+from src.database.db_manager import DatabaseManager
+
+
+class TestTimelineData(unittest.TestCase):
+    """Testy dla TimelineData i LifespanIndex"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        rng = random.Random(7)
+        rows = []
+        for person_id in range(1, 2001):
+            birth = rng.randint(1600, 2000)
+            death = birth + rng.randint(0, 100) if rng.random() < 0.8 else None
+            rows.append((person_id, 'Imię', f'N{person_id}', rng.choice('MK'), birth, death))
+        self.data = build_timeline_data(rows, current_year=2024)
+    
+    def _brute_force(self, year_from, year_to):
+        """Wiersze osób żyjących w przedziale wyznaczone bez indeksu"""
+        mask = (self.data.birth <= year_to) & (self.data.end >= year_from)
+        return np.flatnonzero(mask)
+    
+    def test_query_matches_brute_force(self):
+        """Test zgodności zapytań o zakres lat z pełnym przeglądem"""
+        for year_from, year_to in [(1500, 1550), (1600, 1600), (1750.5, 1760.2),
+                                   (1900, 2100), (2020, 2030), (1500, 2100)]:
+            np.testing.assert_array_equal(
+                self.data.visible_rows(year_from, year_to),
+                self._brute_force(year_from, year_to)
+            )
+    
+    def test_open_ended_lifespans(self):
+        """Test osób bez daty śmierci żyjących do bieżącego roku"""
+        rows = self.data.visible_rows(2024, 2024)
+        
+        self.assertTrue(self.data.open_ended[rows].any())
+        self.assertFalse(self.data.open_ended[self.data.visible_rows(2025, 2200)].any())
+    
+    def test_rows_sorted_by_birth(self):
+        """Test uporządkowania według roku urodzenia i kodów płci"""
+        data = build_timeline_data([
+            (1, 'Jan', 'Nowak', 'M', 1950, 2010),
+            (2, 'Anna', 'Nowak', 'K', 1920, None),
+            (3, 'Alex', 'Nowak', None, 1900, 1880),
+        ], current_year=2024)
+        
+        self.assertEqual(data.ids.tolist(), [3, 2, 1])
+        self.assertEqual(data.names[0], 'Alex Nowak')
+        self.assertEqual(data.gender.tolist(), [GENDER_UNKNOWN, GENDER_FEMALE, GENDER_MALE])
+        self.assertEqual(data.end.tolist(), [1900, 2024, 2010])
+        self.assertEqual(data.year_range, (1900, 2024))
+        self.assertEqual(data.bar_vertices(np.array([1])).shape, (1, 4, 2))
+        self.assertEqual(data.rows_of([1, 3, 99]).tolist(), [0, 2])
+
+
+class TestTimelineRows(unittest.TestCase):
+    """Testy projekcji SQL dla osi czasu"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_manager = DatabaseManager(os.path.join(self.temp_dir.name, 'drzewo.db'))
+    
+    def tearDown(self):
+        """Sprzątanie po każdym teście"""
+        self.db_manager.close()
+        self.temp_dir.cleanup()
+    
+    def test_get_timeline_rows(self):
+        """Test wyodrębniania lat z dat i pomijania osób bez daty urodzenia"""
+        first = self.db_manager.add_person('Jan', 'Kowalski', '1900-03-01', '1970-05-02', 'M')
+        second = self.db_manager.add_person('Anna', 'Kowalska', '1880', 'nieznana', 'K')
+        self.db_manager.add_person('Piotr', 'Kowalski', None, None, 'M')
+        third = self.db_manager.add_person('Ewa', 'Kowalska', 'ok. 1850', None, 'K')
+        
+        rows = self.db_manager.get_timeline_rows()
+        
+        self.assertEqual(rows, [
+            (third, 'Ewa', 'Kowalska', 'K', 1850, None),
+            (second, 'Anna', 'Kowalska', 'K', 1880, None),
+            (first, 'Jan', 'Kowalski', 'M', 1900, 1970),
+        ])
+    
+    def test_contemporaries_rows(self):
+        """Test wierszy osi czasu dla osób żyjących w roku i współczesnych z indeksu R*Tree"""
+        jan = self.db_manager.add_person('Jan', 'Kowalski', '1900', '1970', 'M')
+        anna = self.db_manager.add_person('Anna', 'Kowalska', '1850', '1905', 'K')
+        ewa = self.db_manager.add_person('Ewa', 'Kowalska', '1960', None, 'K')
+        self.db_manager.add_person('Piotr', 'Kowalski', None, None, 'M')
+        data = build_timeline_data(self.db_manager.get_timeline_rows(), current_year=2024)
+        
+        alive = [p['id'] for p in self.db_manager.persons_alive_in(1965)]
+        self.assertEqual(data.ids[data.rows_of(alive)].tolist(), [jan, ewa])
+        contemporaries = [p['id'] for p in self.db_manager.overlapping_persons(jan)] + [jan]
+        self.assertEqual(data.ids[data.rows_of(contemporaries)].tolist(), [anna, jan, ewa])
+
+
+if __name__ == '__main__':
+    unittest.main()
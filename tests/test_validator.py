@@ -0,0 +1,116 @@
+"""
+Testy jednostkowe dla walidatora danych
+"""
+
+import unittest
+import os
+import tempfile
+from src.database.db_manager import DatabaseManager
+
+
+class TestDataValidator(unittest.TestCase):
+    """Testy dla klasy DataValidator"""
+    
+    def setUp(self):
+        """Przygotowanie przed każdym testem"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_manager = DatabaseManager(os.path.join(self.temp_dir.name, 'drzewo.db'))
+        
+        # Poprawna rodzina: ojciec, matka i syn
+        self.ojciec = self.db_manager.add_person('Jan', 'Nowak', '1900-05-01', '1970', 'M')
+        self.matka = self.db_manager.add_person('Maria', 'Nowak', '1905', '1980', 'K')
+        self.syn = self.db_manager.add_person('Piotr', 'Nowak', '1930', None, 'M')
+        self.db_manager.add_relation(self.ojciec, self.syn, 'rodzic')
+        self.db_manager.add_relation(self.syn, self.matka, 'dziecko')
+        self.db_manager.add_relation(self.ojciec, self.matka, 'małżonek')
+    
+    def tearDown(self):
+        """Sprzątanie po każdym teście"""
+        self.db_manager.close()
+        self.temp_dir.cleanup()
+    
+    def _codes(self, findings):
+        """Zbiór par (kod, osoba) z listy problemów"""
+        return {(finding.code, finding.person_id) for finding in findings}
+    
+    def test_valid_data(self):
+        """Test braku problemów w poprawnych danych"""
+        self.assertEqual(list(self.db_manager.validate()), [])
+        self.assertEqual(self.db_manager.get_validation_findings(), [])
+    
+    def test_relation_checks(self):
+        """Test reguł dotyczących relacji"""
+        self.db_manager.add_relation(self.syn, self.syn, 'małżonek')
+        self.db_manager.add_relation(self.syn, 999, 'małżonek')
+        self.db_manager.add_relation(self.matka, self.ojciec, 'małżonek')
+        self.db_manager.add_relation(self.syn, self.ojciec, 'dziecko')
+        
+        codes = self._codes(self.db_manager.validate())
+        
+        self.assertEqual(codes, {('relacja_z_soba', self.syn), ('nieznana_osoba', self.syn),
+                                 ('duplikat_relacji', self.ojciec)})
+    
+    def test_parent_checks(self):
+        """Test reguł dotyczących rodziców"""
+        wnuk = self.db_manager.add_person('Adam', 'Nowak', '1920', None, 'M')
+        dziadek = self.db_manager.add_person('Karol', 'Nowak', '1800', '1850', 'M')
+        obcy = self.db_manager.add_person('Jerzy', 'Kowal', '1890', None, 'M')
+        self.db_manager.add_relation(self.syn, wnuk, 'rodzic')
+        self.db_manager.add_relation(dziadek, self.ojciec, 'rodzic')
+        self.db_manager.add_relation(obcy, self.syn, 'rodzic')
+        
+        findings = list(self.db_manager.validate())
+        codes = self._codes(findings)
+        
+        self.assertIn(('dziecko_starsze_od_rodzica', wnuk), codes)
+        self.assertNotIn(('wiek_rodzica', wnuk), codes)
+        self.assertIn(('wiek_rodzica', self.ojciec), codes)
+        self.assertIn(('urodzenie_po_smierci_rodzica', self.ojciec), codes)
+        self.assertIn(('zbyt_wielu_rodzicow', self.syn), codes)
+        self.assertNotIn(('wiek_rodzica', self.syn), codes)
+    
+    def test_person_and_cycle_checks(self):
+        """Test reguł dotyczących dat osoby i cykli przodków"""
+        wnuk = self.db_manager.add_person('Adam', 'Nowak', '1960', '1950', 'M')
+        self.db_manager.add_relation(self.syn, wnuk, 'rodzic')
+        self.db_manager.add_relation(wnuk, self.ojciec, 'rodzic')
+        self.db_manager.add_relation(self.syn, self.matka, 'rodzic')
+        
+        codes = self._codes(self.db_manager.validate())
+        
+        self.assertIn(('smierc_przed_urodzeniem', wnuk), codes)
+        self.assertIn(('sprzeczne_pokrewienstwo', self.matka), codes)
+        self.assertIn(('cykl_przodkow', self.ojciec), codes)
+        self.assertNotIn(('cykl_przodkow', self.matka), codes)
+    
+    def test_incremental_run(self):
+        """Test sprawdzania tylko osób zmienionych od poprzedniej walidacji"""
+        inna = self.db_manager.add_person('Anna', 'Kowal', '1950', '1940', 'K')
+        self.db_manager.add_relation(self.syn, self.syn, 'małżonek')
+        self.assertEqual(len(list(self.db_manager.validate())), 2)
+        
+        # Brak zmian - nic do sprawdzenia, zapisane problemy pozostają
+        self.assertEqual(list(self.db_manager.validate()), [])
+        self.assertEqual(len(self.db_manager.get_validation_findings()), 2)
+        
+        # Poprawienie jednej osoby nie usuwa problemu drugiej
+        self.db_manager.update_person(inna, 'Anna', 'Kowal', '1950', '1990', 'K')
+        self.assertEqual(list(self.db_manager.validate()), [])
+        self.assertEqual(self._codes(self.db_manager.get_validation_findings()),
+                         {('relacja_z_soba', self.syn)})
+        self.assertEqual(len(self.db_manager.get_validation_findings(inna)), 0)
+    
+    def test_full_run_after_pruned_journal(self):
+        """Test pełnego sprawdzenia, gdy dziennik zmian został przycięty"""
+        list(self.db_manager.validate())
+        self.db_manager.add_relation(self.syn, self.syn, 'małżonek')
+        self.db_manager.add_person('Ewa', 'Nowak', '1990', None, 'K')
+        self.db_manager.journal.prune(self.db_manager.journal.get_last_sequence() - 1)
+        
+        codes = self._codes(self.db_manager.validate())
+        
+        self.assertEqual(codes, {('relacja_z_soba', self.syn)})
+
+
+if __name__ == '__main__':
+    unittest.main()